@@ -0,0 +1,378 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+from app.calibration.session import PoseSession, record_session
+from app.config.persistence import CalibrationWriter, CalibrationWriterConfig
+from app.config.settings import RUNTIME_CONFIG_PATH, AppSettings, DisplaySettings, load_settings
+from app.tracking.base import Tracker
+from app.tracking.network_tracker import NetworkTracker
+from app.tracking.sim_tracker import SimTracker, SimTrackerConfig
+from app.tracking.zed_tracker import ZedTracker, ZedTrackerConfig
+
+# Screen points in display coordinates: origin at the screen centre, +y up, +z toward the viewer.
+SCREEN_POINTS = {
+    "center": (0.0, 0.0),
+    "top_left": (-0.5, 0.5),
+    "top_right": (0.5, 0.5),
+    "bottom_left": (-0.5, -0.5),
+    "bottom_right": (0.5, -0.5),
+}
+
+_WORLD_UP = np.array([0.0, 1.0, 0.0])
+
+
+@dataclass(slots=True)
+class CalibrationReference:
+    # A stretch of the session where the eye position (and optionally gaze target) is known.
+    t_start_s: float
+    t_end_s: float
+    eye_m: tuple[float, float, float]
+    look_at_m: tuple[float, float, float] | None = None
+
+
+@dataclass(slots=True)
+class SolverConfig:
+    max_iterations: int = 50
+    min_confidence: float = 0.4
+    # Residual scales: 1 cm of position error weighs the same as ~0.6 deg of heading error.
+    position_sigma_m: float = 0.01
+    direction_sigma_rad: float = 0.01
+    # Huber threshold in sigmas; tracker glitches beyond it are down-weighted. <= 0 disables.
+    huber_k: float = 3.0
+    initial_lambda: float = 1e-3
+    step_tolerance: float = 1e-9
+
+
+@dataclass(slots=True)
+class CalibrationResult:
+    camera_offset: tuple[float, float, float, float, float, float]
+    samples: int
+    iterations: int
+    converged: bool
+    rms_position_m: float
+    rms_direction_deg: float
+    # yaw/pitch/roll stay at the initial value when no reference constrains them.
+    fitted_angles: tuple[bool, bool, bool] = (False, False, False)
+    solve_ms: float = 0.0
+
+
+@dataclass(slots=True)
+class _Problem:
+    positions: np.ndarray  # (M, 3) tracker positions
+    angles: np.ndarray  # (M, 3) tracker yaw/pitch/roll, radians
+    eyes: np.ndarray  # (M, 3)
+    directions: np.ndarray  # (M, 3) unit gaze targets
+    rights: np.ndarray  # (M, 3) level right vector for the roll residual
+    has_gaze: np.ndarray  # (M,) float 0/1
+    cfg: SolverConfig = field(default_factory=SolverConfig)
+
+
+def load_references(path: Path, display: DisplaySettings) -> list[CalibrationReference]:
+    raw = yaml.safe_load(Path(path).read_text(encoding="utf-8")) or {}
+    return [_reference(item, display) for item in raw.get("references") or []]
+
+
+def _reference(item: dict, display: DisplaySettings) -> CalibrationReference:
+    t_start, t_end = (float(v) for v in item["t_s"])
+    if t_end <= t_start:
+        raise ValueError(f"reference window must be increasing: {item['t_s']}")
+    eye = tuple(float(v) for v in item["eye_m"])
+    look_at = item.get("look_at")
+    if isinstance(look_at, str):
+        if look_at not in SCREEN_POINTS:
+            raise ValueError(f"unknown look_at {look_at!r}; expected one of {sorted(SCREEN_POINTS)} or [x, y, z]")
+        u, v = SCREEN_POINTS[look_at]
+        look_at = (u * display.width_m, v * display.height_m, 0.0)
+    elif look_at is not None:
+        look_at = tuple(float(v) for v in look_at)
+    return CalibrationReference(t_start, t_end, eye, look_at)
+
+
+def solve_camera_offset(
+    session: PoseSession,
+    references: list[CalibrationReference],
+    initial: tuple[float, float, float, float, float, float] = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+    config: SolverConfig | None = None,
+) -> CalibrationResult:
+    # Levenberg-Marquardt over every reference sample at once. The model is exactly the one
+    # DisplayCalibrator applies: eye = tracker position + offset[:3], view angles = tracker
+    # angles + offset[3:]; gaze references pin yaw/pitch through the view forward vector and
+    # roll through the level of the view right vector.
+    cfg = config or SolverConfig()
+    started = time.perf_counter()
+    problem = _build_problem(session, references, cfg)
+    m = problem.positions.shape[0]
+    if m == 0:
+        raise ValueError("no valid tracker samples fall inside the reference windows")
+
+    x = np.array(initial, dtype=np.float64)
+    x[3:] = np.radians(x[3:])
+    # Translation is linear in the residual; start from its closed-form solution.
+    x[:3] = np.mean(problem.eyes - problem.positions, axis=0)
+
+    r = _residuals(problem, x)
+    cost = _robust_cost(r, cfg.huber_k)
+    lam = cfg.initial_lambda
+    converged = False
+    iterations = 0
+    for iterations in range(1, cfg.max_iterations + 1):
+        jac = _jacobian(problem, x)
+        w = _huber_weights(r, cfg.huber_k)
+        jtw = jac.T * w
+        hess = jtw @ jac
+        grad = jtw @ r
+        diag = np.diag(hess).copy()
+        free = diag > 1e-12 * max(1.0, float(diag.max()))
+        if not free.any():
+            converged = True
+            break
+
+        accepted = False
+        while lam < 1e12:
+            h = hess[np.ix_(free, free)] + lam * np.diag(diag[free])
+            step = np.zeros(6)
+            step[free] = np.linalg.solve(h, -grad[free])
+            x_new = x + step
+            r_new = _residuals(problem, x_new)
+            cost_new = _robust_cost(r_new, cfg.huber_k)
+            if cost_new <= cost:
+                accepted = True
+                break
+            lam *= 10.0
+        if not accepted:
+            converged = True
+            break
+
+        improvement = cost - cost_new
+        x, r, cost = x_new, r_new, cost_new
+        lam = max(lam * 0.3, 1e-12)
+        if float(np.max(np.abs(step))) < cfg.step_tolerance or improvement <= 1e-12 * max(1.0, cost):
+            converged = True
+            break
+
+    forward = _forward(problem.angles + x[3:])
+    gaze = problem.has_gaze > 0.0
+    pos_err = problem.positions + x[:3] - problem.eyes
+    cos = np.clip(np.einsum("ij,ij->i", forward[gaze], problem.directions[gaze]), -1.0, 1.0)
+    offset_deg = np.degrees(x[3:])
+    # Unconstrained angles never leave the initial value (their step is pinned to zero).
+    jac = _jacobian(problem, x)
+    fitted = tuple(bool(np.any(jac[:, 3 + i] != 0.0)) for i in range(3))
+
+    return CalibrationResult(
+        camera_offset=(*(float(v) for v in x[:3]), *(float(v) for v in offset_deg)),
+        samples=m,
+        iterations=iterations,
+        converged=converged,
+        rms_position_m=float(np.sqrt(np.mean(np.sum(pos_err * pos_err, axis=1)))),
+        rms_direction_deg=float(np.degrees(np.sqrt(np.mean(np.arccos(cos) ** 2)))) if cos.size else 0.0,
+        fitted_angles=fitted,
+        solve_ms=(time.perf_counter() - started) * 1000.0,
+    )
+
+
+def apply_camera_offset(settings: AppSettings, offset: tuple[float, ...], display_index: int = 0) -> AppSettings:
+    displays = [settings.display, *settings.displays]
+    if not 0 <= display_index < len(displays):
+        raise ValueError(f"display index {display_index} out of range (0..{len(displays) - 1})")
+    displays[display_index].camera_offset = tuple(round(float(v), 6) for v in offset)
+    return settings
+
+
+def write_camera_offset(
+    offset: tuple[float, ...],
+    display_index: int = 0,
+    path: Path | None = None,
+    writer_config: CalibrationWriterConfig | None = None,
+) -> Path:
+    # Same atomic write + history snapshot as the in-app Save Calibration button.
+    out_path = path or RUNTIME_CONFIG_PATH
+    settings = load_settings(out_path if out_path.exists() else None)
+    apply_camera_offset(settings, offset, display_index)
+    writer = CalibrationWriter(writer_config or CalibrationWriterConfig(debounce_s=0.0), out_path)
+    writer.submit(settings)
+    writer.close()
+    for result in writer.poll_results():
+        if not result.ok:
+            raise OSError(result.error)
+    return out_path
+
+
+def _build_problem(session: PoseSession, references: list[CalibrationReference], cfg: SolverConfig) -> _Problem:
+    t = session.elapsed_s
+    usable = session.valid & (session.confidence >= cfg.min_confidence)
+    index_parts: list[np.ndarray] = []
+    eye_parts: list[np.ndarray] = []
+    dir_parts: list[np.ndarray] = []
+    gaze_parts: list[np.ndarray] = []
+    for ref in references:
+        idx = np.flatnonzero(usable & (t >= ref.t_start_s) & (t <= ref.t_end_s))
+        if idx.size == 0:
+            continue
+        eye = np.asarray(ref.eye_m, dtype=np.float64)
+        index_parts.append(idx)
+        eye_parts.append(np.broadcast_to(eye, (idx.size, 3)))
+        if ref.look_at_m is None:
+            dir_parts.append(np.zeros((idx.size, 3)))
+            gaze_parts.append(np.zeros(idx.size))
+        else:
+            d = np.asarray(ref.look_at_m, dtype=np.float64) - eye
+            dir_parts.append(np.broadcast_to(d / np.linalg.norm(d), (idx.size, 3)))
+            gaze_parts.append(np.ones(idx.size))
+
+    if not index_parts:
+        empty = np.zeros((0, 3))
+        return _Problem(empty, empty, empty, empty, empty, np.zeros(0), cfg)
+    idx = np.concatenate(index_parts)
+    directions = np.concatenate(dir_parts)
+    rights = np.cross(directions, _WORLD_UP)
+    norms = np.linalg.norm(rights, axis=1, keepdims=True)
+    rights = np.divide(rights, norms, out=np.zeros_like(rights), where=norms > 1e-9)
+    return _Problem(
+        positions=session.positions_m[idx],
+        angles=np.radians(session.yaw_pitch_roll_deg[idx]),
+        eyes=np.concatenate(eye_parts),
+        directions=directions,
+        rights=rights,
+        has_gaze=np.concatenate(gaze_parts),
+        cfg=cfg,
+    )
+
+
+def _forward(angles: np.ndarray) -> np.ndarray:
+    # -row 2 of rz @ rx @ ry (compute_view_matrix): where the view looks, in display coordinates.
+    yaw, pitch = angles[:, 0], angles[:, 1]
+    cp = np.cos(pitch)
+    return np.stack((cp * np.sin(yaw), -np.sin(pitch), -cp * np.cos(yaw)), axis=1)
+
+
+def _up(angles: np.ndarray) -> np.ndarray:
+    # Row 1 of the same rotation.
+    cy, sy = np.cos(angles[:, 0]), np.sin(angles[:, 0])
+    cp, sp = np.cos(angles[:, 1]), np.sin(angles[:, 1])
+    cr, sr = np.cos(angles[:, 2]), np.sin(angles[:, 2])
+    return np.stack((sr * cy + cr * sp * sy, cr * cp, sr * sy - cr * sp * cy), axis=1)
+
+
+def _residuals(problem: _Problem, x: np.ndarray) -> np.ndarray:
+    cfg = problem.cfg
+    pos = (problem.positions + x[:3] - problem.eyes) / cfg.position_sigma_m
+    angles = problem.angles + x[3:]
+    gaze = problem.has_gaze[:, None] / cfg.direction_sigma_rad
+    direction = (_forward(angles) - problem.directions) * gaze
+    roll = np.einsum("ij,ij->i", _up(angles), problem.rights)[:, None] * gaze
+    return np.concatenate((pos, direction, roll), axis=1).ravel()
+
+
+def _jacobian(problem: _Problem, x: np.ndarray) -> np.ndarray:
+    # Central differences; each column is one vectorized residual evaluation over the session.
+    m = problem.positions.shape[0]
+    jac = np.empty((7 * m, 6))
+    for i in range(6):
+        h = 1e-6
+        dx = np.zeros(6)
+        dx[i] = h
+        jac[:, i] = (_residuals(problem, x + dx) - _residuals(problem, x - dx)) / (2.0 * h)
+    jac[np.abs(jac) < 1e-12] = 0.0
+    return jac
+
+
+def _huber_weights(r: np.ndarray, k: float) -> np.ndarray:
+    if k <= 0.0:
+        return np.ones_like(r)
+    a = np.abs(r)
+    return np.where(a <= k, 1.0, k / np.maximum(a, 1e-300))
+
+
+def _robust_cost(r: np.ndarray, k: float) -> float:
+    if k <= 0.0:
+        return 0.5 * float(r @ r)
+    a = np.abs(r)
+    return float(np.sum(np.where(a <= k, 0.5 * a * a, k * (a - 0.5 * k))))
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Record a pose session and fit camera_offset to reference positions")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="Record tracker poses to an .npz session")
+    rec.add_argument("--input-mode", choices=("zed", "sim", "network"), default="zed")
+    rec.add_argument("--duration-s", type=float, default=30.0)
+    rec.add_argument("--out", type=Path, default=Path("outputs/calibration_session.npz"))
+
+    solve = sub.add_parser("solve", help="Fit camera_offset and write it to runtime.yaml")
+    solve.add_argument("--session", type=Path, required=True)
+    solve.add_argument("--refs", type=Path, required=True, help="YAML with a `references` list")
+    solve.add_argument("--display", type=int, default=0, help="0 = `display`, i >= 1 = `displays[i-1]`")
+    solve.add_argument("--min-confidence", type=float, default=0.4)
+    solve.add_argument("--out", type=Path, default=RUNTIME_CONFIG_PATH)
+    solve.add_argument("--dry-run", action="store_true", help="Print the result without writing")
+    return p.parse_args(argv)
+
+
+def _build_tracker(input_mode: str, settings: AppSettings) -> Tracker:
+    if input_mode == "sim":
+        return SimTracker(SimTrackerConfig())
+    if input_mode == "network":
+        return NetworkTracker()
+    return ZedTracker(ZedTrackerConfig(camera=settings.camera))
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    settings = load_settings()
+
+    if args.command == "record":
+        tracker = _build_tracker(args.input_mode, settings)
+        try:
+            tracker.start()
+        except Exception as exc:
+            print(f"Startup error: {exc}", file=sys.stderr)
+            return 1
+        try:
+            session = record_session(tracker, args.duration_s)
+        finally:
+            tracker.stop()
+        session.save(args.out)
+        print(f"Recorded {len(session)} samples to {args.out}")
+        return 0
+
+    displays = [settings.display, *settings.displays]
+    if not 0 <= args.display < len(displays):
+        print(f"Display index {args.display} out of range", file=sys.stderr)
+        return 1
+    display = displays[args.display]
+    session = PoseSession.load(args.session)
+    references = load_references(args.refs, display)
+    result = solve_camera_offset(
+        session,
+        references,
+        initial=display.camera_offset,
+        config=SolverConfig(min_confidence=args.min_confidence),
+    )
+    offset = ", ".join(f"{v:.4f}" for v in result.camera_offset)
+    print(
+        f"camera_offset: [{offset}]  samples={result.samples} iterations={result.iterations} "
+        f"rms_position={result.rms_position_m * 1000.0:.1f}mm rms_direction={result.rms_direction_deg:.2f}deg "
+        f"({result.solve_ms:.0f}ms)"
+    )
+    if not all(result.fitted_angles):
+        kept = [name for name, ok in zip(("yaw", "pitch", "roll"), result.fitted_angles) if not ok]
+        print(f"No gaze references constrain {', '.join(kept)}; kept the current value.")
+    if args.dry_run:
+        return 0
+    path = write_camera_offset(result.camera_offset, args.display, args.out)
+    print(f"Wrote {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -16,10 +16,67 @@ class DisplayParams:
     resolution_h: int
 
 
+# Eyes closer to (or behind) the screen plane are clamped to this distance so the frustum
+# stays finite and does not flip.
+MIN_EYE_DISTANCE_M = 0.01
+
+
+@dataclass(slots=True)
+class ScreenBasis:
+    # Physical screen rectangle in display coordinates: lower-left corner plus unit right/up/
+    # normal axes and the extents along them. Fields are (3,) for one screen or (N, 3) for a
+    # stack (see stack_screens); the batched functions broadcast either way.
+    origin: np.ndarray
+    right: np.ndarray
+    up: np.ndarray
+    normal: np.ndarray
+    width_m: np.ndarray
+    height_m: np.ndarray
+
+    @classmethod
+    def from_params(cls, params: DisplayParams) -> ScreenBasis:
+        # The screen is the z=0 plane centred on the origin, the plane the box's front face sits on.
+        return cls(
+            origin=np.array([-params.width_m / 2.0, -params.height_m / 2.0, 0.0]),
+            right=np.array([1.0, 0.0, 0.0]),
+            up=np.array([0.0, 1.0, 0.0]),
+            normal=np.array([0.0, 0.0, 1.0]),
+            width_m=np.array(params.width_m, dtype=np.float64),
+            height_m=np.array(params.height_m, dtype=np.float64),
+        )
+
+
+def stack_screens(screens: list[ScreenBasis]) -> ScreenBasis:
+    return ScreenBasis(
+        origin=np.stack([s.origin for s in screens]),
+        right=np.stack([s.right for s in screens]),
+        up=np.stack([s.up for s in screens]),
+        normal=np.stack([s.normal for s in screens]),
+        width_m=np.stack([s.width_m for s in screens]),
+        height_m=np.stack([s.height_m for s in screens]),
+    )
+
+
 class DisplayCalibrator:
     def __init__(self, params: DisplayParams, camera_offset: tuple[float, float, float, float, float, float]) -> None:
         self._params = params
         self._camera_offset = camera_offset
+        self._screen: ScreenBasis | None = None
+
+    @property
+    def params(self) -> DisplayParams:
+        return self._params
+
+    @property
+    def screen(self) -> ScreenBasis:
+        # Built once per set of display params; only the eye position changes per pose.
+        if self._screen is None:
+            self._screen = ScreenBasis.from_params(self._params)
+        return self._screen
+
+    @property
+    def camera_offset(self) -> tuple[float, float, float, float, float, float]:
+        return self._camera_offset
 
     def set_display_params(self, width_m: float, height_m: float, resolution_w: int, resolution_h: int) -> None:
         self._params = DisplayParams(
@@ -28,6 +85,7 @@ class DisplayCalibrator:
             resolution_w=resolution_w,
             resolution_h=resolution_h,
         )
+        self._screen = None
 
     def set_camera_offset(self, tx_m: float, ty_m: float, tz_m: float, yaw_deg: float, pitch_deg: float, roll_deg: float) -> None:
         self._camera_offset = (tx_m, ty_m, tz_m, yaw_deg, pitch_deg, roll_deg)
@@ -67,3 +125,100 @@ class DisplayCalibrator:
         m[2, 3] = (2.0 * far_m * near_m) / (near_m - far_m)
         m[3, 2] = -1.0
         return m
+
+    def compute_off_axis_matrices(self, head_pose: HeadPose, near_m: float, far_m: float) -> tuple[np.ndarray, np.ndarray]:
+        # Generalized perspective: (view, proj) for the eye at the head position mapped into
+        # display coordinates (see mount_eyes) looking through this display's physical rectangle.
+        offset = np.asarray(self._camera_offset, dtype=np.float64)[None, :]
+        eyes = mount_eyes(head_pose, offset, mount_rotations(offset))
+        views, projs = compute_off_axis_matrices(eyes, self.screen, near_m, far_m)
+        return views[0], projs[0]
+
+
+def compute_view_matrices(head_pose: HeadPose, camera_offsets: np.ndarray) -> np.ndarray:
+    # Batched compute_view_matrix for one pose seen through N camera offsets, shape (N, 6) -> (N, 4, 4).
+    offsets = np.asarray(camera_offsets, dtype=np.float64).reshape(-1, 6)
+    n = offsets.shape[0]
+    pos = np.asarray(head_pose.position_m, dtype=np.float64) + offsets[:, 0:3]
+    rot = _view_rotations(np.asarray(head_pose.yaw_pitch_roll_deg, dtype=np.float64) + offsets[:, 3:6])
+
+    out = np.zeros((n, 4, 4), dtype=np.float32)
+    out[:, 0:3, 0:3] = rot
+    out[:, 0:3, 3] = -np.einsum("nij,nj->ni", rot, pos)
+    out[:, 3, 3] = 1.0
+    return out
+
+
+def mount_rotations(camera_offsets: np.ndarray) -> np.ndarray:
+    # Tracker -> display rotation of each camera mount, (N, 6) offsets -> (N, 3, 3): the
+    # orientation the offset angles describe, i.e. the transpose of their view rotation.
+    offsets = np.asarray(camera_offsets, dtype=np.float64).reshape(-1, 6)
+    return np.transpose(_view_rotations(offsets[:, 3:6]), (0, 2, 1))
+
+
+def mount_eyes(head_pose: HeadPose, camera_offsets: np.ndarray, rotations: np.ndarray) -> np.ndarray:
+    # Off-axis eye per display: the tracker position rotated by the mount, then translated.
+    # The view orientation is fixed by the screen there, so the offset angles act on position.
+    offsets = np.asarray(camera_offsets, dtype=np.float64).reshape(-1, 6)
+    pos = np.asarray(head_pose.position_m, dtype=np.float64)
+    return np.einsum("nij,j->ni", rotations, pos) + offsets[:, 0:3]
+
+
+def _view_rotations(angles_deg: np.ndarray) -> np.ndarray:
+    # Closed form of rz @ rx @ ry from compute_view_matrix, (N, 3) degrees -> (N, 3, 3).
+    angles = np.radians(np.asarray(angles_deg, dtype=np.float64).reshape(-1, 3))
+    n = angles.shape[0]
+    c = np.cos(angles)
+    s = np.sin(angles)
+    cy, cp, cr = c[:, 0], c[:, 1], c[:, 2]
+    sy, sp, sr = s[:, 0], s[:, 1], s[:, 2]
+
+    rot = np.empty((n, 3, 3), dtype=np.float64)
+    rot[:, 0, 0] = cr * cy - sr * sp * sy
+    rot[:, 0, 1] = -sr * cp
+    rot[:, 0, 2] = cr * sy + sr * sp * cy
+    rot[:, 1, 0] = sr * cy + cr * sp * sy
+    rot[:, 1, 1] = cr * cp
+    rot[:, 1, 2] = sr * sy - cr * sp * cy
+    rot[:, 2, 0] = -cp * sy
+    rot[:, 2, 1] = sp
+    rot[:, 2, 2] = cp * cy
+    return rot
+
+
+def compute_off_axis_matrices(
+    eyes_m: np.ndarray, screen: ScreenBasis, near_m: float, far_m: float
+) -> tuple[np.ndarray, np.ndarray]:
+    # Kooima's off-axis frustum, batched: N eyes (N, 3) against one screen or a stack of N
+    # screens -> (N, 4, 4) views and projections. The view is the screen basis at the eye
+    # (head rotation does not turn a physical window); the projection is the asymmetric
+    # frustum through the screen edges.
+    eyes = np.asarray(eyes_m, dtype=np.float64).reshape(-1, 3)
+    n = eyes.shape[0]
+    rel = np.broadcast_to(screen.origin, eyes.shape) - eyes
+    right = np.broadcast_to(screen.right, eyes.shape)
+    up = np.broadcast_to(screen.up, eyes.shape)
+    normal = np.broadcast_to(screen.normal, eyes.shape)
+
+    distance = np.maximum(-np.einsum("ni,ni->n", rel, normal), MIN_EYE_DISTANCE_M)
+    scale = near_m / distance
+    left = np.einsum("ni,ni->n", right, rel) * scale
+    bottom = np.einsum("ni,ni->n", up, rel) * scale
+    right_edge = left + np.broadcast_to(screen.width_m, (n,)) * scale
+    top = bottom + np.broadcast_to(screen.height_m, (n,)) * scale
+
+    projs = np.zeros((n, 4, 4), dtype=np.float32)
+    projs[:, 0, 0] = 2.0 * near_m / (right_edge - left)
+    projs[:, 0, 2] = (right_edge + left) / (right_edge - left)
+    projs[:, 1, 1] = 2.0 * near_m / (top - bottom)
+    projs[:, 1, 2] = (top + bottom) / (top - bottom)
+    projs[:, 2, 2] = (far_m + near_m) / (near_m - far_m)
+    projs[:, 2, 3] = (2.0 * far_m * near_m) / (near_m - far_m)
+    projs[:, 3, 2] = -1.0
+
+    rot = np.stack((right, up, normal), axis=1)
+    views = np.zeros((n, 4, 4), dtype=np.float32)
+    views[:, 0:3, 0:3] = rot
+    views[:, 0:3, 3] = -np.einsum("nij,nj->ni", rot, eyes)
+    views[:, 3, 3] = 1.0
+    return views, projs
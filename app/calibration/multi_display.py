@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import numpy as np
+
+from app.calibration.display_calibrator import (
+    DisplayCalibrator,
+    DisplayParams,
+    ScreenBasis,
+    compute_off_axis_matrices,
+    compute_view_matrices,
+    mount_eyes,
+    mount_rotations,
+    stack_screens,
+)
+from app.config.settings import DisplaySettings
+from app.types import HeadPose
+
+
+class DisplayFanout:
+    def __init__(self, calibrators: list[DisplayCalibrator]) -> None:
+        if not calibrators:
+            raise ValueError("at least one display is required")
+        self._calibrators = calibrators
+        self._offsets = np.array([c.camera_offset for c in calibrators], dtype=np.float64)
+        self._mounts = mount_rotations(self._offsets)
+        self._proj_key: tuple[float, float, float] | None = None
+        self._proj: np.ndarray | None = None
+        self._screens: ScreenBasis | None = None
+
+    @classmethod
+    def from_settings(cls, displays: list[DisplaySettings]) -> DisplayFanout:
+        return cls(
+            [
+                DisplayCalibrator(
+                    params=DisplayParams(
+                        width_m=d.width_m,
+                        height_m=d.height_m,
+                        resolution_w=d.resolution_w,
+                        resolution_h=d.resolution_h,
+                    ),
+                    camera_offset=d.camera_offset,
+                )
+                for d in displays
+            ]
+        )
+
+    def __len__(self) -> int:
+        return len(self._calibrators)
+
+    def __getitem__(self, index: int) -> DisplayCalibrator:
+        return self._calibrators[index]
+
+    def set_camera_offset(self, index: int, offset: tuple[float, float, float, float, float, float]) -> None:
+        self._calibrators[index].set_camera_offset(*offset)
+        self._offsets[index] = offset
+        self._mounts[index] = mount_rotations(self._offsets[index])[0]
+
+    def set_display_params(self, index: int, width_m: float, height_m: float, resolution_w: int, resolution_h: int) -> None:
+        self._calibrators[index].set_display_params(width_m, height_m, resolution_w, resolution_h)
+        self._proj_key = None
+        self._screens = None
+
+    def apply_settings(self, displays: list[DisplaySettings]) -> None:
+        if len(displays) != len(self._calibrators):
+            raise ValueError("display count cannot change at runtime")
+        for i, d in enumerate(displays):
+            self.set_display_params(i, d.width_m, d.height_m, d.resolution_w, d.resolution_h)
+            self.set_camera_offset(i, d.camera_offset)
+
+    def compute_view_matrices(self, head_pose: HeadPose) -> np.ndarray:
+        return compute_view_matrices(head_pose, self._offsets)
+
+    def compute_proj_matrices(self, fov_deg: float, near_m: float, far_m: float) -> np.ndarray:
+        # Projections only depend on FOV/clip planes and each display's aspect, so they are
+        # rebuilt when those change rather than every tick.
+        key = (fov_deg, near_m, far_m)
+        if self._proj is None or key != self._proj_key:
+            self._proj = np.stack([c.compute_proj_matrix(fov_deg, near_m, far_m) for c in self._calibrators])
+            self._proj_key = key
+        return self._proj
+
+    def compute_off_axis_matrices(self, head_pose: HeadPose, near_m: float, far_m: float) -> tuple[np.ndarray, np.ndarray]:
+        # One eye per display (pose through that display's camera mount) against the stacked
+        # screen bases, which are only rebuilt when display params change.
+        if self._screens is None:
+            self._screens = stack_screens([c.screen for c in self._calibrators])
+        eyes = mount_eyes(head_pose, self._offsets, self._mounts)
+        return compute_off_axis_matrices(eyes, self._screens, near_m, far_m)
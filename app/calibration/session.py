@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from app.clock import SYSTEM_CLOCK, Clock
+from app.tracking.base import Tracker
+from app.types import HeadPose
+
+
+@dataclass(slots=True)
+class PoseSession:
+    # Column arrays so solvers can work on the whole recording at once.
+    timestamps_ms: np.ndarray  # (N,) int64
+    positions_m: np.ndarray  # (N, 3)
+    yaw_pitch_roll_deg: np.ndarray  # (N, 3)
+    confidence: np.ndarray  # (N,)
+    valid: np.ndarray  # (N,) bool
+
+    def __len__(self) -> int:
+        return int(self.timestamps_ms.shape[0])
+
+    @property
+    def elapsed_s(self) -> np.ndarray:
+        # Seconds since the first sample; reference windows are written against this.
+        if len(self) == 0:
+            return np.zeros(0, dtype=np.float64)
+        return (self.timestamps_ms - self.timestamps_ms[0]) / 1000.0
+
+    @classmethod
+    def from_poses(cls, poses: list[HeadPose]) -> PoseSession:
+        ordered = sorted(poses, key=lambda p: p.timestamp_ms)
+        return cls(
+            timestamps_ms=np.array([p.timestamp_ms for p in ordered], dtype=np.int64),
+            positions_m=np.array([p.position_m for p in ordered], dtype=np.float64).reshape(-1, 3),
+            yaw_pitch_roll_deg=np.array([p.yaw_pitch_roll_deg for p in ordered], dtype=np.float64).reshape(-1, 3),
+            confidence=np.array([p.confidence for p in ordered], dtype=np.float64),
+            valid=np.array([p.valid for p in ordered], dtype=bool),
+        )
+
+    def to_poses(self) -> list[HeadPose]:
+        return [
+            HeadPose(int(t), tuple(map(float, p)), tuple(map(float, r)), float(c), bool(v))
+            for t, p, r, c, v in zip(self.timestamps_ms, self.positions_m, self.yaw_pitch_roll_deg, self.confidence, self.valid)
+        ]
+
+    def save(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as f:
+            np.savez_compressed(
+                f,
+                timestamps_ms=self.timestamps_ms,
+                positions_m=self.positions_m,
+                yaw_pitch_roll_deg=self.yaw_pitch_roll_deg,
+                confidence=self.confidence,
+                valid=self.valid,
+            )
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> PoseSession:
+        with np.load(Path(path)) as data:
+            return cls(
+                timestamps_ms=data["timestamps_ms"].astype(np.int64),
+                positions_m=data["positions_m"].astype(np.float64).reshape(-1, 3),
+                yaw_pitch_roll_deg=data["yaw_pitch_roll_deg"].astype(np.float64).reshape(-1, 3),
+                confidence=data["confidence"].astype(np.float64),
+                valid=data["valid"].astype(bool),
+            )
+
+
+def record_session(tracker: Tracker, duration_s: float, clock: Clock | None = None, poll_interval_s: float = 0.002) -> PoseSession:
+    # Polls a started tracker and keeps each distinct sample once (same rule as PosePublisher).
+    clock = clock or SYSTEM_CLOCK
+    poses: list[HeadPose] = []
+    last_timestamp_ms: int | None = None
+    end = clock.monotonic() + duration_s
+    while clock.monotonic() < end:
+        pose = tracker.get_latest_pose()
+        if pose.timestamp_ms != last_timestamp_ms:
+            last_timestamp_ms = pose.timestamp_ms
+            poses.append(pose)
+        clock.sleep(poll_interval_s)
+    return PoseSession.from_poses(poses)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import threading
+import time
+from abc import ABC, abstractmethod
+
+
+class Clock(ABC):
+    # time(): wall seconds (pose timestamps); monotonic(): intervals; perf_counter(): metrics.
+    @abstractmethod
+    def time(self) -> float:
+        raise NotImplementedError
+
+    @abstractmethod
+    def monotonic(self) -> float:
+        raise NotImplementedError
+
+    @abstractmethod
+    def perf_counter(self) -> float:
+        raise NotImplementedError
+
+    @abstractmethod
+    def sleep(self, seconds: float) -> None:
+        raise NotImplementedError
+
+    def now_ms(self) -> int:
+        return int(self.time() * 1000)
+
+
+class SystemClock(Clock):
+    def time(self) -> float:
+        return time.time()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def perf_counter(self) -> float:
+        return time.perf_counter()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    # Only moves when advanced (or slept on), so a simulated run is deterministic and can go
+    # as fast as the CPU allows. All three readings share one timeline.
+    def __init__(self, start_wall_s: float = 1_700_000_000.0) -> None:
+        self._lock = threading.Lock()
+        self._wall0 = start_wall_s
+        self._elapsed = 0.0
+
+    @property
+    def elapsed_s(self) -> float:
+        with self._lock:
+            return self._elapsed
+
+    def advance(self, seconds: float) -> None:
+        if seconds < 0.0:
+            raise ValueError("a virtual clock cannot run backwards")
+        with self._lock:
+            self._elapsed += seconds
+
+    def time(self) -> float:
+        with self._lock:
+            return self._wall0 + self._elapsed
+
+    def monotonic(self) -> float:
+        with self._lock:
+            return self._elapsed
+
+    def perf_counter(self) -> float:
+        with self._lock:
+            return self._elapsed
+
+    def sleep(self, seconds: float) -> None:
+        self.advance(max(0.0, seconds))
+
+
+SYSTEM_CLOCK = SystemClock()
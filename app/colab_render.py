@@ -2,11 +2,19 @@ from __future__ import annotations
 
 import argparse
 from pathlib import Path
+from typing import Iterator
+
+import numpy as np
 
 from app.calibration.display_calibrator import DisplayCalibrator, DisplayParams
-from app.config.settings import DEFAULT_CONFIG_PATH, load_settings
+from app.config.settings import DEFAULT_CONFIG_PATH, AppSettings, load_settings
+from app.render.encoders import ENCODER_FORMATS, EncoderConfig, encode_frames
+from app.render.frame_cache import FrameCache, FrameCacheConfig, frame_key
+from app.render.frame_store import FrameStore, FrameStoreConfig
 from app.render.headless_matplotlib import HeadlessMatplotlibRenderer, HeadlessRendererConfig
 from app.sim.camera_path import PathConfig, generate_lissajous_path, generate_orbit_path
+from app.sim.keyframe_path import load_keyframe_path
+from app.types import HeadPose
 
 
 def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
@@ -15,13 +23,92 @@ def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p.add_argument("--fps", type=int, default=30)
     p.add_argument("--width", type=int, default=960)
     p.add_argument("--height", type=int, default=540)
-    p.add_argument("--format", choices=("mp4", "gif"), default="mp4")
-    p.add_argument("--path-type", choices=("orbit", "lissajous"), default="orbit")
+    p.add_argument(
+        "--format", choices=(*ENCODER_FORMATS, "raw"), default="mp4", help="raw: memory-mapped frame store directory at --out"
+    )
+    p.add_argument("--path-type", choices=("orbit", "lissajous", "keyframes"), default="orbit")
+    p.add_argument("--keyframes", type=Path, default=None, help="Keyframe YAML for --path-type keyframes")
     p.add_argument("--out", type=Path, default=Path("outputs/colab_render.mp4"))
+    p.add_argument("--thumbnail-levels", type=int, default=0, help="raw only: half-size thumbnail pyramid levels")
+    p.add_argument("--flush-every", type=int, default=64, help="raw only: save poses/written flags every N frames")
     p.add_argument("--config", type=Path, default=DEFAULT_CONFIG_PATH)
+    p.add_argument("--cache-dir", type=Path, default=None, help="Reuse rendered frames across runs")
+    p.add_argument("--cache-max-mb", type=int, default=2048)
+    p.add_argument("--cache-storage", choices=("npz", "raw"), default="npz")
+    p.add_argument("--codec", default=None, help="ffmpeg video codec, e.g. libx264, libvpx-vp9")
+    p.add_argument("--preset", default="medium", help="libx264 preset")
+    p.add_argument("--crf", type=int, default=23)
+    p.add_argument("--pix-fmt", default="yuv420p")
+    p.add_argument("--encoder-threads", type=int, default=0, help="0 = all cores")
     return p.parse_args(argv)
 
 
+def build_calibrator(settings: AppSettings, width: int, height: int) -> DisplayCalibrator:
+    return DisplayCalibrator(
+        params=DisplayParams(
+            width_m=settings.display.width_m,
+            height_m=settings.display.height_m,
+            resolution_w=width,
+            resolution_h=height,
+        ),
+        camera_offset=settings.display.camera_offset,
+    )
+
+
+def build_poses(path_type: str, duration_s: float, fps: int, keyframes: Path | None = None) -> list[HeadPose]:
+    if path_type == "keyframes":
+        if keyframes is None:
+            raise ValueError("path type 'keyframes' needs a keyframe file")
+        return load_keyframe_path(keyframes).to_head_poses(fps, duration_s)
+    path_cfg = PathConfig(duration_s=duration_s, fps=fps)
+    if path_type == "orbit":
+        return generate_orbit_path(path_cfg)
+    if path_type == "lissajous":
+        return generate_lissajous_path(path_cfg)
+    raise ValueError(f"Unknown path type: {path_type}")
+
+
+def render_frames(
+    renderer: HeadlessMatplotlibRenderer,
+    views: list[np.ndarray],
+    proj: np.ndarray,
+    box_size_m: float,
+    box_depth_m: float,
+    cache: FrameCache | None = None,
+) -> list[np.ndarray]:
+    return list(iter_frames(renderer, views, proj, box_size_m, box_depth_m, cache))
+
+
+def iter_frames(
+    renderer: HeadlessMatplotlibRenderer,
+    views: list[np.ndarray],
+    proj: np.ndarray,
+    box_size_m: float,
+    box_depth_m: float,
+    cache: FrameCache | None = None,
+) -> Iterator[np.ndarray]:
+    renderer_config, renderer_version = renderer.cache_identity()
+    for view in views:
+        key = None
+        if cache is not None:
+            key = frame_key(view, proj, box_size_m, box_depth_m, renderer_config, renderer_version)
+            frame = cache.get(key)
+            if frame is not None:
+                yield frame
+                continue
+
+        frame = renderer.render_frame(
+            view_matrix=view,
+            proj_matrix=proj,
+            box_size_m=box_size_m,
+            box_depth_m=box_depth_m,
+        )
+        if cache is not None:
+            # Stored as soon as it exists, so an interrupted run resumes from here.
+            cache.put(key, frame)
+        yield frame
+
+
 def main(argv: list[str] | None = None) -> int:
     args = _parse_args(argv)
 
@@ -31,23 +118,15 @@ def main(argv: list[str] | None = None) -> int:
         raise SystemExit("--fps must be > 0")
     if args.width <= 0 or args.height <= 0:
         raise SystemExit("--width/--height must be > 0")
+    if args.cache_max_mb <= 0:
+        raise SystemExit("--cache-max-mb must be > 0")
 
     settings = load_settings(args.config)
-    calibrator = DisplayCalibrator(
-        params=DisplayParams(
-            width_m=settings.display.width_m,
-            height_m=settings.display.height_m,
-            resolution_w=args.width,
-            resolution_h=args.height,
-        ),
-        camera_offset=settings.display.camera_offset,
-    )
-
-    path_cfg = PathConfig(duration_s=args.duration_s, fps=args.fps)
-    if args.path_type == "orbit":
-        poses = generate_orbit_path(path_cfg)
-    else:
-        poses = generate_lissajous_path(path_cfg)
+    calibrator = build_calibrator(settings, args.width, args.height)
+    try:
+        poses = build_poses(args.path_type, args.duration_s, args.fps, args.keyframes)
+    except (OSError, ValueError) as exc:
+        raise SystemExit(str(exc)) from exc
 
     renderer = HeadlessMatplotlibRenderer(HeadlessRendererConfig(width=args.width, height=args.height))
     proj = calibrator.compute_proj_matrix(
@@ -56,24 +135,58 @@ def main(argv: list[str] | None = None) -> int:
         far_m=settings.render.far_m,
     )
 
-    frames = []
-    for pose in poses:
-        view = calibrator.compute_view_matrix(pose)
-        frame = renderer.render_frame(
-            view_matrix=view,
-            proj_matrix=proj,
-            box_size_m=settings.render.box_size_m,
-            box_depth_m=settings.render.box_depth_m,
+    cache = None
+    if args.cache_dir is not None:
+        cache = FrameCache(
+            FrameCacheConfig(root=args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024, storage=args.cache_storage)
         )
-        frames.append(frame)
 
-    saved = renderer.render_sequence(
-        frames=frames,
-        out_path=args.out,
-        fps=args.fps,
-        fmt=args.format,
+    views = [calibrator.compute_view_matrix(pose) for pose in poses]
+    frames = iter_frames(
+        renderer,
+        views,
+        proj,
+        box_size_m=settings.render.box_size_m,
+        box_depth_m=settings.render.box_depth_m,
+        cache=cache,
     )
+    if args.format == "raw":
+        out = args.out.with_suffix(".frames") if args.out.suffix in {f".{f}" for f in ENCODER_FORMATS} else args.out
+        try:
+            store = FrameStore.create(
+                out,
+                len(views),
+                args.width,
+                args.height,
+                FrameStoreConfig(fps=args.fps, thumbnail_levels=args.thumbnail_levels, flush_every=args.flush_every),
+                renderer.cache_identity()[0],
+            )
+        except ValueError as exc:
+            raise SystemExit(str(exc)) from exc
+        with store:
+            for i, (pose, view, frame) in enumerate(zip(poses, views, frames)):
+                store.write(i, frame, pose, view, proj)
+        print(f"Saved: {store.path} ({len(store)} frames, {store.thumbnail_levels} thumbnail levels)")
+        return 0
+
+    encoder_config = EncoderConfig(
+        codec=args.codec,
+        preset=args.preset,
+        crf=args.crf,
+        pix_fmt=args.pix_fmt,
+        threads=args.encoder_threads,
+    )
+
+    # Frames stream into the encoder as they are rendered.
+    saved, stats = encode_frames(frames, args.out, args.fps, args.format, encoder_config)
     print(f"Saved: {saved}")
+    print(
+        f"Encoded {stats.frames} frames in {stats.seconds:.2f}s "
+        f"({stats.fps:.1f} fps, {stats.bytes_per_frame / 1024:.1f} KiB/frame)"
+    )
+    if cache is not None:
+        st = cache.stats
+        print(f"Frame cache: {st.hits} hits, {st.misses} misses, {st.evictions} evictions, {st.bytes / 1e6:.1f} MB")
     return 0
 
 
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from app.config.settings import RUNTIME_CONFIG_PATH, AppSettings, save_settings, write_atomic
+
+HISTORY_DIR = Path(__file__).resolve().parent / "history"
+
+
+@dataclass(slots=True)
+class CalibrationWriterConfig:
+    debounce_s: float = 0.3
+    history_dir: Path = HISTORY_DIR
+    history_limit: int = 20
+
+
+@dataclass(slots=True)
+class SaveResult:
+    ok: bool
+    path: Path
+    snapshot: Path | None
+    error: str | None
+    coalesced: int
+    duration_ms: float
+
+
+class CalibrationWriter:
+    def __init__(self, config: CalibrationWriterConfig, path: Path | None = None) -> None:
+        self._cfg = config
+        self._path = path or RUNTIME_CONFIG_PATH
+        self._cond = threading.Condition()
+        self._pending: AppSettings | None = None
+        self._pending_count = 0
+        self._last_submit = 0.0
+        self._busy = False
+        self._closed = False
+        self._results: deque[SaveResult] = deque(maxlen=32)
+        self._thread = threading.Thread(target=self._run, name="calibration-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, settings: AppSettings) -> None:
+        # Snapshot on the caller's thread; the GUI keeps mutating its own settings object.
+        snapshot = copy.deepcopy(settings)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("CalibrationWriter is closed")
+            self._pending = snapshot
+            self._pending_count += 1
+            self._last_submit = time.monotonic()
+            self._cond.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            # Skip the debounce window for whatever is queued right now.
+            self._last_submit = 0.0
+            self._cond.notify_all()
+            while self._pending is not None or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0.0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 2.0) -> None:
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def poll_results(self) -> list[SaveResult]:
+        out: list[SaveResult] = []
+        while True:
+            try:
+                out.append(self._results.popleft())
+            except IndexError:
+                return out
+
+    def list_snapshots(self) -> list[Path]:
+        if not self._cfg.history_dir.exists():
+            return []
+        return sorted(self._cfg.history_dir.glob(f"{self._path.stem}-*.yaml"))
+
+    def rollback(self, snapshot: Path) -> Path:
+        self.flush()
+        write_atomic(self._path, snapshot.read_text(encoding="utf-8"))
+        return self._path
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._pending is None and self._closed:
+                    return
+
+                # Coalesce: keep waiting while submits keep arriving inside the debounce window.
+                while self._pending is not None:
+                    wait_s = self._last_submit + self._cfg.debounce_s - time.monotonic()
+                    if wait_s <= 0.0 or self._closed:
+                        break
+                    self._cond.wait(wait_s)
+
+                settings = self._pending
+                count = self._pending_count
+                self._pending = None
+                self._pending_count = 0
+                self._busy = True
+
+            try:
+                self._results.append(self._write(settings, count))
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _write(self, settings: AppSettings, count: int) -> SaveResult:
+        started = time.perf_counter()
+        snapshot: Path | None = None
+        try:
+            save_settings(settings, self._path)
+            if self._cfg.history_limit > 0:
+                snapshot = self._write_snapshot(settings)
+        except Exception as exc:
+            return SaveResult(
+                ok=False,
+                path=self._path,
+                snapshot=snapshot,
+                error=f"{type(exc).__name__}: {exc}",
+                coalesced=count,
+                duration_ms=(time.perf_counter() - started) * 1000.0,
+            )
+        return SaveResult(
+            ok=True,
+            path=self._path,
+            snapshot=snapshot,
+            error=None,
+            coalesced=count,
+            duration_ms=(time.perf_counter() - started) * 1000.0,
+        )
+
+    def _write_snapshot(self, settings: AppSettings) -> Path:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        snapshot = save_settings(settings, self._cfg.history_dir / f"{self._path.stem}-{stamp}.yaml")
+        snapshots = self.list_snapshots()
+        for old in snapshots[: max(0, len(snapshots) - self._cfg.history_limit)]:
+            old.unlink(missing_ok=True)
+        return snapshot
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import os
+import tempfile
 from dataclasses import asdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
 from pathlib import Path
 from typing import Any
 
@@ -13,6 +15,8 @@ class CameraSettings:
     grab_fps: int
     depth_mode: str
     body_model: str
+    multi_viewer: bool = False
+    viewer_policy: str = "closest"
 
 
 @dataclass(slots=True)
@@ -22,6 +26,19 @@ class TrackingSettings:
     min_confidence: float
     loss_timeout_ms: int
     recenter_seconds: float
+    history_size: int = 256
+    max_extrapolation_ms: float = 20.0
+    filter_mode: str = "ema"
+    pos_min_cutoff_hz: tuple[float, float, float] = (1.0, 1.0, 1.0)
+    pos_beta: tuple[float, float, float] = (5.0, 5.0, 5.0)
+    rot_min_cutoff_hz: tuple[float, float, float] = (1.0, 1.0, 1.0)
+    rot_beta: tuple[float, float, float] = (0.05, 0.05, 0.05)
+    derivative_cutoff_hz: float = 1.0
+    # Hampel/MAD test on raw tracker samples ahead of the filter; rejects read as tracking loss.
+    outlier_rejection: bool = True
+    outlier_window: int = 9
+    outlier_threshold: float = 3.5
+    outlier_max_consecutive: int = 3
 
 
 @dataclass(slots=True)
@@ -32,6 +49,21 @@ class RenderSettings:
     fov_deg: float
     near_m: float
     far_m: float
+    # Tracker history is resampled at now + display_lead_ms. At >= 0 that is past the newest
+    # capture, so the pose is linearly extrapolated from the last two raw samples: lowest
+    # latency, but tracker jitter is amplified before the filter. A negative lead of about one
+    # tracker period (e.g. -17 at 60 Hz) renders that far behind and interpolates (Hermite
+    # position, slerp rotation) between real samples instead.
+    display_lead_ms: float = 0.0
+    show_hud: bool = False
+    threaded: bool = False
+    # "fov": symmetric frustum from fov_deg; "off_axis": asymmetric frustum through the
+    # physical screen rectangle from the eye position (fov_deg is ignored).
+    projection_mode: str = "fov"
+    # Threaded mode only: warp the last finished frame to the newest pose at display rate
+    # while full renders run at target_fps / render_divisor.
+    reprojection: bool = False
+    render_divisor: int = 2
 
 
 @dataclass(slots=True)
@@ -41,6 +73,14 @@ class DisplaySettings:
     resolution_w: int
     resolution_h: int
     camera_offset: tuple[float, float, float, float, float, float]
+    screen: int | None = None
+
+
+@dataclass(slots=True)
+class MetricsSettings:
+    enabled: bool = False
+    host: str = "127.0.0.1"
+    port: int = 9464
 
 
 @dataclass(slots=True)
@@ -49,54 +89,231 @@ class AppSettings:
     tracking: TrackingSettings
     render: RenderSettings
     display: DisplaySettings
+    # Additional physical screens driven from the same tracker; `display` is always the first.
+    displays: list[DisplaySettings] = field(default_factory=list)
+    metrics: MetricsSettings = field(default_factory=MetricsSettings)
+
+
+@dataclass(slots=True)
+class SettingsChange:
+    settings: AppSettings
+    changed: list[str] = field(default_factory=list)
+    restart_required: list[str] = field(default_factory=list)
 
 
 DEFAULT_CONFIG_PATH = Path(__file__).resolve().parent / "defaults.yaml"
 RUNTIME_CONFIG_PATH = Path(__file__).resolve().parent / "runtime.yaml"
 
+# Sections consumed once at startup (camera open parameters, metrics listener); edits need a restart.
+RESTART_REQUIRED_SECTIONS = frozenset({"camera", "metrics"})
+# Single keys inside otherwise live-reloadable sections (the render thread is set up once).
+RESTART_REQUIRED_FIELDS = frozenset({"render.threaded", "render.reprojection", "render.render_divisor"})
+
+PROJECTION_MODES = ("fov", "off_axis")
+FILTER_MODES = ("ema", "one_euro")
+# The rejector needs a median over at least three samples.
+MIN_OUTLIER_WINDOW = 3
+
+_PER_AXIS_TRACKING_FIELDS = ("pos_min_cutoff_hz", "pos_beta", "rot_min_cutoff_hz", "rot_beta")
+
+_YAML_CACHE: dict[Path, tuple[tuple[int, int], dict[str, Any]]] = {}
+
+
+def resolve_config_path(path: Path | None = None) -> Path:
+    return path or (RUNTIME_CONFIG_PATH if RUNTIME_CONFIG_PATH.exists() else DEFAULT_CONFIG_PATH)
+
 
 def load_settings(path: Path | None = None) -> AppSettings:
-    cfg_path = path or (RUNTIME_CONFIG_PATH if RUNTIME_CONFIG_PATH.exists() else DEFAULT_CONFIG_PATH)
+    cfg_path = resolve_config_path(path)
     raw = _load_yaml(cfg_path)
 
     camera = CameraSettings(**raw["camera"])
-    tracking = TrackingSettings(**raw["tracking"])
+    tracking = _tracking_settings(raw["tracking"])
     render = RenderSettings(**raw["render"])
-    display_raw = raw["display"]
-    display = DisplaySettings(
-        width_m=float(display_raw["width_m"]),
-        height_m=float(display_raw["height_m"]),
-        resolution_w=int(display_raw["resolution_w"]),
-        resolution_h=int(display_raw["resolution_h"]),
-        camera_offset=tuple(display_raw["camera_offset"]),
-    )
+    if render.projection_mode not in PROJECTION_MODES:
+        raise ValueError(f"Unknown render.projection_mode: {render.projection_mode}")
+    display = _display_settings(raw["display"])
+    displays = [_display_settings(d) for d in raw.get("displays") or []]
+    metrics = MetricsSettings(**raw.get("metrics") or {})
 
-    return AppSettings(camera=camera, tracking=tracking, render=render, display=display)
+    return AppSettings(
+        camera=camera,
+        tracking=tracking,
+        render=render,
+        display=display,
+        displays=displays,
+        metrics=metrics,
+    )
 
 
 def save_settings(settings: AppSettings, path: Path | None = None) -> Path:
     out_path = path or RUNTIME_CONFIG_PATH
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    payload = {
+    text = yaml.safe_dump(_settings_payload(settings), sort_keys=False)
+    write_atomic(out_path, text)
+    return out_path
+
+
+def write_atomic(path: Path, text: str) -> None:
+    # Write a sibling temp file, fsync it, then rename over the target so readers only ever
+    # see the old or the new file, never a partial one.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    _fsync_dir(path.parent)
+
+
+def _fsync_dir(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _settings_payload(settings: AppSettings) -> dict[str, Any]:
+    return {
         "camera": asdict(settings.camera),
-        "tracking": asdict(settings.tracking),
+        "tracking": {k: list(v) if isinstance(v, tuple) else v for k, v in asdict(settings.tracking).items()},
         "render": asdict(settings.render),
-        "display": {
-            "width_m": settings.display.width_m,
-            "height_m": settings.display.height_m,
-            "resolution_w": settings.display.resolution_w,
-            "resolution_h": settings.display.resolution_h,
-            "camera_offset": list(settings.display.camera_offset),
-        },
+        "display": _display_payload(settings.display),
+        "displays": [_display_payload(d) for d in settings.displays],
+        "metrics": asdict(settings.metrics),
     }
-    with out_path.open("w", encoding="utf-8") as f:
-        yaml.safe_dump(payload, f, sort_keys=False)
-    return out_path
+
+
+def _tracking_settings(raw: dict[str, Any]) -> TrackingSettings:
+    values = dict(raw)
+    # Per-axis One-Euro parameters accept a single number for all three axes.
+    for name in _PER_AXIS_TRACKING_FIELDS:
+        if name in values:
+            v = values[name]
+            values[name] = (float(v),) * 3 if isinstance(v, (int, float)) else tuple(float(x) for x in v)
+            if len(values[name]) != 3:
+                raise ValueError(f"tracking.{name} needs 3 values")
+    tracking = TrackingSettings(**values)
+    if tracking.filter_mode not in FILTER_MODES:
+        raise ValueError(f"Unknown tracking.filter_mode: {tracking.filter_mode}")
+    # Checked here so SettingsWatcher refuses the file instead of the running pipeline raising on it.
+    if tracking.outlier_window < MIN_OUTLIER_WINDOW:
+        raise ValueError(f"tracking.outlier_window must be >= {MIN_OUTLIER_WINDOW}")
+    if tracking.outlier_threshold <= 0.0:
+        raise ValueError("tracking.outlier_threshold must be > 0")
+    if tracking.outlier_max_consecutive < 0:
+        raise ValueError("tracking.outlier_max_consecutive must be >= 0")
+    return tracking
+
+
+def _display_settings(raw: dict[str, Any]) -> DisplaySettings:
+    screen = raw.get("screen")
+    return DisplaySettings(
+        width_m=float(raw["width_m"]),
+        height_m=float(raw["height_m"]),
+        resolution_w=int(raw["resolution_w"]),
+        resolution_h=int(raw["resolution_h"]),
+        camera_offset=tuple(float(v) for v in raw["camera_offset"]),
+        screen=None if screen is None else int(screen),
+    )
+
+
+def _display_payload(display: DisplaySettings) -> dict[str, Any]:
+    payload: dict[str, Any] = {
+        "width_m": display.width_m,
+        "height_m": display.height_m,
+        "resolution_w": display.resolution_w,
+        "resolution_h": display.resolution_h,
+        "camera_offset": list(display.camera_offset),
+    }
+    if display.screen is not None:
+        payload["screen"] = display.screen
+    return payload
+
+
+def diff_settings(old: AppSettings, new: AppSettings) -> list[str]:
+    changed: list[str] = []
+    for section in fields(AppSettings):
+        old_section = getattr(old, section.name)
+        new_section = getattr(new, section.name)
+        if isinstance(old_section, list):
+            if old_section != new_section:
+                changed.append(section.name)
+            continue
+        for f in fields(old_section):
+            if getattr(old_section, f.name) != getattr(new_section, f.name):
+                changed.append(f"{section.name}.{f.name}")
+    return changed
+
+
+class SettingsWatcher:
+    # With path=None both runtime.yaml and defaults.yaml are watched, following the same
+    # runtime-over-defaults resolution as load_settings().
+    def __init__(self, current: AppSettings, path: Path | None = None) -> None:
+        self._path = path
+        self._watched = (path,) if path is not None else (RUNTIME_CONFIG_PATH, DEFAULT_CONFIG_PATH)
+        self._current = current
+        self._signature = self._read_signature()
+
+    def poll(self) -> SettingsChange | None:
+        signature = self._read_signature()
+        if signature == self._signature:
+            return None
+        self._signature = signature
+
+        try:
+            new = load_settings(self._path)
+        except (OSError, KeyError, TypeError, ValueError, yaml.YAMLError):
+            # Half-written or invalid file; keep running on the last good settings.
+            return None
+
+        changed = diff_settings(self._current, new)
+        self._current = new
+        if not changed:
+            return None
+        restart = [
+            name
+            for name in changed
+            if name.split(".", 1)[0] in RESTART_REQUIRED_SECTIONS or name in RESTART_REQUIRED_FIELDS
+        ]
+        return SettingsChange(settings=new, changed=changed, restart_required=restart)
+
+    def _read_signature(self) -> tuple[tuple[int, int] | None, ...]:
+        return tuple(_file_signature(p) for p in self._watched)
+
+
+def _file_signature(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
 
 
 def _load_yaml(path: Path) -> dict[str, Any]:
+    key = path.resolve()
+    signature = _file_signature(key)
+    cached = _YAML_CACHE.get(key)
+    if cached is not None and signature is not None and cached[0] == signature:
+        return cached[1]
+
     with path.open("r", encoding="utf-8") as f:
         data = yaml.safe_load(f)
     if not isinstance(data, dict):
         raise ValueError(f"Invalid config format: {path}")
+    if signature is not None:
+        _YAML_CACHE[key] = (signature, data)
     return data
@@ -3,56 +3,70 @@ from __future__ import annotations
 import argparse
 import signal
 import sys
-import time
 
-import numpy as np
-from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFocusEvent, QKeyEvent
 from PyQt6.QtWidgets import QApplication, QHBoxLayout, QMainWindow, QWidget
 
-from app.calibration.display_calibrator import DisplayCalibrator, DisplayParams
-from app.config.settings import RUNTIME_CONFIG_PATH, load_settings, save_settings
+from app.clock import Clock
+from app.config.persistence import CalibrationWriter, CalibrationWriterConfig
+from app.config.settings import (
+    RUNTIME_CONFIG_PATH,
+    AppSettings,
+    SettingsChange,
+    SettingsWatcher,
+    load_settings,
+)
+from app.metrics import MetricsServer, PipelineMetrics
+from app.pipeline import FrameMetrics, PosePipeline
 from app.render.gl_widget import AnamorphicWidget
+from app.render.hud import HudConfig
 from app.tracking.base import Tracker
 from app.tracking.keyboard_tracker import KeyboardTracker, KeyboardTrackerConfig
-from app.tracking.pose_filter import FilterConfig, PoseFilter
+from app.tracking.network_tracker import DEFAULT_PORT, NetworkTracker, NetworkTrackerConfig
+from app.tracking.sim_tracker import SimTracker, SimTrackerConfig
 from app.tracking.zed_tracker import ZedTracker, ZedTrackerConfig
-from app.types import HeadPose, RenderState
 from app.ui.control_panel import ControlPanel
 
+TICK_INTERVAL_MS = 10
+STATUS_INTERVAL_S = 0.25
+
 
 class MainWindow(QMainWindow):
-    def __init__(self, tracker: Tracker, input_mode: str) -> None:
+    def __init__(
+        self,
+        tracker: Tracker,
+        input_mode: str,
+        settings: AppSettings | None = None,
+        clock: Clock | None = None,
+        threaded_render: bool = False,
+        reprojection: bool = False,
+    ) -> None:
         super().__init__()
         self.setWindowTitle("ZED2 Anamorphic Box MVP")
 
-        self._settings = load_settings()
+        self._settings = settings or load_settings()
         self._tracker = tracker
         self._input_mode = input_mode
-        self._filter = PoseFilter(
-            FilterConfig(
-                ema_alpha=self._settings.tracking.ema_alpha,
-                velocity_limit_m_s=self._settings.tracking.velocity_limit_m_s,
-                min_confidence=self._settings.tracking.min_confidence,
-                loss_timeout_ms=self._settings.tracking.loss_timeout_ms,
-                recenter_seconds=self._settings.tracking.recenter_seconds,
-            )
-        )
-        self._calibrator = DisplayCalibrator(
-            params=DisplayParams(
-                width_m=self._settings.display.width_m,
-                height_m=self._settings.display.height_m,
-                resolution_w=self._settings.display.resolution_w,
-                resolution_h=self._settings.display.resolution_h,
-            ),
-            camera_offset=self._settings.display.camera_offset,
-        )
+        self._pipeline = PosePipeline(tracker, self._settings, clock)
 
         self._running = True
         self._fov = self._settings.render.fov_deg
         self._depth = self._settings.render.box_depth_m
 
-        self._render = AnamorphicWidget(target_fps=self._settings.render.target_fps)
+        hud = HudConfig(budget_ms=TICK_INTERVAL_MS, rate_full_scale_hz=float(self._settings.camera.grab_fps))
+        render = self._settings.render
+        # CLI overrides apply to this run only; they never reach the settings that get saved.
+        widget_options = dict(
+            hud_config=hud,
+            threaded=threaded_render or reprojection or render.threaded,
+            clock=clock,
+            reprojection=reprojection or render.reprojection,
+            render_divisor=render.render_divisor,
+        )
+        self._render = AnamorphicWidget(render.target_fps, **widget_options)
+        self._display_windows = [AnamorphicWidget(render.target_fps, **widget_options) for _ in self._settings.displays]
+        self._renders = [self._render, *self._display_windows]
         self._controls = ControlPanel(
             on_start_stop=self._on_start_stop,
             on_recalibrate=self._on_recalibrate,
@@ -69,32 +83,65 @@ class MainWindow(QMainWindow):
         layout.addWidget(self._controls, stretch=2)
         self.setCentralWidget(root)
 
-        self._fallback_pose = HeadPose(
-            timestamp_ms=int(time.time() * 1000),
-            position_m=(0.0, 0.0, 0.7),
-            yaw_pitch_roll_deg=(0.0, 0.0, 0.0),
-            confidence=1.0,
-            valid=True,
-        )
-
         self._poll_timer = QTimer(self)
         self._poll_timer.timeout.connect(self._tick)
-        self._poll_timer.start(10)
-
-        self._frame_counter = 0
-        self._fps_window_started = time.perf_counter()
-        self._last_fps = 0.0
-        self._latency_ema_ms = 0.0
+        self._poll_timer.start(TICK_INTERVAL_MS)
+
+        self._metrics = FrameMetrics(self._pipeline.clock)
+        self._last_tick: float | None = None
+        self._last_status = self._pipeline.clock.perf_counter()
+        for widget in self._renders:
+            widget.set_hud_visible(self._settings.render.show_hud)
+        self._stats: PipelineMetrics | None = None
+        self._metrics_server: MetricsServer | None = None
+        if self._settings.metrics.enabled:
+            self._stats = PipelineMetrics(
+                self._pipeline.filter.stats, tick_interval_ms=TICK_INTERVAL_MS, outlier_stats=self._pipeline.outliers.stats
+            )
+            self._metrics_server = MetricsServer(self._stats, self._settings.metrics.host, self._settings.metrics.port)
+        self._restart_required: list[str] = []
+        self._save_status = ""
         self.statusBar().showMessage(self._status_text())
 
+        self._settings_watcher = SettingsWatcher(load_settings())
+        self._reload_timer = QTimer(self)
+        self._reload_timer.timeout.connect(self._poll_settings)
+        self._reload_timer.start(500)
+
+        self._writer = CalibrationWriter(CalibrationWriterConfig())
+
     def start(self) -> None:
         self._tracker.start()
+        if self._metrics_server is not None:
+            self._metrics_server.start()
+
+    def show_displays(self) -> None:
+        screens = QApplication.screens()
+        for i, (widget, display) in enumerate(zip(self._display_windows, self._settings.displays), start=1):
+            widget.setWindowTitle(f"Display {i}")
+            if display.screen is not None and 0 <= display.screen < len(screens):
+                widget.setGeometry(screens[display.screen].geometry())
+                widget.showFullScreen()
+            else:
+                widget.resize(display.resolution_w // 2, display.resolution_h // 2)
+                widget.show()
 
     def closeEvent(self, event) -> None:  # noqa: N802
         self._tracker.stop()
+        self._writer.close()
+        if self._metrics_server is not None:
+            self._metrics_server.stop()
+        for widget in self._renders:
+            widget.stop_rendering()
+        for widget in self._display_windows:
+            widget.close()
         super().closeEvent(event)
 
     def keyPressEvent(self, event: QKeyEvent) -> None:  # noqa: N802
+        if event.key() == Qt.Key.Key_H and not event.isAutoRepeat():
+            visible = not self._render.hud_visible
+            for widget in self._renders:
+                widget.set_hud_visible(visible)
         if isinstance(self._tracker, KeyboardTracker) and not event.isAutoRepeat():
             self._tracker.set_key_state(event.key(), True)
         super().keyPressEvent(event)
@@ -111,38 +158,33 @@ class MainWindow(QMainWindow):
 
     def _tick(self) -> None:
         if not self._running:
+            self._last_tick = None
             return
 
-        raw_pose = self._tracker.get_latest_pose()
-        filtered = self._filter.update(raw_pose, self._fallback_pose)
-
-        view = self._calibrator.compute_view_matrix(filtered)
-        proj = self._calibrator.compute_proj_matrix(
-            fov_deg=self._fov,
-            near_m=self._settings.render.near_m,
-            far_m=self._settings.render.far_m,
-        )
-
-        state = RenderState(
-            view_matrix=np.array(view, dtype=np.float32).reshape(-1).tolist(),
-            proj_matrix=np.array(proj, dtype=np.float32).reshape(-1).tolist(),
-            box_depth_m=self._depth,
-            box_size_m=self._settings.render.box_size_m,
-        )
-        self._render.set_render_state(state)
-        self._update_metrics(raw_pose.timestamp_ms)
+        clock = self._pipeline.clock
+        started = clock.perf_counter()
+        frame = self._pipeline.step(self._fov, self._depth)
+        for widget, state in zip(self._renders, frame.states):
+            widget.set_render_state(state)
+        frame_ms = (clock.perf_counter() - started) * 1000.0
+        interval_ms = TICK_INTERVAL_MS if self._last_tick is None else (started - self._last_tick) * 1000.0
+        self._last_tick = started
+
+        raw = frame.raw_pose
+        self._update_metrics(frame.latency_ms, raw.timestamp_ms)
+        missed = interval_ms > 1.5 * TICK_INTERVAL_MS
+        for widget in self._renders:
+            if widget.hud_visible:
+                widget.hud.push(frame_ms, frame.latency_ms, missed)
+                widget.hud.set_tracker(self._metrics.tracker_rate_hz, raw.confidence if raw.valid else 0.0)
+        if self._stats is not None:
+            self._stats.observe_frame(interval_ms, frame_ms, frame.latency_ms, raw.valid, raw.timestamp_ms)
 
     def _on_start_stop(self, running: bool) -> None:
         self._running = running
 
     def _on_recalibrate(self) -> None:
-        self._fallback_pose = HeadPose(
-            timestamp_ms=int(time.time() * 1000),
-            position_m=(0.0, 0.0, 0.7),
-            yaw_pitch_roll_deg=(0.0, 0.0, 0.0),
-            confidence=1.0,
-            valid=True,
-        )
+        self._pipeline.recenter()
         if isinstance(self._tracker, KeyboardTracker):
             self._tracker.recenter()
 
@@ -155,42 +197,110 @@ class MainWindow(QMainWindow):
         self._settings.render.box_depth_m = value
 
     def _on_save_calibration(self) -> None:
-        try:
-            save_settings(self._settings)
-        except Exception:
-            # Keep runtime stable if save fails; status text still updates via metrics.
-            pass
-
-    def _update_metrics(self, pose_timestamp_ms: int) -> None:
-        self._frame_counter += 1
-        now_perf = time.perf_counter()
-        elapsed = now_perf - self._fps_window_started
-        if elapsed >= 1.0:
-            self._last_fps = self._frame_counter / elapsed
-            self._frame_counter = 0
-            self._fps_window_started = now_perf
-
-        now_ms = int(time.time() * 1000)
-        sample = max(0.0, float(now_ms - pose_timestamp_ms))
-        alpha = 0.2
-        self._latency_ema_ms = self._latency_ema_ms * (1.0 - alpha) + sample * alpha
+        self._writer.submit(self._settings)
+        self._save_status = "Saving..."
+        self._refresh_status()
+
+    def _poll_settings(self) -> None:
+        change = self._settings_watcher.poll()
+        if change is not None:
+            self._apply_settings_change(change)
+
+        results = self._writer.poll_results()
+        for result in results:
+            if result.ok:
+                self._save_status = f"Saved {result.path.name} ({result.duration_ms:.0f}ms)"
+            else:
+                self._save_status = f"Save failed: {result.error}"
+        if change is not None or results:
+            self._refresh_status()
+
+    def _apply_settings_change(self, change: SettingsChange) -> None:
+        new = change.settings
+        sections = {name.split(".", 1)[0] for name in change.changed}
+
+        if "tracking" in sections:
+            self._settings.tracking = new.tracking
+            self._pipeline.set_tracking(new.tracking)
+
+        if "display" in sections or "displays" in sections:
+            if len(new.displays) == len(self._settings.displays):
+                self._settings.display = new.display
+                self._settings.displays = new.displays
+                self._pipeline.displays.apply_settings([new.display, *new.displays])
+            elif "displays" not in self._restart_required:
+                self._restart_required.append("displays")
+
+        if "render" in sections:
+            # Only overwrite the fields that changed on disk so unsaved slider values survive.
+            for name in change.changed:
+                section, _, field_name = name.partition(".")
+                if section == "render" and name not in change.restart_required:
+                    setattr(self._settings.render, field_name, getattr(new.render, field_name))
+            self._fov = self._settings.render.fov_deg
+            self._depth = self._settings.render.box_depth_m
+            self._controls.set_values(self._fov, self._depth)
+            for widget in self._renders:
+                widget.set_target_fps(self._settings.render.target_fps)
+                if "render.show_hud" in change.changed:
+                    widget.set_hud_visible(self._settings.render.show_hud)
+
+        for name in change.restart_required:
+            if name not in self._restart_required:
+                self._restart_required.append(name)
+
+    def _update_metrics(self, latency_ms: float, pose_timestamp_ms: int) -> None:
+        self._metrics.update(latency_ms, pose_timestamp_ms)
+        # Text layout is costly next to a 10 ms tick; refresh the status bar a few times a second.
+        now = self._pipeline.clock.perf_counter()
+        if now - self._last_status >= STATUS_INTERVAL_S:
+            self._last_status = now
+            self._refresh_status()
+
+    def _refresh_status(self) -> None:
         self.statusBar().showMessage(self._status_text())
 
     def _status_text(self) -> str:
         cfg = RUNTIME_CONFIG_PATH.name if RUNTIME_CONFIG_PATH.exists() else "defaults.yaml"
-        return f"Mode: {self._input_mode} | FPS: {self._last_fps:.1f} | Latency: {self._latency_ema_ms:.1f}ms | Config: {cfg}"
+        text = f"Mode: {self._input_mode} | FPS: {self._metrics.fps:.1f} | Latency: {self._metrics.latency_ema_ms:.1f}ms | Config: {cfg}"
+        if isinstance(self._tracker, ZedTracker):
+            cap = self._tracker.stats()
+            text += f" | Grab: {cap.grabs_per_s:.0f}/s, drops {cap.drops_per_s:.0f}/s"
+            if cap.stale:
+                text += f" | CAMERA STALE ({cap.state}"
+                text += f": {cap.last_error})" if cap.last_error else ")"
+        if self._save_status:
+            text += f" | {self._save_status}"
+        if self._restart_required:
+            text += f" | Restart required: {', '.join(self._restart_required)}"
+        return text
 
 
 def _parse_args(argv: list[str]) -> tuple[argparse.Namespace, list[str]]:
     parser = argparse.ArgumentParser(description="ZED2 / keyboard anamorphic renderer")
-    parser.add_argument("--input-mode", choices=("zed", "keyboard"), default="zed")
+    parser.add_argument("--input-mode", choices=("zed", "keyboard", "sim", "network"), default="zed")
     parser.add_argument("--kb-speed-mps", type=float, default=0.35)
     parser.add_argument("--kb-z-fixed", type=float, default=0.70)
     parser.add_argument("--kb-bound", type=float, default=0.35)
+    parser.add_argument("--sim-path", choices=("orbit", "lissajous"), default="lissajous")
+    parser.add_argument("--sim-rate-hz", type=float, default=60.0)
+    parser.add_argument("--sim-noise-m", type=float, default=0.0)
+    parser.add_argument("--sim-noise-dof", type=float, default=0.0, help="> 0: Student-t heavy-tailed noise")
+    parser.add_argument("--sim-dropout", type=float, default=0.0)
+    parser.add_argument("--sim-burst", type=float, default=0.0)
+    parser.add_argument("--sim-burst-len", type=int, default=10)
+    parser.add_argument("--sim-latency-ms", type=float, default=0.0)
+    parser.add_argument("--sim-seed", type=int, default=0)
+    parser.add_argument("--net-port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--net-group", default="239.255.42.99", help="Multicast group to join; 'none' for unicast")
+    parser.add_argument("--threaded-render", action="store_true", help="Same as render.threaded: true")
+    parser.add_argument(
+        "--reprojection", action="store_true", help="Threaded render with reprojection (render.threaded + render.reprojection)"
+    )
     return parser.parse_known_args(argv)
 
 
-def _build_tracker(args: argparse.Namespace) -> Tracker:
+def _build_tracker(args: argparse.Namespace, settings: AppSettings) -> Tracker:
     if args.input_mode == "keyboard":
         return KeyboardTracker(
             KeyboardTrackerConfig(
@@ -200,16 +310,44 @@ def _build_tracker(args: argparse.Namespace) -> Tracker:
             )
         )
 
-    settings = load_settings()
+    if args.input_mode == "sim":
+        return SimTracker(
+            SimTrackerConfig(
+                path_type=args.sim_path,
+                sample_rate_hz=args.sim_rate_hz,
+                noise_std_m=args.sim_noise_m,
+                noise_t_dof=args.sim_noise_dof,
+                dropout_prob=args.sim_dropout,
+                burst_prob=args.sim_burst,
+                burst_len_samples=args.sim_burst_len,
+                latency_ms=args.sim_latency_ms,
+                seed=args.sim_seed,
+            )
+        )
+
+    if args.input_mode == "network":
+        group = None if args.net_group.lower() == "none" else args.net_group
+        return NetworkTracker(NetworkTrackerConfig(port=args.net_port, multicast_group=group))
+
     return ZedTracker(ZedTrackerConfig(camera=settings.camera))
 
 
 def main() -> int:
     args, qt_args = _parse_args(sys.argv[1:])
+    # Lets every display window reuse the shader program and box VBO of the first context.
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
     app = QApplication([sys.argv[0], *qt_args])
-    window = MainWindow(tracker=_build_tracker(args), input_mode=args.input_mode)
+    settings = load_settings()
+    window = MainWindow(
+        tracker=_build_tracker(args, settings),
+        input_mode=args.input_mode,
+        settings=settings,
+        threaded_render=args.threaded_render,
+        reprojection=args.reprojection,
+    )
     window.resize(1400, 850)
     window.show()
+    window.show_displays()
 
     def _shutdown(*_) -> None:
         window.close()
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import bisect
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.tracking.outlier_filter import AXES, OutlierStats
+from app.tracking.pose_filter import FilterStats
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+FRAME_TIME_BUCKETS_MS = (1.0, 2.0, 4.0, 8.0, 12.0, 16.7, 20.0, 25.0, 33.3, 50.0, 100.0, 250.0)
+LATENCY_BUCKETS_MS = (5.0, 10.0, 15.0, 20.0, 30.0, 40.0, 50.0, 75.0, 100.0, 150.0, 250.0, 500.0, 1000.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    # Fixed buckets in milliseconds; observe() is a bisect and two increments. Exported in
+    # seconds, the conversion happens when the scrape thread formats the text.
+    __slots__ = ("bounds_ms", "counts", "sum_ms", "count")
+
+    def __init__(self, bounds_ms: tuple[float, ...]) -> None:
+        self.bounds_ms = bounds_ms
+        self.counts = [0] * (len(bounds_ms) + 1)
+        self.sum_ms = 0.0
+        self.count = 0
+
+    def observe(self, value_ms: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds_ms, value_ms)] += 1
+        self.sum_ms += value_ms
+        self.count += 1
+
+
+class PipelineMetrics:
+    # Written only by the render loop (plain attribute increments, no locks); the scrape
+    # thread reads them as-is. A scrape may see one frame half-counted, never torn values.
+    def __init__(
+        self, filter_stats: FilterStats | None = None, tick_interval_ms: float = 10.0, outlier_stats: OutlierStats | None = None
+    ) -> None:
+        self.filter_stats = filter_stats or FilterStats()
+        self.outlier_stats = outlier_stats or OutlierStats()
+        self.tick_interval_ms = tick_interval_ms
+        self.frames = 0
+        self.skipped_frames = 0
+        self.valid_poses = 0
+        self.tracker_samples = 0
+        self.frame_time = Histogram(FRAME_TIME_BUCKETS_MS)
+        self.latency = Histogram(LATENCY_BUCKETS_MS)
+        self._last_pose_timestamp_ms: int | None = None
+
+        # Scrape-thread state for rate gauges.
+        self._scrape_lock = threading.Lock()
+        self._last_scrape: tuple[float, int, int] = (time.monotonic(), 0, 0)
+
+    def observe_frame(self, interval_ms: float, frame_time_ms: float, latency_ms: float, pose_valid: bool, pose_timestamp_ms: int) -> None:
+        self.frames += 1
+        if interval_ms > 1.5 * self.tick_interval_ms:
+            self.skipped_frames += int(interval_ms / self.tick_interval_ms + 0.5) - 1
+        self.frame_time.observe(frame_time_ms)
+        self.latency.observe(latency_ms)
+        if pose_valid:
+            self.valid_poses += 1
+        if pose_timestamp_ms != self._last_pose_timestamp_ms:
+            self._last_pose_timestamp_ms = pose_timestamp_ms
+            self.tracker_samples += 1
+
+    def render(self) -> str:
+        now = time.monotonic()
+        frames, samples = self.frames, self.tracker_samples
+        with self._scrape_lock:
+            then, last_frames, last_samples = self._last_scrape
+            self._last_scrape = (now, frames, samples)
+        window = now - then
+        fps = (frames - last_frames) / window if window > 0.0 else 0.0
+        tracker_hz = (samples - last_samples) / window if window > 0.0 else 0.0
+        stats = self.filter_stats
+
+        out: list[str] = []
+        _metric(out, "anamorphic_fps", "gauge", "Rendered frames per second since the previous scrape", fps)
+        _metric(out, "anamorphic_frames_total", "counter", "Pipeline ticks", frames)
+        _metric(out, "anamorphic_skipped_frames_total", "counter", "Ticks missed because the loop ran late", self.skipped_frames)
+        _histogram(out, "anamorphic_frame_time_seconds", "Time spent in one pipeline tick", self.frame_time)
+        _histogram(out, "anamorphic_latency_seconds", "Tracker capture to frame submission", self.latency)
+        _metric(out, "anamorphic_tracker_sample_rate_hz", "gauge", "New tracker samples per second since the previous scrape", tracker_hz)
+        _metric(out, "anamorphic_tracker_samples_total", "counter", "Distinct tracker samples seen", samples)
+        _metric(out, "anamorphic_pose_valid_ratio", "gauge", "Share of ticks with a valid raw pose", self.valid_poses / frames if frames else 0.0)
+        _metric(out, "anamorphic_filter_holds_total", "counter", "Tracking-loss episodes that started a hold", stats.holds)
+        _metric(out, "anamorphic_filter_recenters_total", "counter", "Tracking-loss episodes that reached recenter", stats.recenters)
+        _metric(out, "anamorphic_filter_held_frames_total", "counter", "Frames output from a hold", stats.held_frames)
+        _metric(out, "anamorphic_filter_recentered_frames_total", "counter", "Frames output while recentering", stats.recentered_frames)
+        outliers = self.outlier_stats
+        _metric(out, "anamorphic_outlier_checked_total", "counter", "Tracker samples run through the outlier test", outliers.checked)
+        _metric(out, "anamorphic_outlier_rejected_total", "counter", "Tracker samples rejected as outliers", outliers.rejected)
+        _metric(out, "anamorphic_outlier_reseeds_total", "counter", "Outlier windows restarted after a sustained jump", outliers.reseeds)
+        name = "anamorphic_outlier_rejected_axis_total"
+        out.append(f"# HELP {name} Rejections in which the axis was out of bounds\n# TYPE {name} counter\n")
+        for axis, count in zip(AXES, list(outliers.rejected_axes)):
+            out.append(f'{name}{{axis="{axis}"}} {count}\n')
+        rss = _resident_bytes()
+        if rss is not None:
+            _metric(out, "process_resident_memory_bytes", "gauge", "Resident memory size in bytes", rss)
+        peak = _peak_resident_bytes()
+        if peak is not None:
+            _metric(out, "process_peak_resident_memory_bytes", "gauge", "Peak resident memory size in bytes", peak)
+        return "".join(out)
+
+
+class MetricsServer:
+    # Prometheus text endpoint on a daemon thread; binds to localhost unless told otherwise.
+    def __init__(self, metrics: PipelineMetrics, host: str = "127.0.0.1", port: int = 9464) -> None:
+        self._metrics = metrics
+        self._host = host
+        self._port = port
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1] if self._server is not None else self._port
+
+    def start(self) -> None:
+        if self._server is not None:
+            return
+        metrics = self._metrics
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:  # noqa: A002
+                pass
+
+        self._server = ThreadingHTTPServer((self._host, self._port), _Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=2.0)
+        self._server = None
+        self._thread = None
+
+
+def _metric(out: list[str], name: str, kind: str, help_text: str, value: float) -> None:
+    out.append(f"# HELP {name} {help_text}\n# TYPE {name} {kind}\n{name} {_fmt(value)}\n")
+
+
+def _histogram(out: list[str], name: str, help_text: str, hist: Histogram) -> None:
+    counts = list(hist.counts)
+    out.append(f"# HELP {name} {help_text}\n# TYPE {name} histogram\n")
+    cumulative = 0
+    for bound, count in zip(hist.bounds_ms, counts):
+        cumulative += count
+        out.append(f'{name}_bucket{{le="{_fmt(bound / 1000.0)}"}} {cumulative}\n')
+    cumulative += counts[-1]
+    out.append(f'{name}_bucket{{le="+Inf"}} {cumulative}\n')
+    out.append(f"{name}_sum {_fmt(hist.sum_ms / 1000.0)}\n{name}_count {cumulative}\n")
+
+
+def _fmt(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _resident_bytes() -> int | None:
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _peak_resident_bytes() -> int | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from app.calibration.multi_display import DisplayFanout
+from app.clock import SYSTEM_CLOCK, Clock, VirtualClock
+from app.config.settings import AppSettings, TrackingSettings, load_settings
+from app.tracking.base import Tracker
+from app.tracking.outlier_filter import OutlierConfig, OutlierRejector
+from app.tracking.pose_filter import FilterConfig, PoseFilter
+from app.tracking.pose_history import PoseHistory, PoseHistoryConfig
+from app.tracking.sim_tracker import SIM_PATHS, SimTracker, SimTrackerConfig
+from app.types import HeadPose, RenderState
+
+
+def history_config(tracking: TrackingSettings) -> PoseHistoryConfig:
+    return PoseHistoryConfig(capacity=tracking.history_size, max_extrapolation_ms=tracking.max_extrapolation_ms)
+
+
+def outlier_config(tracking: TrackingSettings) -> OutlierConfig:
+    config = OutlierConfig(
+        enabled=tracking.outlier_rejection,
+        window=tracking.outlier_window,
+        threshold=tracking.outlier_threshold,
+        max_consecutive=tracking.outlier_max_consecutive,
+    )
+    config.min_samples = min(config.min_samples, config.window)
+    return config
+
+
+def filter_config(tracking: TrackingSettings) -> FilterConfig:
+    return FilterConfig(
+        ema_alpha=tracking.ema_alpha,
+        velocity_limit_m_s=tracking.velocity_limit_m_s,
+        min_confidence=tracking.min_confidence,
+        loss_timeout_ms=tracking.loss_timeout_ms,
+        recenter_seconds=tracking.recenter_seconds,
+        mode=tracking.filter_mode,
+        pos_min_cutoff_hz=tracking.pos_min_cutoff_hz,
+        pos_beta=tracking.pos_beta,
+        rot_min_cutoff_hz=tracking.rot_min_cutoff_hz,
+        rot_beta=tracking.rot_beta,
+        derivative_cutoff_hz=tracking.derivative_cutoff_hz,
+    )
+
+
+@dataclass(slots=True)
+class PipelineFrame:
+    raw_pose: HeadPose
+    filtered: HeadPose
+    states: list[RenderState]
+    # Clock time at the end of the step minus the capture timestamp of the raw pose.
+    latency_ms: float
+
+
+class PosePipeline:
+    # tracker -> outlier test -> history resample -> filter -> per-display matrices ->
+    # RenderState. Shared by MainWindow._tick and the headless runner; every time reading
+    # goes through the clock.
+    def __init__(self, tracker: Tracker, settings: AppSettings, clock: Clock | None = None) -> None:
+        self.tracker = tracker
+        self._settings = settings
+        self._clock = clock or SYSTEM_CLOCK
+        self.outliers = OutlierRejector(outlier_config(settings.tracking))
+        self.filter = PoseFilter(filter_config(settings.tracking))
+        self.history = PoseHistory(history_config(settings.tracking))
+        # One tracker/filter stage fanned out to every display; index 0 is the embedded view.
+        self.displays = DisplayFanout.from_settings([settings.display, *settings.displays])
+        self.fallback_pose = self._neutral_pose()
+        self._proj_source: np.ndarray | None = None
+        self._proj_lists: list[list[float]] = []
+
+    @property
+    def clock(self) -> Clock:
+        return self._clock
+
+    @property
+    def settings(self) -> AppSettings:
+        return self._settings
+
+    def recenter(self) -> None:
+        self.fallback_pose = self._neutral_pose()
+
+    def set_tracking(self, tracking: TrackingSettings) -> None:
+        self.outliers.set_config(outlier_config(tracking))
+        self.filter.set_config(filter_config(tracking))
+        self.history.set_config(history_config(tracking))
+
+    def step(self, fov_deg: float, box_depth_m: float) -> PipelineFrame:
+        render = self._settings.render
+        raw_pose = self.tracker.get_latest_pose()
+        # Rejected samples come back invalid: kept out of the history and held by the filter.
+        sample = self.outliers.check(raw_pose)
+        self.history.push(sample)
+        if sample.valid:
+            # Resample the tracker stream at this frame's display time instead of holding the
+            # last capture, so 60 Hz tracking does not step on faster displays. With a lead
+            # >= 0 this is always past the newest capture (linear extrapolation); see
+            # RenderSettings.display_lead_ms.
+            display_ms = self._clock.time() * 1000.0 + render.display_lead_ms
+            sample = self.history.pose_at(display_ms) or sample
+        filtered = self.filter.update(sample, self.fallback_pose)
+
+        if render.projection_mode == "off_axis":
+            views, projs = self.displays.compute_off_axis_matrices(filtered, near_m=render.near_m, far_m=render.far_m)
+        else:
+            views = self.displays.compute_view_matrices(filtered)
+            projs = self.displays.compute_proj_matrices(fov_deg=fov_deg, near_m=render.near_m, far_m=render.far_m)
+        # The fov-mode projections come back as the same cached array until fov/clip planes
+        # change, so their list form is reused too.
+        if projs is not self._proj_source:
+            self._proj_source = projs
+            self._proj_lists = [proj.reshape(-1).tolist() for proj in projs]
+        states = [
+            RenderState(
+                view_matrix=view.reshape(-1).tolist(),
+                proj_matrix=proj,
+                box_depth_m=box_depth_m,
+                box_size_m=render.box_size_m,
+            )
+            for view, proj in zip(views, self._proj_lists)
+        ]
+        latency_ms = max(0.0, self._clock.time() * 1000.0 - raw_pose.timestamp_ms)
+        return PipelineFrame(raw_pose=raw_pose, filtered=filtered, states=states, latency_ms=latency_ms)
+
+    def _neutral_pose(self) -> HeadPose:
+        return HeadPose(
+            timestamp_ms=self._clock.now_ms(),
+            position_m=(0.0, 0.0, 0.7),
+            yaw_pitch_roll_deg=(0.0, 0.0, 0.0),
+            confidence=1.0,
+            valid=True,
+        )
+
+
+class FrameMetrics:
+    def __init__(self, clock: Clock | None = None, latency_alpha: float = 0.2) -> None:
+        self._clock = clock or SYSTEM_CLOCK
+        self._alpha = latency_alpha
+        self._frame_counter = 0
+        self._sample_counter = 0
+        self._last_pose_timestamp_ms: int | None = None
+        self._window_started = self._clock.perf_counter()
+        self.fps = 0.0
+        self.tracker_rate_hz = 0.0
+        self.latency_ema_ms = 0.0
+
+    def update(self, latency_ms: float, pose_timestamp_ms: int | None = None) -> None:
+        self._frame_counter += 1
+        if pose_timestamp_ms is not None and pose_timestamp_ms != self._last_pose_timestamp_ms:
+            self._last_pose_timestamp_ms = pose_timestamp_ms
+            self._sample_counter += 1
+        now = self._clock.perf_counter()
+        elapsed = now - self._window_started
+        if elapsed >= 1.0:
+            self.fps = self._frame_counter / elapsed
+            self.tracker_rate_hz = self._sample_counter / elapsed
+            self._frame_counter = 0
+            self._sample_counter = 0
+            self._window_started = now
+        self.latency_ema_ms = self.latency_ema_ms * (1.0 - self._alpha) + latency_ms * self._alpha
+
+
+@dataclass(slots=True)
+class HeadlessConfig:
+    duration_s: float = 60.0
+    tick_ms: float = 10.0
+    # Simulated cost of one pipeline step, charged to the virtual clock after each tick.
+    frame_cost_ms: float = 0.0
+    # (at_s, stall_ms) pairs: the first frame at or after at_s takes an extra stall_ms.
+    stalls: list[tuple[float, float]] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class HeadlessReport:
+    frames: int
+    simulated_s: float
+    wall_s: float
+    valid_ratio: float
+    latency_mean_ms: float
+    latency_p50_ms: float
+    latency_p99_ms: float
+    latency_max_ms: float
+
+    @property
+    def frames_per_wall_s(self) -> float:
+        return self.frames / self.wall_s if self.wall_s > 0.0 else 0.0
+
+    @property
+    def speedup(self) -> float:
+        return self.simulated_s / self.wall_s if self.wall_s > 0.0 else 0.0
+
+
+def run_headless(pipeline: PosePipeline, clock: VirtualClock, config: HeadlessConfig) -> HeadlessReport:
+    if config.tick_ms <= 0.0:
+        raise ValueError("tick_ms must be > 0")
+    fov = pipeline.settings.render.fov_deg
+    depth = pipeline.settings.render.box_depth_m
+    capacity = int(config.duration_s * 1000.0 / config.tick_ms) + 1
+    latency = np.empty(capacity, dtype=np.float64)
+    valid = np.empty(capacity, dtype=bool)
+    stalls = sorted(config.stalls)
+    next_stall = 0
+
+    started_sim = clock.monotonic()
+    started_wall = time.perf_counter()
+    pipeline.tracker.start()
+    frames = 0
+    try:
+        while frames < capacity and clock.monotonic() - started_sim < config.duration_s:
+            elapsed = clock.monotonic() - started_sim
+            cost_ms = config.frame_cost_ms
+            while next_stall < len(stalls) and elapsed >= stalls[next_stall][0]:
+                cost_ms += stalls[next_stall][1]
+                next_stall += 1
+
+            frame = pipeline.step(fov, depth)
+            # The frame reaches the screen only after its (simulated) cost has been paid.
+            latency[frames] = frame.latency_ms + cost_ms
+            valid[frames] = frame.raw_pose.valid
+            frames += 1
+            clock.advance(max(config.tick_ms, cost_ms) / 1000.0)
+    finally:
+        pipeline.tracker.stop()
+    wall_s = time.perf_counter() - started_wall
+
+    lat = latency[:frames]
+    return HeadlessReport(
+        frames=frames,
+        simulated_s=clock.monotonic() - started_sim,
+        wall_s=wall_s,
+        valid_ratio=float(valid[:frames].mean()) if frames else 0.0,
+        latency_mean_ms=float(lat.mean()) if frames else 0.0,
+        latency_p50_ms=float(np.percentile(lat, 50)) if frames else 0.0,
+        latency_p99_ms=float(np.percentile(lat, 99)) if frames else 0.0,
+        latency_max_ms=float(lat.max()) if frames else 0.0,
+    )
+
+
+def _parse_stall(value: str) -> tuple[float, float]:
+    at_s, _, stall_ms = value.partition(":")
+    return float(at_s), float(stall_ms)
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Run tracking -> filter -> matrices -> render state on a virtual clock")
+    p.add_argument("--duration-s", type=float, default=1800.0, help="Simulated seconds")
+    p.add_argument("--tick-ms", type=float, default=10.0)
+    p.add_argument("--frame-cost-ms", type=float, default=0.0)
+    p.add_argument("--stall", type=_parse_stall, action="append", default=[], help="AT_S:MS, repeatable")
+    p.add_argument("--config", type=Path, default=None)
+    p.add_argument("--sim-path", choices=tuple(SIM_PATHS), default="lissajous")
+    p.add_argument("--sim-rate-hz", type=float, default=60.0)
+    p.add_argument("--sim-noise-m", type=float, default=0.0)
+    p.add_argument("--sim-dropout", type=float, default=0.0)
+    p.add_argument("--sim-burst", type=float, default=0.0)
+    p.add_argument("--sim-latency-ms", type=float, default=0.0)
+    p.add_argument("--sim-seed", type=int, default=0)
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    if args.duration_s <= 0.0:
+        raise SystemExit("--duration-s must be > 0")
+    if args.tick_ms <= 0.0:
+        raise SystemExit("--tick-ms must be > 0")
+
+    clock = VirtualClock()
+    tracker = SimTracker(
+        SimTrackerConfig(
+            path_type=args.sim_path,
+            sample_rate_hz=args.sim_rate_hz,
+            noise_std_m=args.sim_noise_m,
+            dropout_prob=args.sim_dropout,
+            burst_prob=args.sim_burst,
+            latency_ms=args.sim_latency_ms,
+            seed=args.sim_seed,
+        ),
+        clock=clock,
+    )
+    pipeline = PosePipeline(tracker, load_settings(args.config), clock)
+    report = run_headless(
+        pipeline,
+        clock,
+        HeadlessConfig(duration_s=args.duration_s, tick_ms=args.tick_ms, frame_cost_ms=args.frame_cost_ms, stalls=args.stall),
+    )
+    payload = asdict(report)
+    payload["frames_per_wall_s"] = round(report.frames_per_wall_s, 1)
+    payload["speedup"] = round(report.speedup, 1)
+    print(json.dumps(payload, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
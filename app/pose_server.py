@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import argparse
+import signal
+import sys
+import threading
+
+from app.config.settings import load_settings
+from app.tracking.base import Tracker
+from app.tracking.network_tracker import DEFAULT_PORT, PosePublisher, PosePublisherConfig
+from app.tracking.sim_tracker import SIM_PATHS, SimTracker, SimTrackerConfig
+from app.tracking.zed_tracker import ZedTracker, ZedTrackerConfig
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Stream tracker poses to render nodes over UDP")
+    p.add_argument("--input-mode", choices=("zed", "sim"), default="zed")
+    p.add_argument(
+        "--dest",
+        action="append",
+        default=None,
+        help=f"host:port, repeatable; a multicast group reaches every node (default 239.255.42.99:{DEFAULT_PORT})",
+    )
+    p.add_argument("--ttl", type=int, default=1, help="Multicast TTL (1 = local subnet)")
+    p.add_argument("--interface", default=None, help="Local address for outgoing multicast")
+    p.add_argument("--sim-path", choices=tuple(SIM_PATHS), default="lissajous")
+    p.add_argument("--sim-rate-hz", type=float, default=60.0)
+    return p.parse_args(argv)
+
+
+def _build_tracker(args: argparse.Namespace) -> Tracker:
+    if args.input_mode == "sim":
+        return SimTracker(SimTrackerConfig(path_type=args.sim_path, sample_rate_hz=args.sim_rate_hz))
+    return ZedTracker(ZedTrackerConfig(camera=load_settings().camera))
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    config = PosePublisherConfig(multicast_ttl=args.ttl, multicast_interface=args.interface)
+    if args.dest:
+        config.destinations = args.dest
+    publisher = PosePublisher(_build_tracker(args), config)
+
+    done = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: done.set())
+    signal.signal(signal.SIGTERM, lambda *_: done.set())
+    try:
+        publisher.start()
+    except Exception as exc:
+        print(f"Startup error: {exc}", file=sys.stderr)
+        return 1
+    print(f"Publishing {args.input_mode} poses to {', '.join(config.destinations)}")
+    done.wait()
+    publisher.stop()
+    print(f"Sent {publisher.sent} packets")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
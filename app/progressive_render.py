@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import argparse
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+from app.colab_render import build_calibrator, build_poses, iter_frames
+from app.config.settings import DEFAULT_CONFIG_PATH, AppSettings, load_settings
+from app.render.encoders import ENCODER_FORMATS, EncoderConfig, EncodeStats, encode_frames
+from app.render.frame_cache import FrameCache, FrameCacheConfig
+from app.render.headless_matplotlib import HeadlessMatplotlibRenderer, HeadlessRendererConfig
+
+
+@dataclass(slots=True)
+class ProgressiveConfig:
+    proxy_scale: float = 0.25
+    # Pass 1 renders every k-th frame; later passes halve the stride until every frame exists.
+    proxy_stride: int = 4
+
+
+@dataclass(slots=True)
+class ProxyPass:
+    level: int
+    stride: int
+    indices: list[int]
+    frames: list[np.ndarray]
+    rendered: int  # frames newly rendered in this pass; the rest came from earlier passes
+    seconds: float
+    frame_count: int
+
+    def playback_fps(self, fps: int) -> float:
+        # Keeps the preview as long as the final sequence.
+        return fps * len(self.indices) / max(1, self.frame_count)
+
+
+@dataclass(slots=True)
+class _FullTask:
+    views: list[np.ndarray]
+    proj: np.ndarray
+    box_size_m: float
+    box_depth_m: float
+    width: int
+    height: int
+    out_path: Path
+    fps: int
+    fmt: str
+    encoder_config: EncoderConfig | None
+    cache_config: FrameCacheConfig | None
+
+
+def refinement_levels(frame_count: int, stride: int) -> list[tuple[int, list[int]]]:
+    # (stride, new indices) per pass: stride k first, then k/2, ... 1. Each index appears once.
+    stride = max(1, stride)
+    levels: list[tuple[int, list[int]]] = []
+    done: set[int] = set()
+    while True:
+        new = [i for i in range(0, frame_count, stride) if i not in done]
+        done.update(new)
+        if new or not levels:
+            levels.append((stride, new))
+        if stride == 1:
+            return levels
+        stride = max(1, stride // 2)
+
+
+class ProgressiveRender:
+    # Pass 1 shows a decimated 1/4-scale proxy within seconds, later passes fill the gaps at
+    # proxy scale (frames from earlier passes are kept, never re-rendered), and the
+    # full-resolution encode runs in a separate process so it can start at any point.
+    # A process rather than a thread: the matplotlib renderer goes through pyplot, which is
+    # not thread-safe, and the notebook keeps using pyplot for the proxy passes.
+    def __init__(
+        self,
+        views: list[np.ndarray],
+        proj: np.ndarray,
+        box_size_m: float,
+        box_depth_m: float,
+        width: int,
+        height: int,
+        config: ProgressiveConfig | None = None,
+        cache_config: FrameCacheConfig | None = None,
+    ) -> None:
+        cfg = config or ProgressiveConfig()
+        if not 0.0 < cfg.proxy_scale <= 1.0:
+            raise ValueError("proxy_scale must be in (0, 1]")
+        if cfg.proxy_stride < 1:
+            raise ValueError("proxy_stride must be >= 1")
+        self._cfg = cfg
+        self._views = views
+        self._proj = proj
+        self._box = (box_size_m, box_depth_m)
+        self._size = (width, height)
+        self._cache_config = cache_config
+        self._cache = FrameCache(cache_config) if cache_config is not None else None
+        self._proxy = HeadlessMatplotlibRenderer(
+            HeadlessRendererConfig(width=max(16, round(width * cfg.proxy_scale)), height=max(16, round(height * cfg.proxy_scale)))
+        )
+        self._frames: dict[int, np.ndarray] = {}
+        self._pool: ProcessPoolExecutor | None = None
+
+    @property
+    def frame_count(self) -> int:
+        return len(self._views)
+
+    @property
+    def proxy_size(self) -> tuple[int, int]:
+        return self._proxy.config.width, self._proxy.config.height
+
+    @property
+    def cache(self) -> FrameCache | None:
+        return self._cache
+
+    def passes(self) -> Iterator[ProxyPass]:
+        for level, (stride, new) in enumerate(refinement_levels(len(self._views), self._cfg.proxy_stride)):
+            started = time.perf_counter()
+            views = [self._views[i] for i in new]
+            for i, frame in zip(new, iter_frames(self._proxy, views, self._proj, *self._box, cache=self._cache)):
+                self._frames[i] = frame
+            indices = sorted(self._frames)
+            yield ProxyPass(
+                level=level,
+                stride=stride,
+                indices=indices,
+                frames=[self._frames[i] for i in indices],
+                rendered=len(new),
+                seconds=time.perf_counter() - started,
+                frame_count=len(self._views),
+            )
+
+    def write_preview(self, proxy: ProxyPass, out_path: Path, fps: int) -> Path:
+        # GIF so the notebook can show it inline without a video codec.
+        saved, _ = encode_frames(proxy.frames, out_path, max(1, round(proxy.playback_fps(fps))), "gif")
+        return saved
+
+    def start_full(
+        self,
+        out_path: Path,
+        fps: int,
+        fmt: str = "mp4",
+        encoder_config: EncoderConfig | None = None,
+    ) -> Future[tuple[Path, EncodeStats]]:
+        # The worker shares the frame cache (when configured), so a rerun with the same
+        # parameters, or a proxy_scale of 1, skips rendering frames that already exist.
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=1)
+        task = _FullTask(
+            views=self._views,
+            proj=self._proj,
+            box_size_m=self._box[0],
+            box_depth_m=self._box[1],
+            width=self._size[0],
+            height=self._size[1],
+            out_path=out_path,
+            fps=fps,
+            fmt=fmt,
+            encoder_config=encoder_config,
+            cache_config=self._cache_config,
+        )
+        return self._pool.submit(_render_full, task)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+
+def build_progressive(
+    settings: AppSettings,
+    path_type: str,
+    duration_s: float,
+    fps: int,
+    width: int,
+    height: int,
+    keyframes: Path | None = None,
+    config: ProgressiveConfig | None = None,
+    cache_config: FrameCacheConfig | None = None,
+) -> ProgressiveRender:
+    calibrator = build_calibrator(settings, width, height)
+    proj = calibrator.compute_proj_matrix(
+        fov_deg=settings.render.fov_deg,
+        near_m=settings.render.near_m,
+        far_m=settings.render.far_m,
+    )
+    views = [calibrator.compute_view_matrix(pose) for pose in build_poses(path_type, duration_s, fps, keyframes)]
+    return ProgressiveRender(
+        views,
+        proj,
+        settings.render.box_size_m,
+        settings.render.box_depth_m,
+        width,
+        height,
+        config,
+        cache_config,
+    )
+
+
+def _render_full(task: _FullTask) -> tuple[Path, EncodeStats]:
+    renderer = HeadlessMatplotlibRenderer(HeadlessRendererConfig(width=task.width, height=task.height))
+    cache = FrameCache(task.cache_config) if task.cache_config is not None else None
+    frames = iter_frames(renderer, task.views, task.proj, task.box_size_m, task.box_depth_m, cache)
+    return encode_frames(frames, task.out_path, task.fps, task.fmt, task.encoder_config)
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Progressive preview: decimated proxy, refinement, then full resolution")
+    p.add_argument("--duration-s", type=float, default=6.0)
+    p.add_argument("--fps", type=int, default=30)
+    p.add_argument("--width", type=int, default=960)
+    p.add_argument("--height", type=int, default=540)
+    p.add_argument("--format", choices=ENCODER_FORMATS, default="mp4")
+    p.add_argument("--path-type", choices=("orbit", "lissajous", "keyframes"), default="orbit")
+    p.add_argument("--keyframes", type=Path, default=None)
+    p.add_argument("--proxy-scale", type=float, default=0.25)
+    p.add_argument("--proxy-stride", type=int, default=4)
+    p.add_argument("--preview-out", type=Path, default=Path("outputs/preview.gif"))
+    p.add_argument("--out", type=Path, default=Path("outputs/colab_render.mp4"))
+    p.add_argument("--no-full", action="store_true", help="Stop after the proxy passes")
+    p.add_argument("--config", type=Path, default=DEFAULT_CONFIG_PATH)
+    p.add_argument("--cache-dir", type=Path, default=None)
+    p.add_argument("--cache-max-mb", type=int, default=2048)
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    if args.duration_s <= 0.0 or args.fps <= 0 or args.width <= 0 or args.height <= 0:
+        raise SystemExit("--duration-s, --fps, --width and --height must be > 0")
+
+    cache_config = None
+    if args.cache_dir is not None:
+        cache_config = FrameCacheConfig(root=args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024)
+    try:
+        progressive = build_progressive(
+            load_settings(args.config),
+            args.path_type,
+            args.duration_s,
+            args.fps,
+            args.width,
+            args.height,
+            args.keyframes,
+            ProgressiveConfig(proxy_scale=args.proxy_scale, proxy_stride=args.proxy_stride),
+            cache_config,
+        )
+    except (OSError, ValueError) as exc:
+        raise SystemExit(str(exc)) from exc
+
+    full: Future | None = None
+    try:
+        for proxy in progressive.passes():
+            saved = progressive.write_preview(proxy, args.preview_out, args.fps)
+            print(
+                f"Pass {proxy.level + 1}: {len(proxy.indices)}/{progressive.frame_count} frames "
+                f"(+{proxy.rendered} in {proxy.seconds:.2f}s) -> {saved}"
+            )
+            # Start the full-resolution encode once the first preview is on screen.
+            if full is None and not args.no_full:
+                full = progressive.start_full(args.out, args.fps, args.format)
+        if full is not None:
+            saved, stats = full.result()
+            print(f"Saved: {saved} ({stats.frames} frames, {stats.seconds:.2f}s encode)")
+    finally:
+        progressive.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
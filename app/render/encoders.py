@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import itertools
+import queue
+import subprocess
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import imageio.v2 as imageio
+import numpy as np
+
+ENCODER_FORMATS = ("mp4", "webm", "gif")
+_STDERR_TAIL_BYTES = 16384
+
+
+@dataclass(slots=True)
+class EncoderConfig:
+    codec: str | None = None  # None: libx264 for mp4, libvpx-vp9 for webm
+    preset: str = "medium"  # libx264 preset; libvpx uses `deadline`/`cpu_used` instead
+    crf: int = 23
+    pix_fmt: str = "yuv420p"
+    threads: int = 0  # 0 lets ffmpeg use every core
+    deadline: str = "good"
+    cpu_used: int = 4
+    gif_max_colors: int = 256
+    gif_dither: str = "sierra2_4a"
+    queue_frames: int = 32
+
+
+@dataclass(slots=True)
+class EncodeStats:
+    frames: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def fps(self) -> float:
+        return self.frames / self.seconds if self.seconds > 0.0 else 0.0
+
+    @property
+    def bytes_per_frame(self) -> float:
+        return self.bytes / self.frames if self.frames else 0.0
+
+
+class FrameEncoder(ABC):
+    def __init__(self, out_path: Path, fps: int) -> None:
+        self.out_path = out_path
+        self.fps = fps
+        self.stats = EncodeStats()
+
+    @abstractmethod
+    def write(self, frame: np.ndarray) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def close(self) -> EncodeStats:
+        raise NotImplementedError
+
+    def __enter__(self) -> FrameEncoder:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class FfmpegPipeEncoder(FrameEncoder):
+    # Streams raw RGB frames into an ffmpeg subprocess from a feeder thread, so the caller
+    # can keep rendering while ffmpeg encodes on its own threads.
+    def __init__(self, out_path: Path, fps: int, fmt: str, config: EncoderConfig | None = None) -> None:
+        super().__init__(out_path, fps)
+        if fmt not in ENCODER_FORMATS:
+            raise ValueError(f"format must be one of {', '.join(ENCODER_FORMATS)}")
+        import imageio_ffmpeg
+
+        self._exe = imageio_ffmpeg.get_ffmpeg_exe()
+        self._fmt = fmt
+        self._cfg = config or EncoderConfig()
+        self._queue: queue.Queue[bytes | None] = queue.Queue(maxsize=max(1, self._cfg.queue_frames))
+        self._proc: subprocess.Popen | None = None
+        self._feeder: threading.Thread | None = None
+        self._stderr_reader: threading.Thread | None = None
+        self._stderr = bytearray()
+        self._error: BaseException | None = None
+        self._shape: tuple[int, ...] | None = None
+        self._started = 0.0
+
+    def write(self, frame: np.ndarray) -> None:
+        if self._error is not None:
+            raise RuntimeError(f"ffmpeg encoder failed: {self._error}")
+        frame = np.ascontiguousarray(frame, dtype=np.uint8)
+        if self._proc is None:
+            self._open(frame.shape)
+        elif frame.shape != self._shape:
+            raise ValueError(f"frame shape changed from {self._shape} to {frame.shape}")
+        self._queue.put(frame.tobytes())
+        self.stats.frames += 1
+
+    def close(self) -> EncodeStats:
+        if self._proc is None:
+            return self.stats
+        self._queue.put(None)
+        self._feeder.join()
+        code = self._proc.wait()
+        self._stderr_reader.join()
+        self._proc.stderr.close()
+        self._proc = None
+        self.stats.seconds = time.perf_counter() - self._started
+        if code != 0 or self._error is not None:
+            detail = self._stderr.decode("utf-8", errors="ignore").strip() or str(self._error)
+            raise RuntimeError(f"ffmpeg exited with {code}: {detail}")
+        self.stats.bytes = self.out_path.stat().st_size
+        return self.stats
+
+    def command(self, width: int, height: int) -> list[str]:
+        cfg = self._cfg
+        cmd = [
+            self._exe, "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(self.fps),
+            "-i", "-",
+        ]
+        if self._fmt == "gif":
+            # Two passes inside one ffmpeg graph: build an optimized palette, then map onto it.
+            graph = (
+                f"[0:v]split[a][b];[a]palettegen=max_colors={cfg.gif_max_colors}:stats_mode=diff[p];"
+                f"[b][p]paletteuse=dither={cfg.gif_dither}"
+            )
+            return [*cmd, "-filter_complex", graph, "-threads", str(cfg.threads), str(self.out_path)]
+
+        codec = cfg.codec or ("libvpx-vp9" if self._fmt == "webm" else "libx264")
+        cmd += ["-c:v", codec, "-pix_fmt", cfg.pix_fmt, "-threads", str(cfg.threads)]
+        if cfg.pix_fmt in ("yuv420p", "yuv422p"):
+            # Chroma subsampling needs even dimensions.
+            cmd += ["-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2"]
+        if codec.startswith("libx264"):
+            cmd += ["-preset", cfg.preset, "-crf", str(cfg.crf)]
+        elif codec.startswith("libvpx"):
+            cmd += ["-crf", str(cfg.crf), "-b:v", "0", "-deadline", cfg.deadline, "-cpu-used", str(cfg.cpu_used), "-row-mt", "1"]
+        if self._fmt == "mp4":
+            cmd += ["-movflags", "+faststart"]
+        return [*cmd, str(self.out_path)]
+
+    def _open(self, shape: tuple[int, ...]) -> None:
+        if len(shape) != 3 or shape[2] != 3:
+            raise ValueError("frames must be (H, W, 3) RGB")
+        self._shape = shape
+        self.out_path.parent.mkdir(parents=True, exist_ok=True)
+        self._started = time.perf_counter()
+        self._proc = subprocess.Popen(
+            self.command(shape[1], shape[0]),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        self._feeder = threading.Thread(target=self._feed, name="ffmpeg-feeder", daemon=True)
+        self._feeder.start()
+        self._stderr_reader = threading.Thread(target=self._drain_stderr, name="ffmpeg-stderr", daemon=True)
+        self._stderr_reader.start()
+
+    def _drain_stderr(self) -> None:
+        # Read continuously: a full stderr pipe would block ffmpeg, then the feeder on stdin,
+        # then write() on the full queue. Only the tail is kept for the error message.
+        stderr = self._proc.stderr
+        while chunk := stderr.read1(65536):
+            self._stderr += chunk
+            del self._stderr[:-_STDERR_TAIL_BYTES]
+
+    def _feed(self) -> None:
+        stdin = self._proc.stdin
+        try:
+            while True:
+                chunk = self._queue.get()
+                if chunk is None:
+                    break
+                if self._error is None:
+                    stdin.write(chunk)
+        except BaseException as exc:
+            self._error = exc
+            # Keep draining so producers blocked on a full queue are released.
+            while self._queue.get() is not None:
+                pass
+        finally:
+            try:
+                stdin.close()
+            except OSError:
+                pass
+
+
+class ImageioEncoder(FrameEncoder):
+    # Legacy path: buffer frames and hand them to imageio.mimsave on close.
+    def __init__(self, out_path: Path, fps: int, fmt: str) -> None:
+        super().__init__(out_path, fps)
+        self._fmt = fmt
+        self._frames: list[np.ndarray] = []
+
+    def write(self, frame: np.ndarray) -> None:
+        self._frames.append(frame)
+        self.stats.frames += 1
+
+    def close(self) -> EncodeStats:
+        started = time.perf_counter()
+        self.out_path.parent.mkdir(parents=True, exist_ok=True)
+        if self._fmt == "gif":
+            imageio.mimsave(self.out_path, self._frames, format="GIF", fps=self.fps)
+        else:
+            imageio.mimsave(self.out_path, self._frames, fps=self.fps)
+        self.stats.seconds = time.perf_counter() - started
+        self.stats.bytes = self.out_path.stat().st_size
+        return self.stats
+
+
+def encode_frames(
+    frames: Iterable[np.ndarray],
+    out_path: Path,
+    fps: int,
+    fmt: str,
+    config: EncoderConfig | None = None,
+) -> tuple[Path, EncodeStats]:
+    # Frames are pushed to ffmpeg as they are produced and not kept, so memory stays flat for
+    # any sequence length (a generator keeps rendering and encoding overlapped). Only when no
+    # ffmpeg pipe can be opened are frames buffered for the legacy imageio path, falling back
+    # to GIF as before. A pipe that fails mid-stream re-runs the fallback when `frames` is a
+    # sequence that can be iterated again, and raises otherwise.
+    fmt = fmt.lower()
+    if fmt not in ENCODER_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(ENCODER_FORMATS)}")
+
+    reiterable = isinstance(frames, (Sequence, np.ndarray))
+    it = iter(frames)
+    first = next(it, None)
+    if first is None:
+        raise ValueError(f"no frames to encode into {out_path}")
+    try:
+        encoder = FfmpegPipeEncoder(out_path, fps, fmt, config)
+        # The first write starts the ffmpeg process.
+        encoder.write(first)
+    except Exception:
+        return _encode_legacy(frames if reiterable else itertools.chain((first,), it), out_path, fps, fmt)
+    del first
+
+    failure: Exception | None = None
+    try:
+        for frame in it:
+            try:
+                encoder.write(frame)
+            except Exception as exc:
+                failure = exc
+                break
+    except BaseException:
+        # The frame source itself failed: do not leave ffmpeg running.
+        _abandon(encoder)
+        raise
+    if failure is None:
+        try:
+            return out_path, encoder.close()
+        except Exception as exc:
+            failure = exc
+    else:
+        _abandon(encoder)
+    if not reiterable:
+        raise RuntimeError(f"ffmpeg encoding of {out_path} failed mid-stream: {failure}") from failure
+    return _encode_legacy(frames, out_path, fps, fmt)
+
+
+def _encode_legacy(frames: Iterable[np.ndarray], out_path: Path, fps: int, fmt: str) -> tuple[Path, EncodeStats]:
+    kept = list(frames)
+    if fmt != "gif":
+        try:
+            legacy = ImageioEncoder(out_path, fps, fmt)
+            for frame in kept:
+                legacy.write(frame)
+            return out_path, legacy.close()
+        except Exception:
+            out_path = out_path.with_suffix(".gif")
+    legacy = ImageioEncoder(out_path, fps, "gif")
+    for frame in kept:
+        legacy.write(frame)
+    return out_path, legacy.close()
+
+
+def _abandon(encoder: FfmpegPipeEncoder) -> None:
+    try:
+        encoder.close()
+    except Exception:
+        pass
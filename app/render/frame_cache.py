@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+STORAGE_SUFFIX = {"npz": ".npz", "raw": ".npy"}
+
+
+@dataclass(slots=True)
+class FrameCacheConfig:
+    root: Path
+    max_bytes: int = 2 * 1024**3
+    # "npz": zlib-compressed; "raw": uncompressed .npy returned as a read-only memmap.
+    storage: str = "npz"
+
+
+@dataclass(slots=True)
+class FrameCacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+    bytes: int = 0
+
+
+def frame_key(
+    view_matrix: np.ndarray,
+    proj_matrix: np.ndarray,
+    box_size_m: float,
+    box_depth_m: float,
+    renderer_config: dict[str, Any],
+    renderer_version: int,
+) -> str:
+    h = hashlib.sha256()
+    h.update(np.ascontiguousarray(view_matrix, dtype=np.float32).tobytes())
+    h.update(np.ascontiguousarray(proj_matrix, dtype=np.float32).tobytes())
+    h.update(np.array([box_size_m, box_depth_m], dtype=np.float64).tobytes())
+    h.update(json.dumps(renderer_config, sort_keys=True, default=str).encode("utf-8"))
+    h.update(str(renderer_version).encode("ascii"))
+    return h.hexdigest()
+
+
+class FrameCache:
+    def __init__(self, config: FrameCacheConfig) -> None:
+        if config.storage not in STORAGE_SUFFIX:
+            raise ValueError("storage must be npz or raw")
+        self._cfg = config
+        self._suffix = STORAGE_SUFFIX[config.storage]
+        self.stats = FrameCacheStats()
+        # key -> size in bytes, least recently used first.
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._scan()
+
+    def get(self, key: str) -> np.ndarray | None:
+        if key not in self._entries:
+            self.stats.misses += 1
+            return None
+        path = self._path(key)
+        try:
+            if self._cfg.storage == "raw":
+                frame = np.load(path, mmap_mode="r")
+            else:
+                with np.load(path) as data:
+                    frame = data["frame"]
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            # Evicted by another process or truncated; treat as a miss and forget it.
+            self._drop(key)
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return frame
+
+    def put(self, key: str, frame: np.ndarray) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=".frame-", suffix=self._suffix, dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                if self._cfg.storage == "raw":
+                    np.save(f, np.ascontiguousarray(frame))
+                else:
+                    np.savez_compressed(f, frame=frame)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        size = path.stat().st_size
+        self.stats.bytes += size - self._entries.pop(key, 0)
+        self._entries[key] = size
+        self.stats.writes += 1
+        self._evict()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _path(self, key: str) -> Path:
+        return self._cfg.root / key[:2] / f"{key}{self._suffix}"
+
+    def _scan(self) -> None:
+        if not self._cfg.root.exists():
+            return
+        found: list[tuple[float, str, int]] = []
+        for path in self._cfg.root.glob(f"*/*{self._suffix}"):
+            if path.name.startswith("."):
+                continue
+            st = path.stat()
+            found.append((st.st_mtime, path.stem, st.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self.stats.bytes += size
+        self._evict()
+
+    def _evict(self) -> None:
+        while self.stats.bytes > self._cfg.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            self._drop(key)
+            self.stats.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        self.stats.bytes -= self._entries.pop(key, 0)
+        self._path(key).unlink(missing_ok=True)
@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+import argparse
+import json
+import struct
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+import imageio.v2 as imageio
+import numpy as np
+
+from app.render.encoders import ENCODER_FORMATS, EncoderConfig, EncodeStats, encode_frames
+from app.types import HeadPose
+
+# Store layout (a directory):
+#   frames.bin       header + preallocated (N, H, W, 3) uint8 frames, opened as np.memmap
+#   thumbs-<k>.bin   same format, each level halving width/height (optional pyramid)
+#   meta.json        fps, sizes, levels, renderer identity
+#   poses/<name>.npy per-frame pose, view and proj, plus a written flag, one memmapped
+#                    .npy per field so a flush only writes the pages that changed
+STORE_VERSION = 2
+_MAGIC = b"AFRSTORE"
+_HEADER = struct.Struct("<8sIIIII")  # magic, version, frames, height, width, channels
+# Page-sized so frame data starts page-aligned and the memmap maps cleanly.
+HEADER_BYTES = 4096
+# name: (dtype, per-frame shape, initial value). "written" is last so it is flushed last.
+_SIDECAR_FIELDS: dict[str, tuple[Any, tuple[int, ...], Any]] = {
+    "timestamps_ms": (np.int64, (), 0),
+    "positions_m": (np.float64, (3,), np.nan),
+    "yaw_pitch_roll_deg": (np.float64, (3,), np.nan),
+    "confidence": (np.float64, (), 0.0),
+    "pose_valid": (np.bool_, (), False),
+    "view": (np.float32, (4, 4), np.nan),
+    "proj": (np.float32, (4, 4), np.nan),
+    "written": (np.bool_, (), False),
+}
+
+
+@dataclass(slots=True)
+class FrameStoreConfig:
+    fps: int = 30
+    # Each level is a 2x2 box-filtered half of the previous one; 0 disables the pyramid.
+    thumbnail_levels: int = 0
+    # Dirty pages of the frames and sidecar are flushed after this many writes or seconds,
+    # whichever comes first, so a killed render keeps the written flags and poses of what
+    # it finished.
+    flush_every: int = 64
+    flush_interval_s: float = 5.0
+
+
+def _create_array(path: Path, frames: int, height: int, width: int) -> np.memmap:
+    with path.open("wb") as f:
+        f.write(_HEADER.pack(_MAGIC, STORE_VERSION, frames, height, width, 3).ljust(HEADER_BYTES, b"\0"))
+        # Sparse preallocation: no frame bytes are written until a frame is.
+        f.truncate(HEADER_BYTES + frames * height * width * 3)
+    return np.memmap(path, dtype=np.uint8, mode="r+", offset=HEADER_BYTES, shape=(frames, height, width, 3))
+
+
+def _open_array(path: Path, mode: str) -> np.memmap:
+    with path.open("rb") as f:
+        magic, version, frames, height, width, channels = _HEADER.unpack(f.read(_HEADER.size))
+    if magic != _MAGIC:
+        raise ValueError(f"Not a frame store file: {path}")
+    if version != STORE_VERSION:
+        raise ValueError(f"Unsupported frame store version {version}: {path}")
+    return np.memmap(path, dtype=np.uint8, mode=mode, offset=HEADER_BYTES, shape=(frames, height, width, channels))
+
+
+def downsample(frame: np.ndarray) -> np.ndarray:
+    # 2x2 box filter; an odd last row/column is dropped.
+    h, w = frame.shape[0] // 2 * 2, frame.shape[1] // 2 * 2
+    blocks = frame[:h, :w].reshape(h // 2, 2, w // 2, 2, -1).astype(np.uint16)
+    return ((blocks.sum(axis=(1, 3)) + 2) // 4).astype(np.uint8)
+
+
+class FrameStore:
+    # Random access to any rendered frame without decoding a video: frame i is a slice of
+    # one preallocated memmap, and the pose/matrices it was rendered from sit in the poses/ memmaps.
+    def __init__(
+        self,
+        path: Path,
+        frames: np.memmap,
+        thumbnails: list[np.memmap],
+        meta: dict[str, Any],
+        sidecar: dict[str, np.ndarray],
+        config: FrameStoreConfig | None = None,
+    ) -> None:
+        self.path = path
+        self._cfg = config or FrameStoreConfig()
+        self._pending = 0
+        self._flushed_at = time.monotonic()
+        self._frames = frames
+        self._thumbnails = thumbnails
+        self._meta = meta
+        self._sidecar = sidecar
+        self._writable = frames.mode == "r+"
+
+    @classmethod
+    def create(
+        cls,
+        path: Path,
+        frame_count: int,
+        width: int,
+        height: int,
+        config: FrameStoreConfig | None = None,
+        renderer: dict[str, Any] | None = None,
+    ) -> FrameStore:
+        cfg = config or FrameStoreConfig()
+        if frame_count <= 0 or width <= 0 or height <= 0:
+            raise ValueError("frame_count, width and height must be > 0")
+        if cfg.thumbnail_levels < 0 or (height >> cfg.thumbnail_levels) < 1 or (width >> cfg.thumbnail_levels) < 1:
+            raise ValueError("thumbnail_levels must leave at least one pixel")
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        frames = _create_array(path / "frames.bin", frame_count, height, width)
+        thumbnails = [
+            _create_array(path / f"thumbs-{k}.bin", frame_count, height >> k, width >> k) for k in range(1, cfg.thumbnail_levels + 1)
+        ]
+        meta = {
+            "version": STORE_VERSION,
+            "fps": cfg.fps,
+            "frame_count": frame_count,
+            "width": width,
+            "height": height,
+            "thumbnail_levels": cfg.thumbnail_levels,
+            "renderer": renderer or {},
+        }
+        (path / "poses").mkdir(exist_ok=True)
+        sidecar = {}
+        for name, (dtype, shape, fill) in _SIDECAR_FIELDS.items():
+            array = np.lib.format.open_memmap(path / "poses" / f"{name}.npy", mode="w+", dtype=dtype, shape=(frame_count, *shape))
+            array[:] = fill
+            sidecar[name] = array
+        store = cls(path, frames, thumbnails, meta, sidecar, cfg)
+        store.flush()
+        return store
+
+    @classmethod
+    def open(cls, path: Path, writable: bool = False, config: FrameStoreConfig | None = None) -> FrameStore:
+        path = Path(path)
+        mode = "r+" if writable else "r"
+        meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+        frames = _open_array(path / "frames.bin", mode)
+        thumbnails = [_open_array(path / f"thumbs-{k}.bin", mode) for k in range(1, int(meta["thumbnail_levels"]) + 1)]
+        sidecar = {name: np.lib.format.open_memmap(path / "poses" / f"{name}.npy", mode=mode) for name in _SIDECAR_FIELDS}
+        return cls(path, frames, thumbnails, meta, sidecar, config)
+
+    def __len__(self) -> int:
+        return int(self._frames.shape[0])
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        return self._frames[index]
+
+    @property
+    def frames(self) -> np.memmap:
+        return self._frames
+
+    @property
+    def fps(self) -> int:
+        return int(self._meta["fps"])
+
+    @property
+    def thumbnail_levels(self) -> int:
+        return len(self._thumbnails)
+
+    @property
+    def metadata(self) -> dict[str, Any]:
+        return dict(self._meta)
+
+    @property
+    def written(self) -> np.ndarray:
+        return self._sidecar["written"]
+
+    def thumbnails(self, level: int) -> np.memmap:
+        # Level 0 is the full-resolution stack.
+        return self._frames if level == 0 else self._thumbnails[level - 1]
+
+    def view_matrix(self, index: int) -> np.ndarray:
+        return self._sidecar["view"][index]
+
+    def proj_matrix(self, index: int) -> np.ndarray:
+        return self._sidecar["proj"][index]
+
+    def pose(self, index: int) -> HeadPose | None:
+        s = self._sidecar
+        if np.isnan(s["positions_m"][index, 0]):
+            return None
+        return HeadPose(
+            int(s["timestamps_ms"][index]),
+            tuple(map(float, s["positions_m"][index])),
+            tuple(map(float, s["yaw_pitch_roll_deg"][index])),
+            float(s["confidence"][index]),
+            bool(s["pose_valid"][index]),
+        )
+
+    def write(
+        self,
+        index: int,
+        frame: np.ndarray,
+        pose: HeadPose | None = None,
+        view: np.ndarray | None = None,
+        proj: np.ndarray | None = None,
+    ) -> None:
+        if not self._writable:
+            raise ValueError("frame store is open read-only")
+        self._frames[index] = frame
+        level = frame
+        for thumbs in self._thumbnails:
+            level = downsample(level)
+            thumbs[index] = level
+        s = self._sidecar
+        s["written"][index] = True
+        if pose is not None:
+            s["timestamps_ms"][index] = pose.timestamp_ms
+            s["positions_m"][index] = pose.position_m
+            s["yaw_pitch_roll_deg"][index] = pose.yaw_pitch_roll_deg
+            s["confidence"][index] = pose.confidence
+            s["pose_valid"][index] = pose.valid
+        if view is not None:
+            s["view"][index] = np.asarray(view, dtype=np.float32).reshape(4, 4)
+        if proj is not None:
+            s["proj"][index] = np.asarray(proj, dtype=np.float32).reshape(4, 4)
+        self._pending += 1
+        if self._pending >= self._cfg.flush_every or time.monotonic() - self._flushed_at >= self._cfg.flush_interval_s:
+            self.flush()
+
+    def iter_frames(self, level: int = 0, start: int = 0, stop: int | None = None, step: int = 1) -> Iterator[np.ndarray]:
+        # Unwritten slots (an interrupted render) are skipped rather than encoded as black.
+        stack = self.thumbnails(level)
+        written = self._sidecar["written"]
+        for i in range(start, len(self) if stop is None else stop, step):
+            if written[i]:
+                yield np.asarray(stack[i])
+
+    def flush(self) -> None:
+        if not self._writable:
+            return
+        self._pending = 0
+        self._flushed_at = time.monotonic()
+        # Frame pages and poses go out before the flags that claim them.
+        self._frames.flush()
+        for thumbs in self._thumbnails:
+            thumbs.flush()
+        for array in self._sidecar.values():
+            array.flush()
+        self._meta["written"] = int(np.count_nonzero(self._sidecar["written"]))
+        _write_atomic(self.path / "meta.json", json.dumps(self._meta, indent=2).encode("utf-8"))
+
+    def close(self) -> None:
+        self.flush()
+        self._writable = False
+
+    def __enter__(self) -> FrameStore:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def encode_store(
+    store: FrameStore,
+    out_path: Path,
+    fmt: str,
+    fps: int | None = None,
+    config: EncoderConfig | None = None,
+    level: int = 0,
+    start: int = 0,
+    stop: int | None = None,
+    step: int = 1,
+) -> tuple[Path, EncodeStats]:
+    # Encode straight from the memmap; nothing is re-rendered.
+    return encode_frames(store.iter_frames(level, start, stop, step), out_path, fps or store.fps, fmt, config)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Inspect or encode a raw frame store")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    e = sub.add_parser("encode", help="Encode MP4/WebM/GIF from the store without re-rendering")
+    e.add_argument("store", type=Path)
+    e.add_argument("--out", type=Path, required=True)
+    e.add_argument("--format", choices=ENCODER_FORMATS, default="mp4")
+    e.add_argument("--fps", type=int, default=None)
+    e.add_argument("--level", type=int, default=0, help="Thumbnail level; 0 = full resolution")
+    e.add_argument("--start", type=int, default=0)
+    e.add_argument("--stop", type=int, default=None)
+    e.add_argument("--step", type=int, default=1)
+
+    x = sub.add_parser("export", help="Save one frame as PNG")
+    x.add_argument("store", type=Path)
+    x.add_argument("index", type=int)
+    x.add_argument("--out", type=Path, required=True)
+    x.add_argument("--level", type=int, default=0)
+
+    i = sub.add_parser("info", help="Print store metadata")
+    i.add_argument("store", type=Path)
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    try:
+        store = FrameStore.open(args.store)
+    except (OSError, ValueError, KeyError) as exc:
+        raise SystemExit(str(exc)) from exc
+    if args.command == "encode":
+        if not 0 <= args.level <= store.thumbnail_levels:
+            raise SystemExit(f"--level must be in 0..{store.thumbnail_levels}")
+        try:
+            saved, stats = encode_store(store, args.out, args.format, args.fps, level=args.level, start=args.start, stop=args.stop, step=args.step)
+        except ValueError as exc:
+            raise SystemExit(str(exc)) from exc
+        print(f"Saved: {saved} ({stats.frames} frames, {stats.seconds:.2f}s encode)")
+    elif args.command == "export":
+        if not 0 <= args.level <= store.thumbnail_levels:
+            raise SystemExit(f"--level must be in 0..{store.thumbnail_levels}")
+        if not 0 <= args.index < len(store):
+            raise SystemExit(f"index must be in 0..{len(store) - 1}")
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        imageio.imwrite(args.out, np.asarray(store.thumbnails(args.level)[args.index]))
+        print(f"Saved: {args.out}")
+    else:
+        meta = store.metadata
+        print(
+            f"{len(store)} frames {meta['width']}x{meta['height']} @ {store.fps} fps, "
+            f"{int(np.count_nonzero(store.written))} written, {store.thumbnail_levels} thumbnail levels"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,12 +2,19 @@ from __future__ import annotations
 
 import ctypes
 import re
+import threading
 
 import numpy as np
 from OpenGL import GL
+from PyQt6 import sip
 from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QOffscreenSurface, QOpenGLContext
 from PyQt6.QtOpenGLWidgets import QOpenGLWidget
 
+from app.clock import Clock
+from app.render.hud import HUD_VERTEX_FLOATS, HudConfig, HudGraph
+from app.render.render_thread import RenderedFrame, RenderThread
+from app.render.reprojection import reprojection_matrix
 from app.types import RenderState
 
 
@@ -64,61 +71,297 @@ void main() {
 }
 """
 
+HUD_VERT_SHADER_330 = """
+#version 330 core
+layout(location = 0) in vec2 aPos;
+layout(location = 1) in vec3 aColor;
+out vec3 vColor;
+void main() {
+    vColor = aColor;
+    gl_Position = vec4(aPos, 0.0, 1.0);
+}
+"""
 
-class AnamorphicWidget(QOpenGLWidget):
-    def __init__(self, target_fps: int, parent=None) -> None:
-        super().__init__(parent)
-        self._program = 0
-        self._vao = 0
-        self._vbo = 0
-        self._vertex_count = 0
-        self._state = RenderState(
-            view_matrix=np.eye(4, dtype=np.float32).reshape(-1).tolist(),
-            proj_matrix=np.eye(4, dtype=np.float32).reshape(-1).tolist(),
-            box_depth_m=1.2,
-            box_size_m=0.8,
-        )
+HUD_FRAG_SHADER_330 = """
+#version 330 core
+in vec3 vColor;
+out vec4 FragColor;
+void main() {
+    FragColor = vec4(vColor, 1.0);
+}
+"""
 
-        self._timer = QTimer(self)
-        self._timer.timeout.connect(self.update)
-        self._timer.start(max(1, int(1000 / max(1, target_fps))))
-        self._gl_ready = False
+HUD_VERT_SHADER_150 = """
+#version 150
+in vec2 aPos;
+in vec3 aColor;
+out vec3 vColor;
+void main() {
+    vColor = aColor;
+    gl_Position = vec4(aPos, 0.0, 1.0);
+}
+"""
 
-    def set_render_state(self, state: RenderState) -> None:
-        geometry_changed = (
-            state.box_depth_m != self._state.box_depth_m
-            or state.box_size_m != self._state.box_size_m
-        )
-        self._state = state
-        if self._gl_ready and geometry_changed:
-            self._rebuild_geometry(state.box_size_m, state.box_depth_m)
+HUD_FRAG_SHADER_150 = """
+#version 150
+in vec3 vColor;
+out vec4 FragColor;
+void main() {
+    FragColor = vec4(vColor, 1.0);
+}
+"""
 
-    def initializeGL(self) -> None:
-        vert_src, frag_src = self._select_shaders()
-        self._program = self._create_program(vert_src, frag_src)
-        self._rebuild_geometry(self._state.box_size_m, self._state.box_depth_m)
+HUD_VERT_SHADER_120 = """
+#version 120
+attribute vec2 aPos;
+attribute vec3 aColor;
+varying vec3 vColor;
+void main() {
+    vColor = aColor;
+    gl_Position = vec4(aPos, 0.0, 1.0);
+}
+"""
+
+HUD_FRAG_SHADER_120 = """
+#version 120
+varying vec3 vColor;
+void main() {
+    gl_FragColor = vec4(vColor, 1.0);
+}
+"""
+
+
+BLIT_VERT_SHADER_330 = """
+#version 330 core
+layout(location = 0) in vec2 aPos;
+out vec2 vUv;
+void main() {
+    vUv = aPos * 0.5 + 0.5;
+    gl_Position = vec4(aPos, 0.0, 1.0);
+}
+"""
+
+BLIT_FRAG_SHADER_330 = """
+#version 330 core
+in vec2 vUv;
+uniform sampler2D u_frame;
+out vec4 FragColor;
+void main() {
+    FragColor = texture(u_frame, vUv);
+}
+"""
+
+BLIT_VERT_SHADER_150 = """
+#version 150
+in vec2 aPos;
+out vec2 vUv;
+void main() {
+    vUv = aPos * 0.5 + 0.5;
+    gl_Position = vec4(aPos, 0.0, 1.0);
+}
+"""
+
+BLIT_FRAG_SHADER_150 = """
+#version 150
+in vec2 vUv;
+uniform sampler2D u_frame;
+out vec4 FragColor;
+void main() {
+    FragColor = texture(u_frame, vUv);
+}
+"""
+
+BLIT_VERT_SHADER_120 = """
+#version 120
+attribute vec2 aPos;
+varying vec2 vUv;
+void main() {
+    vUv = aPos * 0.5 + 0.5;
+    gl_Position = vec4(aPos, 0.0, 1.0);
+}
+"""
+
+BLIT_FRAG_SHADER_120 = """
+#version 120
+varying vec2 vUv;
+uniform sampler2D u_frame;
+void main() {
+    gl_FragColor = texture2D(u_frame, vUv);
+}
+"""
+
+# Reprojection: one point per source pixel. The vertex stage reads that pixel's depth, moves
+# it from the pose the frame was rendered with to the newest pose (u_reproject maps source
+# NDC to destination clip space) and the depth test keeps the nearest surface.
+REPROJECT_VERT_SHADER_330 = """
+#version 330 core
+layout(location = 0) in vec2 aUv;
+uniform sampler2D u_frame;
+uniform sampler2D u_depth;
+uniform mat4 u_reproject;
+out vec4 vColor;
+void main() {
+    float d = textureLod(u_depth, aUv, 0.0).r;
+    vColor = textureLod(u_frame, aUv, 0.0);
+    // Cleared pixels stay behind; the destination is cleared to the same colour.
+    gl_Position = d >= 1.0 ? vec4(2.0, 2.0, 2.0, 1.0) : u_reproject * vec4(aUv * 2.0 - 1.0, d * 2.0 - 1.0, 1.0);
+}
+"""
+
+REPROJECT_FRAG_SHADER_330 = """
+#version 330 core
+in vec4 vColor;
+out vec4 FragColor;
+void main() {
+    FragColor = vColor;
+}
+"""
+
+REPROJECT_VERT_SHADER_150 = """
+#version 150
+in vec2 aUv;
+uniform sampler2D u_frame;
+uniform sampler2D u_depth;
+uniform mat4 u_reproject;
+out vec4 vColor;
+void main() {
+    float d = textureLod(u_depth, aUv, 0.0).r;
+    vColor = textureLod(u_frame, aUv, 0.0);
+    gl_Position = d >= 1.0 ? vec4(2.0, 2.0, 2.0, 1.0) : u_reproject * vec4(aUv * 2.0 - 1.0, d * 2.0 - 1.0, 1.0);
+}
+"""
+
+REPROJECT_FRAG_SHADER_150 = """
+#version 150
+in vec4 vColor;
+out vec4 FragColor;
+void main() {
+    FragColor = vColor;
+}
+"""
+
+REPROJECT_VERT_SHADER_120 = """
+#version 120
+attribute vec2 aUv;
+uniform sampler2D u_frame;
+uniform sampler2D u_depth;
+uniform mat4 u_reproject;
+varying vec4 vColor;
+void main() {
+    float d = texture2DLod(u_depth, aUv, 0.0).r;
+    vColor = texture2DLod(u_frame, aUv, 0.0);
+    gl_Position = d >= 1.0 ? vec4(2.0, 2.0, 2.0, 1.0) : u_reproject * vec4(aUv * 2.0 - 1.0, d * 2.0 - 1.0, 1.0);
+}
+"""
+
+REPROJECT_FRAG_SHADER_120 = """
+#version 120
+varying vec4 vColor;
+void main() {
+    gl_FragColor = vColor;
+}
+"""
+
+_BLIT_QUAD = np.array([-1.0, -1.0, 1.0, -1.0, -1.0, 1.0, 1.0, 1.0], dtype=np.float32)
+
+
+class _BoxGeometry:
+    __slots__ = ("vbo", "vertex_count", "size")
+
+    def __init__(self, vbo: int) -> None:
+        self.vbo = vbo
+        self.vertex_count = 0
+        self.size: tuple[float, float] | None = None
+
+
+class _SharedGLResources:
+    # Programs and VBOs are shareable between contexts of one share group; VAOs are not.
+    __slots__ = ("program", "hud_program", "blit_program", "reproject_program", "box", "blit_vbo")
+
+    def __init__(
+        self, program: int, hud_program: int, blit_program: int, reproject_program: int, box: _BoxGeometry, blit_vbo: int
+    ) -> None:
+        self.program = program
+        self.hud_program = hud_program
+        self.blit_program = blit_program
+        self.reproject_program = reproject_program
+        self.box = box
+        self.blit_vbo = blit_vbo
+
+
+_SHARED_GL: dict[int, _SharedGLResources] = {}
+_SHARED_GL_LOCK = threading.Lock()
+
+
+def _shared_resources(context: QOpenGLContext) -> _SharedGLResources:
+    # Called with `context` current. The lock covers a render thread initializing while the
+    # GUI thread sets up another window of the same share group.
+    key = sip.unwrapinstance(context.shareGroup())
+    with _SHARED_GL_LOCK:
+        shared = _SHARED_GL.get(key)
+        if shared is None:
+            shaders = _select_shaders()
+            blit_vbo = GL.glGenBuffers(1)
+            GL.glBindBuffer(GL.GL_ARRAY_BUFFER, blit_vbo)
+            GL.glBufferData(GL.GL_ARRAY_BUFFER, _BLIT_QUAD.nbytes, _BLIT_QUAD, GL.GL_STATIC_DRAW)
+            shared = _SharedGLResources(
+                _create_program(shaders[0], shaders[1], ("aPos",)),
+                _create_program(shaders[2], shaders[3], ("aPos", "aColor")),
+                _create_program(shaders[4], shaders[5], ("aPos",)),
+                _create_program(shaders[6], shaders[7], ("aUv",)),
+                _BoxGeometry(GL.glGenBuffers(1)),
+                blit_vbo,
+            )
+            _SHARED_GL[key] = shared
+        return shared
+
+
+class BoxRenderer:
+    # The inward-box pass for one context. A renderer used from a render thread gets its own
+    # box VBO so it never rewrites a buffer that another thread's context is drawing from.
+    def __init__(self, own_geometry: bool = False) -> None:
+        self._own_geometry = own_geometry
+        self._shared: _SharedGLResources | None = None
+        self._box: _BoxGeometry | None = None
+        self._vao = 0
+
+    def initialize(self, context: QOpenGLContext) -> None:
+        shared = _shared_resources(context)
+        self._shared = shared
+        self._box = _BoxGeometry(GL.glGenBuffers(1)) if self._own_geometry else shared.box
+
+        self._vao = GL.glGenVertexArrays(1)
+        GL.glBindVertexArray(self._vao)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._box.vbo)
+        GL.glEnableVertexAttribArray(0)
+        GL.glVertexAttribPointer(0, 3, GL.GL_FLOAT, GL.GL_FALSE, 0, ctypes.c_void_p(0))
         GL.glEnable(GL.GL_DEPTH_TEST)
-        self._gl_ready = True
 
-    def paintGL(self) -> None:
+    def paint(self, state: RenderState, width: int, height: int) -> None:
+        shared = self._shared
+        self._rebuild_geometry(state.box_size_m, state.box_depth_m)
+
+        GL.glViewport(0, 0, width, max(1, height))
+        GL.glEnable(GL.GL_DEPTH_TEST)
         GL.glClearColor(0.03, 0.03, 0.05, 1.0)
         GL.glClear(GL.GL_COLOR_BUFFER_BIT | GL.GL_DEPTH_BUFFER_BIT)
 
-        GL.glUseProgram(self._program)
-        view_loc = GL.glGetUniformLocation(self._program, "u_view")
-        proj_loc = GL.glGetUniformLocation(self._program, "u_proj")
-        view = np.array(self._state.view_matrix, dtype=np.float32).reshape(4, 4)
-        proj = np.array(self._state.proj_matrix, dtype=np.float32).reshape(4, 4)
+        GL.glUseProgram(shared.program)
+        view_loc = GL.glGetUniformLocation(shared.program, "u_view")
+        proj_loc = GL.glGetUniformLocation(shared.program, "u_proj")
+        view = np.array(state.view_matrix, dtype=np.float32).reshape(4, 4)
+        proj = np.array(state.proj_matrix, dtype=np.float32).reshape(4, 4)
         GL.glUniformMatrix4fv(view_loc, 1, GL.GL_TRUE, view)
         GL.glUniformMatrix4fv(proj_loc, 1, GL.GL_TRUE, proj)
 
         GL.glBindVertexArray(self._vao)
-        GL.glDrawArrays(GL.GL_LINES, 0, self._vertex_count)
-
-    def resizeGL(self, w: int, h: int) -> None:
-        GL.glViewport(0, 0, w, max(1, h))
+        GL.glDrawArrays(GL.GL_LINES, 0, self._box.vertex_count)
 
     def _rebuild_geometry(self, size_m: float, depth_m: float) -> None:
+        box = self._box
+        if box.size == (size_m, depth_m):
+            return
+
         s = size_m / 2.0
         z0 = 0.0
         z1 = -depth_m
@@ -133,63 +376,301 @@ class AnamorphicWidget(QOpenGLWidget):
         ]
 
         vertices = np.array(lines, dtype=np.float32).reshape(-1)
-        self._vertex_count = len(lines)
-
-        if self._vao == 0:
-            self._vao = GL.glGenVertexArrays(1)
-        if self._vbo == 0:
-            self._vbo = GL.glGenBuffers(1)
+        box.vertex_count = len(lines)
+        box.size = (size_m, depth_m)
 
-        GL.glBindVertexArray(self._vao)
-        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._vbo)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, box.vbo)
         GL.glBufferData(GL.GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL.GL_STATIC_DRAW)
+
+
+class AnamorphicWidget(QOpenGLWidget):
+    # threaded=True: a RenderThread draws the box into FBOs on its own schedule and paintGL
+    # only composites the newest finished texture (plus the HUD), so slider drags, resizes
+    # and status updates on the GUI thread no longer hold up rendering.
+    # reprojection=True (threaded only): the thread renders at target_fps / render_divisor and
+    # paintGL, driven at target_fps, warps the newest finished frame to the newest pose.
+    def __init__(
+        self,
+        target_fps: int,
+        parent=None,
+        hud_config: HudConfig | None = None,
+        threaded: bool = False,
+        clock: Clock | None = None,
+        reprojection: bool = False,
+        render_divisor: int = 2,
+    ) -> None:
+        super().__init__(parent)
+        self._target_fps = target_fps
+        self._threaded = threaded
+        self._reprojection = threaded and reprojection
+        self._render_divisor = max(1, render_divisor) if self._reprojection else 1
+        self._clock = clock
+        self._renderer = BoxRenderer()
+        self._render_thread: RenderThread | None = None
+        self._surface: QOffscreenSurface | None = None
+        self._blit_vao = 0
+        self._blit_program = 0
+        self._reproject_program = 0
+        self._reproject_vao = 0
+        self._reproject_vbo = 0
+        self._reproject_grid: tuple[int, int] = (0, 0)
+        self.reprojected_frames = 0
+        self.hud = HudGraph(hud_config)
+        self._hud_visible = False
+        self._hud_program = 0
+        self._hud_vaos: tuple[int, int] = (0, 0)
+        self._hud_vbos: tuple[int, int] = (0, 0)
+        self._state = RenderState(
+            view_matrix=np.eye(4, dtype=np.float32).reshape(-1).tolist(),
+            proj_matrix=np.eye(4, dtype=np.float32).reshape(-1).tolist(),
+            box_depth_m=1.2,
+            box_size_m=0.8,
+        )
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.update)
+        if not threaded or self._reprojection:
+            # Plain threaded mode repaints on RenderThread.frame_ready instead.
+            self._timer.start(max(1, int(1000 / max(1, target_fps))))
+        self._gl_ready = False
+
+    @property
+    def threaded(self) -> bool:
+        return self._threaded
+
+    @property
+    def reprojection(self) -> bool:
+        return self._reprojection
+
+    @property
+    def render_thread(self) -> RenderThread | None:
+        return self._render_thread
+
+    def set_target_fps(self, target_fps: int) -> None:
+        self._target_fps = target_fps
+        self._timer.setInterval(max(1, int(1000 / max(1, target_fps))))
+        if self._render_thread is not None:
+            self._render_thread.set_target_fps(target_fps / self._render_divisor)
+
+    @property
+    def hud_visible(self) -> bool:
+        return self._hud_visible
+
+    def set_hud_visible(self, visible: bool) -> None:
+        self._hud_visible = visible
+
+    def set_render_state(self, state: RenderState) -> None:
+        # Geometry uploads happen in paintGL (or on the render thread), where a context is current.
+        self._state = state
+        if self._render_thread is not None:
+            self._render_thread.set_render_state(state)
+
+    def stop_rendering(self) -> None:
+        if self._render_thread is not None:
+            self._render_thread.stop()
+            self._render_thread = None
+
+    def initializeGL(self) -> None:
+        context = self.context()
+        shared = _shared_resources(context)
+        if self._threaded:
+            self._init_blit(shared)
+            if self._reprojection:
+                self._reproject_program = shared.reproject_program
+                self._reproject_vao = GL.glGenVertexArrays(1)
+                self._reproject_vbo = GL.glGenBuffers(1)
+            self._start_render_thread(context)
+        else:
+            self._renderer.initialize(context)
+        self._hud_program = shared.hud_program
+        self._blit_program = shared.blit_program
+        self._init_hud_buffers()
+        GL.glEnable(GL.GL_DEPTH_TEST)
+        self._gl_ready = True
+
+    def paintGL(self) -> None:
+        if self._render_thread is not None:
+            self._composite()
+        else:
+            ratio = self.devicePixelRatioF()
+            self._renderer.paint(self._state, int(self.width() * ratio), int(self.height() * ratio))
+
+        if self._hud_visible:
+            self._draw_hud()
+
+    def resizeGL(self, w: int, h: int) -> None:
+        GL.glViewport(0, 0, w, max(1, h))
+        if self._render_thread is not None:
+            ratio = self.devicePixelRatioF()
+            self._render_thread.resize(int(w * ratio), int(h * ratio))
+
+    def _start_render_thread(self, context: QOpenGLContext) -> None:
+        self._surface = QOffscreenSurface(self.screen())
+        self._surface.setFormat(context.format())
+        self._surface.create()
+        thread = RenderThread(
+            BoxRenderer(own_geometry=True), context, self._surface, self._target_fps / self._render_divisor, self._clock, self
+        )
+        if not self._reprojection:
+            thread.frame_ready.connect(self.update)
+        thread.set_render_state(self._state)
+        ratio = self.devicePixelRatioF()
+        thread.resize(int(self.width() * ratio), int(self.height() * ratio))
+        # The widget context can be torn down (e.g. reparenting) before closeEvent; stop first.
+        context.aboutToBeDestroyed.connect(self.stop_rendering)
+        self._render_thread = thread
+        thread.start()
+
+    def _init_blit(self, shared: _SharedGLResources) -> None:
+        self._blit_vao = GL.glGenVertexArrays(1)
+        GL.glBindVertexArray(self._blit_vao)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, shared.blit_vbo)
         GL.glEnableVertexAttribArray(0)
-        GL.glVertexAttribPointer(0, 3, GL.GL_FLOAT, GL.GL_FALSE, 0, ctypes.c_void_p(0))
+        GL.glVertexAttribPointer(0, 2, GL.GL_FLOAT, GL.GL_FALSE, 0, ctypes.c_void_p(0))
+        GL.glUseProgram(shared.blit_program)
+        GL.glUniform1i(GL.glGetUniformLocation(shared.blit_program, "u_frame"), 0)
 
-    def _create_program(self, vert_src: str, frag_src: str) -> int:
-        vs = GL.glCreateShader(GL.GL_VERTEX_SHADER)
-        GL.glShaderSource(vs, vert_src)
-        GL.glCompileShader(vs)
-        self._check_shader(vs)
-
-        fs = GL.glCreateShader(GL.GL_FRAGMENT_SHADER)
-        GL.glShaderSource(fs, frag_src)
-        GL.glCompileShader(fs)
-        self._check_shader(fs)
-
-        program = GL.glCreateProgram()
-        GL.glAttachShader(program, vs)
-        GL.glAttachShader(program, fs)
-        GL.glBindAttribLocation(program, 0, "aPos")
-        GL.glLinkProgram(program)
-
-        ok = GL.glGetProgramiv(program, GL.GL_LINK_STATUS)
-        if not ok:
-            raise RuntimeError(GL.glGetProgramInfoLog(program).decode("utf-8", errors="ignore"))
-
-        GL.glDeleteShader(vs)
-        GL.glDeleteShader(fs)
-        return program
-
-    def _check_shader(self, shader: int) -> None:
-        ok = GL.glGetShaderiv(shader, GL.GL_COMPILE_STATUS)
-        if not ok:
-            raise RuntimeError(GL.glGetShaderInfoLog(shader).decode("utf-8", errors="ignore"))
-
-    def _select_shaders(self) -> tuple[str, str]:
-        raw = GL.glGetString(GL.GL_SHADING_LANGUAGE_VERSION)
-        if not raw:
-            return VERT_SHADER_120, FRAG_SHADER_120
-
-        text = raw.decode("utf-8", errors="ignore")
-        match = re.search(r"(\\d+)\\.(\\d+)", text)
-        if not match:
-            return VERT_SHADER_120, FRAG_SHADER_120
-
-        major = int(match.group(1))
-        minor = int(match.group(2))
-        if major > 3 or (major == 3 and minor >= 30):
-            return VERT_SHADER_330, FRAG_SHADER_330
-        if major > 1 or (major == 1 and minor >= 50):
-            return VERT_SHADER_150, FRAG_SHADER_150
-        return VERT_SHADER_120, FRAG_SHADER_120
+    def _composite(self) -> None:
+        frame = self._render_thread.acquire()
+        GL.glClearColor(0.03, 0.03, 0.05, 1.0)
+        GL.glClear(GL.GL_COLOR_BUFFER_BIT | GL.GL_DEPTH_BUFFER_BIT)
+        if frame is None:
+            return
+        ratio = self.devicePixelRatioF()
+        GL.glViewport(0, 0, int(self.width() * ratio), max(1, int(self.height() * ratio)))
+        if self._reprojection and frame.state is not None and frame.state is not self._state:
+            self._reproject(frame)
+            return
+        GL.glDisable(GL.GL_DEPTH_TEST)
+        GL.glUseProgram(self._blit_program)
+        GL.glActiveTexture(GL.GL_TEXTURE0)
+        GL.glBindTexture(GL.GL_TEXTURE_2D, frame.texture)
+        GL.glBindVertexArray(self._blit_vao)
+        GL.glDrawArrays(GL.GL_TRIANGLE_STRIP, 0, 4)
+        GL.glBindTexture(GL.GL_TEXTURE_2D, 0)
+        GL.glEnable(GL.GL_DEPTH_TEST)
+
+    def _reproject(self, frame: RenderedFrame) -> None:
+        if self._reproject_grid != (frame.width, frame.height):
+            # Pixel-centre UVs, rebuilt only when the render size changes.
+            xs = (np.arange(frame.width, dtype=np.float32) + 0.5) / frame.width
+            ys = (np.arange(frame.height, dtype=np.float32) + 0.5) / frame.height
+            grid = np.stack(np.meshgrid(xs, ys), axis=-1).reshape(-1)
+            GL.glBindVertexArray(self._reproject_vao)
+            GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._reproject_vbo)
+            GL.glBufferData(GL.GL_ARRAY_BUFFER, grid.nbytes, grid, GL.GL_STATIC_DRAW)
+            GL.glEnableVertexAttribArray(0)
+            GL.glVertexAttribPointer(0, 2, GL.GL_FLOAT, GL.GL_FALSE, 0, ctypes.c_void_p(0))
+            self._reproject_grid = (frame.width, frame.height)
+
+        src, dst = frame.state, self._state
+        matrix = reprojection_matrix(src.view_matrix, src.proj_matrix, dst.view_matrix, dst.proj_matrix).astype(np.float32)
+        program = self._reproject_program
+        GL.glEnable(GL.GL_DEPTH_TEST)
+        GL.glUseProgram(program)
+        GL.glUniformMatrix4fv(GL.glGetUniformLocation(program, "u_reproject"), 1, GL.GL_TRUE, matrix)
+        GL.glUniform1i(GL.glGetUniformLocation(program, "u_frame"), 0)
+        GL.glUniform1i(GL.glGetUniformLocation(program, "u_depth"), 1)
+        GL.glActiveTexture(GL.GL_TEXTURE0)
+        GL.glBindTexture(GL.GL_TEXTURE_2D, frame.texture)
+        GL.glActiveTexture(GL.GL_TEXTURE1)
+        GL.glBindTexture(GL.GL_TEXTURE_2D, frame.depth_texture)
+        GL.glBindVertexArray(self._reproject_vao)
+        GL.glDrawArrays(GL.GL_POINTS, 0, frame.width * frame.height)
+        GL.glBindTexture(GL.GL_TEXTURE_2D, 0)
+        GL.glActiveTexture(GL.GL_TEXTURE0)
+        GL.glBindTexture(GL.GL_TEXTURE_2D, 0)
+        self.reprojected_frames += 1
+
+    def _init_hud_buffers(self) -> None:
+        # Sized once for the preallocated HUD arrays; paintGL only does glBufferSubData.
+        vaos = GL.glGenVertexArrays(2)
+        vbos = GL.glGenBuffers(2)
+        stride = HUD_VERTEX_FLOATS * 4
+        for vao, vbo, data in zip(vaos, vbos, (self.hud.lines, self.hud.bars)):
+            GL.glBindVertexArray(vao)
+            GL.glBindBuffer(GL.GL_ARRAY_BUFFER, vbo)
+            GL.glBufferData(GL.GL_ARRAY_BUFFER, data.nbytes, None, GL.GL_DYNAMIC_DRAW)
+            GL.glEnableVertexAttribArray(0)
+            GL.glVertexAttribPointer(0, 2, GL.GL_FLOAT, GL.GL_FALSE, stride, ctypes.c_void_p(0))
+            GL.glEnableVertexAttribArray(1)
+            GL.glVertexAttribPointer(1, 3, GL.GL_FLOAT, GL.GL_FALSE, stride, ctypes.c_void_p(8))
+        self._hud_vaos = (int(vaos[0]), int(vaos[1]))
+        self._hud_vbos = (int(vbos[0]), int(vbos[1]))
+
+    def _draw_hud(self) -> None:
+        hud = self.hud
+        hud.build()
+        GL.glDisable(GL.GL_DEPTH_TEST)
+        GL.glUseProgram(self._hud_program)
+        for vao, vbo, data, mode, count in (
+            (self._hud_vaos[0], self._hud_vbos[0], hud.lines, GL.GL_LINES, hud.line_vertex_count),
+            (self._hud_vaos[1], self._hud_vbos[1], hud.bars, GL.GL_TRIANGLES, hud.bar_vertex_count),
+        ):
+            GL.glBindBuffer(GL.GL_ARRAY_BUFFER, vbo)
+            GL.glBufferSubData(GL.GL_ARRAY_BUFFER, 0, data.nbytes, data)
+            GL.glBindVertexArray(vao)
+            GL.glDrawArrays(mode, 0, count)
+        GL.glEnable(GL.GL_DEPTH_TEST)
+
+
+def _create_program(vert_src: str, frag_src: str, attributes: tuple[str, ...]) -> int:
+    vs = GL.glCreateShader(GL.GL_VERTEX_SHADER)
+    GL.glShaderSource(vs, vert_src)
+    GL.glCompileShader(vs)
+    _check_shader(vs)
+
+    fs = GL.glCreateShader(GL.GL_FRAGMENT_SHADER)
+    GL.glShaderSource(fs, frag_src)
+    GL.glCompileShader(fs)
+    _check_shader(fs)
+
+    program = GL.glCreateProgram()
+    GL.glAttachShader(program, vs)
+    GL.glAttachShader(program, fs)
+    for location, name in enumerate(attributes):
+        GL.glBindAttribLocation(program, location, name)
+    GL.glLinkProgram(program)
+
+    ok = GL.glGetProgramiv(program, GL.GL_LINK_STATUS)
+    if not ok:
+        raise RuntimeError(GL.glGetProgramInfoLog(program).decode("utf-8", errors="ignore"))
+
+    GL.glDeleteShader(vs)
+    GL.glDeleteShader(fs)
+    return program
+
+
+def _check_shader(shader: int) -> None:
+    ok = GL.glGetShaderiv(shader, GL.GL_COMPILE_STATUS)
+    if not ok:
+        raise RuntimeError(GL.glGetShaderInfoLog(shader).decode("utf-8", errors="ignore"))
+
+
+def _select_shaders() -> tuple[str, ...]:
+    legacy = (
+        VERT_SHADER_120, FRAG_SHADER_120, HUD_VERT_SHADER_120, HUD_FRAG_SHADER_120, BLIT_VERT_SHADER_120, BLIT_FRAG_SHADER_120,
+        REPROJECT_VERT_SHADER_120, REPROJECT_FRAG_SHADER_120,
+    )
+    raw = GL.glGetString(GL.GL_SHADING_LANGUAGE_VERSION)
+    if not raw:
+        return legacy
+
+    text = raw.decode("utf-8", errors="ignore")
+    match = re.search(r"(\\d+)\\.(\\d+)", text)
+    if not match:
+        return legacy
+
+    major = int(match.group(1))
+    minor = int(match.group(2))
+    if major > 3 or (major == 3 and minor >= 30):
+        return (
+            VERT_SHADER_330, FRAG_SHADER_330, HUD_VERT_SHADER_330, HUD_FRAG_SHADER_330, BLIT_VERT_SHADER_330, BLIT_FRAG_SHADER_330,
+            REPROJECT_VERT_SHADER_330, REPROJECT_FRAG_SHADER_330,
+        )
+    if major > 1 or (major == 1 and minor >= 50):
+        return (
+            VERT_SHADER_150, FRAG_SHADER_150, HUD_VERT_SHADER_150, HUD_FRAG_SHADER_150, BLIT_VERT_SHADER_150, BLIT_FRAG_SHADER_150,
+            REPROJECT_VERT_SHADER_150, REPROJECT_FRAG_SHADER_150,
+        )
+    return legacy
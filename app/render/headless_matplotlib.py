@@ -1,16 +1,22 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from pathlib import Path
+from typing import Iterable
 
-import imageio.v2 as imageio
 import matplotlib
 import numpy as np
 
+from app.render.encoders import EncoderConfig, encode_frames
+
 matplotlib.use("Agg")
 from matplotlib import pyplot as plt
 
 
+# Bump whenever render_frame output changes for the same inputs; it is part of frame cache keys.
+RENDERER_VERSION = 1
+
+
 @dataclass(slots=True)
 class HeadlessRendererConfig:
     width: int = 960
@@ -25,6 +31,13 @@ class HeadlessMatplotlibRenderer:
             raise ValueError("width/height must be > 0")
         self._cfg = config
 
+    @property
+    def config(self) -> HeadlessRendererConfig:
+        return self._cfg
+
+    def cache_identity(self) -> tuple[dict, int]:
+        return asdict(self._cfg), RENDERER_VERSION
+
     def render_frame(
         self,
         view_matrix: np.ndarray,
@@ -92,24 +105,11 @@ class HeadlessMatplotlibRenderer:
 
     def render_sequence(
         self,
-        frames: list[np.ndarray],
+        frames: Iterable[np.ndarray],
         out_path: Path,
         fps: int,
         fmt: str,
+        encoder_config: EncoderConfig | None = None,
     ) -> Path:
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        fmt_norm = fmt.lower()
-        if fmt_norm not in ("mp4", "gif"):
-            raise ValueError("format must be mp4 or gif")
-
-        if fmt_norm == "mp4":
-            try:
-                imageio.mimsave(out_path, frames, fps=fps)
-                return out_path
-            except Exception:
-                fallback = out_path.with_suffix(".gif")
-                imageio.mimsave(fallback, frames, format="GIF", fps=fps)
-                return fallback
-
-        imageio.mimsave(out_path, frames, format="GIF", fps=fps)
-        return out_path
+        saved, _ = encode_frames(frames, out_path, fps, fmt, encoder_config)
+        return saved
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# x, y (NDC), r, g, b
+HUD_VERTEX_FLOATS = 5
+
+_FRAME_COLOR = (0.30, 0.95, 0.40)
+_LATENCY_COLOR = (0.95, 0.80, 0.25)
+_BUDGET_COLOR = (0.55, 0.55, 0.60)
+_MISS_COLOR = (0.95, 0.25, 0.25)
+_BAR_BG_COLOR = (0.18, 0.18, 0.22)
+_RATE_COLOR = (0.25, 0.65, 0.95)
+_CONF_COLOR = (0.85, 0.45, 0.95)
+
+
+@dataclass(slots=True)
+class HudConfig:
+    samples: int = 240
+    scale_ms: float = 50.0  # graph full height
+    budget_ms: float = 10.0  # horizontal deadline line
+    rate_full_scale_hz: float = 60.0
+    # Graph rect in NDC: left, bottom, width, height. Bars sit just below it.
+    rect: tuple[float, float, float, float] = (-0.97, 0.55, 0.6, 0.38)
+
+
+class HudGraph:
+    # Samples land in a preallocated ring; build() rewrites a preallocated vertex array in
+    # place (oldest sample on the left) so the GL side uploads one buffer and issues one
+    # GL_LINES draw for both series, the budget line and the missed-deadline ticks.
+    def __init__(self, config: HudConfig | None = None) -> None:
+        cfg = config or HudConfig()
+        if cfg.samples < 2:
+            raise ValueError("samples must be >= 2")
+        self._cfg = cfg
+        n = cfg.samples
+        self._frame_ms = np.zeros(n, dtype=np.float32)
+        self._latency_ms = np.zeros(n, dtype=np.float32)
+        self._missed = np.zeros(n, dtype=np.float32)
+        self._head = 0
+        self.rate_hz = 0.0
+        self.confidence = 0.0
+
+        self._ring_idx = np.arange(n, dtype=np.intp)
+        self._order = np.empty(n, dtype=np.intp)
+        self._scratch = np.empty(n, dtype=np.float32)
+
+        seg = n - 1
+        self._frame_off = 0
+        self._latency_off = 2 * seg
+        self._budget_off = 4 * seg
+        self._miss_off = self._budget_off + 2
+        self.line_vertex_count = self._miss_off + 2 * n
+        self.lines = np.zeros((self.line_vertex_count, HUD_VERTEX_FLOATS), dtype=np.float32)
+        self.bar_vertex_count = 4 * 6
+        self.bars = np.zeros((self.bar_vertex_count, HUD_VERTEX_FLOATS), dtype=np.float32)
+        self._init_static()
+
+    @property
+    def config(self) -> HudConfig:
+        return self._cfg
+
+    def push(self, frame_ms: float, latency_ms: float, missed: bool) -> None:
+        i = self._head
+        self._frame_ms[i] = frame_ms
+        self._latency_ms[i] = latency_ms
+        self._missed[i] = 1.0 if missed else 0.0
+        self._head = (i + 1) % self._cfg.samples
+
+    def set_tracker(self, rate_hz: float, confidence: float) -> None:
+        self.rate_hz = rate_hz
+        self.confidence = confidence
+
+    def build(self) -> None:
+        cfg = self._cfg
+        left, bottom, width, height = cfg.rect
+        np.add(self._ring_idx, self._head, out=self._order)
+        np.remainder(self._order, cfg.samples, out=self._order)
+
+        for values, off in ((self._frame_ms, self._frame_off), (self._latency_ms, self._latency_off)):
+            y = self._scratch
+            np.take(values, self._order, out=y)
+            self._to_y(y)
+            seg = cfg.samples - 1
+            self.lines[off : off + 2 * seg : 2, 1] = y[:-1]
+            self.lines[off + 1 : off + 2 * seg : 2, 1] = y[1:]
+
+        np.take(self._missed, self._order, out=self._scratch)
+        # Missed slots get a full-height tick; the rest collapse to zero length.
+        np.multiply(self._scratch, height, out=self._scratch)
+        np.add(self._scratch, bottom, out=self._scratch)
+        self.lines[self._miss_off + 1 :: 2, 1] = self._scratch
+
+        bar_w = width
+        rate = min(1.0, max(0.0, self.rate_hz / cfg.rate_full_scale_hz)) if cfg.rate_full_scale_hz > 0.0 else 0.0
+        conf = min(1.0, max(0.0, self.confidence))
+        self._quad(6, left, bottom - 0.045, bar_w * rate, 0.025)
+        self._quad(18, left, bottom - 0.085, bar_w * conf, 0.025)
+
+    def _to_y(self, y: np.ndarray) -> None:
+        left, bottom, width, height = self._cfg.rect
+        np.multiply(y, height / self._cfg.scale_ms, out=y)
+        np.clip(y, 0.0, height, out=y)
+        np.add(y, bottom, out=y)
+
+    def _init_static(self) -> None:
+        cfg = self._cfg
+        n = cfg.samples
+        left, bottom, width, height = cfg.rect
+        x = left + width * np.arange(n, dtype=np.float32) / (n - 1)
+        seg = n - 1
+        for off, color in ((self._frame_off, _FRAME_COLOR), (self._latency_off, _LATENCY_COLOR)):
+            self.lines[off : off + 2 * seg : 2, 0] = x[:-1]
+            self.lines[off + 1 : off + 2 * seg : 2, 0] = x[1:]
+            self.lines[off : off + 2 * seg, 2:] = color
+            self.lines[off : off + 2 * seg, 1] = bottom
+
+        budget_y = bottom + min(height, height * cfg.budget_ms / cfg.scale_ms)
+        self.lines[self._budget_off] = (left, budget_y, *_BUDGET_COLOR)
+        self.lines[self._budget_off + 1] = (left + width, budget_y, *_BUDGET_COLOR)
+
+        self.lines[self._miss_off :: 2, 0] = x
+        self.lines[self._miss_off + 1 :: 2, 0] = x
+        self.lines[self._miss_off :, 1] = bottom
+        self.lines[self._miss_off :, 2:] = _MISS_COLOR
+
+        # Bars: background then fill, for tracker rate (top) and confidence (bottom).
+        self._quad(0, left, bottom - 0.045, width, 0.025, _BAR_BG_COLOR)
+        self._quad(6, left, bottom - 0.045, 0.0, 0.025, _RATE_COLOR)
+        self._quad(12, left, bottom - 0.085, width, 0.025, _BAR_BG_COLOR)
+        self._quad(18, left, bottom - 0.085, 0.0, 0.025, _CONF_COLOR)
+
+    def _quad(self, off: int, x: float, y: float, w: float, h: float, color: tuple[float, float, float] | None = None) -> None:
+        v = self.bars[off : off + 6]
+        v[0, :2] = (x, y)
+        v[1, :2] = (x + w, y)
+        v[2, :2] = (x + w, y + h)
+        v[3, :2] = (x, y)
+        v[4, :2] = (x + w, y + h)
+        v[5, :2] = (x, y + h)
+        if color is not None:
+            v[:, 2:] = color
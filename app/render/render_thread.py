@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Generic, Protocol, TypeVar
+
+from OpenGL import GL
+from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtGui import QOffscreenSurface, QOpenGLContext
+
+from app.clock import SYSTEM_CLOCK, Clock
+from app.types import RenderState
+
+T = TypeVar("T")
+
+
+class LatestSlot(Generic[T]):
+    # Single-writer "newest value wins" handoff. put() is one reference assignment, which is
+    # atomic under the GIL, so neither side ever blocks; readers compare generations to see
+    # whether anything new arrived.
+    __slots__ = ("_item",)
+
+    def __init__(self, value: T | None = None) -> None:
+        self._item: tuple[int, T | None] = (0, value)
+
+    def put(self, value: T) -> int:
+        generation = self._item[0] + 1
+        self._item = (generation, value)
+        return generation
+
+    def get(self) -> tuple[int, T | None]:
+        return self._item
+
+    def take_if_newer(self, seen: int) -> tuple[int, T] | None:
+        item = self._item
+        return item if item[0] > seen else None
+
+
+@dataclass(slots=True)
+class RenderedFrame:
+    texture: int
+    width: int
+    height: int
+    state_generation: int
+    render_ms: float
+    # Depth texture and the state (pose matrices) the frame was drawn with, for reprojection.
+    depth_texture: int = 0
+    state: RenderState | None = None
+
+
+class TripleBuffer(Generic[T]):
+    # Producer always owns `back`, consumer owns `front`, `ready` is the newest finished
+    # buffer. Publishing and acquiring are index swaps, so the producer never waits for the
+    # consumer and never overwrites the buffer being composited.
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._back, self._ready, self._front = 0, 1, 2
+        self._payloads: list[T | None] = [None, None, None]
+        self._serials = [0, 0, 0]
+        self._fresh = False
+        self.published = 0
+
+    @property
+    def back_index(self) -> int:
+        return self._back
+
+    @property
+    def front_serial(self) -> int:
+        # Publish serial of the buffer the consumer holds; 0 before the first acquire.
+        return self._serials[self._front]
+
+    def publish(self, payload: T) -> int:
+        # The lock only guards the index swap; nothing blocking happens under it.
+        with self._lock:
+            self.published += 1
+            self._payloads[self._back] = payload
+            self._serials[self._back] = self.published
+            self._back, self._ready = self._ready, self._back
+            self._fresh = True
+            return self.published
+
+    def acquire(self) -> T | None:
+        with self._lock:
+            if self._fresh:
+                self._front, self._ready = self._ready, self._front
+                self._fresh = False
+            return self._payloads[self._front]
+
+
+class FramePacer:
+    # Absolute deadlines so sleep jitter does not accumulate. After a stall longer than one
+    # period the schedule restarts from now instead of bursting frames to catch up.
+    def __init__(self, target_fps: float, clock: Clock | None = None) -> None:
+        self._clock = clock or SYSTEM_CLOCK
+        self._period = 1.0 / max(1.0, float(target_fps))
+        self._deadline: float | None = None
+
+    @property
+    def period_s(self) -> float:
+        return self._period
+
+    def set_target_fps(self, target_fps: float) -> None:
+        self._period = 1.0 / max(1.0, float(target_fps))
+
+    def wait(self) -> int:
+        # Returns how many deadlines were missed since the previous call.
+        now = self._clock.perf_counter()
+        if self._deadline is None:
+            self._deadline = now
+        delay = self._deadline - now
+        skipped = 0
+        if delay > 0.0:
+            self._clock.sleep(delay)
+        elif -delay >= self._period:
+            skipped = int(-delay / self._period)
+            self._deadline = now
+        self._deadline += self._period
+        return skipped
+
+
+class RenderTarget:
+    # Colour + depth textures behind one FBO. QOpenGLFramebufferObject keeps depth in a
+    # renderbuffer, which the reprojection pass cannot sample.
+    __slots__ = ("fbo", "texture", "depth_texture")
+
+    def __init__(self, width: int, height: int) -> None:
+        self.texture = GL.glGenTextures(1)
+        self.depth_texture = GL.glGenTextures(1)
+        for tex, internal, fmt, kind in (
+            (self.texture, GL.GL_RGBA8, GL.GL_RGBA, GL.GL_UNSIGNED_BYTE),
+            (self.depth_texture, GL.GL_DEPTH_COMPONENT24, GL.GL_DEPTH_COMPONENT, GL.GL_FLOAT),
+        ):
+            GL.glBindTexture(GL.GL_TEXTURE_2D, tex)
+            GL.glTexImage2D(GL.GL_TEXTURE_2D, 0, internal, width, height, 0, fmt, kind, None)
+            GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MIN_FILTER, GL.GL_NEAREST)
+            GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MAG_FILTER, GL.GL_NEAREST)
+            GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_S, GL.GL_CLAMP_TO_EDGE)
+            GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_T, GL.GL_CLAMP_TO_EDGE)
+        GL.glBindTexture(GL.GL_TEXTURE_2D, 0)
+        self.fbo = GL.glGenFramebuffers(1)
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self.fbo)
+        GL.glFramebufferTexture2D(GL.GL_FRAMEBUFFER, GL.GL_COLOR_ATTACHMENT0, GL.GL_TEXTURE_2D, self.texture, 0)
+        GL.glFramebufferTexture2D(GL.GL_FRAMEBUFFER, GL.GL_DEPTH_ATTACHMENT, GL.GL_TEXTURE_2D, self.depth_texture, 0)
+        status = GL.glCheckFramebufferStatus(GL.GL_FRAMEBUFFER)
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, 0)
+        if status != GL.GL_FRAMEBUFFER_COMPLETE:
+            self.delete()
+            raise RuntimeError(f"Incomplete render target framebuffer: 0x{int(status):x}")
+
+    def bind(self) -> None:
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self.fbo)
+
+    def release(self, context: QOpenGLContext) -> None:
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, context.defaultFramebufferObject())
+
+    def delete(self) -> None:
+        GL.glDeleteFramebuffers(1, [self.fbo])
+        GL.glDeleteTextures(2, [self.texture, self.depth_texture])
+
+
+class FrameRenderer(Protocol):
+    def initialize(self, context: QOpenGLContext) -> None: ...
+
+    def paint(self, state: RenderState, width: int, height: int) -> None: ...
+
+
+class RenderThread(QThread):
+    # Owns a GL context in the widget's share group and renders the newest RenderState into
+    # one of three FBOs at its own pace. The GUI thread only hands states in (LatestSlot) and
+    # composites the texture from acquire(), so UI work cannot delay a frame being drawn.
+    frame_ready = pyqtSignal()
+
+    def __init__(
+        self,
+        renderer: FrameRenderer,
+        share_context: QOpenGLContext,
+        surface: QOffscreenSurface,
+        target_fps: float,
+        clock: Clock | None = None,
+        parent=None,
+    ) -> None:
+        super().__init__(parent)
+        self._renderer = renderer
+        self._share = share_context
+        # QOffscreenSurface must be created on the GUI thread; the caller passes a ready one.
+        self._surface = surface
+        self._clock = clock or SYSTEM_CLOCK
+        self._pacer = FramePacer(target_fps, self._clock)
+        self._states: LatestSlot[RenderState] = LatestSlot()
+        self._sizes: LatestSlot[tuple[int, int]] = LatestSlot()
+        self._buffers: TripleBuffer[RenderedFrame] = TripleBuffer()
+        self._running = False
+        self.frames = 0
+        self.skipped_frames = 0
+
+    def set_render_state(self, state: RenderState) -> None:
+        self._states.put(state)
+
+    def resize(self, width: int, height: int) -> None:
+        self._sizes.put((max(1, width), max(1, height)))
+
+    def set_target_fps(self, target_fps: float) -> None:
+        self._pacer.set_target_fps(target_fps)
+
+    def acquire(self) -> RenderedFrame | None:
+        return self._buffers.acquire()
+
+    def start(self) -> None:  # type: ignore[override]
+        self._running = True
+        super().start()
+
+    def stop(self) -> None:
+        self._running = False
+        self.wait(2000)
+
+    def run(self) -> None:
+        context = QOpenGLContext()
+        context.setFormat(self._surface.format())
+        context.setShareContext(self._share)
+        if not context.create() or not context.makeCurrent(self._surface):
+            self._running = False
+            return
+        self._renderer.initialize(context)
+
+        targets: list[RenderTarget] = []
+        retired: list[RenderTarget] = []
+        retire_after = 0
+        size_gen = 0
+        drawn_gen = 0
+        width = height = 0
+        try:
+            while self._running:
+                self.skipped_frames += self._pacer.wait()
+
+                resized = self._sizes.take_if_newer(size_gen)
+                if resized is not None:
+                    size_gen, (width, height) = resized
+                    # The GUI may still be compositing an old-size texture; keep those FBOs
+                    # alive until it has picked up a frame rendered at the new size.
+                    retired.extend(targets)
+                    retire_after = self._buffers.published + 1
+                    targets = [RenderTarget(width, height) for _ in range(3)]
+                if retired and self._buffers.front_serial >= retire_after:
+                    _delete_targets(retired)
+
+                state_gen, state = self._states.get()
+                # Nothing new to show: the last published frame is still current.
+                if state is None or not targets or (state_gen == drawn_gen and resized is None):
+                    continue
+                drawn_gen = state_gen
+
+                started = self._clock.perf_counter()
+                target = targets[self._buffers.back_index]
+                target.bind()
+                self._renderer.paint(state, width, height)
+                target.release(context)
+                # The consumer samples this texture from another context; make it complete first.
+                GL.glFinish()
+                self._buffers.publish(
+                    RenderedFrame(
+                        texture=target.texture,
+                        width=width,
+                        height=height,
+                        state_generation=state_gen,
+                        render_ms=(self._clock.perf_counter() - started) * 1000.0,
+                        depth_texture=target.depth_texture,
+                        state=state,
+                    )
+                )
+                self.frames += 1
+                self.frame_ready.emit()
+        finally:
+            _delete_targets(retired)
+            _delete_targets(targets)
+            context.doneCurrent()
+
+
+def _delete_targets(targets: list[RenderTarget]) -> None:
+    for target in targets:
+        target.delete()
+    targets.clear()
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# Depth-buffer value of cleared pixels (window-space depth, GL convention: 0 near, 1 far).
+CLEAR_DEPTH = 1.0
+
+
+def reprojection_matrix(src_view: np.ndarray, src_proj: np.ndarray, dst_view: np.ndarray, dst_proj: np.ndarray) -> np.ndarray:
+    # Maps a source pixel's NDC (x, y, z, 1) straight to destination clip space.
+    src = np.asarray(src_proj, dtype=np.float64).reshape(4, 4) @ np.asarray(src_view, dtype=np.float64).reshape(4, 4)
+    dst = np.asarray(dst_proj, dtype=np.float64).reshape(4, 4) @ np.asarray(dst_view, dtype=np.float64).reshape(4, 4)
+    return dst @ np.linalg.inv(src)
+
+
+def reproject_frame(
+    color: np.ndarray,
+    depth: np.ndarray,
+    src_view: np.ndarray,
+    src_proj: np.ndarray,
+    dst_view: np.ndarray,
+    dst_proj: np.ndarray,
+    clear_color: tuple[int, ...] | np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    # Forward point-splat warp, the NumPy twin of the GL reprojection pass: every covered
+    # source pixel is moved to where the destination pose sees it, nearest wins, uncovered
+    # pixels keep the clear colour. Thin wireframe edges survive this where a backward
+    # (gather) warp would lose them at the depth discontinuities.
+    h, w = depth.shape
+    out_color = np.empty_like(color)
+    out_color[...] = color[0, 0] if clear_color is None else np.asarray(clear_color, dtype=color.dtype)
+    out_depth = np.full((h, w), CLEAR_DEPTH, dtype=np.float32)
+
+    ys, xs = np.nonzero(depth < CLEAR_DEPTH)
+    if ys.size == 0:
+        return out_color, out_depth
+    ndc = np.empty((4, ys.size), dtype=np.float64)
+    ndc[0] = (xs + 0.5) * (2.0 / w) - 1.0
+    ndc[1] = 1.0 - (ys + 0.5) * (2.0 / h)
+    ndc[2] = depth[ys, xs] * 2.0 - 1.0
+    ndc[3] = 1.0
+    clip = reprojection_matrix(src_view, src_proj, dst_view, dst_proj) @ ndc
+
+    cw = clip[3]
+    ok = cw > 1e-9
+    px = np.floor((clip[0, ok] / cw[ok] + 1.0) * (0.5 * w)).astype(np.intp)
+    py = np.floor((1.0 - clip[1, ok] / cw[ok]) * (0.5 * h)).astype(np.intp)
+    z = (clip[2, ok] / cw[ok] + 1.0) * 0.5
+    inside = (px >= 0) & (px < w) & (py >= 0) & (py < h) & (z >= 0.0) & (z < CLEAR_DEPTH)
+    src_idx = (ys[ok] * w + xs[ok])[inside]
+    _splat(out_color, out_depth, py[inside] * w + px[inside], z[inside], color.reshape(h * w, -1)[src_idx])
+    return out_color, out_depth
+
+
+def _splat(color: np.ndarray, depth: np.ndarray, dst_idx: np.ndarray, z: np.ndarray, values: np.ndarray) -> None:
+    # Depth test without a loop: sort by (pixel, depth) and keep the first hit per pixel.
+    order = np.lexsort((z, dst_idx))
+    dst_sorted = dst_idx[order]
+    first = np.ones(dst_sorted.size, dtype=bool)
+    first[1:] = dst_sorted[1:] != dst_sorted[:-1]
+    keep = order[first]
+    flat_depth = depth.reshape(-1)
+    flat_color = color.reshape(flat_depth.size, -1)
+    closer = z[keep] < flat_depth[dst_idx[keep]]
+    keep = keep[closer]
+    flat_depth[dst_idx[keep]] = z[keep]
+    flat_color[dst_idx[keep]] = values[keep]
+
+
+@dataclass(slots=True)
+class SoftwareRendererConfig:
+    width: int = 480
+    height: int = 270
+    line_color: tuple[int, int, int] = (38, 210, 238)
+    bg_color: tuple[int, int, int] = (9, 11, 20)
+
+
+class SoftwareBoxRenderer:
+    # Wireframe box through the real view/projection matrices, with a depth buffer, so the
+    # reprojection path can be checked against a ground-truth render without a GPU.
+    def __init__(self, config: SoftwareRendererConfig | None = None) -> None:
+        cfg = config or SoftwareRendererConfig()
+        if cfg.width <= 0 or cfg.height <= 0:
+            raise ValueError("width/height must be > 0")
+        self._cfg = cfg
+        samples = 2 * max(cfg.width, cfg.height)
+        self._t = np.linspace(0.0, 1.0, samples)
+        self._box_key: tuple[float, float] | None = None
+        self._points = np.empty((4, 0))
+
+    @property
+    def config(self) -> SoftwareRendererConfig:
+        return self._cfg
+
+    def render(self, view: np.ndarray, proj: np.ndarray, box_size_m: float, box_depth_m: float) -> tuple[np.ndarray, np.ndarray]:
+        cfg = self._cfg
+        w, h = cfg.width, cfg.height
+        color = np.empty((h, w, 3), dtype=np.uint8)
+        color[...] = cfg.bg_color
+        depth = np.full((h, w), CLEAR_DEPTH, dtype=np.float32)
+
+        clip = (np.asarray(proj, dtype=np.float64).reshape(4, 4) @ np.asarray(view, dtype=np.float64).reshape(4, 4)) @ self._edge_points(
+            box_size_m, box_depth_m
+        )
+        cw = clip[3]
+        ok = cw > 1e-9
+        px = np.floor((clip[0, ok] / cw[ok] + 1.0) * (0.5 * w)).astype(np.intp)
+        py = np.floor((1.0 - clip[1, ok] / cw[ok]) * (0.5 * h)).astype(np.intp)
+        z = (clip[2, ok] / cw[ok] + 1.0) * 0.5
+        inside = (px >= 0) & (px < w) & (py >= 0) & (py < h) & (z >= 0.0) & (z < CLEAR_DEPTH)
+        z = z[inside]
+        values = np.broadcast_to(np.asarray(cfg.line_color, dtype=np.uint8), (z.size, 3))
+        _splat(color, depth, py[inside] * w + px[inside], z, values)
+        return color, depth
+
+    def _edge_points(self, size_m: float, depth_m: float) -> np.ndarray:
+        if self._box_key == (size_m, depth_m):
+            return self._points
+        s = size_m / 2.0
+        z1 = -depth_m
+        front = np.array([(-s, -s, 0.0), (s, -s, 0.0), (s, s, 0.0), (-s, s, 0.0)])
+        back = np.array([(-s, -s, z1), (s, -s, z1), (s, s, z1), (-s, s, z1)])
+        starts = np.concatenate((front, back, front))
+        ends = np.concatenate((np.roll(front, -1, axis=0), np.roll(back, -1, axis=0), back))
+        t = self._t[None, :, None]
+        pts = (starts[:, None, :] * (1.0 - t) + ends[:, None, :] * t).reshape(-1, 3)
+        self._points = np.vstack((pts.T, np.ones(pts.shape[0])))
+        self._box_key = (size_m, depth_m)
+        return self._points
+
+
+@dataclass(slots=True)
+class ReprojectionStats:
+    full_frames: int = 0
+    warped_frames: int = 0
+
+
+class ReprojectingRenderer:
+    # Offscreen counterpart of the threaded widget's reprojection: a full render every
+    # `full_every` frames, and in between the last colour/depth pair is warped to the newest
+    # pose. A box change always forces a full render.
+    def __init__(self, renderer: SoftwareBoxRenderer, full_every: int = 2) -> None:
+        if full_every < 1:
+            raise ValueError("full_every must be >= 1")
+        self._renderer = renderer
+        self._full_every = full_every
+        self._last: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, tuple[float, float]] | None = None
+        self._since_full = 0
+        self.stats = ReprojectionStats()
+
+    def render(self, view: np.ndarray, proj: np.ndarray, box_size_m: float, box_depth_m: float) -> np.ndarray:
+        last = self._last
+        box = (box_size_m, box_depth_m)
+        if last is not None and self._since_full < self._full_every - 1 and last[4] == box:
+            self._since_full += 1
+            self.stats.warped_frames += 1
+            color, _ = reproject_frame(last[0], last[1], last[2], last[3], view, proj, self._renderer.config.bg_color)
+            return color
+        color, depth = self._renderer.render(view, proj, box_size_m, box_depth_m)
+        self._last = (color, depth, np.asarray(view), np.asarray(proj), box)
+        self._since_full = 0
+        self.stats.full_frames += 1
+        return color
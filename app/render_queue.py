@@ -0,0 +1,444 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import socket
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator
+
+import numpy as np
+
+from app.clock import SYSTEM_CLOCK, Clock
+from app.colab_render import build_calibrator, build_poses, iter_frames
+from app.config.settings import DEFAULT_CONFIG_PATH, load_settings
+from app.render.encoders import ENCODER_FORMATS, EncoderConfig, encode_frames
+from app.render.headless_matplotlib import HeadlessMatplotlibRenderer, HeadlessRendererConfig
+
+# Queue layout under the shared root:
+#   job.json, views.npy, proj.npy      written once by the submitter
+#   tasks/pending/<task>.json          claimable
+#   tasks/claimed/<task>.json@<worker> owned by one worker; its mtime is the heartbeat
+#   tasks/done/<task>.json, tasks/failed/<task>.json
+#   chunks/chunk-NNNNN.npy             rendered frames of one chunk
+#   output.<fmt>                       written by whoever claims the finalize task
+# Every state change is a rename (or write-to-temp + rename), which is atomic on a single
+# NFS server, so nodes need nothing but the shared directory.
+FINALIZE_TASK = "finalize"
+_CLAIM_SEP = "@"
+
+
+@dataclass(slots=True)
+class QueueConfig:
+    heartbeat_s: float = 5.0
+    # A claim whose heartbeat is older than this goes back to pending.
+    stale_s: float = 30.0
+    poll_s: float = 1.0
+    max_attempts: int = 3
+
+
+@dataclass(slots=True)
+class RenderJob:
+    width: int
+    height: int
+    fps: int
+    fmt: str
+    box_size_m: float
+    box_depth_m: float
+    frame_count: int
+    chunk_frames: int
+    encoder: dict = field(default_factory=dict)
+
+    @property
+    def chunk_count(self) -> int:
+        return -(-self.frame_count // self.chunk_frames)
+
+    def chunk_range(self, index: int) -> tuple[int, int]:
+        start = index * self.chunk_frames
+        return start, min(self.frame_count, start + self.chunk_frames)
+
+
+@dataclass(slots=True)
+class Claim:
+    task: str
+    path: Path
+    worker_id: str
+    attempts: int
+    start: int = 0
+    stop: int = 0
+
+
+@dataclass(slots=True)
+class QueueStatus:
+    pending: int
+    claimed: int
+    done: int
+    failed: int
+    chunk_count: int
+    output: Path | None
+
+    @property
+    def finished(self) -> bool:
+        return self.output is not None or (self.failed > 0 and self.pending == 0 and self.claimed == 0)
+
+
+@dataclass(slots=True)
+class WorkerReport:
+    worker_id: str
+    chunks: int = 0
+    frames: int = 0
+    finalized: bool = False
+    reclaimed: int = 0
+    lost: int = 0
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class JobQueue:
+    def __init__(self, root: Path, config: QueueConfig | None = None) -> None:
+        self.root = Path(root)
+        self.config = config or QueueConfig()
+        self._job: RenderJob | None = None
+
+    @classmethod
+    def submit(cls, root: Path, views: np.ndarray, proj: np.ndarray, job: RenderJob, config: QueueConfig | None = None) -> JobQueue:
+        # The submitter resolves every view/projection up front, so workers on other nodes
+        # render exactly the same frames without needing the same settings files.
+        root = Path(root)
+        if (root / "job.json").exists():
+            raise ValueError(f"A job already exists in {root}")
+        if job.fmt not in ENCODER_FORMATS:
+            raise ValueError(f"format must be one of {', '.join(ENCODER_FORMATS)}")
+        if job.chunk_frames <= 0 or job.frame_count <= 0:
+            raise ValueError("frame_count and chunk_frames must be > 0")
+        for sub in ("tasks/pending", "tasks/claimed", "tasks/done", "tasks/failed", "chunks", "heartbeats"):
+            (root / sub).mkdir(parents=True, exist_ok=True)
+        _atomic_save(root / "views.npy", np.asarray(views, dtype=np.float32))
+        _atomic_save(root / "proj.npy", np.asarray(proj, dtype=np.float32))
+        for index in range(job.chunk_count):
+            start, stop = job.chunk_range(index)
+            _atomic_json(root / "tasks/pending" / f"{_chunk_name(index)}.json", {"start": start, "stop": stop, "attempts": 0})
+        _atomic_json(root / "tasks/pending" / f"{FINALIZE_TASK}.json", {"attempts": 0})
+        # job.json last: its presence marks a complete submission.
+        _atomic_json(root / "job.json", asdict(job))
+        return cls(root, config)
+
+    @property
+    def job(self) -> RenderJob:
+        if self._job is None:
+            self._job = RenderJob(**json.loads((self.root / "job.json").read_text(encoding="utf-8")))
+        return self._job
+
+    def load_views(self) -> tuple[np.ndarray, np.ndarray]:
+        return np.load(self.root / "views.npy", mmap_mode="r"), np.load(self.root / "proj.npy")
+
+    def chunk_path(self, index: int) -> Path:
+        return self.root / "chunks" / f"{_chunk_name(index)}.npy"
+
+    def status(self) -> QueueStatus:
+        # Chunk counts only; the finalize task shows up as `output`.
+        output = next((p for p in sorted(self.root.glob("output.*")) if ".partial-" not in p.name), None)
+        return QueueStatus(
+            pending=sum(1 for name in self._names("pending") if not name.startswith(FINALIZE_TASK)),
+            claimed=sum(1 for name in self._names("claimed") if not name.startswith(FINALIZE_TASK)),
+            done=sum(1 for name in self._names("done") if not name.startswith(FINALIZE_TASK)),
+            failed=len(self._names("failed")),
+            chunk_count=self.job.chunk_count,
+            output=output,
+        )
+
+    def claim(self, worker_id: str) -> Claim | None:
+        # Chunks in order; finalize only once every chunk is done. Losing a rename race just
+        # means another worker got that task first.
+        worker_id = _safe_id(worker_id)
+        chunks_done = self.status().done == self.job.chunk_count
+        for name in sorted(self._names("pending")):
+            task = name[: -len(".json")]
+            if task == FINALIZE_TASK and not chunks_done:
+                continue
+            src = self.root / "tasks/pending" / name
+            dst = self.root / "tasks/claimed" / f"{name}{_CLAIM_SEP}{worker_id}"
+            try:
+                os.rename(src, dst)
+            except FileNotFoundError:
+                # NFS can report a retransmitted rename as failed even though it went through.
+                if not dst.exists():
+                    continue
+            info = json.loads(dst.read_text(encoding="utf-8"))
+            info["attempts"] = int(info.get("attempts", 0)) + 1
+            _atomic_json(dst, info)
+            claim = Claim(task, dst, worker_id, info["attempts"], int(info.get("start", 0)), int(info.get("stop", 0)))
+            if claim.attempts > self.config.max_attempts:
+                self._move(claim, "failed")
+                continue
+            return claim
+        return None
+
+    def heartbeat(self, claim: Claim) -> bool:
+        # False once the claim was reclaimed by someone else.
+        try:
+            os.utime(claim.path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def complete(self, claim: Claim) -> bool:
+        return self._move(claim, "done")
+
+    def release(self, claim: Claim) -> bool:
+        # Hands a task back (e.g. after an error) so any worker can retry it.
+        return self._move(claim, "pending")
+
+    def reclaim_stale(self, worker_id: str) -> list[str]:
+        # Staleness is judged against the shared filesystem's clock (a freshly touched probe
+        # file), not this node's, so clock skew between nodes does not matter.
+        now = self._fs_now(_safe_id(worker_id))
+        reclaimed = []
+        for name in self._names("claimed"):
+            path = self.root / "tasks/claimed" / name
+            try:
+                age = now - path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if age <= self.config.stale_s:
+                continue
+            task_file = name.rsplit(_CLAIM_SEP, 1)[0]
+            try:
+                os.rename(path, self.root / "tasks/pending" / task_file)
+            except FileNotFoundError:
+                continue
+            reclaimed.append(task_file[: -len(".json")])
+        return reclaimed
+
+    def _move(self, claim: Claim, state: str) -> bool:
+        try:
+            os.rename(claim.path, self.root / "tasks" / state / f"{claim.task}.json")
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _names(self, state: str) -> list[str]:
+        try:
+            return [n for n in os.listdir(self.root / "tasks" / state) if not n.startswith(".")]
+        except FileNotFoundError:
+            return []
+
+    def _fs_now(self, worker_id: str) -> float:
+        probe = self.root / "heartbeats" / f"{worker_id}.probe"
+        probe.touch()
+        return probe.stat().st_mtime
+
+
+class _Heartbeat(threading.Thread):
+    # Touches the claim file while a chunk renders; `lost` flips when it was reclaimed.
+    def __init__(self, queue: JobQueue, claim: Claim) -> None:
+        super().__init__(daemon=True)
+        self._queue = queue
+        self._claim = claim
+        self._stopped = threading.Event()
+        self.lost = False
+
+    def run(self) -> None:
+        while not self._stopped.wait(self._queue.config.heartbeat_s):
+            if not self._queue.heartbeat(self._claim):
+                self.lost = True
+                return
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+
+def run_worker(
+    root: Path,
+    worker_id: str | None = None,
+    config: QueueConfig | None = None,
+    clock: Clock | None = None,
+    max_tasks: int | None = None,
+) -> WorkerReport:
+    # Claims and renders chunks until the job is finished (output written or only failed
+    # tasks left). Idle workers keep reclaiming stale claims so a dead node's chunks move on.
+    clock = clock or SYSTEM_CLOCK
+    queue = JobQueue(root, config)
+    report = WorkerReport(worker_id=_safe_id(worker_id or default_worker_id()))
+    renderer: HeadlessMatplotlibRenderer | None = None
+    tasks = 0
+    while max_tasks is None or tasks < max_tasks:
+        claim = queue.claim(report.worker_id)
+        if claim is None:
+            report.reclaimed += len(queue.reclaim_stale(report.worker_id))
+            if queue.status().finished:
+                break
+            clock.sleep(queue.config.poll_s)
+            continue
+        tasks += 1
+        heartbeat = _Heartbeat(queue, claim)
+        heartbeat.start()
+        try:
+            if claim.task == FINALIZE_TASK:
+                finalize(queue)
+                report.finalized = True
+            else:
+                if renderer is None:
+                    job = queue.job
+                    renderer = HeadlessMatplotlibRenderer(HeadlessRendererConfig(width=job.width, height=job.height))
+                rendered = render_chunk(queue, claim, renderer, lambda: heartbeat.lost)
+                if rendered is None:
+                    report.lost += 1
+                    continue
+                report.chunks += 1
+                report.frames += rendered
+        except Exception:
+            queue.release(claim)
+            raise
+        finally:
+            heartbeat.stop()
+        if not queue.complete(claim):
+            # Reclaimed while finishing; the chunk file is complete either way and the
+            # other worker's copy is identical.
+            report.lost += 1
+    return report
+
+
+def render_chunk(queue: JobQueue, claim: Claim, renderer: HeadlessMatplotlibRenderer, lost: Callable[[], bool] = lambda: False) -> int | None:
+    # Returns the frame count, or None when the claim was lost mid-chunk.
+    job = queue.job
+    views, proj = queue.load_views()
+    frames = np.empty((claim.stop - claim.start, job.height, job.width, 3), dtype=np.uint8)
+    for i, frame in enumerate(iter_frames(renderer, list(views[claim.start : claim.stop]), proj, job.box_size_m, job.box_depth_m)):
+        if lost():
+            return None
+        frames[i] = frame
+    _atomic_save(queue.chunk_path(int(claim.task.rsplit("-", 1)[1])), frames)
+    return len(frames)
+
+
+def iter_job_frames(queue: JobQueue) -> Iterator[np.ndarray]:
+    for index in range(queue.job.chunk_count):
+        chunk = np.load(queue.chunk_path(index), mmap_mode="r")
+        for frame in chunk:
+            yield np.asarray(frame)
+
+
+def finalize(queue: JobQueue) -> Path:
+    # Streams the chunks in order through one encoder, so there are no codec seams at chunk
+    # boundaries; the output appears under its final name only when complete.
+    job = queue.job
+    partial = queue.root / f"output.partial-{_unique_tag()}.{job.fmt}"
+    saved, _ = encode_frames(iter_job_frames(queue), partial, job.fps, job.fmt, EncoderConfig(**job.encoder))
+    out_path = queue.root / f"output{saved.suffix}"
+    os.replace(saved, out_path)
+    return out_path
+
+
+def _chunk_name(index: int) -> str:
+    return f"chunk-{index:05d}"
+
+
+def _unique_tag() -> str:
+    # PIDs repeat across nodes sharing the root; host + pid + a random suffix does not.
+    return f"{_safe_id(default_worker_id())}-{uuid.uuid4().hex[:8]}"
+
+
+def _safe_id(worker_id: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", worker_id)
+
+
+def _atomic_json(path: Path, data: dict) -> None:
+    tmp = path.with_name(f".{path.name}.{_unique_tag()}.tmp")
+    tmp.write_text(json.dumps(data), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _atomic_save(path: Path, array: np.ndarray) -> None:
+    tmp = path.with_name(f".{path.stem}.{_unique_tag()}.tmp.npy")
+    np.save(tmp, array)
+    os.replace(tmp, path)
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Render job queue over a shared directory")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    s = sub.add_parser("submit", help="Split a colab_render job into chunks")
+    s.add_argument("root", type=Path)
+    s.add_argument("--duration-s", type=float, default=6.0)
+    s.add_argument("--fps", type=int, default=30)
+    s.add_argument("--width", type=int, default=960)
+    s.add_argument("--height", type=int, default=540)
+    s.add_argument("--format", choices=ENCODER_FORMATS, default="mp4")
+    s.add_argument("--path-type", choices=("orbit", "lissajous", "keyframes"), default="orbit")
+    s.add_argument("--keyframes", type=Path, default=None)
+    s.add_argument("--chunk-frames", type=int, default=30)
+    s.add_argument("--config", type=Path, default=DEFAULT_CONFIG_PATH)
+    s.add_argument("--codec", default=None)
+    s.add_argument("--crf", type=int, default=23)
+
+    w = sub.add_parser("work", help="Claim and render chunks until the job is finished")
+    w.add_argument("root", type=Path)
+    w.add_argument("--worker-id", default=None)
+    w.add_argument("--heartbeat-s", type=float, default=5.0)
+    w.add_argument("--stale-s", type=float, default=30.0)
+    w.add_argument("--poll-s", type=float, default=1.0)
+
+    t = sub.add_parser("status", help="Print queue progress")
+    t.add_argument("root", type=Path)
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    if args.command == "submit":
+        if args.duration_s <= 0.0 or args.fps <= 0 or args.width <= 0 or args.height <= 0 or args.chunk_frames <= 0:
+            raise SystemExit("--duration-s, --fps, --width, --height and --chunk-frames must be > 0")
+        settings = load_settings(args.config)
+        calibrator = build_calibrator(settings, args.width, args.height)
+        try:
+            poses = build_poses(args.path_type, args.duration_s, args.fps, args.keyframes)
+            views = np.stack([calibrator.compute_view_matrix(p) for p in poses])
+            proj = calibrator.compute_proj_matrix(settings.render.fov_deg, settings.render.near_m, settings.render.far_m)
+            job = RenderJob(
+                width=args.width,
+                height=args.height,
+                fps=args.fps,
+                fmt=args.format,
+                box_size_m=settings.render.box_size_m,
+                box_depth_m=settings.render.box_depth_m,
+                frame_count=len(views),
+                chunk_frames=args.chunk_frames,
+                encoder={"codec": args.codec, "crf": args.crf},
+            )
+            queue = JobQueue.submit(args.root, views, proj, job)
+        except (OSError, ValueError) as exc:
+            raise SystemExit(str(exc)) from exc
+        print(f"Submitted {job.frame_count} frames as {job.chunk_count} chunks -> {queue.root}")
+        return 0
+
+    if args.command == "work":
+        config = QueueConfig(heartbeat_s=args.heartbeat_s, stale_s=args.stale_s, poll_s=args.poll_s)
+        started = time.perf_counter()
+        report = run_worker(args.root, args.worker_id, config)
+        print(
+            f"{report.worker_id}: {report.chunks} chunks / {report.frames} frames in {time.perf_counter() - started:.1f}s"
+            f"{', finalized' if report.finalized else ''}"
+            f"{f', reclaimed {report.reclaimed}' if report.reclaimed else ''}"
+        )
+        return 0
+
+    st = JobQueue(args.root).status()
+    print(
+        f"chunks {st.done}/{st.chunk_count} done, {st.claimed} claimed, {st.pending} pending, {st.failed} failed"
+        f" | output: {st.output or '-'}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import functools
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import yaml
+
+from app.types import HeadPose
+
+EASINGS = ("linear", "ease_in", "ease_out", "ease_in_out")
+SPLINES = ("catmull_rom", "hermite")
+
+
+@dataclass(slots=True, frozen=True)
+class Keyframe:
+    t_s: float
+    position_m: tuple[float, float, float]
+    yaw_pitch_roll_deg: tuple[float, float, float] = (0.0, 0.0, 0.0)
+    # Timing of the segment that starts at this keyframe.
+    ease: str = "linear"
+    constant_speed: bool = False
+    # Explicit velocity (m/s) for the hermite spline; None falls back to Catmull-Rom.
+    tangent_m_s: tuple[float, float, float] | None = None
+
+
+class KeyframePath:
+    # Positions and angles share one cubic Hermite spline (6 channels per key). Each segment
+    # also stores a normalized arc-length table so constant-speed segments are a lookup.
+    def __init__(self, keyframes: tuple[Keyframe, ...], spline: str = "catmull_rom", lut_samples: int = 64) -> None:
+        _validate(keyframes, spline)
+        self.keyframes = keyframes
+        self.spline = spline
+        self.duration_s = keyframes[-1].t_s - keyframes[0].t_s
+
+        times = np.array([k.t_s for k in keyframes], dtype=np.float64)
+        values = np.array([(*k.position_m, *k.yaw_pitch_roll_deg) for k in keyframes], dtype=np.float64)
+        velocity = self._velocities(times, values)
+
+        dt = np.diff(times)[:, None]
+        p0, p1 = values[:-1], values[1:]
+        m0, m1 = velocity[:-1] * dt, velocity[1:] * dt
+        # pos(u) = a u^3 + b u^2 + c u + d per segment, shape (segments, 4, 6).
+        self._coeffs = np.stack([2.0 * p0 - 2.0 * p1 + m0 + m1, -3.0 * p0 + 3.0 * p1 - 2.0 * m0 - m1, m0, p0], axis=1)
+        self._times = times
+        self._ease = np.array([EASINGS.index(k.ease) for k in keyframes[:-1]], dtype=np.int8)
+        self._constant = np.array([k.constant_speed for k in keyframes[:-1]], dtype=bool)
+
+        # Arc-length tables: cumulative length at u = 0..1, normalized per segment and offset
+        # by the segment index so one flat searchsorted inverts every segment at once.
+        n_seg = len(keyframes) - 1
+        u = np.linspace(0.0, 1.0, lut_samples + 1)
+        pts = self._eval_segments(np.repeat(np.arange(n_seg), u.size), np.tile(u, n_seg))[:, :3]
+        pts = pts.reshape(n_seg, u.size, 3)
+        step = np.linalg.norm(np.diff(pts, axis=1), axis=2)
+        cum = np.concatenate([np.zeros((n_seg, 1)), np.cumsum(step, axis=1)], axis=1)
+        self.segment_lengths_m = cum[:, -1].copy()
+        norm = np.where(cum[:, -1:] > 0.0, cum / np.maximum(cum[:, -1:], 1e-12), u[None, :])
+        self._lut_s = (norm + np.arange(n_seg)[:, None]).reshape(-1)
+        self._lut_u = np.tile(u, n_seg)
+        self._lut_width = u.size
+
+    def evaluate(self, t_s: np.ndarray | float) -> tuple[np.ndarray, np.ndarray]:
+        t = np.atleast_1d(np.asarray(t_s, dtype=np.float64))
+        t = np.clip(t, self._times[0], self._times[-1])
+        seg = np.clip(np.searchsorted(self._times, t, side="right") - 1, 0, len(self._times) - 2)
+        s = (t - self._times[seg]) / (self._times[seg + 1] - self._times[seg])
+        s = self._apply_easing(s, self._ease[seg])
+
+        u = s
+        constant = self._constant[seg]
+        if constant.any():
+            u = s.copy()
+            target = s[constant] + seg[constant]
+            hi = np.searchsorted(self._lut_s, target, side="left")
+            # Stay inside each segment's own table.
+            hi = np.clip(hi, seg[constant] * self._lut_width + 1, (seg[constant] + 1) * self._lut_width - 1)
+            lo = hi - 1
+            span = self._lut_s[hi] - self._lut_s[lo]
+            w = np.where(span > 0.0, (target - self._lut_s[lo]) / np.where(span > 0.0, span, 1.0), 0.0)
+            u[constant] = self._lut_u[lo] + w * (self._lut_u[hi] - self._lut_u[lo])
+
+        out = self._eval_segments(seg, u)
+        return out[:, :3], out[:, 3:]
+
+    def to_head_poses(self, fps: int, duration_s: float | None = None) -> list[HeadPose]:
+        duration = self.duration_s if duration_s is None else duration_s
+        frames = max(1, int(round(duration * fps)))
+        t = self._times[0] + np.arange(frames) / fps
+        pos, ypr = self.evaluate(t)
+        return [
+            HeadPose(
+                timestamp_ms=int((i / fps) * 1000.0),
+                position_m=(float(pos[i, 0]), float(pos[i, 1]), float(pos[i, 2])),
+                yaw_pitch_roll_deg=(float(ypr[i, 0]), float(ypr[i, 1]), float(ypr[i, 2])),
+                confidence=1.0,
+                valid=True,
+            )
+            for i in range(frames)
+        ]
+
+    def _eval_segments(self, seg: np.ndarray, u: np.ndarray) -> np.ndarray:
+        basis = np.stack([u * u * u, u * u, u, np.ones_like(u)], axis=1)
+        return np.einsum("nk,nkc->nc", basis, self._coeffs[seg])
+
+    def _velocities(self, times: np.ndarray, values: np.ndarray) -> np.ndarray:
+        n = len(times)
+        vel = np.empty_like(values)
+        vel[1:-1] = (values[2:] - values[:-2]) / (times[2:] - times[:-2])[:, None]
+        vel[0] = (values[1] - values[0]) / (times[1] - times[0])
+        vel[-1] = (values[-1] - values[-2]) / (times[-1] - times[-2])
+        if n == 2:
+            vel[:] = (values[1] - values[0]) / (times[1] - times[0])
+        if self.spline == "hermite":
+            for i, k in enumerate(self.keyframes):
+                if k.tangent_m_s is not None:
+                    vel[i, :3] = k.tangent_m_s
+        return vel
+
+    @staticmethod
+    def _apply_easing(s: np.ndarray, ease: np.ndarray) -> np.ndarray:
+        return np.select(
+            [ease == 1, ease == 2, ease == 3],
+            [s * s, s * (2.0 - s), s * s * (3.0 - 2.0 * s)],
+            default=s,
+        )
+
+
+@functools.lru_cache(maxsize=32)
+def build_keyframe_path(keyframes: tuple[Keyframe, ...], spline: str = "catmull_rom") -> KeyframePath:
+    return KeyframePath(keyframes, spline)
+
+
+def load_keyframe_path(path: Path) -> KeyframePath:
+    resolved = path.resolve()
+    return _load_cached(resolved, resolved.stat().st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_cached(path: Path, mtime_ns: int) -> KeyframePath:
+    del mtime_ns  # cache key only
+    with path.open("r", encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+    if not isinstance(data, dict) or not isinstance(data.get("keyframes"), list):
+        raise ValueError(f"Invalid keyframe file: {path}")
+    keyframes = tuple(_keyframe(raw) for raw in data["keyframes"])
+    return build_keyframe_path(keyframes, str(data.get("spline", "catmull_rom")))
+
+
+def _keyframe(raw: dict[str, Any]) -> Keyframe:
+    tangent = raw.get("tangent")
+    return Keyframe(
+        t_s=float(raw["t"]),
+        position_m=tuple(float(v) for v in raw["position"]),
+        yaw_pitch_roll_deg=tuple(float(v) for v in raw.get("ypr", (0.0, 0.0, 0.0))),
+        ease=str(raw.get("ease", "linear")),
+        constant_speed=bool(raw.get("constant_speed", False)),
+        tangent_m_s=None if tangent is None else tuple(float(v) for v in tangent),
+    )
+
+
+def _validate(keyframes: tuple[Keyframe, ...], spline: str) -> None:
+    if spline not in SPLINES:
+        raise ValueError(f"spline must be one of {', '.join(SPLINES)}")
+    if len(keyframes) < 2:
+        raise ValueError("at least two keyframes are required")
+    for a, b in zip(keyframes, keyframes[1:]):
+        if b.t_s <= a.t_s:
+            raise ValueError("keyframe times must be strictly increasing")
+    for k in keyframes:
+        if k.ease not in EASINGS:
+            raise ValueError(f"ease must be one of {', '.join(EASINGS)}")
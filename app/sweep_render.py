@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import yaml
+
+from app.colab_render import build_calibrator, build_poses, render_frames
+from app.config.settings import DEFAULT_CONFIG_PATH, load_settings
+from app.render.encoders import ENCODER_FORMATS
+from app.render.frame_cache import FrameCache, FrameCacheConfig
+from app.render.headless_matplotlib import HeadlessMatplotlibRenderer, HeadlessRendererConfig
+
+GRID_AXES = ("fov_deg", "box_depth_m", "path_type", "resolution")
+
+
+@dataclass(slots=True, frozen=True)
+class SweepVariant:
+    fov_deg: float
+    box_depth_m: float
+    path_type: str
+    width: int
+    height: int
+
+    @property
+    def name(self) -> str:
+        return f"{self.path_type}_fov{self.fov_deg:g}_depth{self.box_depth_m:g}_{self.width}x{self.height}"
+
+
+@dataclass(slots=True)
+class _VariantTask:
+    variant: SweepVariant
+    proj: np.ndarray
+    box_size_m: float
+    out_path: Path
+    fps: int
+    fmt: str
+
+
+# Per-worker state: the shared view stacks arrive once through the pool initializer and
+# renderers/caches are reused by every variant the worker picks up.
+_WORKER_VIEWS: dict[str, np.ndarray] = {}
+_WORKER_RENDERERS: dict[tuple[int, int], HeadlessMatplotlibRenderer] = {}
+_WORKER_CACHE: FrameCache | None = None
+
+
+def expand_grid(grid: dict[str, list[Any]]) -> list[SweepVariant]:
+    unknown = set(grid) - set(GRID_AXES)
+    if unknown:
+        raise ValueError(f"Unknown sweep axes: {', '.join(sorted(unknown))}")
+    missing = [axis for axis in GRID_AXES if not grid.get(axis)]
+    if missing:
+        raise ValueError(f"Sweep axes need at least one value: {', '.join(missing)}")
+
+    variants = []
+    for fov, depth, path_type, resolution in itertools.product(*(grid[axis] for axis in GRID_AXES)):
+        width, height = _parse_resolution(resolution)
+        variants.append(
+            SweepVariant(
+                fov_deg=float(fov),
+                box_depth_m=float(depth),
+                path_type=str(path_type),
+                width=width,
+                height=height,
+            )
+        )
+    return list(dict.fromkeys(variants))
+
+
+def load_grid(path: Path) -> dict[str, list[Any]]:
+    with path.open("r", encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"Invalid sweep grid: {path}")
+    return {k: v if isinstance(v, list) else [v] for k, v in data.items()}
+
+
+def _parse_resolution(value: Any) -> tuple[int, int]:
+    if isinstance(value, str):
+        w, _, h = value.lower().partition("x")
+        width, height = int(w), int(h)
+    else:
+        width, height = (int(v) for v in value)
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Invalid resolution: {value}")
+    return width, height
+
+
+def _split(value: str | None) -> list[str] | None:
+    if value is None:
+        return None
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Render a parameter sweep in one invocation")
+    p.add_argument("--grid", type=Path, default=None, help="YAML file with fov_deg/box_depth_m/path_type/resolution lists")
+    p.add_argument("--fov", default=None, help="Comma separated, e.g. 50,60,70")
+    p.add_argument("--depth", default=None, help="Comma separated box depths in metres")
+    p.add_argument("--path-type", default=None, help="Comma separated: orbit,lissajous")
+    p.add_argument("--resolution", default=None, help="Comma separated WxH, e.g. 640x360,960x540")
+    p.add_argument("--duration-s", type=float, default=6.0)
+    p.add_argument("--fps", type=int, default=30)
+    p.add_argument("--format", choices=ENCODER_FORMATS, default="mp4")
+    p.add_argument("--out-dir", type=Path, default=Path("outputs/sweep"))
+    p.add_argument("--config", type=Path, default=DEFAULT_CONFIG_PATH)
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    p.add_argument("--cache-dir", type=Path, default=None)
+    p.add_argument("--cache-max-mb", type=int, default=2048)
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    if args.duration_s <= 0.0:
+        raise SystemExit("--duration-s must be > 0")
+    if args.fps <= 0:
+        raise SystemExit("--fps must be > 0")
+    if args.workers <= 0:
+        raise SystemExit("--workers must be > 0")
+
+    settings = load_settings(args.config)
+    grid: dict[str, list[Any]] = load_grid(args.grid) if args.grid is not None else {}
+    grid.setdefault("fov_deg", [settings.render.fov_deg])
+    grid.setdefault("box_depth_m", [settings.render.box_depth_m])
+    grid.setdefault("path_type", ["orbit"])
+    grid.setdefault("resolution", [[960, 540]])
+    for axis, cli in (("fov_deg", args.fov), ("box_depth_m", args.depth), ("path_type", args.path_type), ("resolution", args.resolution)):
+        values = _split(cli)
+        if values:
+            grid[axis] = values
+    try:
+        variants = expand_grid(grid)
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+
+    # Shared stages: one pose path + view stack per path type, one projection per FOV/aspect.
+    # The view matrix does not depend on resolution, so any calibrator instance will do.
+    view_calibrator = build_calibrator(settings, variants[0].width, variants[0].height)
+    views: dict[str, np.ndarray] = {}
+    for path_type in dict.fromkeys(v.path_type for v in variants):
+        try:
+            poses = build_poses(path_type, args.duration_s, args.fps)
+        except ValueError as exc:
+            raise SystemExit(str(exc)) from exc
+        views[path_type] = np.stack([view_calibrator.compute_view_matrix(p) for p in poses])
+
+    projs: dict[tuple[float, int, int], np.ndarray] = {}
+    tasks = []
+    for v in variants:
+        key = (v.fov_deg, v.width, v.height)
+        if key not in projs:
+            projs[key] = build_calibrator(settings, v.width, v.height).compute_proj_matrix(
+                fov_deg=v.fov_deg,
+                near_m=settings.render.near_m,
+                far_m=settings.render.far_m,
+            )
+        tasks.append(
+            _VariantTask(
+                variant=v,
+                proj=projs[key],
+                box_size_m=settings.render.box_size_m,
+                out_path=args.out_dir / f"{v.name}.{args.format}",
+                fps=args.fps,
+                fmt=args.format,
+            )
+        )
+
+    cache_cfg = None
+    if args.cache_dir is not None:
+        cache_cfg = FrameCacheConfig(root=args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024)
+
+    started = time.perf_counter()
+    workers = min(args.workers, len(tasks))
+    if workers == 1:
+        _init_worker(views, cache_cfg)
+        results = [_render_variant(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(views, cache_cfg)) as pool:
+            results = list(pool.map(_render_variant, tasks))
+    elapsed = time.perf_counter() - started
+
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {
+        "duration_s": args.duration_s,
+        "fps": args.fps,
+        "format": args.format,
+        "elapsed_s": round(elapsed, 3),
+        "variants": results,
+    }
+    index_path = args.out_dir / "index.json"
+    index_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    print(f"Rendered {len(results)} variants in {elapsed:.1f}s -> {index_path}")
+    return 0
+
+
+def _init_worker(views: dict[str, np.ndarray], cache_cfg: FrameCacheConfig | None) -> None:
+    global _WORKER_CACHE
+    _WORKER_VIEWS.clear()
+    _WORKER_VIEWS.update(views)
+    _WORKER_RENDERERS.clear()
+    _WORKER_CACHE = FrameCache(cache_cfg) if cache_cfg is not None else None
+
+
+def _render_variant(task: _VariantTask) -> dict[str, Any]:
+    v = task.variant
+    size = (v.width, v.height)
+    renderer = _WORKER_RENDERERS.get(size)
+    if renderer is None:
+        renderer = HeadlessMatplotlibRenderer(HeadlessRendererConfig(width=v.width, height=v.height))
+        _WORKER_RENDERERS[size] = renderer
+
+    started = time.perf_counter()
+    views = _WORKER_VIEWS[v.path_type]
+    frames = render_frames(renderer, list(views), task.proj, task.box_size_m, v.box_depth_m, cache=_WORKER_CACHE)
+    saved = renderer.render_sequence(frames=frames, out_path=task.out_path, fps=task.fps, fmt=task.fmt)
+    return {
+        "name": v.name,
+        "params": asdict(v),
+        "output": saved.name,
+        "frames": len(frames),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
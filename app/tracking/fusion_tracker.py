@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import math
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.clock import SYSTEM_CLOCK, Clock
+from app.tracking.base import Tracker
+from app.types import HeadPose
+
+
+@dataclass(slots=True)
+class FusionSource:
+    name: str
+    tracker: Tracker
+    # Source frame -> common frame: (tx, ty, tz, yaw_deg, pitch_deg, roll_deg).
+    extrinsic: tuple[float, float, float, float, float, float] = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+    weight: float = 1.0
+
+
+@dataclass(slots=True)
+class FusionConfig:
+    max_age_ms: float = 60.0
+    freshness_tau_ms: float = 12.0
+    min_confidence: float = 0.1
+    # How quickly the clock-offset estimate may rise; drops are taken immediately so the
+    # estimate tracks the lowest observed transport delay.
+    clock_alpha: float = 0.02
+    rate_window_s: float = 1.0
+
+
+@dataclass(slots=True)
+class SourceStats:
+    name: str
+    rate_hz: float = 0.0
+    clock_offset_ms: float | None = None
+    last_age_ms: float | None = None
+    samples: int = 0
+    # Distinct samples that contributed to a fused pose (not polls).
+    fused: int = 0
+
+
+@dataclass(slots=True)
+class _SourceState:
+    rotation: np.ndarray
+    translation: np.ndarray
+    stats: SourceStats
+    last_timestamp_ms: int | None = None
+    window_started: float = 0.0
+    window_count: int = 0
+    pose: HeadPose | None = None
+    local_ms: float = 0.0
+    fused_timestamp_ms: int | None = None
+
+
+class FusionTracker(Tracker):
+    def __init__(
+        self,
+        sources: list[FusionSource],
+        config: FusionConfig | None = None,
+        clock: Clock | None = None,
+    ) -> None:
+        if not sources:
+            raise ValueError("FusionTracker needs at least one source")
+        self._cfg = config or FusionConfig()
+        self._clock = clock or SYSTEM_CLOCK
+        self._sources = sources
+        self._lock = threading.Lock()
+        now = self._clock.monotonic()
+        self._states = [
+            _SourceState(
+                rotation=_rotation(*s.extrinsic[3:6]),
+                translation=np.asarray(s.extrinsic[0:3], dtype=np.float64),
+                stats=SourceStats(name=s.name),
+                window_started=now,
+            )
+            for s in sources
+        ]
+        self._latest_pose = HeadPose(
+            timestamp_ms=int(self._clock.time() * 1000),
+            position_m=(0.0, 0.0, 0.7),
+            yaw_pitch_roll_deg=(0.0, 0.0, 0.0),
+            confidence=0.0,
+            valid=False,
+        )
+
+    def start(self) -> None:
+        started: list[Tracker] = []
+        try:
+            for s in self._sources:
+                s.tracker.start()
+                started.append(s.tracker)
+        except Exception:
+            for tracker in started:
+                tracker.stop()
+            raise
+
+    def stop(self) -> None:
+        for s in self._sources:
+            s.tracker.stop()
+
+    def source_stats(self) -> list[SourceStats]:
+        with self._lock:
+            return [
+                SourceStats(
+                    name=st.stats.name,
+                    rate_hz=st.stats.rate_hz,
+                    clock_offset_ms=st.stats.clock_offset_ms,
+                    last_age_ms=st.stats.last_age_ms,
+                    samples=st.stats.samples,
+                    fused=st.stats.fused,
+                )
+                for st in self._states
+            ]
+
+    def get_latest_pose(self) -> HeadPose:
+        with self._lock:
+            now_ms = self._clock.time() * 1000.0
+            now_mono = self._clock.monotonic()
+            for source, state in zip(self._sources, self._states):
+                self._ingest(state, source.tracker.get_latest_pose(), now_ms, now_mono)
+            self._latest_pose = self._fuse(now_ms)
+            return self._latest_pose
+
+    def _ingest(self, state: _SourceState, pose: HeadPose, now_ms: float, now_mono: float) -> None:
+        stats = state.stats
+        if pose.timestamp_ms != state.last_timestamp_ms:
+            state.last_timestamp_ms = pose.timestamp_ms
+            stats.samples += 1
+            state.window_count += 1
+
+            # Offset maps the source clock onto ours (skew + typical transport delay).
+            observed = now_ms - pose.timestamp_ms
+            if stats.clock_offset_ms is None or observed < stats.clock_offset_ms:
+                stats.clock_offset_ms = observed
+            else:
+                stats.clock_offset_ms += self._cfg.clock_alpha * (observed - stats.clock_offset_ms)
+
+            state.pose = pose
+
+        elapsed = now_mono - state.window_started
+        if elapsed >= self._cfg.rate_window_s:
+            stats.rate_hz = state.window_count / elapsed
+            state.window_count = 0
+            state.window_started = now_mono
+
+        if state.pose is not None and stats.clock_offset_ms is not None:
+            state.local_ms = state.pose.timestamp_ms + stats.clock_offset_ms
+            stats.last_age_ms = max(0.0, now_ms - state.local_ms)
+
+    def _fuse(self, now_ms: float) -> HeadPose:
+        cfg = self._cfg
+        freshest_ms = -math.inf
+        weight_sum = 0.0
+        pos = np.zeros(3, dtype=np.float64)
+        # Angles are averaged on the circle, so 179 and -179 deg fuse to 180, not 0.
+        rot_sin = np.zeros(3, dtype=np.float64)
+        rot_cos = np.zeros(3, dtype=np.float64)
+        conf = 0.0
+
+        for source, state in zip(self._sources, self._states):
+            pose = state.pose
+            age = state.stats.last_age_ms
+            if pose is None or age is None or not pose.valid or pose.confidence < cfg.min_confidence:
+                continue
+            if age > cfg.max_age_ms:
+                continue
+
+            w = source.weight * pose.confidence * math.exp(-age / max(1e-6, cfg.freshness_tau_ms))
+            if w <= 0.0:
+                continue
+            p = state.rotation @ np.asarray(pose.position_m, dtype=np.float64) + state.translation
+            pos += w * p
+            angles = np.radians(np.asarray(pose.yaw_pitch_roll_deg, dtype=np.float64) + np.asarray(source.extrinsic[3:6]))
+            rot_sin += w * np.sin(angles)
+            rot_cos += w * np.cos(angles)
+            conf += w * pose.confidence
+            weight_sum += w
+            if pose.timestamp_ms != state.fused_timestamp_ms:
+                state.fused_timestamp_ms = pose.timestamp_ms
+                state.stats.fused += 1
+            freshest_ms = max(freshest_ms, state.local_ms)
+
+        if weight_sum <= 0.0:
+            last = self._latest_pose
+            return HeadPose(
+                timestamp_ms=int(now_ms),
+                position_m=last.position_m,
+                yaw_pitch_roll_deg=last.yaw_pitch_roll_deg,
+                confidence=0.0,
+                valid=False,
+            )
+
+        pos /= weight_sum
+        rot = np.degrees(np.arctan2(rot_sin, rot_cos))
+        return HeadPose(
+            timestamp_ms=int(freshest_ms),
+            position_m=(float(pos[0]), float(pos[1]), float(pos[2])),
+            yaw_pitch_roll_deg=(float(rot[0]), float(rot[1]), float(rot[2])),
+            confidence=min(1.0, conf / weight_sum),
+            valid=True,
+        )
+
+
+def _rotation(yaw_deg: float, pitch_deg: float, roll_deg: float) -> np.ndarray:
+    cy, sy = math.cos(math.radians(yaw_deg)), math.sin(math.radians(yaw_deg))
+    cp, sp = math.cos(math.radians(pitch_deg)), math.sin(math.radians(pitch_deg))
+    cr, sr = math.cos(math.radians(roll_deg)), math.sin(math.radians(roll_deg))
+    ry = np.array([[cy, 0.0, sy], [0.0, 1.0, 0.0], [-sy, 0.0, cy]])
+    rx = np.array([[1.0, 0.0, 0.0], [0.0, cp, -sp], [0.0, sp, cp]])
+    rz = np.array([[cr, -sr, 0.0], [sr, cr, 0.0], [0.0, 0.0, 1.0]])
+    return ry @ rx @ rz
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 import threading
-import time
 from dataclasses import dataclass
 
 from PyQt6.QtCore import Qt
 
+from app.clock import SYSTEM_CLOCK, Clock
 from app.tracking.base import Tracker
 from app.types import HeadPose
 
@@ -18,19 +18,20 @@ class KeyboardTrackerConfig:
 
 
 class KeyboardTracker(Tracker):
-    def __init__(self, config: KeyboardTrackerConfig) -> None:
+    def __init__(self, config: KeyboardTrackerConfig, clock: Clock | None = None) -> None:
         self._cfg = config
+        self._clock = clock or SYSTEM_CLOCK
         self._lock = threading.Lock()
         self._running = False
         self._pressed: set[int] = set()
         self._x = 0.0
         self._y = 0.0
-        self._last_mono = time.monotonic()
+        self._last_mono = self._clock.monotonic()
 
     def start(self) -> None:
         with self._lock:
             self._running = True
-            self._last_mono = time.monotonic()
+            self._last_mono = self._clock.monotonic()
 
     def stop(self) -> None:
         with self._lock:
@@ -39,7 +40,7 @@ class KeyboardTracker(Tracker):
 
     def get_latest_pose(self) -> HeadPose:
         with self._lock:
-            now_mono = time.monotonic()
+            now_mono = self._clock.monotonic()
             dt = max(0.0, now_mono - self._last_mono)
             self._last_mono = now_mono
 
@@ -64,7 +65,7 @@ class KeyboardTracker(Tracker):
                 self._y = max(-b, min(b, self._y))
 
             return HeadPose(
-                timestamp_ms=int(time.time() * 1000),
+                timestamp_ms=int(self._clock.time() * 1000),
                 position_m=(self._x, self._y, self._cfg.z_fixed_m),
                 yaw_pitch_roll_deg=(0.0, 0.0, 0.0),
                 confidence=1.0,
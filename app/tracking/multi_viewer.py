@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from app.tracking.pose_filter import FilterConfig, PoseFilter
+from app.types import HeadPose
+
+
+@dataclass(slots=True)
+class BodyObservation:
+    body_id: int
+    position_m: tuple[float, float, float]
+    confidence: float
+
+
+@dataclass(slots=True)
+class MultiViewerConfig:
+    policy: str = "closest"
+    max_match_distance_m: float = 0.35
+    lost_timeout_ms: int = 250
+    min_active_ms: int = 1000
+    switch_seconds: float = 0.4
+    # The main loop still filters the active stream, so per-viewer filters default to
+    # gating + velocity clamp only (alpha 1.0) to avoid stacking two EMAs.
+    viewer_filter: FilterConfig = field(default_factory=lambda: FilterConfig(ema_alpha=1.0, velocity_limit_m_s=3.0))
+
+
+class ViewerTrack:
+    __slots__ = ("viewer_id", "sdk_id", "first_seen_ms", "last_seen_ms", "pose", "filter")
+
+    def __init__(self, viewer_id: int, sdk_id: int, pose: HeadPose, filter_config: FilterConfig) -> None:
+        self.viewer_id = viewer_id
+        self.sdk_id = sdk_id
+        self.first_seen_ms = pose.timestamp_ms
+        self.last_seen_ms = pose.timestamp_ms
+        self.filter = PoseFilter(filter_config)
+        self.pose = self.filter.update(pose, pose)
+
+    def observe(self, pose: HeadPose) -> None:
+        self.last_seen_ms = pose.timestamp_ms
+        self.pose = self.filter.update(pose, self.pose)
+
+    def miss(self, now_ms: int) -> None:
+        missing = HeadPose(
+            timestamp_ms=now_ms,
+            position_m=self.pose.position_m,
+            yaw_pitch_roll_deg=self.pose.yaw_pitch_roll_deg,
+            confidence=0.0,
+            valid=False,
+        )
+        self.pose = self.filter.update(missing, self.pose)
+
+
+class ActiveViewerPolicy(ABC):
+    @abstractmethod
+    def score(self, track: ViewerTrack) -> float:
+        # Lower is better.
+        raise NotImplementedError
+
+    def select(self, tracks: list[ViewerTrack]) -> ViewerTrack | None:
+        if not tracks:
+            return None
+        return min(tracks, key=self.score)
+
+
+class ClosestViewerPolicy(ActiveViewerPolicy):
+    def score(self, track: ViewerTrack) -> float:
+        x, y, z = track.pose.position_m
+        return math.sqrt(x * x + y * y + z * z)
+
+
+class LongestPresentPolicy(ActiveViewerPolicy):
+    def score(self, track: ViewerTrack) -> float:
+        return float(track.first_seen_ms)
+
+
+class MostCentralPolicy(ActiveViewerPolicy):
+    def score(self, track: ViewerTrack) -> float:
+        x, y, _ = track.pose.position_m
+        return math.hypot(x, y)
+
+
+VIEWER_POLICIES: dict[str, type[ActiveViewerPolicy]] = {
+    "closest": ClosestViewerPolicy,
+    "longest": LongestPresentPolicy,
+    "central": MostCentralPolicy,
+}
+
+
+class MultiViewerTracker:
+    def __init__(self, config: MultiViewerConfig, policy: ActiveViewerPolicy | None = None) -> None:
+        if policy is None:
+            if config.policy not in VIEWER_POLICIES:
+                raise ValueError(f"Unknown viewer policy: {config.policy}")
+            policy = VIEWER_POLICIES[config.policy]()
+        self._cfg = config
+        self._policy = policy
+        self._tracks: list[ViewerTrack] = []
+        self._next_id = 0
+        self._active: ViewerTrack | None = None
+        self._active_since_ms = 0
+        self._previous: ViewerTrack | None = None
+        self._switch_started_ms: int | None = None
+
+    @property
+    def viewers(self) -> list[ViewerTrack]:
+        return list(self._tracks)
+
+    @property
+    def active_viewer_id(self) -> int | None:
+        return self._active.viewer_id if self._active is not None else None
+
+    def viewer_poses(self) -> dict[int, HeadPose]:
+        return {t.viewer_id: t.pose for t in self._tracks}
+
+    def set_policy(self, policy: ActiveViewerPolicy) -> None:
+        self._policy = policy
+
+    def update(self, observations: list[BodyObservation], timestamp_ms: int) -> HeadPose:
+        matched = self._associate(observations, timestamp_ms)
+
+        for track in self._tracks:
+            if track not in matched:
+                track.miss(timestamp_ms)
+        self._tracks = [t for t in self._tracks if timestamp_ms - t.last_seen_ms <= self._cfg.lost_timeout_ms]
+
+        self._select_active(timestamp_ms)
+        return self._output_pose(timestamp_ms)
+
+    def _associate(self, observations: list[BodyObservation], now_ms: int) -> set[ViewerTrack]:
+        matched: set[ViewerTrack] = set()
+        pending: list[BodyObservation] = []
+
+        by_sdk_id = {t.sdk_id: t for t in self._tracks if t.sdk_id >= 0}
+        for obs in observations:
+            track = by_sdk_id.pop(obs.body_id, None) if obs.body_id >= 0 else None
+            if track is None:
+                pending.append(obs)
+                continue
+            track.observe(self._pose(obs, now_ms))
+            matched.add(track)
+
+        free = [t for t in self._tracks if t not in matched]
+        if pending and free:
+            # Nearest-neighbour fallback for bodies whose SDK id is missing or was re-issued.
+            obs_pos = np.array([o.position_m for o in pending], dtype=np.float64)
+            track_pos = np.array([t.pose.position_m for t in free], dtype=np.float64)
+            dist = np.linalg.norm(obs_pos[:, None, :] - track_pos[None, :, :], axis=2)
+
+            order = np.argsort(dist, axis=None)
+            cutoff = int(np.searchsorted(dist.reshape(-1)[order], self._cfg.max_match_distance_m, side="right"))
+            obs_used = np.zeros(len(pending), dtype=bool)
+            track_used = np.zeros(len(free), dtype=bool)
+            rows, cols = np.unravel_index(order[:cutoff], dist.shape)
+            for oi, ti in zip(rows.tolist(), cols.tolist()):
+                if obs_used[oi] or track_used[ti]:
+                    continue
+                obs_used[oi] = True
+                track_used[ti] = True
+                track = free[ti]
+                track.sdk_id = pending[oi].body_id
+                track.observe(self._pose(pending[oi], now_ms))
+                matched.add(track)
+            pending = [o for o, used in zip(pending, obs_used.tolist()) if not used]
+
+        for obs in pending:
+            track = ViewerTrack(self._next_id, obs.body_id, self._pose(obs, now_ms), self._cfg.viewer_filter)
+            self._next_id += 1
+            self._tracks.append(track)
+            matched.add(track)
+        return matched
+
+    def _select_active(self, now_ms: int) -> None:
+        current = self._active if self._active in self._tracks else None
+        if current is not None and now_ms - self._active_since_ms < self._cfg.min_active_ms:
+            return
+
+        best = self._policy.select(self._tracks)
+        if best is current:
+            return
+        if self._active is not None and best is not None:
+            self._previous = self._active
+            self._switch_started_ms = now_ms
+        self._active = best
+        self._active_since_ms = now_ms
+
+    def _output_pose(self, now_ms: int) -> HeadPose:
+        active = self._active
+        if active is None or active not in self._tracks:
+            last = active.pose if active is not None else None
+            return HeadPose(
+                timestamp_ms=now_ms,
+                position_m=last.position_m if last else (0.0, 0.0, 0.7),
+                yaw_pitch_roll_deg=last.yaw_pitch_roll_deg if last else (0.0, 0.0, 0.0),
+                confidence=0.0,
+                valid=False,
+            )
+
+        pose = active.pose
+        if self._switch_started_ms is None or self._previous is None:
+            return pose
+
+        duration_ms = self._cfg.switch_seconds * 1000.0
+        t = 1.0 if duration_ms <= 0.0 else (now_ms - self._switch_started_ms) / duration_ms
+        if t >= 1.0:
+            self._previous = None
+            self._switch_started_ms = None
+            return pose
+
+        s = t * t * (3.0 - 2.0 * t)
+        prev = self._previous.pose
+        return HeadPose(
+            timestamp_ms=now_ms,
+            position_m=tuple(prev.position_m[i] * (1.0 - s) + pose.position_m[i] * s for i in range(3)),
+            yaw_pitch_roll_deg=tuple(
+                prev.yaw_pitch_roll_deg[i] * (1.0 - s) + pose.yaw_pitch_roll_deg[i] * s for i in range(3)
+            ),
+            confidence=pose.confidence,
+            valid=True,
+        )
+
+    @staticmethod
+    def _pose(obs: BodyObservation, now_ms: int) -> HeadPose:
+        return HeadPose(
+            timestamp_ms=now_ms,
+            position_m=obs.position_m,
+            yaw_pitch_roll_deg=(0.0, 0.0, 0.0),
+            confidence=obs.confidence,
+            valid=True,
+        )
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import secrets
+import socket
+import struct
+import threading
+from dataclasses import dataclass, field
+
+from app.clock import SYSTEM_CLOCK, Clock
+from app.tracking.base import Tracker
+from app.types import HeadPose
+
+# magic, version, flags, session, seq, capture_ms, sent_us, x, y, z, yaw, pitch, roll, confidence.
+# session is random per publisher (0: unknown), so a restarted sender counting from seq 0
+# again is told apart from very late packets.
+PACKET = struct.Struct("<4sBBHIqq3f3ff")
+PACKET_MAGIC = b"APOS"
+PACKET_VERSION = 1
+FLAG_VALID = 0x01
+DEFAULT_PORT = 50555
+
+_SEQ_MOD = 1 << 32
+# A packet this far behind the newest one is not reordering but a sender that restarted.
+_RESYNC_BACK = 1024
+
+
+def encode_packet(seq: int, pose: HeadPose, sent_us: int, session: int = 0) -> bytes:
+    return PACKET.pack(
+        PACKET_MAGIC,
+        PACKET_VERSION,
+        FLAG_VALID if pose.valid else 0,
+        session,
+        seq % _SEQ_MOD,
+        pose.timestamp_ms,
+        sent_us,
+        *pose.position_m,
+        *pose.yaw_pitch_roll_deg,
+        pose.confidence,
+    )
+
+
+def decode_packet(data: bytes | bytearray | memoryview) -> tuple[int, int, int, HeadPose] | None:
+    # Returns (seq, session, sent_us, pose in the sender's clock) or None for foreign/short packets.
+    if len(data) < PACKET.size:
+        return None
+    magic, version, flags, session, seq, capture_ms, sent_us, x, y, z, yaw, pitch, roll, conf = PACKET.unpack_from(data)
+    if magic != PACKET_MAGIC or version != PACKET_VERSION:
+        return None
+    return seq, session, sent_us, HeadPose(capture_ms, (x, y, z), (yaw, pitch, roll), conf, bool(flags & FLAG_VALID))
+
+
+@dataclass(slots=True)
+class PosePublisherConfig:
+    # "host:port" targets; a multicast group reaches every render node that joined it.
+    destinations: list[str] = field(default_factory=lambda: [f"239.255.42.99:{DEFAULT_PORT}"])
+    multicast_ttl: int = 1
+    multicast_interface: str | None = None
+    poll_interval_s: float = 0.0005
+
+
+class PosePublisher:
+    # Polls a local tracker and sends each new sample once. Poll interval bounds the added
+    # latency; the packet is encoded and sent straight from the polling thread.
+    def __init__(self, tracker: Tracker, config: PosePublisherConfig | None = None, clock: Clock | None = None) -> None:
+        self._tracker = tracker
+        self._cfg = config or PosePublisherConfig()
+        self._clock = clock or SYSTEM_CLOCK
+        self._targets = [_parse_target(t) for t in self._cfg.destinations]
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, self._cfg.multicast_ttl)
+        self._sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+        if self._cfg.multicast_interface:
+            self._sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(self._cfg.multicast_interface))
+        self._seq = 0
+        self.session = secrets.randbelow(0xFFFF) + 1
+        self._last_timestamp_ms: int | None = None
+        self._running = False
+        self._thread: threading.Thread | None = None
+        self.sent = 0
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._tracker.start()
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="pose-publisher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self._tracker.stop()
+        self._sock.close()
+
+    def publish(self, pose: HeadPose) -> None:
+        packet = encode_packet(self._seq, pose, int(self._clock.time() * 1_000_000), self.session)
+        self._seq = (self._seq + 1) % _SEQ_MOD
+        for target in self._targets:
+            self._sock.sendto(packet, target)
+        self.sent += 1
+
+    def _loop(self) -> None:
+        while self._running:
+            pose = self._tracker.get_latest_pose()
+            if pose.timestamp_ms != self._last_timestamp_ms:
+                self._last_timestamp_ms = pose.timestamp_ms
+                try:
+                    self.publish(pose)
+                except OSError:
+                    pass
+            self._clock.sleep(self._cfg.poll_interval_s)
+
+
+@dataclass(slots=True)
+class NetworkTrackerConfig:
+    bind_host: str = "0.0.0.0"
+    port: int = DEFAULT_PORT
+    multicast_group: str | None = "239.255.42.99"
+    multicast_interface: str = "0.0.0.0"
+    # A sample older than this (local clock) is reported invalid so the filter holds.
+    stale_ms: float = 200.0
+    # Same rule as FusionTracker: drops are taken at once, rises are smoothed.
+    clock_alpha: float = 0.02
+    recv_timeout_s: float = 0.2
+
+
+@dataclass(slots=True)
+class NetworkStats:
+    received: int = 0
+    lost: int = 0
+    reordered: int = 0
+    duplicates: int = 0
+    malformed: int = 0
+    # Sender restarts detected (new session id, or a sequence far behind the newest).
+    restarts: int = 0
+    clock_offset_ms: float | None = None
+
+
+class NetworkTracker(Tracker):
+    def __init__(self, config: NetworkTrackerConfig | None = None, clock: Clock | None = None) -> None:
+        self._cfg = config or NetworkTrackerConfig()
+        self._clock = clock or SYSTEM_CLOCK
+        self._lock = threading.Lock()
+        self._stats = NetworkStats()
+        self._sock: socket.socket | None = None
+        self._thread: threading.Thread | None = None
+        self._running = False
+        self._latest: HeadPose | None = None
+        self._latest_recv_ms = 0.0
+        self._highest_seq: int | None = None
+        # Bit i set: packet (highest_seq - i) arrived. Lets late packets un-count a loss.
+        self._seen_mask = 0
+        self._session: int | None = None
+        self._retired_session: int | None = None
+
+    @property
+    def port(self) -> int:
+        return self._sock.getsockname()[1] if self._sock is not None else self._cfg.port
+
+    def start(self) -> None:
+        if self._running:
+            return
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self._cfg.bind_host, self._cfg.port))
+        if self._cfg.multicast_group:
+            mreq = socket.inet_aton(self._cfg.multicast_group) + socket.inet_aton(self._cfg.multicast_interface)
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, mreq)
+        sock.settimeout(self._cfg.recv_timeout_s)
+        self._sock = sock
+        self._running = True
+        self._thread = threading.Thread(target=self._recv_loop, name="pose-receiver", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def stats(self) -> NetworkStats:
+        with self._lock:
+            s = self._stats
+            return NetworkStats(s.received, s.lost, s.reordered, s.duplicates, s.malformed, s.restarts, s.clock_offset_ms)
+
+    def get_latest_pose(self) -> HeadPose:
+        now_ms = self._clock.time() * 1000.0
+        with self._lock:
+            latest = self._latest
+            recv_ms = self._latest_recv_ms
+        if latest is None:
+            return HeadPose(int(now_ms), (0.0, 0.0, 0.7), (0.0, 0.0, 0.0), 0.0, False)
+        if now_ms - recv_ms > self._cfg.stale_ms:
+            return HeadPose(latest.timestamp_ms, latest.position_m, latest.yaw_pitch_roll_deg, 0.0, False)
+        return latest
+
+    def ingest(self, data: bytes | bytearray | memoryview, recv_ms: float) -> None:
+        decoded = decode_packet(data)
+        with self._lock:
+            if decoded is None:
+                self._stats.malformed += 1
+                return
+            seq, session, sent_us, pose = decoded
+            stats = self._stats
+            stats.received += 1
+
+            observed = recv_ms - sent_us / 1000.0
+            if stats.clock_offset_ms is None or observed < stats.clock_offset_ms:
+                stats.clock_offset_ms = observed
+            else:
+                stats.clock_offset_ms += self._cfg.clock_alpha * (observed - stats.clock_offset_ms)
+
+            if not self._accept_seq(seq, session):
+                return
+            self._latest = HeadPose(
+                timestamp_ms=int(pose.timestamp_ms + stats.clock_offset_ms),
+                position_m=pose.position_m,
+                yaw_pitch_roll_deg=pose.yaw_pitch_roll_deg,
+                confidence=pose.confidence,
+                valid=pose.valid,
+            )
+            self._latest_recv_ms = recv_ms
+
+    def _accept_seq(self, seq: int, session: int) -> bool:
+        # True when seq is the newest so far; older packets only update the stats.
+        stats = self._stats
+        if session != self._session and self._highest_seq is not None:
+            if session == self._retired_session:
+                # A late packet from before the restart.
+                stats.reordered += 1
+                return False
+            stats.restarts += 1
+            self._retired_session = self._session
+            self._highest_seq = None
+        self._session = session
+        if self._highest_seq is None:
+            self._highest_seq = seq
+            self._seen_mask = 1
+            return True
+        delta = (seq - self._highest_seq) % _SEQ_MOD
+        if delta == 0:
+            stats.duplicates += 1
+            return False
+        if delta < _SEQ_MOD // 2:
+            stats.lost += delta - 1
+            self._highest_seq = seq
+            self._seen_mask = ((self._seen_mask << delta) | 1) & 0xFFFFFFFFFFFFFFFF
+            return True
+
+        back = _SEQ_MOD - delta
+        if back > _RESYNC_BACK:
+            # A restarted sender without a session id (or a colliding one): start over here.
+            stats.restarts += 1
+            self._highest_seq = seq
+            self._seen_mask = 1
+            return True
+        if back < 64:
+            bit = 1 << back
+            if self._seen_mask & bit:
+                stats.duplicates += 1
+                return False
+            self._seen_mask |= bit
+            stats.lost = max(0, stats.lost - 1)
+        stats.reordered += 1
+        return False
+
+    def _recv_loop(self) -> None:
+        buf = bytearray(PACKET.size + 64)
+        view = memoryview(buf)
+        sock = self._sock
+        while self._running:
+            try:
+                n = sock.recv_into(buf)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self.ingest(view[:n], self._clock.time() * 1000.0)
+
+
+def _parse_target(value: str) -> tuple[str, int]:
+    host, _, port = value.rpartition(":")
+    if not host:
+        return value, DEFAULT_PORT
+    return host, int(port)
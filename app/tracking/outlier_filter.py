@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from app.types import HeadPose
+
+# Scales a median absolute deviation to a Gaussian standard deviation.
+MAD_SCALE = 1.4826
+AXES = ("x", "y", "z", "yaw", "pitch", "roll")
+
+
+@dataclass(slots=True)
+class OutlierConfig:
+    enabled: bool = True
+    # Ring of recent accepted samples the median/MAD are taken over.
+    window: int = 9
+    # Hampel threshold in scaled-MAD units, per axis.
+    threshold: float = 3.5
+    # The test only runs once the ring holds this many samples.
+    min_samples: int = 5
+    # Lower bounds on the per-axis spread, so a perfectly still head does not turn ordinary
+    # sensor noise into rejections.
+    pos_floor_m: float = 0.004
+    rot_floor_deg: float = 0.75
+    # More rejections in a row than this is a real move (or a new viewer), not a glitch:
+    # the ring restarts from the current sample.
+    max_consecutive: int = 3
+    # A gap this long between samples also restarts the ring.
+    reset_after_ms: int = 500
+
+
+@dataclass(slots=True)
+class OutlierStats:
+    checked: int = 0
+    rejected: int = 0
+    reseeds: int = 0
+    # Rejections in which each axis (x, y, z, yaw, pitch, roll) was out of bounds.
+    rejected_axes: list[int] = field(default_factory=lambda: [0] * 6)
+
+
+class OutlierRejector:
+    # Hampel test per axis over a fixed ring of the last accepted tracker samples. A rejected
+    # sample is returned as invalid, so PoseFilter holds exactly as it does on tracking loss;
+    # it never enters the ring, so one bad keypoint cannot drag the median. All per-sample
+    # arrays are preallocated and the NumPy calls write into them.
+    def __init__(self, config: OutlierConfig | None = None) -> None:
+        self.stats = OutlierStats()
+        self._cfg = OutlierConfig()
+        self._ring = np.empty((0, 6))
+        self.set_config(config or OutlierConfig())
+
+    @property
+    def config(self) -> OutlierConfig:
+        return self._cfg
+
+    def set_config(self, config: OutlierConfig) -> None:
+        validate_outlier_config(config)
+        if config.window != self._ring.shape[0]:
+            self._ring = np.empty((config.window, 6))
+            self._dev = np.empty((config.window, 6))
+            self._sample = np.empty(6)
+            self._median = np.empty(6)
+            self._spread = np.empty(6)
+            self._out = np.empty(6, dtype=bool)
+            self.reset()
+        self._floor = np.array([config.pos_floor_m] * 3 + [config.rot_floor_deg] * 3)
+        self._cfg = config
+
+    def reset(self) -> None:
+        self._restart_ring()
+        self._consecutive = 0
+        self._last_timestamp_ms: int | None = None
+        self._last_valid_ms: int | None = None
+        self._last_accepted = True
+
+    def check(self, pose: HeadPose) -> HeadPose:
+        # The pipeline polls faster than the tracker delivers; a repeated sample gets the
+        # verdict it got the first time.
+        if pose.timestamp_ms == self._last_timestamp_ms:
+            return pose if self._last_accepted else _invalid(pose)
+        self._last_timestamp_ms = pose.timestamp_ms
+        self._last_accepted = True
+        if not self._cfg.enabled or not pose.valid:
+            return pose
+
+        cfg = self._cfg
+        x = self._sample
+        x[0:3] = pose.position_m
+        x[3:6] = pose.yaw_pitch_roll_deg
+        self.stats.checked += 1
+        if self._last_valid_ms is not None and pose.timestamp_ms - self._last_valid_ms > cfg.reset_after_ms:
+            self._restart_ring()
+        self._last_valid_ms = pose.timestamp_ms
+
+        n = self._count
+        if n >= cfg.min_samples:
+            # Deviations are taken relative to the new sample, with yaw/pitch/roll wrapped into
+            # (-180, 180] so a turn across +/-180 deg reads as a small step, not a 360 deg jump.
+            dev = self._dev[:n]
+            np.subtract(self._ring[:n], x, out=dev)
+            ang = dev[:, 3:6]
+            np.subtract(180.0, ang, out=ang)
+            np.mod(ang, 360.0, out=ang)
+            np.subtract(180.0, ang, out=ang)
+            np.median(dev, axis=0, out=self._median)
+            np.subtract(dev, self._median, out=dev)
+            np.abs(dev, out=dev)
+            np.median(dev, axis=0, out=self._spread)
+            self._spread *= MAD_SCALE
+            np.maximum(self._spread, self._floor, out=self._spread)
+            self._spread *= cfg.threshold
+            # |x - median| > k * sigma, per axis.
+            np.abs(self._median, out=self._median)
+            np.greater(self._median, self._spread, out=self._out)
+            if self._out.any():
+                self._consecutive += 1
+                if self._consecutive <= cfg.max_consecutive:
+                    self.stats.rejected += 1
+                    axes = self.stats.rejected_axes
+                    for i in np.flatnonzero(self._out):
+                        axes[i] += 1
+                    self._last_accepted = False
+                    return _invalid(pose)
+                self.stats.reseeds += 1
+                self._restart_ring()
+        self._consecutive = 0
+        self._push(x)
+        return pose
+
+    def _push(self, x: np.ndarray) -> None:
+        # Oldest-first order does not matter for a median, so the ring is just overwritten.
+        self._ring[self._head] = x
+        self._head = (self._head + 1) % self._ring.shape[0]
+        self._count = min(self._count + 1, self._ring.shape[0])
+
+    def _restart_ring(self) -> None:
+        self._head = 0
+        self._count = 0
+
+
+def validate_outlier_config(config: OutlierConfig) -> None:
+    if config.window < 3 or not 2 <= config.min_samples <= config.window:
+        raise ValueError("outlier window must be >= 3 and min_samples in [2, window]")
+    if config.threshold <= 0.0:
+        raise ValueError("outlier threshold must be > 0")
+    if config.max_consecutive < 0:
+        raise ValueError("outlier max_consecutive must be >= 0")
+
+
+def _invalid(pose: HeadPose) -> HeadPose:
+    return HeadPose(pose.timestamp_ms, pose.position_m, pose.yaw_pitch_roll_deg, pose.confidence, False)
@@ -5,6 +5,8 @@ from dataclasses import dataclass
 
 from app.types import HeadPose
 
+FILTER_MODES = ("ema", "one_euro")
+
 
 @dataclass(slots=True)
 class FilterConfig:
@@ -13,26 +15,86 @@ class FilterConfig:
     min_confidence: float = 0.4
     loss_timeout_ms: int = 300
     recenter_seconds: float = 0.6
+    # "one_euro": speed-adaptive low-pass; cutoff = min_cutoff + beta * |speed| per axis.
+    mode: str = "ema"
+    pos_min_cutoff_hz: tuple[float, float, float] = (1.0, 1.0, 1.0)
+    pos_beta: tuple[float, float, float] = (5.0, 5.0, 5.0)  # Hz per m/s
+    rot_min_cutoff_hz: tuple[float, float, float] = (1.0, 1.0, 1.0)
+    rot_beta: tuple[float, float, float] = (0.05, 0.05, 0.05)  # Hz per deg/s
+    derivative_cutoff_hz: float = 1.0
+
+
+@dataclass(slots=True)
+class FilterStats:
+    # Episodes are counted once per loss; *_frames count every output in that state.
+    holds: int = 0
+    recenters: int = 0
+    held_frames: int = 0
+    recentered_frames: int = 0
+
+
+class _OneEuroState:
+    # Six channels (x, y, z, yaw, pitch, roll) in preallocated lists that are overwritten
+    # in place, so the per-sample path does no container allocation.
+    __slots__ = ("primed", "value", "deriv", "min_cutoff", "beta")
+
+    def __init__(self) -> None:
+        self.primed = False
+        self.value = [0.0] * 6
+        self.deriv = [0.0] * 6
+        self.min_cutoff = [0.0] * 6
+        self.beta = [0.0] * 6
+
+    def configure(self, config: FilterConfig) -> None:
+        for i in range(3):
+            self.min_cutoff[i] = config.pos_min_cutoff_hz[i]
+            self.beta[i] = config.pos_beta[i]
+            self.min_cutoff[i + 3] = config.rot_min_cutoff_hz[i]
+            self.beta[i + 3] = config.rot_beta[i]
 
 
 class PoseFilter:
     def __init__(self, config: FilterConfig) -> None:
+        _validate(config)
         self._cfg = config
         self._last_stable_pose: HeadPose | None = None
         self._last_output_pose: HeadPose | None = None
         self._loss_started_ms: int | None = None
+        self._recentering = False
+        self.stats = FilterStats()
+        self._euro = _OneEuroState()
+        self._euro.configure(config)
+
+    @property
+    def config(self) -> FilterConfig:
+        return self._cfg
+
+    def set_config(self, config: FilterConfig) -> None:
+        # Swaps tuning parameters in place; filter state (last pose, loss timer) is kept.
+        _validate(config)
+        if config.mode != self._cfg.mode:
+            self._euro.primed = False
+        self._cfg = config
+        self._euro.configure(config)
 
     def update(self, raw_pose: HeadPose, fallback_pose: HeadPose) -> HeadPose:
         if raw_pose.valid and raw_pose.confidence >= self._cfg.min_confidence:
             self._loss_started_ms = None
-            filtered = self._apply_filter(raw_pose)
+            self._recentering = False
+            if self._cfg.mode == "one_euro":
+                filtered = self._apply_one_euro(raw_pose)
+            else:
+                filtered = self._apply_filter(raw_pose)
             self._last_stable_pose = filtered
             self._last_output_pose = filtered
             return filtered
 
+        # Held/recentered output re-seeds the One-Euro state when tracking comes back.
+        self._euro.primed = False
         now_ms = raw_pose.timestamp_ms
         if self._loss_started_ms is None:
             self._loss_started_ms = now_ms
+            self.stats.holds += 1
 
         elapsed_ms = now_ms - self._loss_started_ms
         stable = self._last_stable_pose or fallback_pose
@@ -45,8 +107,13 @@ class PoseFilter:
                 valid=True,
             )
             self._last_output_pose = hold_pose
+            self.stats.held_frames += 1
             return hold_pose
 
+        if not self._recentering:
+            self._recentering = True
+            self.stats.recenters += 1
+        self.stats.recentered_frames += 1
         recentered = self._recenter_pose(now_ms, stable, fallback_pose)
         self._last_output_pose = recentered
         return recentered
@@ -82,6 +149,64 @@ class PoseFilter:
             valid=True,
         )
 
+    def _apply_one_euro(self, pose: HeadPose) -> HeadPose:
+        prev = self._last_output_pose
+        st = self._euro
+        value = st.value
+        if prev is None:
+            self._seed_one_euro(pose)
+            return pose
+        if not st.primed:
+            self._seed_one_euro(prev)
+
+        dt_s = max(1e-3, (pose.timestamp_ms - prev.timestamp_ms) / 1000.0)
+        pos = pose.position_m
+        rot = pose.yaw_pitch_roll_deg
+        px, py, pz = pos[0], pos[1], pos[2]
+
+        # Same velocity clamp as the EMA path, applied to the raw position first.
+        dx, dy, dz = px - value[0], py - value[1], pz - value[2]
+        dist = math.sqrt(dx * dx + dy * dy + dz * dz)
+        max_step = self._cfg.velocity_limit_m_s * dt_s
+        if dist > max_step:
+            scale = max_step / dist
+            px, py, pz = value[0] + dx * scale, value[1] + dy * scale, value[2] + dz * scale
+
+        a_d = _smoothing(self._cfg.derivative_cutoff_hz, dt_s)
+        x0 = self._one_euro_step(0, px, dt_s, a_d)
+        x1 = self._one_euro_step(1, py, dt_s, a_d)
+        x2 = self._one_euro_step(2, pz, dt_s, a_d)
+        r0 = self._one_euro_step(3, rot[0], dt_s, a_d)
+        r1 = self._one_euro_step(4, rot[1], dt_s, a_d)
+        r2 = self._one_euro_step(5, rot[2], dt_s, a_d)
+
+        return HeadPose(
+            timestamp_ms=pose.timestamp_ms,
+            position_m=(x0, x1, x2),
+            yaw_pitch_roll_deg=(r0, r1, r2),
+            confidence=pose.confidence,
+            valid=True,
+        )
+
+    def _one_euro_step(self, i: int, x: float, dt_s: float, a_d: float) -> float:
+        st = self._euro
+        prev = st.value[i]
+        deriv = st.deriv[i] + a_d * ((x - prev) / dt_s - st.deriv[i])
+        cutoff = st.min_cutoff[i] + st.beta[i] * abs(deriv)
+        out = prev + _smoothing(cutoff, dt_s) * (x - prev)
+        st.deriv[i] = deriv
+        st.value[i] = out
+        return out
+
+    def _seed_one_euro(self, pose: HeadPose) -> None:
+        st = self._euro
+        for i in range(3):
+            st.value[i] = pose.position_m[i]
+            st.value[i + 3] = pose.yaw_pitch_roll_deg[i]
+            st.deriv[i] = 0.0
+            st.deriv[i + 3] = 0.0
+        st.primed = True
+
     def _recenter_pose(
         self,
         now_ms: int,
@@ -110,3 +235,15 @@ class PoseFilter:
             confidence=1.0 - t,
             valid=True,
         )
+
+
+def _smoothing(cutoff_hz: float, dt_s: float) -> float:
+    if cutoff_hz <= 0.0:
+        return 0.0
+    tau = 1.0 / (2.0 * math.pi * cutoff_hz)
+    return 1.0 / (1.0 + tau / dt_s)
+
+
+def _validate(config: FilterConfig) -> None:
+    if config.mode not in FILTER_MODES:
+        raise ValueError(f"filter mode must be one of {', '.join(FILTER_MODES)}")
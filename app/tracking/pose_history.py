@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.types import HeadPose
+
+
+@dataclass(slots=True)
+class PoseHistoryConfig:
+    capacity: int = 256
+    max_extrapolation_ms: float = 20.0
+
+
+class PoseHistory:
+    # Every sample is written twice (slot i and i + capacity) so the live window is always a
+    # contiguous, time-ordered slice and np.searchsorted can run on it without copying.
+    def __init__(self, config: PoseHistoryConfig) -> None:
+        self._cfg = PoseHistoryConfig(capacity=0)
+        self.set_config(config)
+
+    @property
+    def config(self) -> PoseHistoryConfig:
+        return self._cfg
+
+    def set_config(self, config: PoseHistoryConfig) -> None:
+        # Only a capacity change reallocates (and so drops) the ring; the extrapolation limit
+        # applies to the samples already held.
+        if config.capacity < 2:
+            raise ValueError("capacity must be >= 2")
+        if config.capacity != self._cfg.capacity:
+            cap = config.capacity
+            self._t = np.zeros(2 * cap, dtype=np.float64)
+            self._pos = np.zeros((2 * cap, 3), dtype=np.float64)
+            self._quat = np.zeros((2 * cap, 4), dtype=np.float64)
+            self._conf = np.zeros(2 * cap, dtype=np.float64)
+            self._start = 0
+            self._count = 0
+        self._cfg = config
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def newest_timestamp_ms(self) -> float | None:
+        if self._count == 0:
+            return None
+        return float(self._t[self._start + self._count - 1])
+
+    def clear(self) -> None:
+        self._start = 0
+        self._count = 0
+
+    def push(self, pose: HeadPose) -> bool:
+        if not pose.valid:
+            return False
+        newest = self.newest_timestamp_ms
+        if newest is not None and pose.timestamp_ms <= newest:
+            return False
+
+        cap = self._cfg.capacity
+        if self._count == cap:
+            self._start = (self._start + 1) % cap
+            self._count -= 1
+        slot = (self._start + self._count) % cap
+        q = ypr_to_quat(pose.yaw_pitch_roll_deg)
+        if self._count > 0:
+            prev = self._quat[self._start + self._count - 1]
+            if float(np.dot(prev, q)) < 0.0:
+                q = -q
+        for i in (slot, slot + cap):
+            self._t[i] = pose.timestamp_ms
+            self._pos[i] = pose.position_m
+            self._quat[i] = q
+            self._conf[i] = pose.confidence
+        self._count += 1
+        return True
+
+    def pose_at(self, timestamp_ms: float) -> HeadPose | None:
+        n = self._count
+        if n == 0:
+            return None
+        lo = self._start
+        t = self._t[lo : lo + n]
+        if n == 1 or timestamp_ms <= t[0]:
+            return self._sample(lo, timestamp_ms)
+
+        if timestamp_ms >= t[-1]:
+            return self._extrapolate(lo + n - 2, lo + n - 1, timestamp_ms)
+
+        i = lo + int(np.searchsorted(t, timestamp_ms, side="right")) - 1
+        return self._interpolate(i, timestamp_ms)
+
+    def _sample(self, i: int, timestamp_ms: float) -> HeadPose:
+        return _pose(timestamp_ms, self._pos[i], self._quat[i], float(self._conf[i]))
+
+    def _interpolate(self, i: int, timestamp_ms: float) -> HeadPose:
+        lo = self._start
+        hi = lo + self._count - 1
+        t0, t1 = self._t[i], self._t[i + 1]
+        h = t1 - t0
+        u = (timestamp_ms - t0) / h
+
+        # Cubic Hermite with Catmull-Rom style tangents from the neighbouring samples.
+        p0, p1 = self._pos[i], self._pos[i + 1]
+        m0 = self._tangent(i, lo, hi) * h
+        m1 = self._tangent(i + 1, lo, hi) * h
+        u2 = u * u
+        u3 = u2 * u
+        pos = (
+            (2.0 * u3 - 3.0 * u2 + 1.0) * p0
+            + (u3 - 2.0 * u2 + u) * m0
+            + (-2.0 * u3 + 3.0 * u2) * p1
+            + (u3 - u2) * m1
+        )
+        quat = slerp(self._quat[i], self._quat[i + 1], u)
+        conf = float(self._conf[i] * (1.0 - u) + self._conf[i + 1] * u)
+        return _pose(timestamp_ms, pos, quat, conf)
+
+    def _extrapolate(self, i0: int, i1: int, timestamp_ms: float) -> HeadPose:
+        t0, t1 = self._t[i0], self._t[i1]
+        ahead = min(timestamp_ms - t1, self._cfg.max_extrapolation_ms)
+        h = t1 - t0
+        if ahead <= 0.0 or h <= 0.0:
+            return self._sample(i1, timestamp_ms)
+        velocity = (self._pos[i1] - self._pos[i0]) / h
+        pos = self._pos[i1] + velocity * ahead
+        quat = slerp(self._quat[i0], self._quat[i1], 1.0 + ahead / h)
+        return _pose(timestamp_ms, pos, quat, float(self._conf[i1]))
+
+    def _tangent(self, i: int, lo: int, hi: int) -> np.ndarray:
+        a = max(lo, i - 1)
+        b = min(hi, i + 1)
+        return (self._pos[b] - self._pos[a]) / (self._t[b] - self._t[a])
+
+
+def ypr_to_quat(yaw_pitch_roll_deg: tuple[float, float, float]) -> np.ndarray:
+    # q = qy(yaw) * qx(pitch) * qz(roll), returned as (w, x, y, z).
+    hy, hp, hr = (math.radians(v) * 0.5 for v in yaw_pitch_roll_deg)
+    cy, sy = math.cos(hy), math.sin(hy)
+    cp, sp = math.cos(hp), math.sin(hp)
+    cr, sr = math.cos(hr), math.sin(hr)
+    return np.array(
+        [
+            cy * cp * cr + sy * sp * sr,
+            cy * sp * cr + sy * cp * sr,
+            sy * cp * cr - cy * sp * sr,
+            cy * cp * sr - sy * sp * cr,
+        ],
+        dtype=np.float64,
+    )
+
+
+def quat_to_ypr(q: np.ndarray) -> tuple[float, float, float]:
+    w, x, y, z = (float(v) for v in q)
+    sin_p = max(-1.0, min(1.0, 2.0 * (w * x - y * z)))
+    pitch = math.asin(sin_p)
+    yaw = math.atan2(2.0 * (x * z + w * y), 1.0 - 2.0 * (x * x + y * y))
+    roll = math.atan2(2.0 * (x * y + w * z), 1.0 - 2.0 * (x * x + z * z))
+    return (math.degrees(yaw), math.degrees(pitch), math.degrees(roll))
+
+
+def slerp(q0: np.ndarray, q1: np.ndarray, u: float) -> np.ndarray:
+    dot = float(np.dot(q0, q1))
+    if dot < 0.0:
+        q1 = -q1
+        dot = -dot
+    if dot > 0.9995:
+        q = q0 + (q1 - q0) * u
+        return q / np.linalg.norm(q)
+    theta = math.acos(dot)
+    s = math.sin(theta)
+    return (math.sin((1.0 - u) * theta) / s) * q0 + (math.sin(u * theta) / s) * q1
+
+
+def _pose(timestamp_ms: float, pos: np.ndarray, quat: np.ndarray, confidence: float) -> HeadPose:
+    return HeadPose(
+        timestamp_ms=int(round(timestamp_ms)),
+        position_m=(float(pos[0]), float(pos[1]), float(pos[2])),
+        yaw_pitch_roll_deg=quat_to_ypr(quat),
+        confidence=confidence,
+        valid=True,
+    )
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import bisect
+import threading
+from dataclasses import dataclass
+
+from app.clock import SYSTEM_CLOCK, Clock
+from app.tracking.base import Tracker
+from app.types import HeadPose
+
+
+@dataclass(slots=True)
+class ReplayTrackerConfig:
+    loop: bool = True
+    # Shift applied to the recorded timestamps, e.g. to emulate a source with a skewed clock.
+    clock_offset_ms: int = 0
+
+
+class ReplayTracker(Tracker):
+    # Plays back recorded poses at the speed of its clock; the pose whose timestamp was reached last is "latest".
+    def __init__(
+        self,
+        poses: list[HeadPose],
+        config: ReplayTrackerConfig | None = None,
+        clock: Clock | None = None,
+    ) -> None:
+        if not poses:
+            raise ValueError("poses must not be empty")
+        self._cfg = config or ReplayTrackerConfig()
+        self._clock = clock or SYSTEM_CLOCK
+        self._poses = sorted(poses, key=lambda p: p.timestamp_ms)
+        self._stamps = [p.timestamp_ms - self._poses[0].timestamp_ms for p in self._poses]
+        self._span_ms = max(1, self._stamps[-1] + 1)
+        self._lock = threading.Lock()
+        self._started_mono: float | None = None
+
+    def start(self) -> None:
+        with self._lock:
+            self._started_mono = self._clock.monotonic()
+
+    def stop(self) -> None:
+        with self._lock:
+            self._started_mono = None
+
+    def get_latest_pose(self) -> HeadPose:
+        with self._lock:
+            started = self._started_mono
+        if started is None:
+            first = self._poses[0]
+            return HeadPose(first.timestamp_ms, first.position_m, first.yaw_pitch_roll_deg, 0.0, False)
+
+        elapsed_ms = int((self._clock.monotonic() - started) * 1000)
+        lap = 0
+        if self._cfg.loop:
+            lap, elapsed_ms = divmod(elapsed_ms, self._span_ms)
+        idx = max(0, bisect.bisect_right(self._stamps, elapsed_ms) - 1)
+        pose = self._poses[idx]
+        return HeadPose(
+            timestamp_ms=pose.timestamp_ms + lap * self._span_ms + self._cfg.clock_offset_ms,
+            position_m=pose.position_m,
+            yaw_pitch_roll_deg=pose.yaw_pitch_roll_deg,
+            confidence=pose.confidence,
+            valid=pose.valid,
+        )
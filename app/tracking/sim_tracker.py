@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import math
+import threading
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from app.clock import SYSTEM_CLOCK, Clock
+from app.sim.camera_path import PathConfig, generate_lissajous_path, generate_orbit_path
+from app.tracking.base import Tracker
+from app.types import HeadPose
+
+SIM_PATHS = {"orbit": generate_orbit_path, "lissajous": generate_lissajous_path}
+
+
+@dataclass(slots=True)
+class SimTrackerConfig:
+    path_type: str = "lissajous"
+    # duration_s is the loop period; fps is ignored in favour of sample_rate_hz.
+    path: PathConfig = field(default_factory=PathConfig)
+    sample_rate_hz: float = 60.0
+    noise_std_m: float = 0.0
+    rot_noise_std_deg: float = 0.0
+    # > 0 draws noise from a Student-t with this many degrees of freedom (heavy tails).
+    noise_t_dof: float = 0.0
+    dropout_prob: float = 0.0
+    dropout_confidence: float = 0.1
+    burst_prob: float = 0.0
+    burst_len_samples: int = 10
+    latency_ms: float = 0.0
+    seed: int = 0
+
+
+class SimTracker(Tracker):
+    # All noise/loss draws are precomputed for one path loop from a seeded RNG, so a given
+    # config always yields the same sample stream regardless of how often it is polled.
+    def __init__(self, config: SimTrackerConfig, clock: Clock | None = None) -> None:
+        if config.sample_rate_hz <= 0.0:
+            raise ValueError("sample_rate_hz must be > 0")
+        if config.path_type not in SIM_PATHS:
+            raise ValueError(f"Unknown path type: {config.path_type}")
+        self._cfg = config
+        self._clock = clock or SYSTEM_CLOCK
+        self._lock = threading.Lock()
+        self._started_mono: float | None = None
+        self._started_wall_ms = 0.0
+
+        rate = int(round(config.sample_rate_hz))
+        path_cfg = PathConfig(
+            duration_s=config.path.duration_s,
+            fps=max(1, rate),
+            x_amp_m=config.path.x_amp_m,
+            y_amp_m=config.path.y_amp_m,
+            z_base_m=config.path.z_base_m,
+            z_amp_m=config.path.z_amp_m,
+            clamp_xy_m=config.path.clamp_xy_m,
+            clamp_z_min_m=config.path.clamp_z_min_m,
+            clamp_z_max_m=config.path.clamp_z_max_m,
+        )
+        poses = SIM_PATHS[config.path_type](path_cfg)
+        n = len(poses)
+        rng = np.random.default_rng(config.seed)
+
+        self._pos = np.array([p.position_m for p in poses], dtype=np.float64)
+        self._rot = np.array([p.yaw_pitch_roll_deg for p in poses], dtype=np.float64)
+        self._pos += self._noise(rng, (n, 3), config.noise_std_m)
+        self._rot += self._noise(rng, (n, 3), config.rot_noise_std_deg)
+
+        self._conf = np.ones(n, dtype=np.float64)
+        self._conf[rng.random(n) < config.dropout_prob] = config.dropout_confidence
+        self._valid = np.ones(n, dtype=bool)
+        for start in np.flatnonzero(rng.random(n) < config.burst_prob):
+            self._valid[start : start + config.burst_len_samples] = False
+        self._n = n
+
+    @property
+    def samples_per_loop(self) -> int:
+        return self._n
+
+    def start(self) -> None:
+        with self._lock:
+            self._started_mono = self._clock.monotonic()
+            self._started_wall_ms = self._clock.time() * 1000.0
+
+    def stop(self) -> None:
+        with self._lock:
+            self._started_mono = None
+
+    def get_latest_pose(self) -> HeadPose:
+        with self._lock:
+            started = self._started_mono
+            started_wall_ms = self._started_wall_ms
+        if started is None:
+            return HeadPose(int(self._clock.time() * 1000), (0.0, 0.0, 0.7), (0.0, 0.0, 0.0), 0.0, False)
+
+        # Only samples captured at least latency_ms ago have been "delivered".
+        captured_s = self._clock.monotonic() - started - self._cfg.latency_ms / 1000.0
+        index = math.floor(captured_s * self._cfg.sample_rate_hz)
+        if index < 0:
+            return HeadPose(int(started_wall_ms), (0.0, 0.0, 0.7), (0.0, 0.0, 0.0), 0.0, False)
+        return self.sample(index, started_wall_ms)
+
+    def sample(self, index: int, t0_ms: float = 0.0) -> HeadPose:
+        i = index % self._n
+        p = self._pos[i]
+        r = self._rot[i]
+        return HeadPose(
+            timestamp_ms=int(t0_ms + index * 1000.0 / self._cfg.sample_rate_hz),
+            position_m=(float(p[0]), float(p[1]), float(p[2])),
+            yaw_pitch_roll_deg=(float(r[0]), float(r[1]), float(r[2])),
+            confidence=float(self._conf[i]),
+            valid=bool(self._valid[i]),
+        )
+
+    def _noise(self, rng: np.random.Generator, shape: tuple[int, int], std: float) -> np.ndarray:
+        if std <= 0.0:
+            return np.zeros(shape, dtype=np.float64)
+        dof = self._cfg.noise_t_dof
+        if dof > 0.0:
+            draw = rng.standard_t(dof, size=shape)
+            if dof > 2.0:
+                # Rescale so std keeps its meaning for the heavy-tailed draw.
+                draw *= math.sqrt((dof - 2.0) / dof)
+            return draw * std
+        return rng.normal(0.0, std, size=shape)
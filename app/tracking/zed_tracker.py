@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import threading
-import time
 from dataclasses import dataclass
 from typing import Any
 
+from app.clock import SYSTEM_CLOCK, Clock
 from app.config.settings import CameraSettings
 from app.tracking.base import Tracker
+from app.tracking.multi_viewer import BodyObservation, MultiViewerConfig, MultiViewerTracker
 from app.types import HeadPose
 
 try:
@@ -18,16 +19,47 @@ except Exception:  # pragma: no cover - runtime dependency
 @dataclass(slots=True)
 class ZedTrackerConfig:
     camera: CameraSettings
+    # Failed grabs back off exponentially from backoff_initial_s up to backoff_max_s.
+    backoff_initial_s: float = 0.002
+    backoff_max_s: float = 1.0
+    # Consecutive failures before the camera is closed and reopened (sooner on disconnect errors).
+    reopen_after_failures: int = 20
+    # No successful grab for this long: poses are reported invalid and stats().stale is set.
+    stale_ms: float = 250.0
+    # Grab no faster than the consumer reads (with headroom), but never below min_grab_fps.
+    adaptive_pacing: bool = True
+    pacing_headroom: float = 1.25
+    min_grab_fps: float = 15.0
+
+
+# Errors after which retrying grab() on the same handle does not help.
+_REOPEN_ERRORS = frozenset({"CAMERA_NOT_DETECTED", "CAMERA_DETECTION_ISSUE", "CAMERA_FAILED_TO_SETUP", "CAMERA_REBOOTING"})
+
+
+@dataclass(slots=True)
+class CaptureStats:
+    state: str = "stopped"  # stopped | running | backoff | reopening
+    grabs_per_s: float = 0.0
+    drops_per_s: float = 0.0
+    total_grabs: int = 0
+    total_drops: int = 0
+    reopens: int = 0
+    consecutive_failures: int = 0
+    stale: bool = True
+    last_error: str | None = None
+    grab_interval_s: float = 0.0
+    consumer_hz: float = 0.0
 
 
 class ZedTracker(Tracker):
-    def __init__(self, config: ZedTrackerConfig) -> None:
+    def __init__(self, config: ZedTrackerConfig, clock: Clock | None = None) -> None:
         self._cfg = config
+        self._clock = clock or SYSTEM_CLOCK
         self._lock = threading.Lock()
         self._running = False
         self._thread: threading.Thread | None = None
         self._latest_pose = HeadPose(
-            timestamp_ms=int(time.time() * 1000),
+            timestamp_ms=int(self._clock.time() * 1000),
             position_m=(0.0, 0.0, 0.7),
             yaw_pitch_roll_deg=(0.0, 0.0, 0.0),
             confidence=0.0,
@@ -36,6 +68,25 @@ class ZedTracker(Tracker):
 
         self._camera: Any = None
         self._bodies: Any = None
+        self._runtime: Any = None
+        self._body_runtime: Any = None
+        # Only the capture thread touches _viewers; readers get the snapshot it publishes under _lock.
+        self._viewers: MultiViewerTracker | None = None
+        self._viewer_poses: dict[int, HeadPose] = {}
+        if config.camera.multi_viewer:
+            self._viewers = MultiViewerTracker(MultiViewerConfig(policy=config.camera.viewer_policy))
+
+        # Supervisor state; written by the capture thread, read under _lock by stats().
+        self._stats = CaptureStats()
+        self._backoff_s = 0.0
+        self._last_success = float("-inf")
+        self._next_grab = 0.0
+        self._window_start = 0.0
+        self._window_grabs = 0
+        self._window_drops = 0
+        # Consumer read rate, measured in get_latest_pose() (EMA of the read interval).
+        self._last_read: float | None = None
+        self._read_interval_s = 0.0
 
     def start(self) -> None:
         if self._running:
@@ -43,14 +94,79 @@ class ZedTracker(Tracker):
         if sl is None:
             raise RuntimeError("pyzed.sl not available. Install ZED SDK Python bindings.")
 
-        self._camera = sl.Camera()
+        err = self._open_camera()
+        if err is not None:
+            raise RuntimeError(err)
+
+        self._runtime = sl.RuntimeParameters()
+        self._body_runtime = sl.BodyTrackingRuntimeParameters()
+        now = self._clock.monotonic()
+        self._window_start = now
+        self._next_grab = now
+        self._last_success = now
+        with self._lock:
+            self._stats = CaptureStats(state="running", stale=False)
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name="zed-capture", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._running = False
+        if self._thread is not None:
+            # The capture thread owns the camera and closes it on its way out; waiting without a
+            # timeout keeps a reopen in progress from racing a close here or a restart.
+            self._thread.join()
+            self._thread = None
+        else:
+            self._close_camera()
+        with self._lock:
+            self._stats.state = "stopped"
+
+    def get_latest_pose(self) -> HeadPose:
+        now = self._clock.monotonic()
+        with self._lock:
+            if self._last_read is not None:
+                dt = now - self._last_read
+                self._read_interval_s = dt if self._read_interval_s == 0.0 else self._read_interval_s + 0.1 * (dt - self._read_interval_s)
+            self._last_read = now
+            pose = self._latest_pose
+            stale = self._running and (now - self._last_success) * 1000.0 > self._cfg.stale_ms
+        if stale and pose.valid:
+            return HeadPose(pose.timestamp_ms, pose.position_m, pose.yaw_pitch_roll_deg, 0.0, False)
+        return pose
+
+    def get_viewer_poses(self) -> dict[int, HeadPose]:
+        with self._lock:
+            return dict(self._viewer_poses)
+
+    def stats(self) -> CaptureStats:
+        now = self._clock.monotonic()
+        with self._lock:
+            s = self._stats
+            stale = s.state == "stopped" or (now - self._last_success) * 1000.0 > self._cfg.stale_ms
+            return CaptureStats(
+                state=s.state,
+                grabs_per_s=s.grabs_per_s,
+                drops_per_s=s.drops_per_s,
+                total_grabs=s.total_grabs,
+                total_drops=s.total_drops,
+                reopens=s.reopens,
+                consecutive_failures=s.consecutive_failures,
+                stale=stale,
+                last_error=s.last_error,
+                grab_interval_s=s.grab_interval_s,
+                consumer_hz=1.0 / self._read_interval_s if self._read_interval_s > 0.0 else 0.0,
+            )
+
+    def _open_camera(self) -> str | None:
+        camera = sl.Camera()
         init = sl.InitParameters()
         init.camera_fps = self._cfg.camera.grab_fps
         init.depth_mode = getattr(sl.DEPTH_MODE, self._cfg.camera.depth_mode, sl.DEPTH_MODE.PERFORMANCE)
 
-        err = self._camera.open(init)
+        err = camera.open(init)
         if err != sl.ERROR_CODE.SUCCESS:
-            raise RuntimeError(f"Failed to open ZED camera: {err}")
+            return f"Failed to open ZED camera: {err}"
 
         body_params = sl.BodyTrackingParameters()
         body_params.enable_tracking = True
@@ -58,50 +174,129 @@ class ZedTracker(Tracker):
         body_params.body_format = sl.BODY_FORMAT.BODY_38
         body_params.detection_model = body_model
 
-        err = self._camera.enable_body_tracking(body_params)
+        err = camera.enable_body_tracking(body_params)
         if err != sl.ERROR_CODE.SUCCESS:
-            self._camera.close()
-            raise RuntimeError(f"Failed to enable body tracking: {err}")
+            camera.close()
+            return f"Failed to enable body tracking: {err}"
 
+        self._camera = camera
         self._bodies = sl.Bodies()
-        self._running = True
-        self._thread = threading.Thread(target=self._capture_loop, name="zed-capture", daemon=True)
-        self._thread.start()
+        return None
 
-    def stop(self) -> None:
-        self._running = False
-        if self._thread is not None:
-            self._thread.join(timeout=2.0)
-            self._thread = None
-
-        if self._camera is not None:
-            try:
-                self._camera.disable_body_tracking()
-            except Exception:
-                pass
+    def _close_camera(self) -> None:
+        if self._camera is None:
+            return
+        try:
+            self._camera.disable_body_tracking()
+        except Exception:
+            pass
+        try:
             self._camera.close()
-            self._camera = None
-
-    def get_latest_pose(self) -> HeadPose:
-        with self._lock:
-            return self._latest_pose
+        except Exception:
+            pass
+        self._camera = None
 
     def _capture_loop(self) -> None:
-        runtime = sl.RuntimeParameters()
-        body_runtime = sl.BodyTrackingRuntimeParameters()
+        try:
+            while self._running:
+                self._capture_step()
+        finally:
+            self._close_camera()
+
+    def _capture_step(self) -> None:
+        # One supervised iteration: pace, grab (or recover), publish, roll the 1 s counters.
+        clock = self._clock
+        wait = self._next_grab - clock.monotonic()
+        if wait > 0.0:
+            clock.sleep(wait)
+        started = clock.monotonic()
+        interval = self._grab_interval()
+        self._next_grab = max(self._next_grab + interval, started)
+
+        if self._camera is None:
+            self._reopen()
+        else:
+            err = self._camera.grab(self._runtime)
+            if err == sl.ERROR_CODE.SUCCESS:
+                self._camera.retrieve_bodies(self._bodies, self._body_runtime)
+                pose = self._extract_pose(self._bodies)
+                now = clock.monotonic()
+                self._backoff_s = 0.0
+                self._window_grabs += 1
+                with self._lock:
+                    self._latest_pose = pose
+                    self._last_success = now
+                    self._stats.state = "running"
+                    self._stats.total_grabs += 1
+                    self._stats.consecutive_failures = 0
+                    self._stats.grab_interval_s = interval
+            else:
+                self._on_grab_failure(err)
+        self._roll_window()
 
-        while self._running:
-            if self._camera.grab(runtime) != sl.ERROR_CODE.SUCCESS:
-                time.sleep(0.002)
-                continue
+    def _grab_interval(self) -> float:
+        cfg = self._cfg
+        fastest = 1.0 / max(1.0, float(cfg.camera.grab_fps))
+        if not cfg.adaptive_pacing:
+            return 0.0
+        slowest = 1.0 / max(1.0, cfg.min_grab_fps)
+        with self._lock:
+            read_interval = self._read_interval_s
+        if read_interval <= 0.0:
+            return fastest
+        return min(slowest, max(fastest, read_interval / cfg.pacing_headroom))
+
+    def _on_grab_failure(self, err: Any) -> None:
+        self._window_drops += 1
+        name = getattr(err, "name", str(err))
+        with self._lock:
+            self._stats.total_drops += 1
+            self._stats.consecutive_failures += 1
+            self._stats.last_error = name
+            self._stats.state = "backoff"
+            failures = self._stats.consecutive_failures
+        if name in _REOPEN_ERRORS or failures >= self._cfg.reopen_after_failures:
+            self._close_camera()
+            self._reopen()
+            return
+        self._sleep_backoff()
 
-            self._camera.retrieve_bodies(self._bodies, body_runtime)
-            pose = self._extract_pose(self._bodies)
+    def _reopen(self) -> None:
+        with self._lock:
+            self._stats.state = "reopening"
+        self._close_camera()
+        err = self._open_camera()
+        if err is None:
             with self._lock:
-                self._latest_pose = pose
+                self._stats.reopens += 1
+                self._stats.consecutive_failures = 0
+                self._stats.state = "running"
+            self._backoff_s = 0.0
+            return
+        with self._lock:
+            self._stats.last_error = err
+        self._sleep_backoff()
+
+    def _sleep_backoff(self) -> None:
+        cfg = self._cfg
+        self._backoff_s = cfg.backoff_initial_s if self._backoff_s == 0.0 else min(cfg.backoff_max_s, self._backoff_s * 2.0)
+        self._clock.sleep(self._backoff_s)
+        self._next_grab = self._clock.monotonic()
+
+    def _roll_window(self) -> None:
+        now = self._clock.monotonic()
+        elapsed = now - self._window_start
+        if elapsed < 1.0:
+            return
+        with self._lock:
+            self._stats.grabs_per_s = self._window_grabs / elapsed
+            self._stats.drops_per_s = self._window_drops / elapsed
+        self._window_grabs = 0
+        self._window_drops = 0
+        self._window_start = now
 
     def _extract_pose(self, bodies: Any) -> HeadPose:
-        now_ms = int(time.time() * 1000)
+        now_ms = int(self._clock.time() * 1000)
         if not bodies.is_new:
             return HeadPose(
                 timestamp_ms=now_ms,
@@ -111,6 +306,24 @@ class ZedTracker(Tracker):
                 valid=False,
             )
 
+        if self._viewers is not None:
+            observations = []
+            for body in bodies.body_list:
+                point = self._head_point(body)
+                if point is not None:
+                    observations.append(
+                        BodyObservation(
+                            body_id=int(getattr(body, "id", -1)),
+                            position_m=point,
+                            confidence=float(body.confidence) / 100.0,
+                        )
+                    )
+            pose = self._viewers.update(observations, now_ms)
+            viewer_poses = self._viewers.viewer_poses()
+            with self._lock:
+                self._viewer_poses = viewer_poses
+            return pose
+
         if len(bodies.body_list) == 0:
             return HeadPose(
                 timestamp_ms=now_ms,
@@ -121,19 +334,8 @@ class ZedTracker(Tracker):
             )
 
         body = max(bodies.body_list, key=lambda b: b.confidence)
-        # BODY_38 index for nose/head center can vary by SDK version.
-        # We pick the first reliable upper-face keypoint available.
-        kp3d = body.keypoint
-        idx_candidates = (27, 26, 30, 0)
-        point = None
-        for idx in idx_candidates:
-            if idx < len(kp3d):
-                p = kp3d[idx]
-                if all(abs(v) < 1000 for v in p):
-                    point = p
-                    break
-
-        if point is None:
+        position = self._head_point(body)
+        if position is None:
             return HeadPose(
                 timestamp_ms=now_ms,
                 position_m=self._latest_pose.position_m,
@@ -142,7 +344,6 @@ class ZedTracker(Tracker):
                 valid=False,
             )
 
-        position = (float(point[0]), float(point[1]), float(point[2]))
         return HeadPose(
             timestamp_ms=now_ms,
             position_m=position,
@@ -150,3 +351,16 @@ class ZedTracker(Tracker):
             confidence=float(body.confidence) / 100.0,
             valid=True,
         )
+
+    @staticmethod
+    def _head_point(body: Any) -> tuple[float, float, float] | None:
+        # BODY_38 index for nose/head center can vary by SDK version.
+        # We pick the first reliable upper-face keypoint available.
+        kp3d = body.keypoint
+        idx_candidates = (27, 26, 30, 0)
+        for idx in idx_candidates:
+            if idx < len(kp3d):
+                p = kp3d[idx]
+                if all(abs(v) < 1000 for v in p):
+                    return (float(p[0]), float(p[1]), float(p[2]))
+        return None
@@ -47,13 +47,13 @@ class ControlPanel(QWidget):
         depth_value = int(round(initial_depth * 100))
 
         self._fov_label = QLabel(str(fov_value))
-        fov = QSlider(Qt.Orientation.Horizontal)
+        self._fov_slider = fov = QSlider(Qt.Orientation.Horizontal)
         fov.setRange(40, 100)
         fov.setValue(max(40, min(100, fov_value)))
         fov.valueChanged.connect(lambda v: (self._fov_label.setText(str(v)), on_fov_change(float(v))))
 
         self._depth_label = QLabel(f"{depth_value/100.0:.2f}")
-        depth = QSlider(Qt.Orientation.Horizontal)
+        self._depth_slider = depth = QSlider(Qt.Orientation.Horizontal)
         depth.setRange(50, 250)
         depth.setValue(max(50, min(250, depth_value)))
         depth.valueChanged.connect(lambda v: (self._depth_label.setText(f"{v/100.0:.2f}"), on_depth_change(v / 100.0)))
@@ -66,6 +66,17 @@ class ControlPanel(QWidget):
         root.addLayout(btn_row)
         root.addLayout(form)
 
+    def set_values(self, fov: float, depth: float) -> None:
+        # Reflect externally applied values without echoing them back through the callbacks.
+        fov_value = max(40, min(100, int(round(fov))))
+        depth_value = max(50, min(250, int(round(depth * 100))))
+        for slider, value in ((self._fov_slider, fov_value), (self._depth_slider, depth_value)):
+            slider.blockSignals(True)
+            slider.setValue(value)
+            slider.blockSignals(False)
+        self._fov_label.setText(str(fov_value))
+        self._depth_label.setText(f"{depth_value/100.0:.2f}")
+
     def _toggle_run(self) -> None:
         self._running = not self._running
         self._start_stop_btn.setText("Stop" if self._running else "Start")
@@ -1,5 +1,7 @@
 from pathlib import Path
 
+import numpy as np
+
 from app.colab_render import main
 
 
@@ -27,3 +29,47 @@ def test_colab_pipeline_smoke(tmp_path: Path) -> None:
     assert rc == 0
     assert out.exists()
     assert out.stat().st_size > 0
+
+
+def test_colab_pipeline_reuses_cached_frames(tmp_path: Path, monkeypatch) -> None:
+    from app.render.headless_matplotlib import HeadlessMatplotlibRenderer
+
+    calls = []
+    real_render = HeadlessMatplotlibRenderer.render_frame
+
+    def counting_render(self, **kwargs):
+        calls.append(1)
+        return real_render(self, **kwargs)
+
+    monkeypatch.setattr(HeadlessMatplotlibRenderer, "render_frame", counting_render)
+    args = [
+        "--duration-s", "0.5", "--fps", "8", "--width", "160", "--height", "90",
+        "--format", "gif", "--cache-dir", str(tmp_path / "cache"),
+    ]
+
+    assert main([*args, "--out", str(tmp_path / "a.gif")]) == 0
+    first = len(calls)
+    assert main([*args, "--out", str(tmp_path / "b.gif")]) == 0
+
+    assert 0 < first <= 4  # closed orbit: first and last poses coincide and share a frame
+    assert len(calls) == first
+    assert (tmp_path / "b.gif").stat().st_size > 0
+
+
+def test_colab_pipeline_raw_frame_store(tmp_path: Path) -> None:
+    from app.render.frame_store import FrameStore
+
+    rc = main(
+        [
+            "--duration-s", "0.5", "--fps", "8", "--width", "160", "--height", "90",
+            "--format", "raw", "--thumbnail-levels", "2", "--out", str(tmp_path / "run.mp4"),
+        ]
+    )
+
+    assert rc == 0
+    store = FrameStore.open(tmp_path / "run.frames")
+    assert len(store) == 4 and store.written.all()
+    assert store.thumbnails(2).shape == (4, 22, 40, 3)
+    assert store.pose(2) is not None
+    assert not np.allclose(store.view_matrix(0), store.view_matrix(2))
+    assert store[1].any()
@@ -0,0 +1,97 @@
+import pytest
+
+from app.clock import VirtualClock
+from app.config.settings import DEFAULT_CONFIG_PATH, load_settings
+from app.pipeline import FrameMetrics, HeadlessConfig, PosePipeline, run_headless
+from app.tracking.sim_tracker import SimTracker, SimTrackerConfig
+
+
+def _pipeline(latency_ms: float = 0.0, **sim) -> tuple[PosePipeline, VirtualClock]:
+    clock = VirtualClock()
+    tracker = SimTracker(SimTrackerConfig(sample_rate_hz=60.0, latency_ms=latency_ms, **sim), clock=clock)
+    return PosePipeline(tracker, load_settings(DEFAULT_CONFIG_PATH), clock), clock
+
+
+def test_virtual_clock_only_moves_when_advanced() -> None:
+    clock = VirtualClock(start_wall_s=100.0)
+    assert clock.time() == 100.0 and clock.monotonic() == 0.0
+
+    clock.advance(1.5)
+    clock.sleep(0.5)
+
+    assert clock.time() == 102.0
+    assert clock.perf_counter() == 2.0
+    with pytest.raises(ValueError):
+        clock.advance(-1.0)
+
+
+def test_headless_run_is_faster_than_real_time_and_deterministic() -> None:
+    reports = []
+    for _ in range(2):
+        pipeline, clock = _pipeline(latency_ms=30.0, noise_std_m=0.002, dropout_prob=0.05, seed=3)
+        reports.append(run_headless(pipeline, clock, HeadlessConfig(duration_s=30.0, tick_ms=10.0)))
+    a, b = reports
+
+    assert a.frames == 3000
+    assert a.simulated_s == pytest.approx(30.0)
+    assert a.speedup > 1.0
+    assert (a.latency_mean_ms, a.latency_p99_ms, a.valid_ratio) == (b.latency_mean_ms, b.latency_p99_ms, b.valid_ratio)
+    # 30 ms transport plus up to one 60 Hz sample interval of age.
+    assert 30.0 <= a.latency_p50_ms <= 48.0
+
+
+def test_stall_reproduces_a_latency_spike() -> None:
+    pipeline, clock = _pipeline()
+    report = run_headless(pipeline, clock, HeadlessConfig(duration_s=5.0, tick_ms=10.0, stalls=[(2.0, 200.0)]))
+
+    assert report.latency_max_ms >= 200.0
+    assert report.latency_p99_ms < 50.0
+
+
+def test_frame_metrics_use_the_injected_clock() -> None:
+    clock = VirtualClock()
+    metrics = FrameMetrics(clock)
+    for _ in range(121):
+        clock.advance(1.0 / 120.0)
+        metrics.update(10.0)
+
+    assert metrics.fps == pytest.approx(120.0, rel=0.02)
+    assert metrics.latency_ema_ms == pytest.approx(10.0)
+
+
+def test_off_axis_mode_projection_follows_the_head() -> None:
+    pipeline, clock = _pipeline()
+    pipeline.tracker.start()
+    first = pipeline.step(60.0, 1.2).states[0]
+    clock.advance(0.01)
+    assert pipeline.step(60.0, 1.2).states[0].proj_matrix is first.proj_matrix
+
+    pipeline.settings.render.projection_mode = "off_axis"
+    projs = []
+    for _ in range(50):
+        clock.advance(0.01)
+        projs.append(pipeline.step(60.0, 1.2).states[0].proj_matrix)
+
+    assert len({tuple(p) for p in projs}) > 1
+
+
+def test_tracking_reload_keeps_history_and_negative_lead_interpolates() -> None:
+    pipeline, clock = _pipeline()
+    pipeline.tracker.start()
+    for _ in range(30):
+        clock.advance(0.005)
+        pipeline.step(60.0, 1.2)
+    held = len(pipeline.history)
+    assert held > 2
+
+    tracking = load_settings(DEFAULT_CONFIG_PATH).tracking
+    tracking.min_confidence = 0.2
+    pipeline.set_tracking(tracking)
+    assert len(pipeline.history) == held
+
+    # One 60 Hz period behind: the display time falls between captured samples.
+    pipeline.settings.render.display_lead_ms = -17.0
+    clock.advance(0.005)
+    frame = pipeline.step(60.0, 1.2)
+    assert frame.filtered.valid
+    assert clock.time() * 1000.0 - 17.0 < pipeline.history.newest_timestamp_ms
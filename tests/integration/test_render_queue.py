@@ -0,0 +1,105 @@
+import multiprocessing
+import os
+import socket
+import time
+from pathlib import Path
+
+import imageio.v2 as imageio
+import numpy as np
+import pytest
+
+from app.render.headless_matplotlib import HeadlessMatplotlibRenderer, HeadlessRendererConfig
+from app.render_queue import FINALIZE_TASK, JobQueue, QueueConfig, main, render_chunk, run_worker
+
+FAST = QueueConfig(heartbeat_s=0.05, stale_s=5.0, poll_s=0.02)
+
+
+def _submit(root: Path, chunk_frames: int = 3) -> JobQueue:
+    assert main(
+        [
+            "submit", str(root), "--duration-s", "1.0", "--fps", "10", "--width", "96", "--height", "54",
+            "--format", "gif", "--chunk-frames", str(chunk_frames),
+        ]
+    ) == 0
+    return JobQueue(root, FAST)
+
+
+def _work(root: Path, worker_id: str) -> None:
+    run_worker(root, worker_id, FAST)
+
+
+def test_worker_processes_share_the_queue_and_finalize_once(tmp_path: Path) -> None:
+    queue = _submit(tmp_path / "job")
+    assert queue.job.chunk_count == 4
+    with pytest.raises(SystemExit):
+        _submit(tmp_path / "job")
+
+    workers = [multiprocessing.Process(target=_work, args=(queue.root, f"node{i}")) for i in range(3)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join(60)
+        assert w.exitcode == 0
+
+    status = queue.status()
+    assert (status.done, status.pending, status.claimed, status.failed) == (4, 0, 0, 0)
+    assert status.output == queue.root / "output.gif"
+    assert len(imageio.mimread(status.output)) == 10
+
+    views, proj = queue.load_views()
+    renderer = HeadlessMatplotlibRenderer(HeadlessRendererConfig(width=96, height=54))
+    expected = renderer.render_frame(views[4], proj, queue.job.box_size_m, queue.job.box_depth_m)
+    assert np.array_equal(np.load(queue.chunk_path(1))[1], expected)
+
+
+def test_stale_claim_is_reclaimed_and_late_completion_is_ignored(tmp_path: Path) -> None:
+    queue = _submit(tmp_path / "job", chunk_frames=5)
+    dead = queue.claim("dead-node")
+    assert dead is not None and dead.task == "chunk-00000"
+    other = queue.claim("other")
+    assert other.task == "chunk-00001"
+    # The finalize task stays pending until every chunk is done.
+    assert queue.claim("other") is None
+    assert queue.release(other)
+
+    old = time.time() - 60.0
+    os.utime(dead.path, (old, old))
+    report = run_worker(queue.root, "alive", FAST)
+
+    assert report.reclaimed == 1
+    assert report.chunks == 2 and report.finalized
+    assert queue.status().output is not None
+    assert not queue.heartbeat(dead)
+    assert not queue.complete(dead)
+
+
+def test_task_fails_after_max_attempts(tmp_path: Path) -> None:
+    queue = JobQueue(_submit(tmp_path / "job", chunk_frames=10).root, QueueConfig(max_attempts=2))
+    for _ in range(2):
+        claim = queue.claim("flaky")
+        assert claim.task == "chunk-00000"
+        queue.release(claim)
+
+    assert queue.claim("flaky") is None
+    status = queue.status()
+    assert status.failed == 1 and status.finished
+    assert FINALIZE_TASK not in {p.stem for p in (queue.root / "tasks/failed").iterdir()}
+
+
+def test_temp_names_do_not_collide_across_nodes_with_the_same_pid(tmp_path: Path, monkeypatch) -> None:
+    queue = _submit(tmp_path / "job", chunk_frames=5)
+    claim = queue.claim("node-a")
+    renderer = HeadlessMatplotlibRenderer(HeadlessRendererConfig(width=96, height=54))
+    saved: list[str] = []
+    real_save = np.save
+    monkeypatch.setattr(os, "getpid", lambda: 4242)
+    monkeypatch.setattr(np, "save", lambda path, array: saved.append(Path(path).name) or real_save(path, array))
+
+    # Two nodes (same PID, different hosts) rendering the same reclaimed chunk.
+    for host in ("node-a", "node-b"):
+        monkeypatch.setattr(socket, "gethostname", lambda host=host: host)
+        assert render_chunk(queue, claim, renderer) == 5
+
+    assert len(saved) == 2 and saved[0] != saved[1]
+    assert all("4242" in name for name in saved)
+    assert np.load(queue.chunk_path(0)).shape == (5, 54, 96, 3)
@@ -0,0 +1,45 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.sweep_render import expand_grid, main
+
+
+def test_expand_grid_product_and_validation() -> None:
+    variants = expand_grid(
+        {
+            "fov_deg": [50, 60],
+            "box_depth_m": [1.0],
+            "path_type": ["orbit", "lissajous"],
+            "resolution": ["320x180", [160, 90]],
+        }
+    )
+    assert len(variants) == 8
+    assert len({v.name for v in variants}) == 8
+
+    with pytest.raises(ValueError):
+        expand_grid({"fov_deg": [50], "box_depth_m": [1.0], "path_type": ["orbit"], "resolution": ["oops"]})
+    with pytest.raises(ValueError):
+        expand_grid({"fov_deg": [50], "box_depth_m": [1.0], "path_type": ["orbit"], "resolution": [], "x": [1]})
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_sweep_writes_one_output_per_variant(tmp_path: Path, workers: str) -> None:
+    grid = tmp_path / "grid.yaml"
+    grid.write_text("fov_deg: [50, 70]\nbox_depth_m: [1.0, 1.4]\npath_type: orbit\nresolution: ['160x90']\n", encoding="utf-8")
+    out_dir = tmp_path / "sweep"
+
+    rc = main(
+        [
+            "--grid", str(grid), "--duration-s", "0.4", "--fps", "5", "--format", "gif",
+            "--out-dir", str(out_dir), "--workers", workers,
+        ]
+    )
+
+    assert rc == 0
+    manifest = json.loads((out_dir / "index.json").read_text(encoding="utf-8"))
+    assert len(manifest["variants"]) == 4
+    for entry in manifest["variants"]:
+        assert entry["frames"] == 2
+        assert (out_dir / entry["output"]).stat().st_size > 0
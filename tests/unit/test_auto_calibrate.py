@@ -0,0 +1,139 @@
+import math
+
+import numpy as np
+import pytest
+
+from app.calibration.auto_calibrate import (
+    CalibrationReference,
+    SolverConfig,
+    load_references,
+    solve_camera_offset,
+    write_camera_offset,
+)
+from app.calibration.display_calibrator import DisplayCalibrator, DisplayParams
+from app.calibration.session import PoseSession
+from app.config.persistence import CalibrationWriterConfig
+from app.config.settings import DEFAULT_CONFIG_PATH, DisplaySettings, load_settings, save_settings
+from app.types import HeadPose
+
+TRUE_OFFSET = (0.03, 0.06, 0.22, 4.0, -2.5, 1.5)
+DISPLAY = DisplaySettings(0.6, 0.34, 1920, 1080, (0.0, 0.0, 0.0, 0.0, 0.0, 0.0))
+
+
+def _facing(eye: tuple[float, float, float], target: tuple[float, float, float]) -> tuple[float, float, float]:
+    d = np.subtract(target, eye)
+    d /= np.linalg.norm(d)
+    return math.degrees(math.atan2(d[0], -d[2])), math.degrees(-math.asin(d[1])), 0.0
+
+
+def _session(references: list[CalibrationReference], rate_hz: float = 60.0, noise: float = 0.0, seed: int = 0) -> PoseSession:
+    # Tracker readings that DisplayCalibrator + TRUE_OFFSET map back onto each reference.
+    rng = np.random.default_rng(seed)
+    end_s = max(r.t_end_s for r in references) + 1.0
+    poses = []
+    for i in range(int(end_s * rate_hz)):
+        t = i / rate_hz
+        ref = next((r for r in references if r.t_start_s <= t <= r.t_end_s), None)
+        if ref is None:
+            pos, ypr = (0.1 * math.sin(t), 0.0, 0.5), (10.0 * math.sin(t), 0.0, 0.0)
+        else:
+            look = ref.look_at_m or (0.0, 0.0, 0.0)
+            view = _facing(ref.eye_m, look)
+            pos = tuple(e - o + noise * rng.standard_normal() for e, o in zip(ref.eye_m, TRUE_OFFSET[:3]))
+            ypr = tuple(v - o + 50.0 * noise * rng.standard_normal() for v, o in zip(view, TRUE_OFFSET[3:]))
+        poses.append(HeadPose(1_000 + int(t * 1000), pos, ypr, 0.9, True))
+    return PoseSession.from_poses(poses)
+
+
+def _references() -> list[CalibrationReference]:
+    return [
+        CalibrationReference(1.0, 3.0, (0.0, 0.0, 0.7), (0.0, 0.0, 0.0)),
+        CalibrationReference(4.0, 6.0, (0.0, 0.0, 0.7), (-0.3, 0.17, 0.0)),
+        CalibrationReference(7.0, 9.0, (-0.2, 0.05, 0.6), (0.3, -0.17, 0.0)),
+        CalibrationReference(10.0, 12.0, (0.25, -0.05, 0.9), (0.0, 0.0, 0.0)),
+    ]
+
+
+def test_solver_recovers_offset_that_reproduces_the_reference_view() -> None:
+    refs = _references()
+    session = _session(refs, noise=0.002)
+    result = solve_camera_offset(session, refs)
+
+    assert result.converged
+    assert result.fitted_angles == (True, True, True)
+    np.testing.assert_allclose(result.camera_offset[:3], TRUE_OFFSET[:3], atol=0.002)
+    np.testing.assert_allclose(result.camera_offset[3:], TRUE_OFFSET[3:], atol=0.2)
+    assert result.rms_position_m < 0.01
+
+    # The fitted offset puts the eye where the reference says, through the runtime model.
+    calibrator = DisplayCalibrator(DisplayParams(0.6, 0.34, 1920, 1080), result.camera_offset)
+    ref = refs[2]
+    idx = int(np.flatnonzero(session.elapsed_s >= ref.t_start_s)[0])
+    view = calibrator.compute_view_matrix(session.to_poses()[idx])
+    eye = -view[:3, :3].T @ view[:3, 3]
+    np.testing.assert_allclose(eye, ref.eye_m, atol=0.01)
+
+
+def test_solver_downweights_glitches_and_skips_invalid_samples() -> None:
+    refs = _references()
+    session = _session(refs)
+    glitch = np.flatnonzero((session.elapsed_s >= 1.0) & (session.elapsed_s <= 3.0))[::10]
+    session.positions_m[glitch] += 0.4
+    invalid = np.flatnonzero((session.elapsed_s >= 4.0) & (session.elapsed_s <= 6.0))[::3]
+    session.valid[invalid] = False
+    session.yaw_pitch_roll_deg[invalid] += 45.0
+
+    result = solve_camera_offset(session, refs)
+
+    np.testing.assert_allclose(result.camera_offset[:3], TRUE_OFFSET[:3], atol=0.01)
+    np.testing.assert_allclose(result.camera_offset[3:], TRUE_OFFSET[3:], atol=0.2)
+
+
+def test_position_only_references_keep_initial_angles() -> None:
+    refs = [CalibrationReference(1.0, 2.0, (0.0, 0.0, 0.7)), CalibrationReference(3.0, 4.0, (0.1, 0.0, 0.6))]
+    result = solve_camera_offset(_session(refs), refs, initial=(0.0, 0.0, 0.0, 1.0, 2.0, 3.0))
+
+    assert result.fitted_angles == (False, False, False)
+    assert result.camera_offset[3:] == pytest.approx((1.0, 2.0, 3.0))
+    np.testing.assert_allclose(result.camera_offset[:3], TRUE_OFFSET[:3], atol=1e-9)
+
+
+def test_solver_handles_long_sessions_quickly() -> None:
+    refs = [CalibrationReference(10.0 * i + 1.0, 10.0 * i + 9.0, (0.05 * i, 0.0, 0.7), (0.0, 0.0, 0.0)) for i in range(8)]
+    session = _session(refs, rate_hz=120.0, noise=0.001)
+
+    result = solve_camera_offset(session, refs, config=SolverConfig(max_iterations=30))
+
+    assert result.samples > 7000
+    assert result.solve_ms < 3000.0
+    np.testing.assert_allclose(result.camera_offset[3:], TRUE_OFFSET[3:], atol=0.2)
+
+
+def test_load_references_resolves_screen_points(tmp_path) -> None:
+    path = tmp_path / "refs.yaml"
+    path.write_text(
+        "references:\n"
+        "  - {t_s: [1, 2], eye_m: [0, 0, 0.7], look_at: top_left}\n"
+        "  - {t_s: [3, 4], eye_m: [0, 0, 0.7], look_at: [0.1, 0.2, 0.0]}\n"
+        "  - {t_s: [5, 6], eye_m: [0, 0, 0.7]}\n",
+        encoding="utf-8",
+    )
+    refs = load_references(path, DISPLAY)
+
+    assert refs[0].look_at_m == pytest.approx((-0.3, 0.17, 0.0))
+    assert refs[1].look_at_m == (0.1, 0.2, 0.0)
+    assert refs[2].look_at_m is None
+
+
+def test_session_roundtrip_and_write_to_runtime(tmp_path) -> None:
+    session = _session(_references())
+    loaded = PoseSession.load(session.save(tmp_path / "session.npz"))
+    assert len(loaded) == len(session)
+    np.testing.assert_array_equal(loaded.timestamps_ms, session.timestamps_ms)
+
+    runtime = tmp_path / "runtime.yaml"
+    save_settings(load_settings(DEFAULT_CONFIG_PATH), runtime)
+    write_camera_offset(TRUE_OFFSET, 0, runtime, CalibrationWriterConfig(debounce_s=0.0, history_dir=tmp_path / "history"))
+
+    assert load_settings(runtime).display.camera_offset == TRUE_OFFSET
+    assert len(list((tmp_path / "history").glob("runtime-*.yaml"))) == 1
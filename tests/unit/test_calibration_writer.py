@@ -0,0 +1,56 @@
+from app.config.persistence import CalibrationWriter, CalibrationWriterConfig
+from app.config.settings import DEFAULT_CONFIG_PATH, load_settings
+
+
+def test_rapid_saves_are_coalesced(tmp_path) -> None:
+    out_path = tmp_path / "runtime.yaml"
+    w = CalibrationWriter(CalibrationWriterConfig(debounce_s=0.2, history_dir=tmp_path / "history"), out_path)
+    settings = load_settings(DEFAULT_CONFIG_PATH)
+    for fov in (61.0, 62.0, 63.0, 64.0):
+        settings.render.fov_deg = fov
+        w.submit(settings)
+    settings.render.fov_deg = 99.0  # mutated after submit; must not leak into the write
+    assert w.flush(timeout=2.0)
+    w.close()
+
+    results = w.poll_results()
+    assert len(results) == 1
+    assert results[0].ok
+    assert results[0].coalesced == 4
+    assert load_settings(out_path).render.fov_deg == 64.0
+    assert not list(tmp_path.glob(".runtime.yaml.*.tmp"))
+
+
+def test_history_is_bounded_and_rollback_restores(tmp_path) -> None:
+    out_path = tmp_path / "runtime.yaml"
+    w = CalibrationWriter(
+        CalibrationWriterConfig(debounce_s=0.0, history_dir=tmp_path / "history", history_limit=3),
+        out_path,
+    )
+    settings = load_settings(DEFAULT_CONFIG_PATH)
+    for depth in (1.0, 1.1, 1.2, 1.3, 1.4):
+        settings.render.box_depth_m = depth
+        w.submit(settings)
+        assert w.flush(timeout=2.0)
+
+    snapshots = w.list_snapshots()
+    assert len(snapshots) == 3
+    assert load_settings(snapshots[0]).render.box_depth_m == 1.2
+
+    w.rollback(snapshots[0])
+    w.close()
+    assert load_settings(out_path).render.box_depth_m == 1.2
+
+
+def test_write_failure_is_reported(tmp_path) -> None:
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("x", encoding="utf-8")
+    w = CalibrationWriter(CalibrationWriterConfig(debounce_s=0.0, history_dir=tmp_path / "history"), blocker / "runtime.yaml")
+    w.submit(load_settings(DEFAULT_CONFIG_PATH))
+    assert w.flush(timeout=2.0)
+    w.close()
+
+    results = w.poll_results()
+    assert len(results) == 1
+    assert not results[0].ok
+    assert results[0].error
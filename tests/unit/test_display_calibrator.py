@@ -1,6 +1,6 @@
 import numpy as np
 
-from app.calibration.display_calibrator import DisplayCalibrator, DisplayParams
+from app.calibration.display_calibrator import DisplayCalibrator, DisplayParams, compute_off_axis_matrices, compute_view_matrices
 from app.types import HeadPose
 
 
@@ -51,3 +51,79 @@ def test_view_matrix_applies_camera_offset() -> None:
     assert np.isclose(m[0, 3], -(1.1))
     assert np.isclose(m[1, 3], -(1.9))
     assert np.isclose(m[2, 3], -(3.2))
+
+
+def test_batched_view_matrices_match_scalar() -> None:
+    pose = HeadPose(
+        timestamp_ms=0,
+        position_m=(0.1, -0.2, 0.7),
+        yaw_pitch_roll_deg=(12.0, -4.0, 3.0),
+        confidence=1.0,
+        valid=True,
+    )
+    offsets = np.array(
+        [
+            (0.0, 0.06, 0.25, 0.0, 0.0, 0.0),
+            (0.6, 0.06, 0.25, -30.0, 0.0, 0.0),
+            (-0.6, 0.0, 0.2, 30.0, 5.0, -2.0),
+        ]
+    )
+
+    batched = compute_view_matrices(pose, offsets)
+
+    assert batched.shape == (3, 4, 4)
+    for i, offset in enumerate(offsets):
+        c = DisplayCalibrator(
+            params=DisplayParams(width_m=0.6, height_m=0.34, resolution_w=1920, resolution_h=1080),
+            camera_offset=tuple(offset),
+        )
+        assert np.allclose(batched[i], c.compute_view_matrix(pose), atol=1e-5)
+
+
+def _screen_corners_ndc(view: np.ndarray, proj: np.ndarray, width_m: float, height_m: float) -> np.ndarray:
+    w, h = width_m / 2.0, height_m / 2.0
+    corners = np.array([[-w, -h, 0.0, 1.0], [w, -h, 0.0, 1.0], [w, h, 0.0, 1.0], [-w, h, 0.0, 1.0]]).T
+    clip = proj.astype(np.float64) @ view.astype(np.float64) @ corners
+    return (clip[:2] / clip[3]).T
+
+
+def test_off_axis_frustum_passes_through_screen_corners() -> None:
+    c = DisplayCalibrator(DisplayParams(0.6, 0.34, 1920, 1080), (0.02, 0.05, 0.0, 0.0, 0.0, 0.0))
+
+    centred_view, centred_proj = c.compute_off_axis_matrices(HeadPose(0, (-0.02, -0.05, 0.7), (0.0, 0.0, 0.0), 1.0, True), 0.05, 10.0)
+    assert np.isclose(centred_proj[0, 2], 0.0) and np.isclose(centred_proj[1, 2], 0.0)
+
+    # Off-centre, rotated head: the frustum skews but the screen edges stay on the NDC border.
+    view, proj = c.compute_off_axis_matrices(HeadPose(0, (0.2, -0.1, 0.5), (15.0, -5.0, 3.0), 1.0, True), 0.05, 10.0)
+    assert proj[0, 2] < 0.0 < proj[1, 2]
+    assert np.allclose(_screen_corners_ndc(view, proj, 0.6, 0.34), [[-1, -1], [1, -1], [1, 1], [-1, 1]], atol=1e-5)
+    assert np.allclose(view[:3, :3], np.eye(3))
+
+
+def test_off_axis_batched_matches_scalar() -> None:
+    c = DisplayCalibrator(DisplayParams(0.6, 0.34, 1920, 1080), (0.0, 0.0, 0.0, 0.0, 0.0, 0.0))
+    eyes = np.array([[0.0, 0.0, 0.7], [0.1, -0.05, 0.4], [-0.3, 0.2, 1.1]])
+
+    views, projs = compute_off_axis_matrices(eyes, c.screen, 0.05, 10.0)
+
+    assert views.shape == projs.shape == (3, 4, 4)
+    for eye, view, proj in zip(eyes, views, projs):
+        v, p = c.compute_off_axis_matrices(HeadPose(0, tuple(eye), (0.0, 0.0, 0.0), 1.0, True), 0.05, 10.0)
+        assert np.allclose(view, v) and np.allclose(proj, p)
+
+    c.set_display_params(1.2, 0.68, 1920, 1080)
+    assert np.isclose(c.screen.width_m, 1.2)
+
+
+def test_off_axis_applies_camera_mount_yaw() -> None:
+    # A camera yawed 90 deg: its forward axis (-z) is the display's +x.
+    c = DisplayCalibrator(DisplayParams(0.6, 0.34, 1920, 1080), (0.0, 0.0, 0.7, 90.0, 0.0, 0.0))
+    pose = HeadPose(0, (0.0, 0.0, -0.2), (0.0, 0.0, 0.0), 1.0, True)
+
+    view, _ = c.compute_off_axis_matrices(pose, 0.05, 10.0)
+    expected, _ = compute_off_axis_matrices(np.array([[0.2, 0.0, 0.7]]), c.screen, 0.05, 10.0)
+
+    assert np.allclose(view, expected[0], atol=1e-6)
+    # The same mount rotation that turns the fixed-FOV view forward vector.
+    forward = -c.compute_view_matrix(HeadPose(0, (0.0, 0.0, 0.0), (0.0, 0.0, 0.0), 1.0, True))[2, :3]
+    assert np.allclose(forward, (1.0, 0.0, 0.0), atol=1e-6)
@@ -0,0 +1,142 @@
+import threading
+import weakref
+
+import numpy as np
+import pytest
+
+from app.render.encoders import EncoderConfig, FfmpegPipeEncoder, encode_frames
+
+
+def _frames(n: int, h: int = 90, w: int = 160):
+    for i in range(n):
+        frame = np.zeros((h, w, 3), dtype=np.uint8)
+        frame[:, : (i + 1) * w // n] = (30, 200, 240)
+        yield frame
+
+
+@pytest.mark.parametrize("fmt", ["mp4", "webm", "gif"])
+def test_pipe_encoder_streams_frames(tmp_path, fmt) -> None:
+    out = tmp_path / f"clip.{fmt}"
+    with FfmpegPipeEncoder(out, 10, fmt, EncoderConfig(preset="ultrafast", threads=2)) as enc:
+        for frame in _frames(8):
+            enc.write(frame)
+    stats = enc.stats
+
+    assert out.stat().st_size > 0
+    assert stats.frames == 8
+    assert stats.bytes == out.stat().st_size
+    assert stats.bytes_per_frame > 0.0
+
+
+def test_odd_sizes_are_padded_for_yuv420p(tmp_path) -> None:
+    out = tmp_path / "odd.mp4"
+    enc = FfmpegPipeEncoder(out, 10, "mp4")
+    for frame in _frames(3, h=91, w=161):
+        enc.write(frame)
+    assert enc.close().frames == 3
+
+
+def test_encode_frames_falls_back_to_gif(tmp_path, monkeypatch) -> None:
+    import app.render.encoders as encoders
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("no ffmpeg")
+
+    monkeypatch.setattr(encoders, "FfmpegPipeEncoder", broken)
+    monkeypatch.setattr(encoders.ImageioEncoder, "close", _fail_non_gif(encoders.ImageioEncoder.close))
+
+    saved, stats = encode_frames(_frames(3), tmp_path / "clip.mp4", fps=10, fmt="mp4")
+    assert saved == tmp_path / "clip.gif"
+    assert stats.frames == 3
+
+
+def _fail_non_gif(close):
+    def wrapper(self):
+        if self._fmt != "gif":
+            raise RuntimeError("mp4 backend missing")
+        return close(self)
+
+    return wrapper
+
+
+def test_command_carries_codec_settings(tmp_path) -> None:
+    enc = FfmpegPipeEncoder(tmp_path / "x.mp4", 30, "mp4", EncoderConfig(preset="veryfast", crf=18, threads=3))
+    cmd = enc.command(320, 180)
+    assert cmd[cmd.index("-c:v") + 1] == "libx264"
+    assert cmd[cmd.index("-preset") + 1] == "veryfast"
+    assert cmd[cmd.index("-crf") + 1] == "18"
+    assert cmd[cmd.index("-threads") + 1] == "3"
+
+    gif = FfmpegPipeEncoder(tmp_path / "x.gif", 30, "gif").command(320, 180)
+    graph = gif[gif.index("-filter_complex") + 1]
+    assert "palettegen" in graph and "paletteuse" in graph
+
+
+def test_rejects_unknown_format(tmp_path) -> None:
+    with pytest.raises(ValueError):
+        encode_frames(_frames(1), tmp_path / "x.avi", fps=10, fmt="avi")
+
+
+def test_encode_frames_streams_without_retaining_frames(tmp_path) -> None:
+    refs: list[weakref.ref] = []
+    alive: list[int] = []
+
+    def produce():
+        for frame in _frames(40, h=36, w=64):
+            alive.append(sum(ref() is not None for ref in refs))
+            refs.append(weakref.ref(frame))
+            yield frame
+            del frame
+
+    saved, stats = encode_frames(produce(), tmp_path / "clip.mp4", fps=10, fmt="mp4", config=EncoderConfig(preset="ultrafast"))
+
+    assert saved == tmp_path / "clip.mp4"
+    assert stats.frames == 40
+    # At most the frame the loop is on is still referenced while the next one is rendered.
+    assert max(alive) <= 1
+
+
+def test_mid_stream_failure_raises_for_generator_and_reruns_for_sequence(tmp_path, monkeypatch) -> None:
+    import app.render.encoders as encoders
+
+    write = encoders.FfmpegPipeEncoder.write
+
+    def flaky(self, frame):
+        if self.stats.frames == 2:
+            raise RuntimeError("broken pipe")
+        write(self, frame)
+
+    monkeypatch.setattr(encoders.FfmpegPipeEncoder, "write", flaky)
+
+    with pytest.raises(RuntimeError, match="mid-stream"):
+        encode_frames(_frames(5), tmp_path / "gen.gif", fps=10, fmt="gif")
+
+    saved, stats = encode_frames(list(_frames(5)), tmp_path / "seq.gif", fps=10, fmt="gif")
+    assert saved == tmp_path / "seq.gif"
+    assert stats.frames == 5
+
+
+def test_ffmpeg_stderr_flood_does_not_deadlock(tmp_path) -> None:
+    # Trace logging writes far more than a pipe buffer to stderr while frames still flow.
+    enc = FfmpegPipeEncoder(tmp_path / "x.mp4", 10, "mp4", EncoderConfig(preset="ultrafast", queue_frames=2))
+    command = enc.command
+    enc.command = lambda w, h: [part if part != "error" else "trace" for part in command(w, h)]
+    done = threading.Event()
+
+    def run() -> None:
+        for frame in _frames(800, h=36, w=64):
+            enc.write(frame)
+        enc.close()
+        done.set()
+
+    worker = threading.Thread(target=run, daemon=True)
+    worker.start()
+    worker.join(60)
+    assert done.is_set()
+    assert enc.stats.frames == 800
+
+
+def test_encode_frames_rejects_empty_input(tmp_path) -> None:
+    with pytest.raises(ValueError, match="no frames"):
+        encode_frames(iter(()), tmp_path / "x.mp4", fps=10, fmt="mp4")
+    assert not (tmp_path / "x.mp4").exists()
@@ -0,0 +1,53 @@
+import numpy as np
+
+from app.render.frame_cache import FrameCache, FrameCacheConfig, frame_key
+
+
+def _frame(value: int) -> np.ndarray:
+    return np.full((18, 32, 3), value, dtype=np.uint8)
+
+
+def test_key_depends_on_every_input() -> None:
+    view = np.eye(4, dtype=np.float32)
+    proj = np.eye(4, dtype=np.float32)
+    base = frame_key(view, proj, 0.8, 1.2, {"width": 32}, 1)
+
+    moved = view.copy()
+    moved[0, 3] = 0.01
+    assert frame_key(moved, proj, 0.8, 1.2, {"width": 32}, 1) != base
+    assert frame_key(view, proj, 0.8, 1.3, {"width": 32}, 1) != base
+    assert frame_key(view, proj, 0.8, 1.2, {"width": 64}, 1) != base
+    assert frame_key(view, proj, 0.8, 1.2, {"width": 32}, 2) != base
+    assert frame_key(view.astype(np.float64), proj, 0.8, 1.2, {"width": 32}, 1) == base
+
+
+def test_roundtrip_both_storages_and_persistence(tmp_path) -> None:
+    for storage in ("npz", "raw"):
+        cfg = FrameCacheConfig(root=tmp_path / storage, storage=storage)
+        cache = FrameCache(cfg)
+        assert cache.get("ab" * 32) is None
+        cache.put("ab" * 32, _frame(7))
+
+        reopened = FrameCache(cfg)
+        out = reopened.get("ab" * 32)
+        assert out is not None
+        assert np.array_equal(out, _frame(7))
+        assert reopened.stats.hits == 1
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path) -> None:
+    probe = FrameCache(FrameCacheConfig(root=tmp_path / "probe", storage="raw"))
+    probe.put("00" * 32, _frame(0))
+    entry_size = probe.stats.bytes
+
+    cache = FrameCache(FrameCacheConfig(root=tmp_path / "c", storage="raw", max_bytes=entry_size * 2))
+    cache.put("aa" * 32, _frame(1))
+    cache.put("bb" * 32, _frame(2))
+    cache.get("aa" * 32)
+    cache.put("cc" * 32, _frame(3))
+
+    assert "aa" * 32 in cache
+    assert "bb" * 32 not in cache
+    assert "cc" * 32 in cache
+    assert cache.stats.evictions == 1
+    assert not (tmp_path / "c" / "bb" / f"{'bb' * 32}.npy").exists()
@@ -0,0 +1,99 @@
+import signal
+import subprocess
+import sys
+from pathlib import Path
+
+import imageio.v2 as imageio
+import numpy as np
+import pytest
+
+from app.render.frame_store import FrameStore, FrameStoreConfig, downsample, encode_store, main
+from app.types import HeadPose
+
+
+def _frames(n: int, h: int = 24, w: int = 32) -> np.ndarray:
+    return np.random.default_rng(0).integers(0, 256, size=(n, h, w, 3), dtype=np.uint8)
+
+
+def test_store_roundtrip_with_random_access_and_sidecar(tmp_path: Path) -> None:
+    frames = _frames(6)
+    with FrameStore.create(tmp_path / "s.frames", 6, 32, 24, FrameStoreConfig(fps=12, thumbnail_levels=2)) as store:
+        for i in (5, 0, 3):
+            pose = HeadPose(1000 + i, (0.01 * i, 0.0, 0.7), (float(i), 0.0, 0.0), 0.9, True)
+            store.write(i, frames[i], pose, np.eye(4) * (i + 1), np.eye(4))
+
+    store = FrameStore.open(tmp_path / "s.frames")
+    assert np.load(tmp_path / "s.frames" / "poses" / "view.npy", mmap_mode="r").shape == (6, 4, 4)
+    assert len(store) == 6 and store.fps == 12
+    assert np.array_equal(store[3], frames[3])
+    assert list(np.flatnonzero(store.written)) == [0, 3, 5]
+    assert store.pose(5) == HeadPose(1005, (0.05, 0.0, 0.7), (5.0, 0.0, 0.0), 0.9, True)
+    assert store.pose(1) is None
+    assert store.view_matrix(3)[0, 0] == 4.0
+    assert store.thumbnails(1).shape == (6, 12, 16, 3)
+    assert store.thumbnails(2).shape == (6, 6, 8, 3)
+    assert np.array_equal(store.thumbnails(2)[0], downsample(downsample(frames[0])))
+    assert [f.shape for f in store.iter_frames(level=1)] == [(12, 16, 3)] * 3
+    with pytest.raises(ValueError):
+        store.write(1, frames[1])
+
+
+def test_downsample_is_a_rounded_box_filter() -> None:
+    frame = np.array([[[0], [1], [9]], [[2], [3], [9]], [[9], [9], [9]]], dtype=np.uint8)
+
+    assert downsample(frame).tolist() == [[[2]]]
+
+
+def test_encode_from_store_without_rendering(tmp_path: Path) -> None:
+    frames = _frames(5)
+    with FrameStore.create(tmp_path / "s.frames", 5, 32, 24, FrameStoreConfig(fps=5, thumbnail_levels=1)) as store:
+        for i, frame in enumerate(frames):
+            store.write(i, frame)
+
+    saved, stats = encode_store(FrameStore.open(tmp_path / "s.frames"), tmp_path / "all.gif", "gif", step=2)
+    assert stats.frames == 3
+    assert len(imageio.mimread(saved)) == 3
+
+    assert main(["encode", str(tmp_path / "s.frames"), "--out", str(tmp_path / "thumb.gif"), "--format", "gif", "--level", "1"]) == 0
+    assert imageio.mimread(tmp_path / "thumb.gif")[0].shape[:2] == (12, 16)
+    assert main(["export", str(tmp_path / "s.frames"), "4", "--out", str(tmp_path / "f4.png")]) == 0
+    assert np.array_equal(imageio.imread(tmp_path / "f4.png"), frames[4])
+
+
+def test_killed_writer_keeps_flushed_flags_and_poses(tmp_path: Path) -> None:
+    script = f"""
+import os, signal
+import numpy as np
+from app.render.frame_store import FrameStore, FrameStoreConfig
+from app.types import HeadPose
+store = FrameStore.create({str(tmp_path / "s.frames")!r}, 10, 32, 24, FrameStoreConfig(flush_every=2, flush_interval_s=60.0))
+for i in range(5):
+    store.write(i, np.full((24, 32, 3), i + 1, dtype=np.uint8), HeadPose(i, (0.0, 0.0, 0.7), (0.0, 0.0, 0.0), 1.0, True))
+os.kill(os.getpid(), signal.SIGKILL)
+"""
+    proc = subprocess.run([sys.executable, "-c", script], cwd=Path(__file__).resolve().parents[2])
+    assert proc.returncode == -signal.SIGKILL
+
+    # The sidecar is memmapped like the frames, so everything written before the kill
+    # survives the process; flushes only bound what a power loss could take.
+    store = FrameStore.open(tmp_path / "s.frames")
+    assert list(np.flatnonzero(store.written)) == [0, 1, 2, 3, 4]
+    assert store.pose(4).timestamp_ms == 4
+    assert np.all(store[4] == 5)
+    assert store.metadata["written"] == 4
+
+
+def test_export_rejects_unknown_level(tmp_path: Path) -> None:
+    with FrameStore.create(tmp_path / "s.frames", 2, 32, 24, FrameStoreConfig(thumbnail_levels=1)) as store:
+        store.write(0, _frames(1)[0])
+
+    with pytest.raises(SystemExit, match="--level"):
+        main(["export", str(tmp_path / "s.frames"), "0", "--out", str(tmp_path / "f.png"), "--level", "3"])
+
+
+def test_encode_of_an_empty_store_fails_cleanly(tmp_path: Path) -> None:
+    FrameStore.create(tmp_path / "s.frames", 2, 32, 24).close()
+
+    with pytest.raises(SystemExit, match="no frames"):
+        main(["encode", str(tmp_path / "s.frames"), "--out", str(tmp_path / "x.gif"), "--format", "gif"])
+    assert not (tmp_path / "x.gif").exists()
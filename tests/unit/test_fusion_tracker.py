@@ -0,0 +1,118 @@
+import time
+
+import pytest
+
+from app.tracking.base import Tracker
+from app.tracking.fusion_tracker import FusionConfig, FusionSource, FusionTracker
+from app.tracking.replay_tracker import ReplayTracker
+from app.types import HeadPose
+
+
+class _ManualTracker(Tracker):
+    def __init__(self, x: float, skew_ms: int = 0) -> None:
+        self.x = x
+        self.skew_ms = skew_ms
+        self.frozen: HeadPose | None = None
+        self.valid = True
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def get_latest_pose(self) -> HeadPose:
+        if self.frozen is not None:
+            return self.frozen
+        return HeadPose(
+            timestamp_ms=int(time.time() * 1000) + self.skew_ms,
+            position_m=(self.x, 0.0, 0.7),
+            yaw_pitch_roll_deg=(0.0, 0.0, 0.0),
+            confidence=1.0,
+            valid=self.valid,
+        )
+
+
+def test_extrinsic_maps_source_into_common_frame() -> None:
+    src = _ManualTracker(0.1)
+    fusion = FusionTracker([FusionSource("a", src, extrinsic=(0.5, 0.0, 0.0, 90.0, 0.0, 0.0))])
+
+    out = fusion.get_latest_pose()
+
+    assert out.valid
+    # 90 deg yaw turns +x into -z.
+    assert out.position_m[0] == pytest.approx(0.5 + 0.7, abs=1e-6)
+    assert out.position_m[2] == pytest.approx(-0.1, abs=1e-6)
+
+
+def test_confidence_weighted_and_stale_source_dropped() -> None:
+    a = _ManualTracker(0.0)
+    b = _ManualTracker(1.0, skew_ms=-3000)
+    fusion = FusionTracker([FusionSource("a", a), FusionSource("b", b)], FusionConfig(max_age_ms=30.0))
+
+    both = fusion.get_latest_pose()
+    assert 0.3 < both.position_m[0] < 0.7
+
+    b.frozen = b.get_latest_pose()
+    fusion.get_latest_pose()
+    time.sleep(0.06)
+    only_a = fusion.get_latest_pose()
+    assert only_a.position_m[0] == pytest.approx(0.0)
+
+    stats = {s.name: s for s in fusion.source_stats()}
+    assert stats["b"].clock_offset_ms == pytest.approx(3000.0, abs=50.0)
+    assert stats["b"].last_age_ms > 30.0
+
+
+def test_no_valid_source_reports_invalid() -> None:
+    a = _ManualTracker(0.0)
+    a.valid = False
+    out = FusionTracker([FusionSource("a", a)]).get_latest_pose()
+    assert not out.valid
+
+
+def test_reports_per_source_rate_with_replayed_sources() -> None:
+    fast = [HeadPose(i * 10, (0.0, 0.0, 0.7), (0.0, 0.0, 0.0), 1.0, True) for i in range(100)]
+    slow = [HeadPose(i * 25, (0.0, 0.0, 0.7), (0.0, 0.0, 0.0), 1.0, True) for i in range(40)]
+    fusion = FusionTracker(
+        [FusionSource("fast", ReplayTracker(fast)), FusionSource("slow", ReplayTracker(slow))],
+        FusionConfig(rate_window_s=0.2),
+    )
+    fusion.start()
+    deadline = time.monotonic() + 0.45
+    while time.monotonic() < deadline:
+        fusion.get_latest_pose()
+        time.sleep(0.001)
+    fusion.stop()
+
+    stats = {s.name: s for s in fusion.source_stats()}
+    assert 60.0 < stats["fast"].rate_hz < 130.0
+    assert 25.0 < stats["slow"].rate_hz < 55.0
+
+
+def test_angles_fuse_across_the_wrap() -> None:
+    a = _ManualTracker(0.0)
+    b = _ManualTracker(0.0)
+    a.frozen = HeadPose(int(time.time() * 1000), (0.0, 0.0, 0.7), (179.0, 10.0, -170.0), 1.0, True)
+    b.frozen = HeadPose(int(time.time() * 1000), (0.0, 0.0, 0.7), (-179.0, 20.0, 170.0), 1.0, True)
+    fusion = FusionTracker([FusionSource("a", a), FusionSource("b", b)])
+
+    yaw, pitch, roll = fusion.get_latest_pose().yaw_pitch_roll_deg
+
+    assert abs(yaw) == pytest.approx(180.0, abs=1e-6)
+    assert pitch == pytest.approx(15.0, abs=1e-6)
+    assert abs(roll) == pytest.approx(180.0, abs=1e-6)
+
+
+def test_fused_counts_samples_not_polls() -> None:
+    a = _ManualTracker(0.0)
+    a.frozen = a.get_latest_pose()
+    fusion = FusionTracker([FusionSource("a", a)])
+    for _ in range(5):
+        fusion.get_latest_pose()
+    a.frozen = HeadPose(a.frozen.timestamp_ms + 1, (0.0, 0.0, 0.7), (0.0, 0.0, 0.0), 1.0, True)
+    fusion.get_latest_pose()
+
+    stats = fusion.source_stats()[0]
+    assert stats.samples == 2
+    assert stats.fused == 2
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from app.render.hud import HudConfig, HudGraph
+
+
+def _graph(samples: int = 8) -> HudGraph:
+    return HudGraph(HudConfig(samples=samples, scale_ms=40.0, budget_ms=10.0, rect=(-1.0, 0.0, 1.0, 1.0)))
+
+
+def test_build_reuses_preallocated_buffers() -> None:
+    hud = _graph()
+    lines, bars = hud.lines, hud.bars
+    for i in range(20):
+        hud.push(float(i), 2.0 * i, missed=False)
+    hud.build()
+
+    assert hud.lines is lines and hud.bars is bars
+    assert hud.lines.shape == (hud.line_vertex_count, 5)
+    assert hud.lines.dtype == np.float32
+
+
+def test_ring_orders_oldest_left_newest_right() -> None:
+    hud = _graph(samples=4)
+    for v in (4.0, 8.0, 12.0, 16.0, 20.0, 24.0):  # wraps: ring holds 12, 16, 20, 24
+        hud.push(v, 0.0, missed=False)
+    hud.build()
+
+    frame = hud.lines[0:6]  # 3 segments
+    assert frame[0, 1] == pytest.approx(12.0 / 40.0)
+    assert frame[-1, 1] == pytest.approx(24.0 / 40.0)
+    assert frame[0, 0] < frame[-1, 0]
+
+
+def test_values_clamp_to_graph_height() -> None:
+    hud = _graph(samples=4)
+    hud.push(500.0, -5.0, missed=False)
+    hud.build()
+
+    ys = hud.lines[: 4 * 3, 1]
+    assert ys.max() <= 1.0 and ys.min() >= 0.0
+
+
+def test_missed_deadline_ticks_and_bars() -> None:
+    hud = _graph(samples=4)
+    for missed in (False, True, False, False):
+        hud.push(5.0, 5.0, missed)
+    hud.set_tracker(rate_hz=30.0, confidence=0.5)
+    hud.build()
+
+    miss = hud.lines[4 * 3 + 2 :]
+    heights = miss[1::2, 1] - miss[0::2, 1]
+    assert heights.tolist() == [0.0, 1.0, 0.0, 0.0]
+    rate_fill = hud.bars[6:12, 0]
+    conf_fill = hud.bars[18:24, 0]
+    assert rate_fill.max() - rate_fill.min() == pytest.approx(0.5)
+    assert conf_fill.max() - conf_fill.min() == pytest.approx(0.5)
@@ -2,6 +2,7 @@ import time
 
 from PyQt6.QtCore import Qt
 
+from app.clock import VirtualClock
 from app.tracking.keyboard_tracker import KeyboardTracker, KeyboardTrackerConfig
 
 
@@ -42,3 +43,16 @@ def test_recenter_resets_position() -> None:
 
     assert p.position_m[0] == 0.0
     assert p.position_m[1] == 0.0
+
+
+def test_virtual_clock_makes_motion_deterministic() -> None:
+    clock = VirtualClock()
+    t = KeyboardTracker(KeyboardTrackerConfig(speed_m_s=1.0, z_fixed_m=0.7, bound_xy_m=1.0), clock=clock)
+    t.start()
+    t.set_key_state(Qt.Key.Key_Up, True)
+    clock.advance(0.25)
+    p = t.get_latest_pose()
+    t.stop()
+
+    assert abs(p.position_m[1] - 0.25) < 1e-9
+    assert p.timestamp_ms == clock.now_ms()
@@ -0,0 +1,87 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.sim.keyframe_path import Keyframe, KeyframePath, build_keyframe_path, load_keyframe_path
+
+
+def _keys(constant_speed: bool = False, ease: str = "linear") -> tuple[Keyframe, ...]:
+    return (
+        Keyframe(0.0, (0.0, 0.0, 0.7), (0.0, 0.0, 0.0), ease=ease, constant_speed=constant_speed),
+        Keyframe(1.0, (0.2, 0.1, 0.6), (10.0, 0.0, 0.0), ease=ease, constant_speed=constant_speed),
+        Keyframe(3.0, (-0.2, 0.0, 0.8), (-10.0, 5.0, 0.0), ease=ease, constant_speed=constant_speed),
+    )
+
+
+def test_spline_passes_through_keyframes() -> None:
+    path = KeyframePath(_keys())
+    pos, ypr = path.evaluate(np.array([0.0, 1.0, 3.0]))
+
+    assert np.allclose(pos, [[0.0, 0.0, 0.7], [0.2, 0.1, 0.6], [-0.2, 0.0, 0.8]])
+    assert np.allclose(ypr[:, 0], [0.0, 10.0, -10.0])
+
+
+def test_vectorized_matches_scalar_and_clamps() -> None:
+    path = KeyframePath(_keys(ease="ease_in_out"))
+    t = np.linspace(-1.0, 4.0, 57)
+    pos, ypr = path.evaluate(t)
+
+    for i in (0, 13, 30, 56):
+        p, r = path.evaluate(float(t[i]))
+        assert np.allclose(pos[i], p[0]) and np.allclose(ypr[i], r[0])
+    assert np.allclose(pos[0], [0.0, 0.0, 0.7])
+    assert np.allclose(pos[-1], [-0.2, 0.0, 0.8])
+
+
+def test_constant_speed_segments_have_uniform_steps() -> None:
+    path = KeyframePath(_keys(constant_speed=True))
+    pos, _ = path.evaluate(np.linspace(1.0, 3.0, 201))
+    steps = np.linalg.norm(np.diff(pos, axis=0), axis=1)
+
+    assert steps.std() / steps.mean() < 0.02
+    assert np.isclose(steps.sum(), path.segment_lengths_m[1], rtol=1e-3)
+
+
+def test_hermite_tangent_overrides_catmull_rom() -> None:
+    keys = (
+        Keyframe(0.0, (0.0, 0.0, 0.7), tangent_m_s=(0.0, 0.0, 0.0)),
+        Keyframe(1.0, (0.2, 0.0, 0.7), tangent_m_s=(0.0, 0.0, 0.0)),
+    )
+    pos, _ = KeyframePath(keys, spline="hermite").evaluate(np.array([0.0, 0.01]))
+
+    # Zero start velocity: the path barely moves in the first 10 ms.
+    assert pos[1, 0] - pos[0, 0] < 0.2 * 0.01
+
+
+def test_invalid_keyframes_rejected() -> None:
+    with pytest.raises(ValueError):
+        KeyframePath((Keyframe(0.0, (0.0, 0.0, 0.7)),))
+    with pytest.raises(ValueError):
+        KeyframePath((Keyframe(1.0, (0.0, 0.0, 0.7)), Keyframe(1.0, (0.1, 0.0, 0.7))))
+    with pytest.raises(ValueError):
+        KeyframePath(_keys(ease="bounce"))
+
+
+def test_load_from_yaml_is_cached(tmp_path: Path) -> None:
+    path = tmp_path / "keys.yaml"
+    path.write_text(
+        "spline: catmull_rom\n"
+        "keyframes:\n"
+        "  - {t: 0.0, position: [0, 0, 0.7], ease: ease_in}\n"
+        "  - {t: 2.0, position: [0.1, 0, 0.7], ypr: [5, 0, 0], constant_speed: true}\n"
+        "  - {t: 4.0, position: [0, 0.1, 0.7]}\n",
+        encoding="utf-8",
+    )
+    first = load_keyframe_path(path)
+
+    assert load_keyframe_path(path) is first
+    assert build_keyframe_path(first.keyframes, "catmull_rom") is first
+    poses = first.to_head_poses(fps=10)
+    assert len(poses) == 40
+    assert poses[0].position_m == pytest.approx((0.0, 0.0, 0.7))
+
+
+def test_demo_keyframes_load() -> None:
+    path = load_keyframe_path(Path(__file__).resolve().parents[2] / "app" / "sim" / "demo_keyframes.yaml")
+    assert path.duration_s == pytest.approx(6.0)
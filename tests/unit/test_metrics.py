@@ -0,0 +1,102 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from app.metrics import Histogram, MetricsServer, PipelineMetrics
+from app.tracking.outlier_filter import OutlierRejector
+from app.tracking.pose_filter import FilterConfig, PoseFilter
+from app.types import HeadPose
+
+
+def _pose(ts: int, valid: bool = True) -> HeadPose:
+    return HeadPose(ts, (0.0, 0.0, 0.7), (0.0, 0.0, 0.0), 1.0 if valid else 0.0, valid)
+
+
+def _value(text: str, name: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(name + " "):
+            return float(line.split()[1])
+    raise AssertionError(f"{name} not exported")
+
+
+def test_histogram_buckets_are_cumulative_in_seconds() -> None:
+    metrics = PipelineMetrics()
+    for latency in (3.0, 12.0, 12.0, 2000.0):
+        metrics.observe_frame(10.0, 1.0, latency, True, 0)
+    text = metrics.render()
+
+    assert 'anamorphic_latency_seconds_bucket{le="0.005"} 1' in text
+    assert 'anamorphic_latency_seconds_bucket{le="0.015"} 3' in text
+    assert 'anamorphic_latency_seconds_bucket{le="+Inf"} 4' in text
+    assert _value(text, "anamorphic_latency_seconds_count") == 4
+    assert _value(text, "anamorphic_latency_seconds_sum") == pytest.approx(2.027)
+
+
+def test_counts_skips_valid_ratio_and_tracker_samples() -> None:
+    metrics = PipelineMetrics(tick_interval_ms=10.0)
+    metrics.observe_frame(10.0, 1.0, 5.0, True, 100)
+    metrics.observe_frame(31.0, 1.0, 5.0, True, 100)  # two ticks missed, same sample
+    metrics.observe_frame(10.0, 1.0, 5.0, False, 117)
+    text = metrics.render()
+
+    assert _value(text, "anamorphic_frames_total") == 3
+    assert _value(text, "anamorphic_skipped_frames_total") == 2
+    assert _value(text, "anamorphic_tracker_samples_total") == 2
+    assert _value(text, "anamorphic_pose_valid_ratio") == pytest.approx(2 / 3)
+    assert _value(text, "process_resident_memory_bytes") > 0
+
+
+def test_filter_hold_and_recenter_episodes() -> None:
+    f = PoseFilter(FilterConfig(loss_timeout_ms=100, recenter_seconds=0.5))
+    metrics = PipelineMetrics(f.stats)
+    fallback = _pose(0)
+    f.update(_pose(0), fallback)
+    for ts in range(10, 400, 10):
+        f.update(_pose(ts, valid=False), fallback)
+    f.update(_pose(400), fallback)
+    f.update(_pose(410, valid=False), fallback)
+    text = metrics.render()
+
+    assert _value(text, "anamorphic_filter_holds_total") == 2
+    assert _value(text, "anamorphic_filter_recenters_total") == 1
+    assert _value(text, "anamorphic_filter_held_frames_total") == 11 + 1
+
+
+def test_histogram_overflow_bucket() -> None:
+    h = Histogram((1.0, 2.0))
+    h.observe(1.0)
+    h.observe(1.5)
+    h.observe(9.0)
+    assert h.counts == [1, 1, 1]
+
+
+def test_server_serves_prometheus_text_on_localhost() -> None:
+    metrics = PipelineMetrics()
+    metrics.observe_frame(10.0, 2.0, 20.0, True, 1)
+    server = MetricsServer(metrics, port=0)
+    server.start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as resp:
+            body = resp.read().decode("utf-8")
+            assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"http://127.0.0.1:{server.port}/other", timeout=5)
+    finally:
+        server.stop()
+
+    assert "# TYPE anamorphic_frame_time_seconds histogram" in body
+    assert _value(body, "anamorphic_frames_total") == 1
+
+
+def test_outlier_counters_are_exported_per_axis() -> None:
+    rejector = OutlierRejector()
+    for i in range(8):
+        rejector.check(HeadPose(10 * i, (0.0, 0.0, 0.7), (0.0, 0.0, 0.0), 1.0, True))
+    rejector.check(HeadPose(80, (0.0, 0.3, 0.7), (0.0, 0.0, 0.0), 1.0, True))
+    text = PipelineMetrics(outlier_stats=rejector.stats).render()
+
+    assert _value(text, "anamorphic_outlier_checked_total") == 9
+    assert _value(text, "anamorphic_outlier_rejected_total") == 1
+    assert 'anamorphic_outlier_rejected_axis_total{axis="y"} 1' in text
+    assert 'anamorphic_outlier_rejected_axis_total{axis="x"} 0' in text
@@ -0,0 +1,81 @@
+import numpy as np
+
+from app.calibration.multi_display import DisplayFanout
+from app.config.settings import DEFAULT_CONFIG_PATH, DisplaySettings, load_settings, save_settings
+from app.types import HeadPose
+
+
+def _display(tx: float, resolution_w: int = 1920) -> DisplaySettings:
+    return DisplaySettings(
+        width_m=0.6,
+        height_m=0.34,
+        resolution_w=resolution_w,
+        resolution_h=1080,
+        camera_offset=(tx, 0.06, 0.25, 0.0, 0.0, 0.0),
+    )
+
+
+def test_fanout_views_follow_per_display_offsets() -> None:
+    fanout = DisplayFanout.from_settings([_display(0.0), _display(0.6), _display(-0.6)])
+    pose = HeadPose(0, (0.1, 0.0, 0.7), (0.0, 0.0, 0.0), 1.0, True)
+
+    views = fanout.compute_view_matrices(pose)
+
+    assert views.shape == (3, 4, 4)
+    assert np.allclose(views[:, 0, 3], [-0.1, -0.7, 0.5])
+
+    fanout.set_camera_offset(1, (0.3, 0.06, 0.25, 0.0, 0.0, 0.0))
+    assert np.isclose(fanout.compute_view_matrices(pose)[1, 0, 3], -0.4)
+
+
+def test_fanout_projection_cache_tracks_aspect_changes() -> None:
+    fanout = DisplayFanout.from_settings([_display(0.0), _display(0.6, resolution_w=1080)])
+    p1 = fanout.compute_proj_matrices(60.0, 0.05, 10.0)
+    assert fanout.compute_proj_matrices(60.0, 0.05, 10.0) is p1
+    assert not np.isclose(p1[0, 0, 0], p1[1, 0, 0])
+
+    fanout.set_display_params(1, 0.6, 0.34, 1920, 1080)
+    p2 = fanout.compute_proj_matrices(60.0, 0.05, 10.0)
+    assert np.isclose(p2[0, 0, 0], p2[1, 0, 0])
+
+
+def test_extra_displays_roundtrip(tmp_path) -> None:
+    settings = load_settings(DEFAULT_CONFIG_PATH)
+    assert settings.displays == []
+    extra = _display(0.6)
+    extra.screen = 1
+    settings.displays = [extra]
+
+    out_path = tmp_path / "runtime.yaml"
+    save_settings(settings, out_path)
+    loaded = load_settings(out_path)
+
+    assert loaded.displays == [extra]
+
+
+def test_fanout_off_axis_matches_each_display() -> None:
+    fanout = DisplayFanout.from_settings([_display(0.0), _display(0.6), _display(-0.6)])
+    pose = HeadPose(0, (0.1, 0.0, 0.5), (10.0, 0.0, 0.0), 1.0, True)
+
+    views, projs = fanout.compute_off_axis_matrices(pose, 0.05, 10.0)
+
+    assert views.shape == projs.shape == (3, 4, 4)
+    for i in range(3):
+        view, proj = fanout[i].compute_off_axis_matrices(pose, 0.05, 10.0)
+        assert np.allclose(views[i], view) and np.allclose(projs[i], proj)
+    # A display to the right sees the eye off to its left.
+    assert projs[1, 0, 2] < 0.0 < projs[2, 0, 2]
+
+
+def test_fanout_off_axis_follows_mount_angle_updates() -> None:
+    fanout = DisplayFanout.from_settings([_display(0.0), _display(0.6)])
+    pose = HeadPose(0, (0.1, 0.05, 0.5), (0.0, 0.0, 0.0), 1.0, True)
+    before, _ = fanout.compute_off_axis_matrices(pose, 0.05, 10.0)
+
+    fanout.set_camera_offset(1, (0.6, 0.06, 0.25, 20.0, -5.0, 0.0))
+    views, projs = fanout.compute_off_axis_matrices(pose, 0.05, 10.0)
+
+    assert np.allclose(views[0], before[0])
+    assert not np.allclose(views[1], before[1])
+    view, proj = fanout[1].compute_off_axis_matrices(pose, 0.05, 10.0)
+    assert np.allclose(views[1], view) and np.allclose(projs[1], proj)
@@ -0,0 +1,68 @@
+import numpy as np
+
+from app.tracking.multi_viewer import (
+    BodyObservation,
+    LongestPresentPolicy,
+    MultiViewerConfig,
+    MultiViewerTracker,
+)
+
+
+def _obs(x: float, z: float, body_id: int = -1, conf: float = 0.9) -> BodyObservation:
+    return BodyObservation(body_id=body_id, position_m=(x, 0.0, z), confidence=conf)
+
+
+def test_ids_persist_without_sdk_ids() -> None:
+    t = MultiViewerTracker(MultiViewerConfig())
+    t.update([_obs(-0.4, 1.0), _obs(0.4, 1.5)], 0)
+    ids = {round(v.pose.position_m[0], 1): v.viewer_id for v in t.viewers}
+
+    # Bodies arrive in swapped order and drift slightly; association must follow position.
+    for ts in range(33, 330, 33):
+        drift = ts / 3300.0
+        t.update([_obs(0.4 + drift, 1.5), _obs(-0.4 + drift, 1.0)], ts)
+
+    for v in t.viewers:
+        assert v.viewer_id == ids[-0.4 if v.pose.position_m[0] < 0 else 0.4]
+
+
+def test_sdk_ids_take_priority_over_distance() -> None:
+    t = MultiViewerTracker(MultiViewerConfig(max_match_distance_m=5.0))
+    t.update([_obs(0.0, 1.0, body_id=7), _obs(1.0, 1.0, body_id=8)], 0)
+    before = {v.sdk_id: v.viewer_id for v in t.viewers}
+
+    t.update([_obs(0.9, 1.0, body_id=7), _obs(0.1, 1.0, body_id=8)], 33)
+    after = {v.sdk_id: v.viewer_id for v in t.viewers}
+    assert before == after
+
+
+def test_closest_policy_and_lost_viewer_expiry() -> None:
+    t = MultiViewerTracker(MultiViewerConfig(lost_timeout_ms=100, switch_seconds=0.0))
+    out = t.update([_obs(0.0, 2.0, body_id=1), _obs(0.2, 0.8, body_id=2)], 0)
+    assert np.isclose(out.position_m[2], 0.8)
+
+    t.update([_obs(0.0, 2.0, body_id=1)], 50)
+    out = t.update([_obs(0.0, 2.0, body_id=1)], 200)
+    assert len(t.viewers) == 1
+    assert np.isclose(out.position_m[2], 2.0)
+
+
+def test_switch_blends_between_viewers() -> None:
+    cfg = MultiViewerConfig(lost_timeout_ms=50, switch_seconds=0.4)
+    t = MultiViewerTracker(cfg, policy=LongestPresentPolicy())
+    t.update([_obs(-0.5, 1.0, body_id=1)], 0)
+    t.update([_obs(-0.5, 1.0, body_id=1), _obs(0.5, 1.0, body_id=2)], 10)
+
+    # Viewer 1 leaves; output must glide towards viewer 2 instead of jumping.
+    xs = [t.update([_obs(0.5, 1.0, body_id=2)], ts).position_m[0] for ts in range(100, 600, 50)]
+    assert np.isclose(xs[0], -0.5)
+    assert -0.5 < xs[2] < 0.5
+    assert all(a <= b for a, b in zip(xs, xs[1:]))
+    assert np.isclose(xs[-1], 0.5)
+
+
+def test_no_bodies_reports_invalid_pose() -> None:
+    t = MultiViewerTracker(MultiViewerConfig())
+    out = t.update([], 0)
+    assert not out.valid
+    assert t.active_viewer_id is None
@@ -0,0 +1,173 @@
+import statistics
+import time
+
+import pytest
+
+from app.clock import VirtualClock
+from app.tracking.network_tracker import (
+    PACKET,
+    NetworkTracker,
+    NetworkTrackerConfig,
+    PosePublisher,
+    PosePublisherConfig,
+    decode_packet,
+    encode_packet,
+)
+from app.tracking.replay_tracker import ReplayTracker
+from app.types import HeadPose
+
+
+def _pose(ts: int, x: float = 0.1) -> HeadPose:
+    return HeadPose(ts, (x, -0.05, 0.7), (5.0, -2.0, 1.0), 0.9, True)
+
+
+def _wait_for(predicate, timeout_s: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if predicate():
+            return
+        time.sleep(0)
+    raise AssertionError("timed out")
+
+
+def test_packet_roundtrip_is_fixed_size() -> None:
+    packet = encode_packet(7, _pose(1234), sent_us=99, session=42)
+
+    assert len(packet) == PACKET.size == 56
+    seq, session, sent_us, pose = decode_packet(packet)
+    assert (seq, session, sent_us, pose.timestamp_ms, pose.valid) == (7, 42, 99, 1234, True)
+    assert pose.position_m == pytest.approx((0.1, -0.05, 0.7))
+    assert pose.yaw_pitch_roll_deg == pytest.approx((5.0, -2.0, 1.0))
+    assert decode_packet(b"junk") is None
+    assert decode_packet(b"XXXX" + packet[4:]) is None
+
+
+def test_reordering_loss_and_duplicates() -> None:
+    clock = VirtualClock()
+    tracker = NetworkTracker(NetworkTrackerConfig(), clock=clock)
+    now = clock.time() * 1000.0
+    sent = int(now * 1000) - 2000
+
+    for seq in (0, 1, 3, 4):
+        tracker.ingest(encode_packet(seq, _pose(int(now) + seq, x=float(seq)), sent), now)
+    tracker.ingest(encode_packet(2, _pose(int(now) + 2, x=2.0), sent), now)  # late
+    tracker.ingest(encode_packet(4, _pose(int(now) + 4, x=4.0), sent), now)  # duplicate
+    tracker.ingest(encode_packet(7, _pose(int(now) + 7, x=7.0), sent), now)
+
+    stats = tracker.stats()
+    assert stats.received == 7
+    assert stats.reordered == 1
+    assert stats.duplicates == 1
+    assert stats.lost == 2  # 5 and 6; 2 arrived late
+    # A late packet never moves the pose backwards.
+    assert tracker.get_latest_pose().position_m[0] == pytest.approx(7.0)
+
+
+def test_sequence_wraparound() -> None:
+    clock = VirtualClock()
+    tracker = NetworkTracker(clock=clock)
+    now = clock.time() * 1000.0
+    for seq in (2**32 - 2, 2**32 - 1, 0, 1):
+        tracker.ingest(encode_packet(seq, _pose(int(now), x=float(seq % 5)), int(now * 1000)), now)
+
+    stats = tracker.stats()
+    assert stats.lost == 0 and stats.reordered == 0
+    assert tracker.get_latest_pose().position_m[0] == pytest.approx(1.0)
+
+
+def test_clock_offset_maps_sender_time_and_goes_stale() -> None:
+    clock = VirtualClock()
+    tracker = NetworkTracker(NetworkTrackerConfig(stale_ms=100.0), clock=clock)
+    now = clock.time() * 1000.0
+    skew_ms = 5000.0  # sender clock is 5 s behind
+    sender_now = now - skew_ms
+    tracker.ingest(encode_packet(0, _pose(int(sender_now) - 10), int(sender_now * 1000)), now + 1.0)
+
+    pose = tracker.get_latest_pose()
+    assert pose.valid
+    assert pose.timestamp_ms == pytest.approx(now - 10 + 1.0, abs=1.0)
+    assert tracker.stats().clock_offset_ms == pytest.approx(skew_ms + 1.0, abs=0.01)
+
+    clock.advance(0.2)
+    assert not tracker.get_latest_pose().valid
+
+
+def test_loopback_stream_adds_under_a_millisecond() -> None:
+    receiver = NetworkTracker(NetworkTrackerConfig(bind_host="127.0.0.1", port=0, multicast_group=None))
+    receiver.start()
+    source = ReplayTracker([_pose(0)])
+    publisher = PosePublisher(source, PosePublisherConfig(destinations=[f"127.0.0.1:{receiver.port}"]))
+    try:
+        delays = []
+        base = int(time.time() * 1000)
+        for i in range(200):
+            started = time.perf_counter()
+            publisher.publish(_pose(base + i, x=i * 0.001))
+            _wait_for(lambda: receiver.stats().received == i + 1)
+            delays.append((time.perf_counter() - started) * 1000.0)
+    finally:
+        publisher.stop()
+        receiver.stop()
+
+    assert receiver.stats().lost == 0
+    assert statistics.median(delays) < 1.0
+
+
+def test_publisher_loop_forwards_new_samples_only() -> None:
+    receiver = NetworkTracker(NetworkTrackerConfig(bind_host="127.0.0.1", port=0, multicast_group=None))
+    receiver.start()
+    base = int(time.time() * 1000)
+    source = ReplayTracker([_pose(base + 20 * i, x=0.01 * i) for i in range(5)])
+    publisher = PosePublisher(source, PosePublisherConfig(destinations=[f"127.0.0.1:{receiver.port}"]))
+    publisher.start()
+    try:
+        _wait_for(lambda: receiver.stats().received >= 3)
+        assert receiver.get_latest_pose().valid
+    finally:
+        publisher.stop()
+        receiver.stop()
+
+    # One packet per replayed sample, not one per poll.
+    assert publisher.sent <= 6
+
+
+def test_sender_restart_without_session_resyncs() -> None:
+    clock = VirtualClock()
+    tracker = NetworkTracker(clock=clock)
+    now = clock.time() * 1000.0
+    for seq in range(2000):
+        tracker.ingest(encode_packet(seq, _pose(int(now), x=0.5), int(now * 1000)), now)
+    # An older sender (session 0) restarts from seq 0: far outside any reordering window.
+    tracker.ingest(encode_packet(0, _pose(int(now) + 1, x=-0.3), int(now * 1000)), now)
+    tracker.ingest(encode_packet(1, _pose(int(now) + 2, x=-0.2), int(now * 1000)), now)
+
+    stats = tracker.stats()
+    assert stats.restarts == 1 and stats.reordered == 0
+    assert tracker.get_latest_pose().position_m[0] == pytest.approx(-0.2)
+
+
+def test_publisher_restart_is_followed_immediately() -> None:
+    receiver = NetworkTracker(NetworkTrackerConfig(bind_host="127.0.0.1", port=0, multicast_group=None))
+    receiver.start()
+    target = PosePublisherConfig(destinations=[f"127.0.0.1:{receiver.port}"])
+    base = int(time.time() * 1000)
+    try:
+        first = PosePublisher(ReplayTracker([_pose(0)]), target)
+        for i in range(1000):
+            first.publish(_pose(base + i, x=0.5))
+            _wait_for(lambda: receiver.stats().received == i + 1)
+        first.stop()
+
+        second = PosePublisher(ReplayTracker([_pose(0)]), target)
+        assert second.session != first.session
+        second.publish(_pose(base + 1000, x=-0.25))
+        _wait_for(lambda: receiver.get_latest_pose().position_m[0] == pytest.approx(-0.25))
+        # A straggler from the old session does not pull the pose back.
+        receiver.ingest(encode_packet(1000, _pose(base + 999, x=0.5), int(time.time() * 1e6), first.session), time.time() * 1000.0)
+        second.stop()
+    finally:
+        receiver.stop()
+
+    stats = receiver.stats()
+    assert stats.restarts == 1
+    assert receiver.get_latest_pose().position_m[0] == pytest.approx(-0.25)
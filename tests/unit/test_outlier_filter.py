@@ -0,0 +1,108 @@
+import pytest
+
+from app.tracking.outlier_filter import OutlierConfig, OutlierRejector
+from app.tracking.pose_filter import FilterConfig, PoseFilter
+from app.types import HeadPose
+
+
+def _pose(ts: int, x: float, yaw: float = 0.0, valid: bool = True) -> HeadPose:
+    return HeadPose(ts, (x, 0.0, 0.7), (yaw, 0.0, 0.0), 1.0, valid)
+
+
+def _warm(rejector: OutlierRejector, count: int = 8) -> int:
+    # Small jitter around x=0, well inside the spread floors.
+    for i in range(count):
+        assert rejector.check(_pose(10 * i, 0.001 * (i % 3))).valid
+    return 10 * count
+
+
+def test_single_spike_is_rejected_then_tracking_continues() -> None:
+    rejector = OutlierRejector(OutlierConfig(window=9, threshold=3.5))
+    ts = _warm(rejector)
+
+    spike = rejector.check(_pose(ts, 0.25))
+    after = rejector.check(_pose(ts + 10, 0.001))
+
+    assert not spike.valid
+    assert spike.position_m == (0.25, 0.0, 0.7)
+    assert after.valid
+    assert rejector.stats.rejected == 1
+    assert rejector.stats.rejected_axes == [1, 0, 0, 0, 0, 0]
+
+
+def test_repeated_timestamp_keeps_its_verdict() -> None:
+    rejector = OutlierRejector()
+    ts = _warm(rejector)
+
+    assert not rejector.check(_pose(ts, 0.3)).valid
+    assert not rejector.check(_pose(ts, 0.3)).valid
+    assert rejector.stats.checked == 9
+    assert rejector.stats.rejected == 1
+
+
+def test_rotation_spike_counts_its_axis() -> None:
+    rejector = OutlierRejector()
+    ts = _warm(rejector)
+
+    assert not rejector.check(_pose(ts, 0.0, yaw=40.0)).valid
+    assert rejector.stats.rejected_axes == [0, 0, 0, 1, 0, 0]
+
+
+def test_turn_across_180_degrees_is_not_rejected() -> None:
+    rejector = OutlierRejector()
+    yaws = [177.0 + 0.5 * i for i in range(8)] + [-179.0 + 0.5 * i for i in range(8)]
+
+    verdicts = [rejector.check(_pose(10 * i, 0.0, yaw=(yaw + 180.0) % 360.0 - 180.0)).valid for i, yaw in enumerate(yaws)]
+
+    assert all(verdicts)
+    assert rejector.stats.rejected == 0
+    # A real spike is still caught just past the wrap.
+    assert not rejector.check(_pose(10 * len(yaws), 0.0, yaw=-140.0)).valid
+    assert rejector.stats.rejected_axes == [0, 0, 0, 1, 0, 0]
+
+
+def test_sustained_jump_reseeds_after_max_consecutive() -> None:
+    rejector = OutlierRejector(OutlierConfig(max_consecutive=3))
+    ts = _warm(rejector)
+
+    verdicts = [rejector.check(_pose(ts + 10 * i, 0.2)).valid for i in range(6)]
+
+    assert verdicts == [False, False, False, True, True, True]
+    assert rejector.stats.reseeds == 1
+
+
+def test_long_gap_restarts_the_window() -> None:
+    rejector = OutlierRejector(OutlierConfig(reset_after_ms=500))
+    ts = _warm(rejector)
+
+    # A new viewer after a dropout is not an outlier against the old window.
+    assert rejector.check(_pose(ts + 1000, 0.3)).valid
+    assert rejector.stats.rejected == 0
+
+
+def test_invalid_and_disabled_pass_through() -> None:
+    rejector = OutlierRejector(OutlierConfig(enabled=False))
+    ts = _warm(rejector)
+    assert rejector.check(_pose(ts, 0.5)).valid
+
+    rejector.set_config(OutlierConfig())
+    lost = _pose(ts + 10, 0.0, valid=False)
+    assert rejector.check(lost) is lost
+
+
+def test_filter_holds_through_rejected_sample() -> None:
+    rejector = OutlierRejector()
+    f = PoseFilter(FilterConfig(ema_alpha=1.0, velocity_limit_m_s=100.0))
+    fallback = _pose(0, 0.0)
+    for i in range(8):
+        out = f.update(rejector.check(_pose(10 * i, 0.0)), fallback)
+
+    held = f.update(rejector.check(_pose(80, 0.3)), fallback)
+
+    assert held.position_m == out.position_m
+
+
+@pytest.mark.parametrize("config", [OutlierConfig(window=2), OutlierConfig(min_samples=12), OutlierConfig(threshold=0.0)])
+def test_invalid_config_is_rejected(config: OutlierConfig) -> None:
+    with pytest.raises(ValueError):
+        OutlierRejector(config)
@@ -44,3 +44,59 @@ def test_tracking_loss_hold_then_recenter() -> None:
 
     recentered = f.update(_pose(1700, 9.0, conf=0.0, valid=False), fallback)
     assert 0.0 <= recentered.position_m[0] < 0.2
+
+
+def _euro(**kwargs) -> FilterConfig:
+    return FilterConfig(mode="one_euro", velocity_limit_m_s=100.0, **kwargs)
+
+
+def test_one_euro_smooths_jitter_when_still() -> None:
+    f = PoseFilter(_euro(pos_min_cutoff_hz=(0.5, 0.5, 0.5)))
+    fallback = _pose(0, 0.0)
+
+    outs = [f.update(_pose(100 + 10 * i, 0.01 if i % 2 else -0.01), fallback) for i in range(50)]
+    spread = max(o.position_m[0] for o in outs[10:]) - min(o.position_m[0] for o in outs[10:])
+
+    assert spread < 0.005
+
+
+def test_one_euro_follows_fast_motion_with_less_lag_than_ema() -> None:
+    fallback = _pose(0, 0.0)
+    euro = PoseFilter(_euro(pos_min_cutoff_hz=(0.5, 0.5, 0.5), pos_beta=(20.0, 20.0, 20.0)))
+    ema = PoseFilter(FilterConfig(ema_alpha=0.03, velocity_limit_m_s=100.0))
+
+    for i in range(30):
+        pose = _pose(100 + 10 * i, 0.02 * i)
+        out_euro = euro.update(pose, fallback)
+        out_ema = ema.update(pose, fallback)
+
+    target = 0.02 * 29
+    assert abs(target - out_euro.position_m[0]) < 0.5 * abs(target - out_ema.position_m[0])
+
+
+def test_one_euro_rotation_axes_use_their_own_params() -> None:
+    f = PoseFilter(_euro(rot_min_cutoff_hz=(100.0, 0.1, 0.1), rot_beta=(0.0, 0.0, 0.0)))
+    fallback = _pose(0, 0.0)
+    f.update(_pose(100, 0.0), fallback)
+    step = HeadPose(110, (0.0, 0.0, 0.7), (10.0, 10.0, 0.0), 1.0, True)
+
+    out = f.update(step, fallback)
+
+    assert out.yaw_pitch_roll_deg[0] > 8.0
+    assert out.yaw_pitch_roll_deg[1] < 1.0
+
+
+def test_one_euro_keeps_hold_and_recenter() -> None:
+    f = PoseFilter(_euro(loss_timeout_ms=300, recenter_seconds=1.0))
+    fallback = _pose(0, 0.0)
+    for i in range(20):
+        f.update(_pose(100 + 10 * i, 1.0), fallback)
+
+    hold = f.update(_pose(350, 9.0, conf=0.0, valid=False), fallback)
+    assert 0.9 < hold.position_m[0] <= 1.0
+    recentered = f.update(_pose(1900, 9.0, conf=0.0, valid=False), fallback)
+    assert 0.0 <= recentered.position_m[0] < 0.2
+
+    # Recovery continues from the recentered output instead of the stale pre-loss state.
+    back = f.update(_pose(1910, 0.0), fallback)
+    assert back.position_m[0] < 0.2
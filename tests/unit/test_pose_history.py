@@ -0,0 +1,73 @@
+import pytest
+
+from app.tracking.pose_history import PoseHistory, PoseHistoryConfig
+from app.types import HeadPose
+
+
+def _pose(ts: int, x: float, yaw: float = 0.0, valid: bool = True) -> HeadPose:
+    return HeadPose(
+        timestamp_ms=ts,
+        position_m=(x, 0.0, 0.7),
+        yaw_pitch_roll_deg=(yaw, 0.0, 0.0),
+        confidence=1.0,
+        valid=valid,
+    )
+
+
+def test_interpolates_between_samples() -> None:
+    h = PoseHistory(PoseHistoryConfig(capacity=8))
+    for i in range(4):
+        h.push(_pose(i * 16, i * 0.016, yaw=i * 10.0))
+
+    out = h.pose_at(24.0)
+
+    assert out is not None
+    # Constant velocity: Hermite with finite-difference tangents is exact.
+    assert out.position_m[0] == pytest.approx(0.024)
+    assert out.yaw_pitch_roll_deg[0] == pytest.approx(15.0)
+    assert out.timestamp_ms == 24
+
+
+def test_extrapolation_is_bounded() -> None:
+    h = PoseHistory(PoseHistoryConfig(capacity=8, max_extrapolation_ms=10.0))
+    h.push(_pose(0, 0.0))
+    h.push(_pose(10, 0.1))
+
+    near = h.pose_at(15.0)
+    far = h.pose_at(500.0)
+
+    assert near.position_m[0] == pytest.approx(0.15)
+    assert far.position_m[0] == pytest.approx(0.2)
+
+
+def test_ring_wraps_and_ignores_invalid_or_stale_samples() -> None:
+    h = PoseHistory(PoseHistoryConfig(capacity=4))
+    for i in range(10):
+        h.push(_pose(i * 10, float(i)))
+    assert not h.push(_pose(200, 99.0, valid=False))
+    assert not h.push(_pose(50, 99.0))
+
+    assert len(h) == 4
+    assert h.newest_timestamp_ms == 90.0
+    # Queries before the retained window clamp to the oldest kept sample.
+    assert h.pose_at(0.0).position_m[0] == pytest.approx(6.0)
+    assert h.pose_at(75.0).position_m[0] == pytest.approx(7.5)
+
+
+def test_empty_history_returns_none() -> None:
+    assert PoseHistory(PoseHistoryConfig()).pose_at(0.0) is None
+
+
+def test_set_config_keeps_samples_unless_capacity_changes() -> None:
+    h = PoseHistory(PoseHistoryConfig(capacity=8, max_extrapolation_ms=10.0))
+    h.push(_pose(0, 0.0))
+    h.push(_pose(10, 0.1))
+
+    h.set_config(PoseHistoryConfig(capacity=8, max_extrapolation_ms=0.0))
+    assert len(h) == 2
+    assert h.pose_at(15.0).position_m[0] == pytest.approx(0.1)
+
+    h.set_config(PoseHistoryConfig(capacity=16))
+    assert len(h) == 0
+    with pytest.raises(ValueError):
+        h.set_config(PoseHistoryConfig(capacity=1))
@@ -0,0 +1,72 @@
+import numpy as np
+
+from app.config.settings import DEFAULT_CONFIG_PATH, load_settings
+from app.progressive_render import ProgressiveConfig, build_progressive, refinement_levels
+from app.render.frame_cache import FrameCacheConfig
+
+
+def test_refinement_levels_halve_stride_and_cover_each_frame_once() -> None:
+    levels = refinement_levels(10, 4)
+
+    assert [stride for stride, _ in levels] == [4, 2, 1]
+    assert levels[0][1] == [0, 4, 8]
+    assert levels[1][1] == [2, 6]
+    flat = [i for _, new in levels for i in new]
+    assert sorted(flat) == list(range(10))
+    assert refinement_levels(3, 1) == [(1, [0, 1, 2])]
+
+
+def test_passes_reuse_earlier_frames_and_end_complete(tmp_path) -> None:
+    cache_cfg = FrameCacheConfig(root=tmp_path / "cache")
+    progressive = build_progressive(
+        load_settings(DEFAULT_CONFIG_PATH),
+        "orbit",
+        duration_s=1.0,
+        fps=9,
+        width=128,
+        height=72,
+        config=ProgressiveConfig(proxy_scale=0.25, proxy_stride=4),
+        cache_config=cache_cfg,
+    )
+    try:
+        passes = list(progressive.passes())
+    finally:
+        progressive.close()
+
+    assert [len(p.indices) for p in passes] == [3, 5, 9]
+    assert sum(p.rendered for p in passes) == 9
+    stats = progressive.cache.stats
+    assert stats.hits + stats.misses == 9
+    first, last = passes[0], passes[-1]
+    assert first.frames[0].shape[:2] == (18, 32)
+    # A frame from pass 1 is carried into the final pass as the same array.
+    assert last.frames[last.indices.index(4)] is first.frames[1]
+    assert last.playback_fps(9) == 9.0
+    assert first.playback_fps(9) == 3.0
+
+
+def test_full_pass_runs_in_background_and_preview_is_written(tmp_path) -> None:
+    progressive = build_progressive(
+        load_settings(DEFAULT_CONFIG_PATH),
+        "orbit",
+        duration_s=0.5,
+        fps=8,
+        width=96,
+        height=64,
+        config=ProgressiveConfig(proxy_scale=0.5, proxy_stride=2),
+    )
+    try:
+        passes = progressive.passes()
+        first = next(passes)
+        preview = progressive.write_preview(first, tmp_path / "preview.gif", 8)
+        full = progressive.start_full(tmp_path / "full.gif", 8, "gif")
+        rest = list(passes)
+        saved, stats = full.result(timeout=120)
+    finally:
+        progressive.close()
+
+    assert preview.exists()
+    assert len(rest[-1].indices) == 4
+    assert saved.exists()
+    assert stats.frames == 4
+    assert np.asarray(rest[-1].frames[0]).shape[:2] == (32, 48)
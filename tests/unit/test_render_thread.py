@@ -0,0 +1,102 @@
+import threading
+
+import pytest
+
+from app.clock import VirtualClock
+from app.render.render_thread import FramePacer, LatestSlot, TripleBuffer
+
+
+def approx(value: float):
+    return pytest.approx(value, abs=1e-9)
+
+
+def test_latest_slot_keeps_only_newest_value() -> None:
+    slot: LatestSlot[int] = LatestSlot()
+    assert slot.get() == (0, None)
+    assert slot.take_if_newer(0) is None
+
+    slot.put(1)
+    slot.put(2)
+    generation, value = slot.get()
+
+    assert (generation, value) == (2, 2)
+    assert slot.take_if_newer(generation) is None
+    slot.put(3)
+    assert slot.take_if_newer(generation) == (3, 3)
+
+
+def test_triple_buffer_acquire_returns_newest_published() -> None:
+    buffers: TripleBuffer[int] = TripleBuffer()
+    assert buffers.acquire() is None
+
+    buffers.publish(10)
+    assert buffers.acquire() == 10
+    assert buffers.front_serial == 1
+    for value in range(11, 20):
+        # Consumer keeps compositing the same frame while the producer runs ahead.
+        buffers.publish(value)
+    assert buffers.front_serial == 1
+    assert buffers.acquire() == 19
+    assert buffers.front_serial == buffers.published
+    assert buffers.acquire() == 19
+
+
+def test_triple_buffer_producer_never_writes_the_held_frame() -> None:
+    buffers: TripleBuffer[str] = TripleBuffer()
+    writes: dict[int, str] = {}
+    held = None
+    for i in range(50):
+        value = f"f{i}"
+        writes[buffers.back_index] = value
+        buffers.publish(value)
+        if i % 3 == 0:
+            held = buffers.acquire()
+        # The slot the consumer holds is never the one the producer draws into next.
+        assert held is None or writes.get(buffers.back_index) != held
+
+
+def test_triple_buffer_under_concurrent_producer() -> None:
+    buffers: TripleBuffer[int] = TripleBuffer()
+    done = threading.Event()
+
+    def produce() -> None:
+        for i in range(1, 20001):
+            buffers.publish(i)
+        done.set()
+
+    thread = threading.Thread(target=produce)
+    thread.start()
+    seen = []
+    while not done.is_set():
+        value = buffers.acquire()
+        if value is not None:
+            seen.append(value)
+    thread.join()
+    seen.append(buffers.acquire())
+
+    assert seen == sorted(seen)
+    assert seen[-1] == 20000
+
+
+def test_frame_pacer_holds_absolute_deadlines() -> None:
+    clock = VirtualClock()
+    pacer = FramePacer(100.0, clock)
+    start = clock.perf_counter()
+
+    for _ in range(10):
+        assert pacer.wait() == 0
+        clock.advance(0.003)  # render cost shorter than the period
+
+    assert clock.perf_counter() - start == approx(0.093)
+
+
+def test_frame_pacer_skips_instead_of_bursting_after_stall() -> None:
+    clock = VirtualClock()
+    pacer = FramePacer(100.0, clock)
+    pacer.wait()
+    clock.advance(0.055)
+
+    assert pacer.wait() == 4
+    before = clock.perf_counter()
+    assert pacer.wait() == 0
+    assert clock.perf_counter() - before == approx(0.010)
@@ -0,0 +1,95 @@
+import numpy as np
+
+from app.calibration.display_calibrator import DisplayCalibrator, DisplayParams
+from app.render.reprojection import (
+    ReprojectingRenderer,
+    SoftwareBoxRenderer,
+    SoftwareRendererConfig,
+    reproject_frame,
+    reprojection_matrix,
+)
+from app.types import HeadPose
+
+BG = (9, 11, 20)
+
+
+def _setup() -> tuple[DisplayCalibrator, np.ndarray, SoftwareBoxRenderer]:
+    calibrator = DisplayCalibrator(DisplayParams(0.6, 0.34, 320, 180), (0.0, 0.0, 0.0, 0.0, 0.0, 0.0))
+    proj = calibrator.compute_proj_matrix(fov_deg=60.0, near_m=0.05, far_m=10.0)
+    renderer = SoftwareBoxRenderer(SoftwareRendererConfig(width=320, height=180, bg_color=BG))
+    return calibrator, proj, renderer
+
+
+def _view(calibrator: DisplayCalibrator, x: float, y: float = 0.0, yaw: float = 0.0) -> np.ndarray:
+    return calibrator.compute_view_matrix(HeadPose(0, (x, y, 0.6), (yaw, 0.0, 0.0), 1.0, True))
+
+
+def _coverage(image: np.ndarray, reference: np.ndarray) -> float:
+    # Share of the reference's line pixels that have a line pixel within one pixel in `image`.
+    lines = np.any(image != BG, axis=-1)
+    near = lines.copy()
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            near |= np.roll(np.roll(lines, dy, axis=0), dx, axis=1)
+    ref = np.any(reference != BG, axis=-1)
+    return float(np.count_nonzero(near & ref)) / max(1, np.count_nonzero(ref))
+
+
+def test_reprojection_matrix_is_identity_for_same_pose() -> None:
+    calibrator, proj, _ = _setup()
+    view = _view(calibrator, 0.03)
+
+    assert np.allclose(reprojection_matrix(view, proj, view, proj), np.eye(4), atol=1e-5)
+
+
+def test_same_pose_warp_reproduces_frame() -> None:
+    calibrator, proj, renderer = _setup()
+    view = _view(calibrator, 0.02, 0.01)
+    color, depth = renderer.render(view, proj, 0.8, 1.2)
+
+    warped, warped_depth = reproject_frame(color, depth, view, proj, view, proj, BG)
+
+    assert np.array_equal(warped, color)
+    assert np.allclose(warped_depth, depth, atol=1e-5)
+
+
+def test_warp_matches_direct_render_at_new_pose() -> None:
+    calibrator, proj, renderer = _setup()
+    src_view = _view(calibrator, 0.0)
+    dst_view = _view(calibrator, 0.04, 0.02, yaw=2.0)
+    color, depth = renderer.render(src_view, proj, 0.8, 1.2)
+    truth, _ = renderer.render(dst_view, proj, 0.8, 1.2)
+
+    warped, _ = reproject_frame(color, depth, src_view, proj, dst_view, proj, BG)
+
+    # The stale frame is visibly off; the warped one lands on the new-pose render.
+    assert _coverage(color, truth) < 0.6
+    assert _coverage(warped, truth) > 0.9
+    assert _coverage(truth, warped) > 0.95
+
+
+def test_empty_frame_warps_to_clear_colour() -> None:
+    calibrator, proj, renderer = _setup()
+    view = _view(calibrator, 0.0)
+    color, depth = renderer.render(view, proj, 0.8, 1.2)
+    depth[:] = 1.0
+
+    warped, _ = reproject_frame(color, depth, view, proj, _view(calibrator, 0.05), proj, BG)
+
+    assert np.all(warped == BG)
+
+
+def test_reprojecting_renderer_alternates_full_and_warped_frames() -> None:
+    calibrator, proj, renderer = _setup()
+    reprojecting = ReprojectingRenderer(renderer, full_every=2)
+
+    frames = [reprojecting.render(_view(calibrator, 0.01 * i), proj, 0.8, 1.2) for i in range(6)]
+    # A box change forces a full render even mid-cycle.
+    reprojecting.render(_view(calibrator, 0.06), proj, 0.6, 1.2)
+    reprojecting.render(_view(calibrator, 0.07), proj, 0.6, 1.2)
+    reprojecting.render(_view(calibrator, 0.08), proj, 0.8, 1.2)
+
+    assert reprojecting.stats.full_frames == 5
+    assert reprojecting.stats.warped_frames == 4
+    truth, _ = renderer.render(_view(calibrator, 0.05), proj, 0.8, 1.2)
+    assert _coverage(frames[5], truth) > 0.9
@@ -1,4 +1,10 @@
-from app.config.settings import DEFAULT_CONFIG_PATH, load_settings, save_settings
+import os
+
+import pytest
+import yaml
+
+from app.config.settings import DEFAULT_CONFIG_PATH, FILTER_MODES, SettingsWatcher, load_settings, save_settings
+from app.tracking import pose_filter
 
 
 def test_save_and_load_roundtrip(tmp_path) -> None:
@@ -12,3 +18,92 @@ def test_save_and_load_roundtrip(tmp_path) -> None:
     loaded = load_settings(out_path)
     assert loaded.render.fov_deg == 72.0
     assert loaded.render.box_depth_m == 1.44
+
+
+def test_load_settings_parses_each_file_once(tmp_path, monkeypatch) -> None:
+    out_path = tmp_path / "runtime.yaml"
+    save_settings(load_settings(DEFAULT_CONFIG_PATH), out_path)
+
+    calls = []
+    real_safe_load = yaml.safe_load
+    monkeypatch.setattr(yaml, "safe_load", lambda f: calls.append(1) or real_safe_load(f))
+
+    first = load_settings(out_path)
+    second = load_settings(out_path)
+    first.render.fov_deg = 99.0
+
+    assert len(calls) == 1
+    assert second.render.fov_deg != 99.0
+
+
+def test_watcher_reports_live_and_restart_fields(tmp_path) -> None:
+    out_path = tmp_path / "runtime.yaml"
+    settings = load_settings(DEFAULT_CONFIG_PATH)
+    save_settings(settings, out_path)
+    watcher = SettingsWatcher(load_settings(out_path), out_path)
+    assert watcher.poll() is None
+
+    settings.tracking.ema_alpha = 0.5
+    settings.camera.grab_fps = 30
+    settings.render.threaded = True
+    save_settings(settings, out_path)
+    st = out_path.stat()
+    os.utime(out_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    change = watcher.poll()
+    assert change is not None
+    assert set(change.changed) == {"tracking.ema_alpha", "camera.grab_fps", "render.threaded"}
+    assert sorted(change.restart_required) == ["camera.grab_fps", "render.threaded"]
+    assert change.settings.tracking.ema_alpha == 0.5
+    assert watcher.poll() is None
+
+
+def test_one_euro_tracking_settings_roundtrip(tmp_path) -> None:
+    settings = load_settings(DEFAULT_CONFIG_PATH)
+    settings.tracking.filter_mode = "one_euro"
+    settings.tracking.pos_beta = (1.0, 2.0, 3.0)
+    out = save_settings(settings, tmp_path / "runtime.yaml")
+
+    loaded = load_settings(out)
+
+    assert loaded.tracking.filter_mode == "one_euro"
+    assert loaded.tracking.pos_beta == (1.0, 2.0, 3.0)
+    assert loaded.tracking.rot_beta == settings.tracking.rot_beta
+
+
+def test_invalid_outlier_settings_are_rejected(tmp_path) -> None:
+    out_path = tmp_path / "runtime.yaml"
+    settings = load_settings(DEFAULT_CONFIG_PATH)
+    save_settings(settings, out_path)
+    watcher = SettingsWatcher(load_settings(out_path), out_path)
+
+    for name, value in (("outlier_window", 2), ("outlier_threshold", 0.0), ("outlier_max_consecutive", -1)):
+        bad = load_settings(DEFAULT_CONFIG_PATH)
+        setattr(bad.tracking, name, value)
+        save_settings(bad, out_path)
+        with pytest.raises(ValueError):
+            load_settings(out_path)
+        st = out_path.stat()
+        os.utime(out_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        # The watcher keeps the last good settings instead of handing the change on.
+        assert watcher.poll() is None
+
+    settings.tracking.outlier_window = 3
+    save_settings(settings, out_path)
+    assert load_settings(out_path).tracking.outlier_window == 3
+
+
+def test_unknown_filter_mode_is_rejected(tmp_path) -> None:
+    # settings.py keeps its own copy so loading config does not import the tracking package.
+    assert FILTER_MODES == pose_filter.FILTER_MODES
+    out_path = tmp_path / "runtime.yaml"
+    settings = load_settings(DEFAULT_CONFIG_PATH)
+    for mode in FILTER_MODES:
+        settings.tracking.filter_mode = mode
+        save_settings(settings, out_path)
+        assert load_settings(out_path).tracking.filter_mode == mode
+
+    settings.tracking.filter_mode = "kalman"
+    save_settings(settings, out_path)
+    with pytest.raises(ValueError, match="filter_mode"):
+        load_settings(out_path)
@@ -0,0 +1,58 @@
+import time
+
+import numpy as np
+
+from app.sim.camera_path import PathConfig
+from app.tracking.sim_tracker import SimTracker, SimTrackerConfig
+
+
+def _stream(cfg: SimTrackerConfig, n: int):
+    t = SimTracker(cfg)
+    return [t.sample(i) for i in range(n)]
+
+
+def test_same_seed_same_stream_and_noise_applied() -> None:
+    cfg = SimTrackerConfig(sample_rate_hz=1000.0, noise_std_m=0.01, dropout_prob=0.1, burst_prob=0.01, seed=3)
+    a = _stream(cfg, 500)
+    b = _stream(cfg, 500)
+    clean = _stream(SimTrackerConfig(sample_rate_hz=1000.0), 500)
+
+    assert a == b
+    err = np.array([p.position_m for p in a]) - np.array([p.position_m for p in clean])
+    assert 0.007 < err.std() < 0.013
+
+
+def test_bursts_and_dropouts() -> None:
+    cfg = SimTrackerConfig(dropout_prob=0.2, dropout_confidence=0.05, burst_prob=0.02, burst_len_samples=5, seed=1)
+    poses = _stream(cfg, SimTracker(cfg).samples_per_loop)
+
+    assert any(p.valid and p.confidence == 0.05 for p in poses)
+    valid = [p.valid for p in poses]
+    runs = []
+    run = 0
+    for v in valid:
+        run = 0 if v else run + 1
+        runs.append(run)
+    assert max(runs) >= 5
+
+
+def test_heavy_tailed_noise_has_outliers() -> None:
+    base = dict(sample_rate_hz=1000.0, path=PathConfig(duration_s=10.0), noise_std_m=0.01, seed=7)
+    gauss = np.array([p.position_m[0] for p in _stream(SimTrackerConfig(**base), 10000)])
+    heavy = np.array([p.position_m[0] for p in _stream(SimTrackerConfig(noise_t_dof=2.5, **base), 10000)])
+    clean = np.array([p.position_m[0] for p in _stream(SimTrackerConfig(sample_rate_hz=1000.0, path=PathConfig(duration_s=10.0)), 10000)])
+
+    assert np.abs(heavy - clean).max() > 2.0 * np.abs(gauss - clean).max()
+
+
+def test_latency_delays_delivered_samples() -> None:
+    t = SimTracker(SimTrackerConfig(sample_rate_hz=500.0, latency_ms=40.0))
+    t.start()
+    assert not t.get_latest_pose().valid
+    time.sleep(0.06)
+    pose = t.get_latest_pose()
+    lag_ms = time.time() * 1000.0 - pose.timestamp_ms
+    t.stop()
+
+    assert pose.valid
+    assert 38.0 <= lag_ms < 60.0
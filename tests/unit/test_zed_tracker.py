@@ -0,0 +1,234 @@
+import enum
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.clock import VirtualClock
+from app.config.settings import CameraSettings
+from app.tracking import zed_tracker
+from app.tracking.zed_tracker import ZedTracker, ZedTrackerConfig
+
+
+class ERROR_CODE(enum.Enum):  # noqa: N801 - mirrors pyzed.sl
+    SUCCESS = 0
+    FAILURE = 1
+    CAMERA_NOT_DETECTED = 2
+
+
+class LoggingClock(VirtualClock):
+    def __init__(self) -> None:
+        super().__init__()
+        self.sleeps: list[float] = []
+        self.on_advance = None
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        super().sleep(seconds)
+
+    def advance(self, seconds: float) -> None:
+        super().advance(seconds)
+        if self.on_advance is not None:
+            self.on_advance()
+
+
+class FakeSdk:
+    # Stand-in for pyzed.sl: grab() and open() results come from scripts; each grab costs one
+    # camera frame of virtual time. When the grab script runs out, `done` is set and the last
+    # code repeats.
+    def __init__(self, clock: VirtualClock, grabs: list[ERROR_CODE], opens: list[ERROR_CODE] | None = None, on_grab=None, on_open=None) -> None:
+        self.clock = clock
+        self.grabs = list(grabs)
+        self.opens = list(opens or [])
+        self.on_grab = on_grab
+        self.on_open = on_open
+        self.done = threading.Event()
+        self.opened = 0
+        self.closed = 0
+        sdk = self
+
+        class Camera:
+            def open(self, init):
+                sdk.opened += 1
+                if sdk.on_open is not None:
+                    sdk.on_open()
+                return sdk.opens.pop(0) if sdk.opens else ERROR_CODE.SUCCESS
+
+            def enable_body_tracking(self, params):
+                return ERROR_CODE.SUCCESS
+
+            def disable_body_tracking(self):
+                pass
+
+            def close(self):
+                sdk.closed += 1
+
+            def grab(self, runtime):
+                sdk.clock.advance(1.0 / 60.0)
+                time.sleep(0)
+                if sdk.on_grab is not None:
+                    sdk.on_grab()
+                if len(sdk.grabs) > 1:
+                    return sdk.grabs.pop(0)
+                sdk.done.set()
+                return sdk.grabs[0]
+
+            def retrieve_bodies(self, bodies, runtime):
+                bodies.is_new = True
+                bodies.body_list = [SimpleNamespace(id=1, confidence=90.0, keypoint=[(0.1, 0.2, 0.8)])]
+
+        self.module = SimpleNamespace(
+            ERROR_CODE=ERROR_CODE,
+            Camera=Camera,
+            InitParameters=lambda: SimpleNamespace(),
+            DEPTH_MODE=SimpleNamespace(PERFORMANCE="PERFORMANCE"),
+            BodyTrackingParameters=lambda: SimpleNamespace(),
+            BODY_TRACKING_MODEL=SimpleNamespace(HUMAN_BODY_MEDIUM="MEDIUM"),
+            BODY_FORMAT=SimpleNamespace(BODY_38="BODY_38"),
+            Bodies=lambda: SimpleNamespace(is_new=False, body_list=[]),
+            RuntimeParameters=lambda: SimpleNamespace(),
+            BodyTrackingRuntimeParameters=lambda: SimpleNamespace(),
+        )
+
+
+def _tracker(monkeypatch, sdk: FakeSdk, **overrides) -> ZedTracker:
+    monkeypatch.setattr(zed_tracker, "sl", sdk.module)
+    camera = CameraSettings(grab_fps=60, depth_mode="PERFORMANCE", body_model="MEDIUM")
+    return ZedTracker(ZedTrackerConfig(camera=camera, **overrides), clock=sdk.clock)
+
+
+def _run_until_done(tracker: ZedTracker, sdk: FakeSdk):
+    tracker.start()
+    try:
+        assert sdk.done.wait(5.0)
+        return tracker.stats(), tracker.get_latest_pose()
+    finally:
+        tracker.stop()
+
+
+def test_disconnect_reopens_with_exponential_backoff(monkeypatch) -> None:
+    clock = LoggingClock()
+    ok, lost = ERROR_CODE.SUCCESS, ERROR_CODE.CAMERA_NOT_DETECTED
+    sdk = FakeSdk(clock, [ok] * 5 + [lost] + [ok] * 5, opens=[ok, lost, lost, lost])
+    tracker = _tracker(monkeypatch, sdk, adaptive_pacing=False)
+
+    stats, pose = _run_until_done(tracker, sdk)
+
+    assert stats.reopens == 1
+    assert sdk.opened == 5  # initial open, three failed reopens, one good one
+    assert clock.sleeps[:3] == pytest.approx([0.002, 0.004, 0.008])
+    assert stats.last_error.startswith("Failed to open")
+    assert stats.total_drops == 1
+    assert pose.valid and pose.position_m == (0.1, 0.2, 0.8)
+
+
+def test_repeated_failures_trigger_reopen_and_backoff_is_capped(monkeypatch) -> None:
+    clock = LoggingClock()
+    ok, fail = ERROR_CODE.SUCCESS, ERROR_CODE.FAILURE
+    sdk = FakeSdk(clock, [ok] * 3 + [fail] * 12 + [ok] * 3)
+    tracker = _tracker(monkeypatch, sdk, adaptive_pacing=False, reopen_after_failures=6, backoff_max_s=0.01)
+
+    stats, _ = _run_until_done(tracker, sdk)
+
+    assert stats.reopens == 2
+    assert stats.total_drops == 12
+    assert max(clock.sleeps) == pytest.approx(0.01)
+    assert stats.consecutive_failures == 0
+
+
+def test_stop_waits_for_a_reopen_in_progress_before_the_camera_is_closed(monkeypatch) -> None:
+    clock = LoggingClock()
+    opening, release = threading.Event(), threading.Event()
+
+    def on_open() -> None:
+        if sdk.opened > 1:
+            opening.set()
+            assert release.wait(5.0)
+
+    sdk = FakeSdk(clock, [ERROR_CODE.CAMERA_NOT_DETECTED], on_open=on_open)
+    tracker = _tracker(monkeypatch, sdk, adaptive_pacing=False)
+    tracker.start()
+    assert opening.wait(5.0)
+
+    stopper = threading.Thread(target=tracker.stop)
+    stopper.start()
+    stopper.join(0.2)
+    assert stopper.is_alive()
+    assert sdk.closed == 1  # only the camera that failed the grab
+
+    release.set()
+    stopper.join(5.0)
+    assert not stopper.is_alive()
+    # The camera opened during stop() is closed by the capture thread, not leaked or closed early.
+    assert sdk.closed == sdk.opened == 2
+    assert tracker.stats().state == "stopped"
+
+
+def test_stale_flag_and_invalid_pose_while_grabs_fail(monkeypatch) -> None:
+    clock = LoggingClock()
+    ok, fail = ERROR_CODE.SUCCESS, ERROR_CODE.FAILURE
+    sdk = FakeSdk(clock, [ok] * 3 + [fail] * 40, on_grab=None)
+    tracker = _tracker(monkeypatch, sdk, adaptive_pacing=False, reopen_after_failures=1000, backoff_max_s=0.05, stale_ms=100.0)
+
+    stats, pose = _run_until_done(tracker, sdk)
+
+    assert stats.stale
+    assert stats.state == "backoff"
+    assert not pose.valid
+    assert stats.drops_per_s > 0.0
+
+
+def test_adaptive_pacing_follows_consumer_rate(monkeypatch) -> None:
+    clock = LoggingClock()
+    next_read = [0.0]
+    tracker: ZedTracker | None = None
+
+    def consumer() -> None:
+        # A 20 Hz reader running alongside the capture thread, on virtual time.
+        if clock.monotonic() >= next_read[0]:
+            next_read[0] = clock.monotonic() + 0.05 - (clock.monotonic() - next_read[0]) % 0.05
+            tracker.get_latest_pose()
+
+    sdk = FakeSdk(clock, [ERROR_CODE.SUCCESS] * 400)
+    tracker = _tracker(monkeypatch, sdk, pacing_headroom=1.25, min_grab_fps=10.0)
+    next_read[0] = clock.monotonic()
+    clock.on_advance = consumer
+
+    stats, _ = _run_until_done(tracker, sdk)
+
+    assert 20.0 <= stats.consumer_hz <= 21.0
+    # 20 Hz reads * 1.25 headroom -> ~25 grabs/s instead of the camera's 60.
+    assert 20.0 <= stats.grabs_per_s <= 30.0
+    assert stats.total_drops == 0
+
+
+def test_viewer_poses_are_a_snapshot_published_by_the_capture_thread(monkeypatch) -> None:
+    clock = LoggingClock()
+    sdk = FakeSdk(clock, [ERROR_CODE.SUCCESS] * 200)
+    monkeypatch.setattr(zed_tracker, "sl", sdk.module)
+    camera = CameraSettings(grab_fps=60, depth_mode="PERFORMANCE", body_model="MEDIUM", multi_viewer=True)
+    tracker = ZedTracker(ZedTrackerConfig(camera=camera, adaptive_pacing=False), clock=clock)
+    seen: list[dict] = []
+
+    def reader() -> None:
+        while not sdk.done.is_set():
+            seen.append(tracker.get_viewer_poses())
+
+    assert tracker.get_viewer_poses() == {}
+    thread = threading.Thread(target=reader)
+    tracker.start()
+    thread.start()
+    try:
+        assert sdk.done.wait(5.0)
+        thread.join(5.0)
+        poses = tracker.get_viewer_poses()
+    finally:
+        tracker.stop()
+
+    assert len(poses) == 1
+    (pose,) = poses.values()
+    assert pose.valid and pose.position_m == (0.1, 0.2, 0.8)
+    poses.clear()
+    assert len(tracker.get_viewer_poses()) == 1
+    assert all(len(p) <= 1 for p in seen)